@@ -18,98 +18,198 @@ See [https://docs.livekit.io/agents/](https://docs.livekit.io/agents/) for quick
 documentation, and examples.
 """
 
+import importlib
 import typing
 
-from . import cli, inference, ipc, llm, metrics, stt, tokenize, tts, utils, vad, voice
-from ._exceptions import (
-    APIConnectionError,
-    APIError,
-    APIStatusError,
-    APITimeoutError,
-    AssignmentTimeoutError,
-)
-from .job import (
-    AutoSubscribe,
-    JobContext,
-    JobExecutorType,
-    JobProcess,
-    JobRequest,
-    get_job_context,
-)
-from .llm.chat_context import (
-    ChatContent,
-    ChatContext,
-    ChatItem,
-    ChatMessage,
-    ChatRole,
-    FunctionCall,
-    FunctionCallOutput,
-)
-from .llm.tool_context import FunctionTool, StopResponse, ToolError, function_tool
-from .plugin import Plugin
-from .types import (
-    DEFAULT_API_CONNECT_OPTIONS,
-    NOT_GIVEN,
-    APIConnectOptions,
-    FlushSentinel,
-    NotGiven,
-    NotGivenOr,
-)
 from .version import __version__
-from .voice import (
-    Agent,
-    AgentEvent,
-    AgentFalseInterruptionEvent,
-    AgentSession,
-    AgentStateChangedEvent,
-    AgentTask,
-    CloseEvent,
-    CloseReason,
-    ConversationItemAddedEvent,
-    ErrorEvent,
-    FunctionToolsExecutedEvent,
-    MetricsCollectedEvent,
-    ModelSettings,
-    RunContext,
-    SpeechCreatedEvent,
-    UserInputTranscribedEvent,
-    UserStateChangedEvent,
-    avatar,
-    io,
-    room_io,
-)
-from .voice.background_audio import AudioConfig, BackgroundAudioPlayer, BuiltinAudioClip, PlayHandle
-from .voice.room_io import RoomInputOptions, RoomIO, RoomOutputOptions
-from .voice.run_result import (
-    AgentHandoffEvent,
-    ChatMessageEvent,
-    EventAssert,
-    EventRangeAssert,
-    FunctionCallEvent,
-    FunctionCallOutputEvent,
-    RunAssert,
-    RunEvent,
-    RunResult,
-    mock_tools,
-)
-from .worker import (
-    AgentServer,
-    WorkerOptions,
-    WorkerPermissions,
-    WorkerType,
-)
 
+# the package is imported lazily (PEP 562): importing `livekit.agents` (e.g. in a job process)
+# only loads the submodules that are actually used
 if typing.TYPE_CHECKING:
+    from . import cli, inference, ipc, llm, metrics, stt, tokenize, tts, utils, vad, voice
+    from ._exceptions import (
+        APIConnectionError,
+        APIError,
+        APIStatusError,
+        APITimeoutError,
+        AssignmentTimeoutError,
+    )
+    from .job import (
+        AutoSubscribe,
+        JobContext,
+        JobExecutorType,
+        JobProcess,
+        JobRequest,
+        get_job_context,
+    )
     from .llm import mcp  # noqa: F401
+    from .llm.chat_context import (
+        ChatContent,
+        ChatContext,
+        ChatItem,
+        ChatMessage,
+        ChatRole,
+        FunctionCall,
+        FunctionCallOutput,
+    )
+    from .llm.tool_context import FunctionTool, StopResponse, ToolError, function_tool
+    from .plugin import Plugin
+    from .types import (
+        DEFAULT_API_CONNECT_OPTIONS,
+        NOT_GIVEN,
+        APIConnectOptions,
+        FlushSentinel,
+        NotGiven,
+        NotGivenOr,
+    )
+    from .voice import (
+        Agent,
+        AgentEvent,
+        AgentFalseInterruptionEvent,
+        AgentSession,
+        AgentStateChangedEvent,
+        AgentTask,
+        CloseEvent,
+        CloseReason,
+        ConversationItemAddedEvent,
+        ErrorEvent,
+        FunctionToolsExecutedEvent,
+        MetricsCollectedEvent,
+        ModelSettings,
+        RunContext,
+        SpeechCreatedEvent,
+        TurnLatencyEvent,
+        UserInputTranscribedEvent,
+        UserStateChangedEvent,
+        avatar,
+        io,
+        room_io,
+    )
+    from .voice.background_audio import (
+        AudioConfig,
+        BackgroundAudioPlayer,
+        BuiltinAudioClip,
+        PlayHandle,
+    )
+    from .voice.room_io import RoomInputOptions, RoomIO, RoomOutputOptions
+    from .voice.run_result import (
+        AgentHandoffEvent,
+        ChatMessageEvent,
+        EventAssert,
+        EventRangeAssert,
+        FunctionCallEvent,
+        FunctionCallOutputEvent,
+        RunAssert,
+        RunEvent,
+        RunResult,
+        mock_tools,
+    )
+    from .worker import (
+        AgentServer,
+        WorkerOptions,
+        WorkerPermissions,
+        WorkerType,
+    )
+
+_LAZY_SUBMODULES = frozenset(
+    ("cli", "inference", "ipc", "llm", "metrics", "stt", "tokenize", "tts", "utils", "vad", "voice")
+)
+
+_LAZY_ATTRS: dict[str, str] = {
+    "APIConnectionError": "._exceptions",
+    "APIError": "._exceptions",
+    "APIStatusError": "._exceptions",
+    "APITimeoutError": "._exceptions",
+    "AssignmentTimeoutError": "._exceptions",
+    "AutoSubscribe": ".job",
+    "JobContext": ".job",
+    "JobExecutorType": ".job",
+    "JobProcess": ".job",
+    "JobRequest": ".job",
+    "get_job_context": ".job",
+    "ChatContent": ".llm.chat_context",
+    "ChatContext": ".llm.chat_context",
+    "ChatItem": ".llm.chat_context",
+    "ChatMessage": ".llm.chat_context",
+    "ChatRole": ".llm.chat_context",
+    "FunctionCall": ".llm.chat_context",
+    "FunctionCallOutput": ".llm.chat_context",
+    "FunctionTool": ".llm.tool_context",
+    "StopResponse": ".llm.tool_context",
+    "ToolError": ".llm.tool_context",
+    "function_tool": ".llm.tool_context",
+    "Plugin": ".plugin",
+    "DEFAULT_API_CONNECT_OPTIONS": ".types",
+    "NOT_GIVEN": ".types",
+    "APIConnectOptions": ".types",
+    "FlushSentinel": ".types",
+    "NotGiven": ".types",
+    "NotGivenOr": ".types",
+    "Agent": ".voice",
+    "AgentEvent": ".voice",
+    "AgentFalseInterruptionEvent": ".voice",
+    "AgentSession": ".voice",
+    "AgentStateChangedEvent": ".voice",
+    "AgentTask": ".voice",
+    "CloseEvent": ".voice",
+    "CloseReason": ".voice",
+    "ConversationItemAddedEvent": ".voice",
+    "ErrorEvent": ".voice",
+    "FunctionToolsExecutedEvent": ".voice",
+    "MetricsCollectedEvent": ".voice",
+    "ModelSettings": ".voice",
+    "RunContext": ".voice",
+    "SpeechCreatedEvent": ".voice",
+    "TurnLatencyEvent": ".voice",
+    "UserInputTranscribedEvent": ".voice",
+    "UserStateChangedEvent": ".voice",
+    "avatar": ".voice",
+    "io": ".voice",
+    "room_io": ".voice",
+    "AudioConfig": ".voice.background_audio",
+    "BackgroundAudioPlayer": ".voice.background_audio",
+    "BuiltinAudioClip": ".voice.background_audio",
+    "PlayHandle": ".voice.background_audio",
+    "RoomInputOptions": ".voice.room_io",
+    "RoomIO": ".voice.room_io",
+    "RoomOutputOptions": ".voice.room_io",
+    "AgentHandoffEvent": ".voice.run_result",
+    "ChatMessageEvent": ".voice.run_result",
+    "EventAssert": ".voice.run_result",
+    "EventRangeAssert": ".voice.run_result",
+    "FunctionCallEvent": ".voice.run_result",
+    "FunctionCallOutputEvent": ".voice.run_result",
+    "RunAssert": ".voice.run_result",
+    "RunEvent": ".voice.run_result",
+    "RunResult": ".voice.run_result",
+    "mock_tools": ".voice.run_result",
+    "AgentServer": ".worker",
+    "WorkerOptions": ".worker",
+    "WorkerPermissions": ".worker",
+    "WorkerType": ".worker",
+    "mcp": ".llm",
+}
 
 
 def __getattr__(name: str) -> typing.Any:
-    if name == "mcp":
-        from .llm import mcp
+    if name in _LAZY_SUBMODULES:
+        value: typing.Any = importlib.import_module(f".{name}", __name__)
+    elif (module_name := _LAZY_ATTRS.get(name)) is not None:
+        module = importlib.import_module(module_name, __name__)
+        try:
+            value = getattr(module, name)
+        except AttributeError:
+            # submodule that wasn't imported by its package yet (e.g. `mcp`)
+            value = importlib.import_module(f"{module_name}.{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
 
-        return mcp
 
-    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
 
 
 __all__ = [
@@ -144,6 +244,7 @@ __all__ = [
     "UserInputTranscribedEvent",
     "UserStateChangedEvent",
     "SpeechCreatedEvent",
+    "TurnLatencyEvent",
     "MetricsCollectedEvent",
     "FunctionToolsExecutedEvent",
     "FunctionCall",
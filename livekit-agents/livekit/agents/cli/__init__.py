@@ -1,7 +1,23 @@
-from .cli import AgentsConsole, run_app
+import typing
+
+if typing.TYPE_CHECKING:
+    from .cli import AgentsConsole, run_app
 
 __all__ = ["run_app", "AgentsConsole"]
 
+
+# `cli.run_app` is only used by the main process, don't import the whole CLI in job processes
+def __getattr__(name: str) -> typing.Any:
+    if name in __all__:
+        from . import cli
+
+        value = getattr(cli, name)
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Cleanup docs of unexported modules
 _module = dir()
 NOT_IN_ALL = [m for m in _module if m not in __all__]
@@ -1340,6 +1340,13 @@ class LogLevel(str, enum.Enum):
     critical = "CRITICAL"
 
 
+class ImportSortKey(str, enum.Enum):
+    self_time = "self_time"
+    cumulative_time = "cumulative_time"
+    self_memory = "self_memory"
+    cumulative_memory = "cumulative_memory"
+
+
 def _build_cli(server: AgentServer) -> typer.Typer:
     app = typer.Typer(rich_markup_mode="rich")
 
@@ -1517,6 +1524,55 @@ def _build_cli(server: AgentServer) -> typer.Typer:
         except _ExitCli:
             raise typer.Exit() from None
 
+    @app.command()
+    def profile_imports(
+        *,
+        sort: Annotated[
+            ImportSortKey,
+            typer.Option(help="Column used to sort the modules", case_sensitive=False),
+        ] = ImportSortKey.cumulative_time,
+        limit: Annotated[int, typer.Option(help="Number of modules to show")] = 30,
+    ) -> None:
+        """
+        Report the import time and memory of each module loaded by a job process.
+        """
+        from .import_profiler import profile_job_imports
+
+        main_file = pathlib.Path(sys.argv[0]).resolve()
+        try:
+            stats = profile_job_imports(str(main_file))
+        except Exception as e:
+            logger.error(f"failed to profile the imports of {main_file}: {e}")
+            raise typer.Exit(code=1) from None
+
+        stats.sort(key=lambda stat: getattr(stat, sort.value), reverse=True)
+
+        table = Table(show_header=True, show_lines=False, box=None)
+        table.add_column("Module", style="bold", overflow="fold")
+        table.add_column("Self (ms)", justify="right")
+        table.add_column("Cumulative (ms)", style="#1fd5f9", justify="right")
+        table.add_column("Self (MB)", justify="right")
+        table.add_column("Cumulative (MB)", style="#1fd5f9", justify="right")
+
+        for stat in stats[:limit]:
+            table.add_row(
+                stat.module,
+                f"{stat.self_time * 1000:.1f}",
+                f"{stat.cumulative_time * 1000:.1f}",
+                f"{stat.self_memory / 1e6:.1f}",
+                f"{stat.cumulative_memory / 1e6:.1f}",
+            )
+
+        total_time = sum(stat.self_time for stat in stats)
+        total_memory = sum(stat.self_memory for stat in stats)
+
+        console = Console()
+        console.print(table)
+        console.print(
+            f"\n{len(stats)} modules imported in {total_time:.2f}s, "
+            f"{total_memory / 1e6:.1f}MB of RSS"
+        )
+
     @app.command()
     def download_files() -> None:
         c = AgentsConsole.get_instance()
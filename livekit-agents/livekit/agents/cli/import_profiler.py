@@ -0,0 +1,169 @@
+"""Measure the import time and memory of each module loaded by a job process.
+
+This file is executed as a script in a fresh interpreter (see `profile_job_imports`), it must
+only depend on the standard library and psutil so the profiler is installed before anything
+else gets imported.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import importlib
+import importlib.abc
+import importlib.machinery
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from types import ModuleType
+from typing import Any
+
+import psutil
+
+
+@dataclass
+class ImportStat:
+    module: str
+    self_time: float = 0.0
+    """time spent importing the module itself, in seconds"""
+    cumulative_time: float = 0.0
+    """time spent importing the module and the modules it imported, in seconds"""
+    self_memory: int = 0
+    """RSS increase while importing the module itself, in bytes"""
+    cumulative_memory: int = 0
+    """RSS increase while importing the module and the modules it imported, in bytes"""
+
+
+@dataclass
+class _Frame:
+    start_time: float
+    start_memory: int
+    child_time: float = 0.0
+    child_memory: int = 0
+
+
+class _ProfilingLoader(importlib.abc.Loader):
+    def __init__(self, loader: Any, name: str, profiler: ImportProfiler) -> None:
+        self._loader = loader
+        self._name = name
+        self._profiler = profiler
+
+    def create_module(self, spec: importlib.machinery.ModuleSpec) -> ModuleType | None:
+        # extension modules are loaded here
+        with self._profiler.measure(self._name):
+            return self._loader.create_module(spec)  # type: ignore[no-any-return]
+
+    def exec_module(self, module: ModuleType) -> None:
+        with self._profiler.measure(self._name):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._loader, name)
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    """Meta path finder wrapping the loaders of the imported modules to time them"""
+
+    def __init__(self) -> None:
+        self._process = psutil.Process()
+        self._stack: list[_Frame] = []
+        self._stats: dict[str, ImportStat] = {}
+
+    @property
+    def stats(self) -> list[ImportStat]:
+        return list(self._stats.values())
+
+    def install(self) -> None:
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self) -> None:
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(
+        self, fullname: str, path: Any, target: ModuleType | None = None
+    ) -> importlib.machinery.ModuleSpec | None:
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _ProfilingLoader(spec.loader, fullname, self)
+
+            return spec
+
+        return None
+
+    @contextlib.contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        self._stack.append(_Frame(time.perf_counter(), self._process.memory_info().rss))
+        try:
+            yield
+        finally:
+            self._exit(name)
+
+    def _exit(self, name: str) -> None:
+        frame = self._stack.pop()
+        total_time = time.perf_counter() - frame.start_time
+        total_memory = self._process.memory_info().rss - frame.start_memory
+
+        stat = self._stats.setdefault(name, ImportStat(module=name))
+        stat.self_time += total_time - frame.child_time
+        stat.cumulative_time += total_time
+        stat.self_memory += total_memory - frame.child_memory
+        stat.cumulative_memory += total_memory
+
+        if self._stack:
+            self._stack[-1].child_time += total_time
+            self._stack[-1].child_memory += total_memory
+
+
+def profile_job_imports(main_file: str, *, timeout: float = 120.0) -> list[ImportStat]:
+    """Import `main_file` like a job process would, in a fresh interpreter.
+
+    The main module is executed as `__mp_main__` (so the `if __name__ == "__main__"` block
+    isn't run), followed by the job process entrypoint.
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_path = os.path.join(tmpdir, "imports.json")
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), os.path.abspath(main_file), output_path],
+            check=True,
+            timeout=timeout,
+        )
+
+        with open(output_path) as f:
+            return [ImportStat(**stat) for stat in json.load(f)]
+
+
+def _profile_main(main_file: str, output_path: str) -> None:
+    import runpy
+
+    # don't resolve the imports relative to the livekit.agents.cli directory
+    sys.path[0] = os.path.dirname(main_file)
+    sys.argv = [main_file]
+
+    profiler = ImportProfiler()
+    profiler.install()
+    try:
+        with profiler.measure("__mp_main__"):
+            runpy.run_path(main_file, run_name="__mp_main__")
+
+        importlib.import_module("livekit.agents.ipc.job_proc_lazy_main")
+    finally:
+        profiler.uninstall()
+
+    with open(output_path, "w") as f:
+        json.dump([asdict(stat) for stat in profiler.stats], f)
+
+
+if __name__ == "__main__":
+    _profile_main(sys.argv[1], sys.argv[2])
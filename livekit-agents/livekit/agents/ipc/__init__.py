@@ -6,6 +6,8 @@ from . import (
     job_thread_executor,
     proc_pool,
     proto,
+    shared_proc_executor,
+    zygote,
 )
 
 __all__ = [
@@ -16,6 +18,8 @@ __all__ = [
     "job_thread_executor",
     "proc_pool",
     "proto",
+    "shared_proc_executor",
+    "zygote",
 ]
 
 # Cleanup docs of unexported modules
@@ -75,6 +75,11 @@ class InferenceProcExecutor(SupervisedProc):
                 with contextlib.suppress(asyncio.InvalidStateError):
                     fut.set_result(msg)
 
+    @property
+    def num_pending_requests(self) -> int:
+        """Number of inference requests waiting for a response"""
+        return len(self._active_requests)
+
     async def do_inference(self, method: str, data: bytes) -> bytes | None:
         if not self.started:
             raise RuntimeError("process not started")
@@ -36,6 +36,7 @@ class ProcJobExecutor(SupervisedProc):
         http_proxy: str | None,
         mp_ctx: BaseContext,
         loop: asyncio.AbstractEventLoop,
+        loop_monitor_threshold: float = 0.0,
     ) -> None:
         super().__init__(
             initialize_timeout=initialize_timeout,
@@ -48,6 +49,7 @@ class ProcJobExecutor(SupervisedProc):
             mp_ctx=mp_ctx,
             loop=loop,
             http_proxy=http_proxy,
+            loop_monitor_threshold=loop_monitor_threshold,
         )
 
         self._user_args: Any | None = None
@@ -58,6 +60,7 @@ class ProcJobExecutor(SupervisedProc):
         self._session_end_fnc = session_end_fnc
         self._inference_executor = inference_executor
         self._inference_tasks: list[asyncio.Task[None]] = []
+        self._job_start_cpu_time = 0.0
         self._id = shortuuid("PCEXEC_")
 
     @property
@@ -113,6 +116,13 @@ class ProcJobExecutor(SupervisedProc):
         finally:
             if self._running_job:
                 metrics.job_ended()
+                if (sample := self.last_sample) is not None:
+                    # the last sample is at most a sampling interval old
+                    metrics.job_resources(
+                        cpu_time=sample.cpu_time - self._job_start_cpu_time,
+                        peak_memory_bytes=self._peak_memory_bytes,
+                    )
+
                 self._job_status = JobStatus.SUCCESS if self.exitcode == 0 else JobStatus.FAILED
 
     async def _do_inference_task(self, inf_req: proto.InferenceRequest) -> None:
@@ -149,6 +159,9 @@ class ProcJobExecutor(SupervisedProc):
         metrics.job_started()
         self._job_status = JobStatus.RUNNING
         self._running_job = info
+        if (sample := self.last_sample) is not None:
+            # don't account the initialization of the process to the job
+            self._job_start_cpu_time = sample.cpu_time
 
         start_req = proto.StartJobRequest()
         start_req.running_job = info
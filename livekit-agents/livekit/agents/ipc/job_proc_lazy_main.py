@@ -45,6 +45,8 @@ class ProcStartArgs:
     mp_cch: socket.socket
     log_cch: socket.socket
     user_arguments: Any | None = None
+    job_process: JobProcess | None = None
+    """already initialized JobProcess, set when the process is forked from the job zygote"""
 
 
 def proc_main(args: ProcStartArgs) -> None:
@@ -66,6 +68,7 @@ def proc_main(args: ProcStartArgs) -> None:
         args.session_end_fnc,
         JobExecutorType.PROCESS,
         args.user_arguments,
+        job_process=args.job_process,
     )
 
     client = _ProcClient(args.mp_cch, args.log_cch, job_proc.initialize, job_proc.entrypoint)
@@ -112,6 +115,8 @@ def proc_main(args: ProcStartArgs) -> None:
             logger.warning("stack for `%s`:\n%s", t.name, "".join(traceback.format_stack(frame)))
 
     log_handler.close()
+    # processes forked from the job zygote exit with os._exit, flush the remaining records
+    log_handler.thread.join()
 
 
 class _InfClient(InferenceExecutor):
@@ -159,8 +164,11 @@ class _JobProc:
         session_end_fnc: Callable[[JobContext], Awaitable[None]] | None,
         executor_type: JobExecutorType,
         user_arguments: Any | None = None,
+        *,
+        job_process: JobProcess | None = None,
     ) -> None:
         self._executor_type = executor_type
+        self._prewarmed_job_proc = job_process
         self._user_arguments = user_arguments
         self._initialize_process_fnc = initialize_process_fnc
         self._job_entrypoint_fnc = job_entrypoint_fnc
@@ -178,6 +186,11 @@ class _JobProc:
     def initialize(self, init_req: InitializeRequest, client: _ProcClient) -> None:
         self._client = client
         self._inf_client = _InfClient(client)
+        if self._prewarmed_job_proc is not None:
+            # forked from the job zygote, initialize_process_fnc already ran there
+            self._job_proc = self._prewarmed_job_proc
+            return
+
         self._job_proc = JobProcess(
             executor_type=self._executor_type,
             user_arguments=self._user_arguments,
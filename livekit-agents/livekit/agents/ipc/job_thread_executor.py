@@ -28,6 +28,7 @@ class _ProcOpts:
     ping_interval: float
     high_ping_threshold: float
     http_proxy: str | None
+    loop_monitor_threshold: float
 
 
 class ThreadJobExecutor:
@@ -44,6 +45,7 @@ class ThreadJobExecutor:
         high_ping_threshold: float,
         http_proxy: str | None,
         loop: asyncio.AbstractEventLoop,
+        loop_monitor_threshold: float = 0.0,
     ) -> None:
         self._loop = loop
         self._opts = _ProcOpts(
@@ -55,6 +57,7 @@ class ThreadJobExecutor:
             ping_interval=ping_interval,
             high_ping_threshold=high_ping_threshold,
             http_proxy=http_proxy,
+            loop_monitor_threshold=loop_monitor_threshold,
         )
 
         self._user_args: Any | None = None
@@ -148,7 +151,11 @@ class ThreadJobExecutor:
 
     async def initialize(self) -> None:
         await channel.asend_message(
-            self._pch, proto.InitializeRequest(http_proxy=self._opts.http_proxy or "")
+            self._pch,
+            proto.InitializeRequest(
+                http_proxy=self._opts.http_proxy or "",
+                loop_monitor_threshold=self._opts.loop_monitor_threshold,
+            ),
         )
 
         try:
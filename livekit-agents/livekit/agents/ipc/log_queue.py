@@ -1,16 +1,92 @@
 from __future__ import annotations
 
-import copy
 import logging
-import pickle
+import marshal
 import queue
 import sys
 import threading
-from typing import Callable, Optional
+import time
+from typing import Any, Callable, Optional
 
 from .. import utils
 from ..utils.aio import duplex_unix
 
+# records are shipped as tuples of these fields (followed by the extra attributes), the full
+# LogRecord is never pickled
+_RECORD_FIELDS: tuple[str, ...] = (
+    "name",
+    "levelno",
+    "levelname",
+    "msg",
+    "pathname",
+    "filename",
+    "module",
+    "lineno",
+    "funcName",
+    "created",
+    "msecs",
+    "relativeCreated",
+    "thread",
+    "threadName",
+    "processName",
+    "process",
+)
+
+# attributes of a LogRecord that are either shipped above or dropped once the message is formatted
+_SKIPPED_ATTRS = frozenset(
+    _RECORD_FIELDS
+    + (
+        "args",
+        "exc_info",
+        "exc_text",
+        "stack_info",
+        "message",
+        "asctime",
+        "taskName",
+        # webosckets library add "websocket" attribute to log records
+        "websocket",
+    )
+)
+
+_PRIMITIVE_TYPES = (str, int, float, bool, type(None))
+
+
+def _sanitize(value: Any) -> Any:
+    """Convert a value to something marshal can serialize"""
+    # marshal rejects subclasses (e.g. str enums), check the exact type
+    if type(value) in _PRIMITIVE_TYPES:
+        return value
+
+    if isinstance(value, (list, tuple)):
+        return [_sanitize(v) for v in value]
+
+    if isinstance(value, dict):
+        return {str(k): _sanitize(v) for k, v in value.items()}
+
+    try:
+        return str(value)
+    except Exception:
+        return None
+
+
+def _encode_batch(records: list[tuple[Any, ...]]) -> bytes:
+    try:
+        return marshal.dumps(records)
+    except ValueError:
+        # an extra attribute isn't serializable, only sanitize this batch
+        return marshal.dumps(_sanitize(records))
+
+
+def _decode_batch(data: bytes) -> list[logging.LogRecord]:
+    records: list[logging.LogRecord] = []
+    for rec in marshal.loads(data):
+        attrs = dict(zip(_RECORD_FIELDS, rec[:-1]))
+        attrs.update(rec[-1])
+        attrs["args"] = None
+        records.append(logging.makeLogRecord(attrs))
+
+    return records
+
 
 class LogQueueListener:
     def __init__(
@@ -43,6 +119,11 @@ class LogQueueListener:
 
         lger.callHandlers(record)
 
+    def handle_batch(self, data: bytes) -> None:
+        """Handle a frame sent by a LogQueueHandler"""
+        for record in _decode_batch(data):
+            self.handle(record)
+
     def _monitor(self) -> None:
         while True:
             try:
@@ -50,17 +131,42 @@ class LogQueueListener:
             except utils.aio.duplex_unix.DuplexClosed:
                 break
 
-            record = pickle.loads(data)
-            self.handle(record)
+            self.handle_batch(data)
 
 
 class LogQueueHandler(logging.Handler):
+    """Forward the log records of a job process to the worker.
+
+    Records are coalesced for up to `batch_interval` seconds (or `max_batch_size` records) and
+    sent as a single frame. Records below WARNING are rate limited to `max_records_per_second`
+    (with bursts up to `burst_size`), the number of dropped records is reported to the worker
+    with the next batch.
+    """
+
     _sentinal = None
 
-    def __init__(self, duplex: utils.aio.duplex_unix._Duplex) -> None:
+    def __init__(
+        self,
+        duplex: utils.aio.duplex_unix._Duplex,
+        *,
+        batch_interval: float = 0.05,
+        max_batch_size: int = 256,
+        max_records_per_second: float = 500.0,
+        burst_size: int = 2000,
+    ) -> None:
         super().__init__()
         self._duplex = duplex
-        self._send_q = queue.SimpleQueue[Optional[bytes]]()
+        self._batch_interval = batch_interval
+        self._max_batch_size = max_batch_size
+        self._rate = max_records_per_second
+        self._burst_size = burst_size
+        self._tokens = float(burst_size)
+        self._last_refill = time.monotonic()
+        self._rate_lock = threading.Lock()
+        self._dropped = 0
+        self._total_dropped = 0
+
+        self._send_q = queue.SimpleQueue[Optional[tuple[Any, ...]]]()
         self._send_thread = threading.Thread(target=self._forward_logs, name="ipc_log_forwarder")
         self._send_thread.start()
 
@@ -68,41 +174,126 @@ class LogQueueHandler(logging.Handler):
     def thread(self) -> threading.Thread:
         return self._send_thread
 
+    @property
+    def dropped_records(self) -> int:
+        """Total number of records dropped by the rate limiter"""
+        return self._total_dropped
+
     def _forward_logs(self) -> None:
-        while True:
-            serialized_record = self._send_q.get()
-            if serialized_record is None:
+        closing = False
+        while not closing:
+            item = self._send_q.get()
+            if item is None:
                 break
 
+            batch = [item]
+            deadline = time.monotonic() + self._batch_interval
+            while len(batch) < self._max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+
+                try:
+                    item = self._send_q.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+                if item is None:
+                    closing = True
+                    break
+
+                batch.append(item)
+
+            if dropped_record := self._take_dropped_record():
+                batch.append(dropped_record)
+
+            try:
+                data = _encode_batch(batch)
+            except Exception:
+                continue  # can't report it, the logging is what's failing
+
             try:
-                self._duplex.send_bytes(serialized_record)
+                self._duplex.send_bytes(data)
             except duplex_unix.DuplexClosed:
                 break
 
         self._duplex.close()
 
+    def _acquire(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        with self._rate_lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self._burst_size), self._tokens + (now - self._last_refill) * self._rate
+            )
+            self._last_refill = now
+
+            if self._tokens < 1.0:
+                self._dropped += 1
+                self._total_dropped += 1
+                return False
+
+            self._tokens -= 1.0
+            return True
+
+    def _take_dropped_record(self) -> tuple[Any, ...] | None:
+        with self._rate_lock:
+            dropped, self._dropped = self._dropped, 0
+
+        if not dropped:
+            return None
+
+        record = logging.LogRecord(
+            name="livekit.agents",
+            level=logging.WARNING,
+            pathname=__file__,
+            lineno=0,
+            msg=f"dropped {dropped} log records, the job is logging too fast",
+            args=None,
+            exc_info=None,
+        )
+        return self._serialize(record, record.msg, {"dropped_records": dropped})
+
+    def _serialize(self, record: logging.LogRecord, msg: str, extra: dict[str, Any]) -> tuple:
+        d = record.__dict__
+        return (
+            record.name,
+            record.levelno,
+            record.levelname,
+            msg,
+            record.pathname,
+            record.filename,
+            record.module,
+            record.lineno,
+            record.funcName,
+            record.created,
+            record.msecs,
+            record.relativeCreated,
+            d.get("thread"),
+            d.get("threadName"),
+            d.get("processName"),
+            d.get("process"),
+            extra,
+        )
+
     def emit(self, record: logging.LogRecord) -> None:
         try:
             # Check if Python is shutting down
             if sys.is_finalizing():
                 return
 
-            # from https://github.com/python/cpython/blob/91b7f2e7f6593acefda4fa860250dd87d6f849bf/Lib/logging/handlers.py#L1453
+            if not self._acquire(record):
+                return
+
             msg = self.format(record)
-            record = copy.copy(record)
-            record.message = msg
-            record.msg = msg
-            record.args = None
-            record.exc_info = None
-            record.exc_text = None
-            record.stack_info = None
-
-            # https://websockets.readthedocs.io/en/stable/topics/logging.html#logging-to-json
-            # webosckets library add "websocket" attribute to log records, which is not pickleable
-            if hasattr(record, "websocket"):
-                record.websocket = None
-
-            self._send_q.put_nowait(pickle.dumps(record))
+            extra = {
+                key: value
+                for key, value in record.__dict__.items()
+                if key not in _SKIPPED_ATTRS and not key.startswith("_")
+            }
+            self._send_q.put_nowait(self._serialize(record, msg, extra))
 
         except Exception:
             self.handleError(record)
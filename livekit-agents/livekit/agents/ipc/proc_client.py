@@ -63,6 +63,15 @@ class _ProcClient:
         loop.set_debug(self._init_req.asyncio_debug)
         loop.slow_callback_duration = 0.1  # 100ms
 
+        loop_monitor = None
+        if self._init_req.loop_monitor_threshold > 0:
+            from ..telemetry.loop_monitor import LoopMonitor
+
+            loop_monitor = LoopMonitor(
+                slow_callback_threshold=self._init_req.loop_monitor_threshold
+            )
+            loop_monitor.start(loop)
+
         try:
             self._task = loop.create_task(self._monitor_task(), name="proc_client_main")
             while not self._task.done():
@@ -76,6 +85,9 @@ class _ProcClient:
         except KeyboardInterrupt:
             pass
         finally:
+            if loop_monitor is not None:
+                loop_monitor.stop()
+
             loop.run_until_complete(loop.shutdown_default_executor())
 
     async def send(self, msg: Message) -> None:
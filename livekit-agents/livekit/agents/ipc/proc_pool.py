@@ -11,7 +11,13 @@ from ..job import JobContext, JobExecutorType, JobProcess, RunningJobInfo
 from ..log import logger
 from ..utils import aio
 from ..utils.hw.cpu import get_cpu_monitor
-from . import inference_executor, job_proc_executor, job_thread_executor
+from . import (
+    inference_executor,
+    job_proc_executor,
+    job_thread_executor,
+    shared_proc_executor,
+    zygote,
+)
 from .job_executor import JobExecutor
 
 EventTypes = Literal[
@@ -42,6 +48,9 @@ class ProcPool(utils.EventEmitter[EventTypes]):
         memory_limit_mb: float,
         http_proxy: str | None,
         loop: asyncio.AbstractEventLoop,
+        use_zygote: bool = False,
+        max_jobs_per_process: int = 1,
+        loop_monitor_threshold: float = 0.0,
     ) -> None:
         super().__init__()
         self._job_executor_type = job_executor_type
@@ -57,7 +66,16 @@ class ProcPool(utils.EventEmitter[EventTypes]):
         self._memory_warn_mb = memory_warn_mb
         self._default_num_idle_processes = num_idle_processes
         self._http_proxy = http_proxy
+        self._loop_monitor_threshold = loop_monitor_threshold
         self._target_idle_processes = num_idle_processes
+        self._use_zygote = use_zygote
+        self._zygote: zygote.JobZygote | None = None
+        self._shared_procs: shared_proc_executor.SharedProcGroup | None = None
+        if job_executor_type == JobExecutorType.SHARED_PROCESS:
+            self._shared_procs = shared_proc_executor.SharedProcGroup(
+                max_jobs_per_process=max_jobs_per_process,
+                create_process=self._create_shared_process,
+            )
 
         self._init_sem = asyncio.Semaphore(MAX_CONCURRENT_INITIALIZATIONS)
         self._warmed_proc_queue = asyncio.Queue[JobExecutor]()
@@ -85,6 +103,9 @@ class ProcPool(utils.EventEmitter[EventTypes]):
             return
 
         self._started = True
+        if self._use_zygote:
+            await self._start_zygote()
+
         self._main_atask = asyncio.create_task(self._main_task())
 
         if self._default_num_idle_processes > 0:
@@ -98,6 +119,12 @@ class ProcPool(utils.EventEmitter[EventTypes]):
         self._closed = True
         await aio.cancel_and_wait(self._main_atask)
 
+        if self._zygote is not None:
+            await self._zygote.aclose()
+
+        if self._shared_procs is not None:
+            await self._shared_procs.aclose()
+
     async def launch_job(self, info: RunningJobInfo) -> None:
         self._jobs_waiting_for_process += 1
         if (
@@ -122,6 +149,60 @@ class ProcPool(utils.EventEmitter[EventTypes]):
     def target_idle_processes(self) -> int:
         return self._target_idle_processes
 
+    async def _start_zygote(self) -> None:
+        if self._job_executor_type != JobExecutorType.PROCESS:
+            logger.warning("the job zygote is only used with the process executor")
+            return
+
+        if not zygote.is_supported():
+            logger.warning("the job zygote isn't supported on this platform, spawning processes")
+            return
+
+        job_zygote = zygote.JobZygote(
+            initialize_process_fnc=self._initialize_process_fnc,
+            job_entrypoint_fnc=self._job_entrypoint_fnc,
+            session_end_fnc=self._session_end_fnc,
+            initialize_timeout=self._initialize_timeout,
+            close_timeout=self._close_timeout,
+            http_proxy=self._http_proxy,
+            mp_ctx=self._mp_ctx,
+            loop=self._loop,
+        )
+        try:
+            await job_zygote.start()
+        except Exception:
+            logger.warning(
+                "failed to start the job zygote, falling back to spawning job processes",
+                exc_info=True,
+            )
+            return
+
+        self._zygote = job_zygote
+
+    def _create_shared_process(
+        self, user_arguments: Any | None
+    ) -> shared_proc_executor.SharedJobProcess:
+        assert self._shared_procs is not None
+        return shared_proc_executor.SharedJobProcess(
+            initialize_process_fnc=self._initialize_process_fnc,
+            job_entrypoint_fnc=self._job_entrypoint_fnc,
+            session_end_fnc=self._session_end_fnc,
+            inference_executor=self._inf_executor,
+            max_jobs=self._shared_procs.max_jobs_per_process,
+            initialize_timeout=self._initialize_timeout,
+            close_timeout=self._close_timeout,
+            mp_ctx=self._mp_ctx,
+            loop=self._loop,
+            ping_interval=2.5,
+            ping_timeout=60,
+            high_ping_threshold=0.5,
+            memory_warn_mb=self._memory_warn_mb,
+            memory_limit_mb=self._memory_limit_mb,
+            http_proxy=self._http_proxy,
+            user_arguments=user_arguments,
+            loop_monitor_threshold=self._loop_monitor_threshold,
+        )
+
     @utils.log_exceptions(logger=logger)
     async def _proc_spawn_task(self) -> None:
         proc: JobExecutor
@@ -137,6 +218,32 @@ class ProcPool(utils.EventEmitter[EventTypes]):
                 high_ping_threshold=0.5,
                 http_proxy=self._http_proxy,
                 loop=self._loop,
+                loop_monitor_threshold=self._loop_monitor_threshold,
+            )
+        elif self._job_executor_type == JobExecutorType.PROCESS and (
+            self._zygote is not None and self._zygote.alive
+        ):
+            proc = zygote.ZygoteJobExecutor(
+                zygote=self._zygote,
+                initialize_process_fnc=self._initialize_process_fnc,
+                job_entrypoint_fnc=self._job_entrypoint_fnc,
+                session_end_fnc=self._session_end_fnc,
+                initialize_timeout=self._initialize_timeout,
+                close_timeout=self._close_timeout,
+                inference_executor=self._inf_executor,
+                mp_ctx=self._mp_ctx,
+                loop=self._loop,
+                ping_interval=2.5,
+                ping_timeout=60,
+                high_ping_threshold=0.5,
+                memory_warn_mb=self._memory_warn_mb,
+                memory_limit_mb=self._memory_limit_mb,
+                http_proxy=self._http_proxy,
+                loop_monitor_threshold=self._loop_monitor_threshold,
+            )
+        elif self._shared_procs is not None:
+            proc = shared_proc_executor.SharedJobExecutor(
+                group=self._shared_procs, close_timeout=self._close_timeout, loop=self._loop
             )
         elif self._job_executor_type == JobExecutorType.PROCESS:
             proc = job_proc_executor.ProcJobExecutor(
@@ -154,6 +261,7 @@ class ProcPool(utils.EventEmitter[EventTypes]):
                 memory_warn_mb=self._memory_warn_mb,
                 memory_limit_mb=self._memory_limit_mb,
                 http_proxy=self._http_proxy,
+                loop_monitor_threshold=self._loop_monitor_threshold,
             )
         else:
             raise ValueError(f"unsupported job executor: {self._job_executor_type}")
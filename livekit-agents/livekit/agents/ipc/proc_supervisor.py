@@ -0,0 +1,368 @@
+from __future__ import annotations
+
+import os
+import selectors
+import socket
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Protocol
+
+import psutil
+
+from ..log import logger
+from ..telemetry import metrics
+from ..utils.aio import duplex_unix
+from .log_queue import LogQueueListener
+
+SAMPLE_INTERVAL = 5.0
+
+# exits are polled when they can't be watched with a pidfd
+_EXIT_POLL_INTERVAL = 0.1
+
+_HAS_PROCFS = sys.platform.startswith("linux") and os.path.isdir("/proc/self")
+_HAS_PIDFD = hasattr(os, "pidfd_open")
+
+
+@dataclass
+class ProcSample:
+    pid: int
+    memory_bytes: int
+    cpu_time: float
+    """user + system CPU time since the process started, in seconds"""
+    cpu_usage: float
+    """CPU usage since the previous sample, 1.0 is one fully used core"""
+
+    @property
+    def memory_mb(self) -> float:
+        return self.memory_bytes / (1024 * 1024)
+
+
+class _Process(Protocol):
+    @property
+    def pid(self) -> int | None: ...
+
+    def is_alive(self) -> bool: ...
+
+
+class _Watch:
+    def __init__(
+        self,
+        proc: _Process,
+        log_duplex: duplex_unix._Duplex | None,
+        log_listener: LogQueueListener | None,
+        on_exit: Callable[[], None],
+        on_sample: Callable[[ProcSample], None] | None,
+    ) -> None:
+        assert proc.pid is not None
+        self.pid = proc.pid
+        self.proc = proc
+        self.on_exit = on_exit
+        self.on_sample = on_sample
+        self.log_duplex = log_duplex
+        self.log_listener = log_listener
+        self.log_sock: socket.socket | None = None
+        self.log_buf = bytearray()
+        self.pidfd: int | None = None
+        self.exiting = False  # the pidfd fired, wait for the exit status to be available
+        self.last_cpu_time: float | None = None
+        self.last_sample_time = 0.0
+
+
+class ProcSupervisor:
+    """Supervise the child processes of the worker from a single thread.
+
+    For every process, the supervisor detects its exit (using a pidfd when available, polling
+    `is_alive()` otherwise), forwards the records of its log socket to the worker loggers and
+    samples its memory and CPU usage. All the sockets are multiplexed on one selector and the
+    samples of all the processes are read in one pass over /proc, instead of a few threads and
+    tasks per process.
+
+    The callbacks are called from the supervisor thread.
+    """
+
+    def __init__(self, *, sample_interval: float = SAMPLE_INTERVAL) -> None:
+        self._sample_interval = sample_interval
+        self._lock = threading.Lock()
+        self._pending: list[_Watch] = []
+        self._watches: list[_Watch] = []
+        self._thread: threading.Thread | None = None
+        self._selector = selectors.DefaultSelector()
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ, None)
+
+    @property
+    def num_processes(self) -> int:
+        with self._lock:
+            return len(self._watches) + len(self._pending)
+
+    def watch(
+        self,
+        proc: _Process,
+        *,
+        on_exit: Callable[[], None],
+        on_sample: Callable[[ProcSample], None] | None = None,
+        log_duplex: duplex_unix._Duplex | None = None,
+        log_listener: LogQueueListener | None = None,
+    ) -> None:
+        """Start supervising a started process.
+
+        `on_exit` is called once the process exited and its remaining log records were handled,
+        the log duplex is closed by the supervisor.
+        """
+        watch = _Watch(proc, log_duplex, log_listener, on_exit, on_sample)
+        with self._lock:
+            self._pending.append(watch)
+            if self._thread is None:
+                # the thread exits when there is nothing left to supervise
+                self._thread = threading.Thread(target=self._run, name="proc_supervisor")
+                self._thread.start()
+            else:
+                self._wakeup()
+
+    def _wakeup(self) -> None:
+        try:
+            self._wakeup_w.send(b"\x00")
+        except (BlockingIOError, OSError):
+            pass  # already woken up
+
+    def _run(self) -> None:
+        next_sample = time.monotonic()
+        while True:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                if not pending and not self._watches:
+                    self._thread = None
+                    return
+
+            for watch in pending:
+                self._register(watch)
+
+            poll_exits = any(w.pidfd is None or w.exiting for w in self._watches)
+            timeout = max(next_sample - time.monotonic(), 0.0)
+            if poll_exits:
+                timeout = min(timeout, _EXIT_POLL_INTERVAL)
+
+            for key, _ in self._selector.select(timeout):
+                if key.data is None:
+                    self._drain_wakeup()
+                    continue
+
+                watch, is_log = key.data
+                if is_log:
+                    self._read_logs(watch)
+                else:
+                    watch.exiting = True
+
+            for watch in [w for w in self._watches if w.pidfd is None or w.exiting]:
+                if not watch.proc.is_alive():
+                    self._unregister(watch)
+
+            if time.monotonic() >= next_sample:
+                self._sample()
+                next_sample = time.monotonic() + self._sample_interval
+
+    def _drain_wakeup(self) -> None:
+        try:
+            while self._wakeup_r.recv(512):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _register(self, watch: _Watch) -> None:
+        if watch.log_duplex is not None and watch.log_duplex._sock is not None:
+            watch.log_sock = watch.log_duplex._sock
+            watch.log_sock.setblocking(False)
+            self._selector.register(watch.log_sock, selectors.EVENT_READ, (watch, True))
+
+        if _HAS_PIDFD:
+            try:
+                watch.pidfd = os.pidfd_open(watch.pid)
+            except ProcessLookupError:
+                watch.exiting = True  # already exited
+            except OSError:
+                pass  # e.g. not supported by the kernel, poll it
+            else:
+                self._selector.register(watch.pidfd, selectors.EVENT_READ, (watch, False))
+
+        self._watches.append(watch)
+
+    def _unregister(self, watch: _Watch) -> None:
+        self._watches.remove(watch)
+
+        if watch.pidfd is not None:
+            self._selector.unregister(watch.pidfd)
+            os.close(watch.pidfd)
+            watch.pidfd = None
+
+        if watch.log_sock is not None:
+            # handle the records sent right before exiting
+            self._read_logs(watch)
+
+        self._close_logs(watch)
+
+        try:
+            watch.on_exit()
+        except Exception:
+            logger.exception("error in the process exit callback", extra={"pid": watch.pid})
+
+    def _close_logs(self, watch: _Watch) -> None:
+        if watch.log_sock is not None:
+            self._selector.unregister(watch.log_sock)
+            watch.log_sock = None
+
+        if watch.log_duplex is not None:
+            try:
+                watch.log_duplex.close()
+            except duplex_unix.DuplexClosed:
+                pass
+
+    def _read_logs(self, watch: _Watch) -> None:
+        assert watch.log_sock is not None
+        closed = False
+        while True:
+            try:
+                data = watch.log_sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                closed = True
+                break
+
+            if not data:
+                closed = True
+                break
+
+            watch.log_buf += data
+
+        buf = watch.log_buf
+        offset = 0
+        while len(buf) - offset >= 4:
+            length = struct.unpack_from("!I", buf, offset)[0]
+            if len(buf) - offset - 4 < length:
+                break
+
+            frame = bytes(buf[offset + 4 : offset + 4 + length])
+            offset += 4 + length
+            if watch.log_listener is None:
+                continue
+
+            try:
+                watch.log_listener.handle_batch(frame)
+            except Exception:
+                logger.exception("failed to handle the logs of a process", extra={"pid": watch.pid})
+
+        del buf[:offset]
+
+        if closed:
+            self._close_logs(watch)
+
+    def _sample(self) -> None:
+        now = time.monotonic()
+        stats = _read_proc_stats([w.pid for w in self._watches])
+
+        total_memory = 0
+        total_cpu = 0.0
+        for watch in self._watches:
+            if (stat := stats.get(watch.pid)) is None:
+                continue
+
+            memory_bytes, cpu_time = stat
+            cpu_usage = 0.0
+            if watch.last_cpu_time is not None and now > watch.last_sample_time:
+                cpu_delta = max(cpu_time - watch.last_cpu_time, 0.0)
+                cpu_usage = cpu_delta / (now - watch.last_sample_time)
+                total_cpu += cpu_delta
+
+            watch.last_cpu_time = cpu_time
+            watch.last_sample_time = now
+            total_memory += memory_bytes
+
+            if watch.on_sample is None:
+                continue
+
+            try:
+                watch.on_sample(
+                    ProcSample(
+                        pid=watch.pid,
+                        memory_bytes=memory_bytes,
+                        cpu_time=cpu_time,
+                        cpu_usage=cpu_usage,
+                    )
+                )
+            except Exception:
+                logger.exception("error in the process sample callback", extra={"pid": watch.pid})
+
+        metrics._update_child_proc_usage(
+            count=len(self._watches), memory_bytes=total_memory, cpu_time=total_cpu
+        )
+
+
+if _HAS_PROCFS:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+    _CLK_TCK = os.sysconf("SC_CLK_TCK")
+
+
+def _read_proc_stats(pids: list[int]) -> dict[int, tuple[int, float]]:
+    """Return the resident memory (in bytes) and the CPU time of the given processes"""
+    stats: dict[int, tuple[int, float]] = {}
+    if _HAS_PROCFS:
+        for pid in pids:
+            # a single read of /proc/<pid>/stat has both the CPU times and the rss
+            try:
+                with open(f"/proc/{pid}/stat", "rb") as f:
+                    data = f.read()
+            except OSError:
+                continue  # exited
+
+            # the fields following the process name (which can contain spaces)
+            fields = data[data.rindex(b")") + 2 :].split()
+            utime, stime, rss = int(fields[11]), int(fields[12]), int(fields[21])
+            stats[pid] = (rss * _PAGE_SIZE, (utime + stime) / _CLK_TCK)
+
+        return stats
+
+    for pid in pids:
+        try:
+            process = psutil.Process(pid)
+            with process.oneshot():
+                memory_bytes = process.memory_info().rss
+                cpu_times = process.cpu_times()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+
+        stats[pid] = (memory_bytes, cpu_times.user + cpu_times.system)
+
+    return stats
+
+
+_supervisor: ProcSupervisor | None = None
+_supervisor_lock = threading.Lock()
+
+
+def get_proc_supervisor() -> ProcSupervisor:
+    """Return the supervisor shared by all the processes of the worker"""
+    global _supervisor
+
+    with _supervisor_lock:
+        if _supervisor is None:
+            _supervisor = ProcSupervisor()
+
+        return _supervisor
+
+
+def _reset_after_fork() -> None:
+    global _supervisor, _supervisor_lock
+
+    # the supervisor thread doesn't exist in the child
+    _supervisor = None
+    _supervisor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
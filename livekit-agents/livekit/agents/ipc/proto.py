@@ -22,6 +22,8 @@ class InitializeRequest:
     # if ping is higher than this, process is considered unresponsive
     high_ping_threshold: float = 0
     http_proxy: str = ""  # empty = None
+    # callbacks blocking the event loop longer than this are reported, 0 = disabled
+    loop_monitor_threshold: float = 0
 
     def write(self, b: io.BytesIO) -> None:
         channel.write_bool(b, self.asyncio_debug)
@@ -29,6 +31,7 @@ class InitializeRequest:
         channel.write_float(b, self.ping_timeout)
         channel.write_float(b, self.high_ping_threshold)
         channel.write_string(b, self.http_proxy)
+        channel.write_float(b, self.loop_monitor_threshold)
 
     def read(self, b: io.BytesIO) -> None:
         self.asyncio_debug = channel.read_bool(b)
@@ -36,6 +39,7 @@ class InitializeRequest:
         self.ping_timeout = channel.read_float(b)
         self.high_ping_threshold = channel.read_float(b)
         self.http_proxy = channel.read_string(b)
+        self.loop_monitor_threshold = channel.read_float(b)
 
 
 @dataclass
@@ -192,6 +196,100 @@ class InferenceResponse:
         self.error = channel.read_string(b)
 
 
+@dataclass
+class ShutdownJobRequest:
+    """sent by the main process to a shared job process to shut down one of its jobs, when
+    `force` is set the job task is cancelled instead of waiting for a graceful shutdown"""
+
+    MSG_ID: ClassVar[int] = 9
+    job_id: str = ""
+    reason: str = ""
+    force: bool = False
+
+    def write(self, b: io.BytesIO) -> None:
+        channel.write_string(b, self.job_id)
+        channel.write_string(b, self.reason)
+        channel.write_bool(b, self.force)
+
+    def read(self, b: io.BytesIO) -> None:
+        self.job_id = channel.read_string(b)
+        self.reason = channel.read_string(b)
+        self.force = channel.read_bool(b)
+
+
+@dataclass
+class JobExiting:
+    """sent by a shared job process when one of its jobs is shutting down"""
+
+    MSG_ID: ClassVar[int] = 10
+    job_id: str = ""
+    reason: str = ""
+
+    def write(self, b: io.BytesIO) -> None:
+        channel.write_string(b, self.job_id)
+        channel.write_string(b, self.reason)
+
+    def read(self, b: io.BytesIO) -> None:
+        self.job_id = channel.read_string(b)
+        self.reason = channel.read_string(b)
+
+
+@dataclass
+class JobUsage:
+    job_id: str = ""
+    cpu_time: float = 0.0
+    """CPU time spent in the tasks of the job, in seconds"""
+    num_tasks: int = 0
+    """number of tasks of the job currently alive"""
+
+
+@dataclass
+class JobEnded:
+    """sent by a shared job process once one of its jobs is done"""
+
+    MSG_ID: ClassVar[int] = 11
+    usage: JobUsage = field(default_factory=JobUsage)
+    success: bool = True
+
+    def write(self, b: io.BytesIO) -> None:
+        _write_job_usage(b, self.usage)
+        channel.write_bool(b, self.success)
+
+    def read(self, b: io.BytesIO) -> None:
+        self.usage = _read_job_usage(b)
+        self.success = channel.read_bool(b)
+
+
+@dataclass
+class JobUsageReport:
+    """periodically sent by a shared job process with the resources used by each of its jobs"""
+
+    MSG_ID: ClassVar[int] = 12
+    jobs: list[JobUsage] = field(default_factory=list)
+
+    def write(self, b: io.BytesIO) -> None:
+        channel.write_int(b, len(self.jobs))
+        for usage in self.jobs:
+            _write_job_usage(b, usage)
+
+    def read(self, b: io.BytesIO) -> None:
+        self.jobs = [_read_job_usage(b) for _ in range(channel.read_int(b))]
+
+
+def _write_job_usage(b: io.BytesIO, usage: JobUsage) -> None:
+    channel.write_string(b, usage.job_id)
+    channel.write_double(b, usage.cpu_time)
+    channel.write_int(b, usage.num_tasks)
+
+
+def _read_job_usage(b: io.BytesIO) -> JobUsage:
+    return JobUsage(
+        job_id=channel.read_string(b),
+        cpu_time=channel.read_double(b),
+        num_tasks=channel.read_int(b),
+    )
+
+
 IPC_MESSAGES = {
     InitializeRequest.MSG_ID: InitializeRequest,
     InitializeResponse.MSG_ID: InitializeResponse,
@@ -202,4 +300,8 @@ IPC_MESSAGES = {
     Exiting.MSG_ID: Exiting,
     InferenceRequest.MSG_ID: InferenceRequest,
     InferenceResponse.MSG_ID: InferenceResponse,
+    ShutdownJobRequest.MSG_ID: ShutdownJobRequest,
+    JobExiting.MSG_ID: JobExiting,
+    JobEnded.MSG_ID: JobEnded,
+    JobUsageReport.MSG_ID: JobUsageReport,
 }
@@ -0,0 +1,457 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import multiprocessing as mp
+import socket
+from collections.abc import Awaitable
+from dataclasses import dataclass
+from multiprocessing.context import BaseContext
+from typing import Any, Callable
+
+from ..job import JobContext, JobProcess, RunningJobInfo
+from ..log import logger
+from ..telemetry import metrics
+from ..utils import aio, log_exceptions, shortuuid
+from ..utils.aio import duplex_unix
+from . import channel, proto
+from .inference_executor import InferenceExecutor
+from .job_executor import JobStatus
+from .shared_proc_lazy_main import SharedProcStartArgs, proc_main
+from .supervised_proc import SupervisedProc
+
+FORCE_SHUTDOWN_TIMEOUT = 5.0
+
+
+@dataclass
+class JobResourceUsage:
+    cpu_time: float = 0.0
+    """CPU time spent in the tasks of the job, in seconds"""
+    num_tasks: int = 0
+    """number of tasks of the job currently alive"""
+
+
+class SharedJobProcess(SupervisedProc):
+    """Job process hosting up to `max_jobs` jobs, each job runs in its own task and context.
+
+    A crash of the process only affects the jobs it hosts.
+    """
+
+    def __init__(
+        self,
+        *,
+        initialize_process_fnc: Callable[[JobProcess], Any],
+        job_entrypoint_fnc: Callable[[JobContext], Awaitable[None]],
+        session_end_fnc: Callable[[JobContext], Awaitable[None]] | None,
+        inference_executor: InferenceExecutor | None,
+        max_jobs: int,
+        initialize_timeout: float,
+        close_timeout: float,
+        memory_warn_mb: float,
+        memory_limit_mb: float,
+        ping_interval: float,
+        ping_timeout: float,
+        high_ping_threshold: float,
+        http_proxy: str | None,
+        mp_ctx: BaseContext,
+        loop: asyncio.AbstractEventLoop,
+        loop_monitor_threshold: float = 0.0,
+        user_arguments: Any | None = None,
+    ) -> None:
+        super().__init__(
+            initialize_timeout=initialize_timeout,
+            close_timeout=close_timeout,
+            memory_warn_mb=memory_warn_mb,
+            memory_limit_mb=memory_limit_mb,
+            ping_interval=ping_interval,
+            ping_timeout=ping_timeout,
+            high_ping_threshold=high_ping_threshold,
+            mp_ctx=mp_ctx,
+            loop=loop,
+            http_proxy=http_proxy,
+            loop_monitor_threshold=loop_monitor_threshold,
+        )
+
+        self._initialize_process_fnc = initialize_process_fnc
+        self._job_entrypoint_fnc = job_entrypoint_fnc
+        self._session_end_fnc = session_end_fnc
+        self._inference_executor = inference_executor
+        self._inference_tasks: list[asyncio.Task[None]] = []
+        self._max_jobs = max_jobs
+        self._user_args = user_arguments
+        self._slots: set[SharedJobExecutor] = set()
+        self._jobs: dict[str, SharedJobExecutor] = {}
+        self._id = shortuuid("SHPROC_")
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    @property
+    def max_jobs(self) -> int:
+        return self._max_jobs
+
+    @property
+    def num_slots(self) -> int:
+        """number of executors (idle or running a job) assigned to this process"""
+        return len(self._slots)
+
+    @property
+    def accepting_jobs(self) -> bool:
+        return (
+            not self._closing
+            and self._initialize_fut.done()
+            and not self._initialize_fut.cancelled()
+            and self._initialize_fut.exception() is None
+            and self.exitcode is None
+        )
+
+    def _reserve(self, executor: SharedJobExecutor) -> None:
+        self._slots.add(executor)
+
+    def _release(self, executor: SharedJobExecutor) -> None:
+        self._slots.discard(executor)
+        if executor.running_job is not None:
+            self._jobs.pop(executor.running_job.job.id, None)
+
+    def _create_process(self, cch: socket.socket, log_cch: socket.socket) -> mp.Process:
+        proc_args = SharedProcStartArgs(
+            initialize_process_fnc=self._initialize_process_fnc,
+            job_entrypoint_fnc=self._job_entrypoint_fnc,
+            session_end_fnc=self._session_end_fnc,
+            log_cch=log_cch,
+            mp_cch=cch,
+            user_arguments=self._user_args,
+        )
+
+        return self._mp_ctx.Process(  # type: ignore
+            target=proc_main, args=(proc_args,), name="job_proc"
+        )
+
+    async def _launch_job(self, executor: SharedJobExecutor, info: RunningJobInfo) -> None:
+        self._jobs[info.job.id] = executor
+
+        start_req = proto.StartJobRequest()
+        start_req.running_job = info
+        await channel.asend_message(self._pch, start_req)
+
+    async def _shutdown_job(self, job_id: str, *, force: bool = False) -> None:
+        with contextlib.suppress(duplex_unix.DuplexClosed):
+            await channel.asend_message(
+                self._pch, proto.ShutdownJobRequest(job_id=job_id, force=force)
+            )
+
+    @log_exceptions(logger=logger)
+    async def _main_task(self, ipc_ch: aio.ChanReceiver[channel.Message]) -> None:
+        try:
+            async for msg in ipc_ch:
+                if isinstance(msg, proto.InferenceRequest):
+                    self._inference_tasks.append(asyncio.create_task(self._do_inference_task(msg)))
+
+                if isinstance(msg, proto.JobExiting):
+                    logger.info(
+                        "job exiting",
+                        extra={"reason": msg.reason, "job_id": msg.job_id, **self.logging_extra()},
+                    )
+
+                if isinstance(msg, proto.JobUsageReport):
+                    for usage in msg.jobs:
+                        if executor := self._jobs.get(usage.job_id):
+                            executor._update_usage(usage)
+
+                if isinstance(msg, proto.JobEnded):
+                    if executor := self._jobs.pop(msg.usage.job_id, None):
+                        executor._update_usage(msg.usage)
+                        executor._on_job_ended(success=msg.success)
+        finally:
+            await aio.cancel_and_wait(*self._inference_tasks)
+
+    @log_exceptions(logger=logger)
+    async def _supervise_task(self) -> None:
+        try:
+            await super()._supervise_task()
+        finally:
+            # the jobs still running died with the process
+            for executor in list(self._slots):
+                executor._on_process_closed()
+
+    async def _do_inference_task(self, inf_req: proto.InferenceRequest) -> None:
+        if self._inference_executor is None:
+            logger.warning("inference request received but no inference executor")
+            await channel.asend_message(
+                self._pch,
+                proto.InferenceResponse(
+                    request_id=inf_req.request_id, error="no inference executor"
+                ),
+            )
+            return
+
+        try:
+            inf_res = await self._inference_executor.do_inference(inf_req.method, inf_req.data)
+            await channel.asend_message(
+                self._pch,
+                proto.InferenceResponse(request_id=inf_req.request_id, data=inf_res),
+            )
+        except Exception as e:
+            await channel.asend_message(
+                self._pch,
+                proto.InferenceResponse(request_id=inf_req.request_id, error=str(e)),
+            )
+
+
+class SharedProcGroup:
+    """Assign the job executors to the shared processes.
+
+    Jobs are spread across the processes having a free slot (the least loaded first), a new
+    process is only started once every process is full. Processes without any slot left are
+    closed.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_jobs_per_process: int,
+        create_process: Callable[[Any | None], SharedJobProcess],
+    ) -> None:
+        if max_jobs_per_process < 1:
+            raise ValueError("max_jobs_per_process must be at least 1")
+
+        self._max_jobs_per_process = max_jobs_per_process
+        self._create_process = create_process
+        self._processes: list[SharedJobProcess] = []
+        self._lock = asyncio.Lock()
+        self._close_tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def max_jobs_per_process(self) -> int:
+        return self._max_jobs_per_process
+
+    @property
+    def processes(self) -> list[SharedJobProcess]:
+        return self._processes
+
+    async def _acquire(self, executor: SharedJobExecutor) -> SharedJobProcess:
+        # the lock avoids starting several processes when many slots are requested at once
+        async with self._lock:
+            candidates = [
+                p for p in self._processes if p.accepting_jobs and p.num_slots < p.max_jobs
+            ]
+            if candidates:
+                proc = min(candidates, key=lambda p: p.num_slots)
+                proc._reserve(executor)
+                return proc
+
+            proc = self._create_process(executor.user_arguments)
+            proc._reserve(executor)
+            self._processes.append(proc)
+            try:
+                await proc.start()
+                await proc.initialize()
+            except BaseException:
+                self._release(executor, proc)
+                raise
+
+            return proc
+
+    def _release(self, executor: SharedJobExecutor, proc: SharedJobProcess) -> None:
+        proc._release(executor)
+        if proc.num_slots > 0:
+            return
+
+        with contextlib.suppress(ValueError):
+            self._processes.remove(proc)
+
+        if proc.started:
+            task = asyncio.create_task(proc.aclose())
+            self._close_tasks.add(task)
+            task.add_done_callback(self._close_tasks.discard)
+
+    async def aclose(self) -> None:
+        await asyncio.gather(*(proc.aclose() for proc in self._processes))
+        await asyncio.gather(*self._close_tasks)
+
+
+class SharedJobExecutor:
+    """Job executor running its job inside a process shared with other jobs"""
+
+    def __init__(
+        self,
+        *,
+        group: SharedProcGroup,
+        close_timeout: float,
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        self._group = group
+        self._close_timeout = close_timeout
+        self._loop = loop
+        self._proc: SharedJobProcess | None = None
+        self._user_args: Any | None = None
+        self._job_status: JobStatus | None = None
+        self._running_job: RunningJobInfo | None = None
+        self._usage = JobResourceUsage()
+        self._join_fut = asyncio.Future[None]()
+        self._started = False
+        self._start_error: Exception | None = None
+        self._closing = False
+        self._id = shortuuid("SHEXEC_")
+
+    @property
+    def id(self) -> str:
+        return self._id
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    @property
+    def pid(self) -> int | None:
+        return self._proc.pid if self._proc is not None else None
+
+    @property
+    def status(self) -> JobStatus:
+        if self._job_status is None:
+            raise RuntimeError("job status not available")
+
+        return self._job_status
+
+    @property
+    def user_arguments(self) -> Any | None:
+        return self._user_args
+
+    @user_arguments.setter
+    def user_arguments(self, value: Any | None) -> None:
+        # only used when a new process is created for this executor
+        self._user_args = value
+
+    @property
+    def running_job(self) -> RunningJobInfo | None:
+        return self._running_job
+
+    @property
+    def resource_usage(self) -> JobResourceUsage:
+        """Resources used by the job, reported periodically by the shared process"""
+        return self._usage
+
+    async def start(self) -> None:
+        if self.started:
+            raise RuntimeError("executor already started")
+
+        if self._closing:
+            raise RuntimeError("executor is closed")
+
+        self._started = True
+        try:
+            self._proc = await self._group._acquire(self)
+        except Exception as e:
+            # reported by initialize(), like a process failing to initialize
+            self._start_error = e
+            self._closing = True
+            self._join_fut.set_result(None)
+
+    async def initialize(self) -> None:
+        # the process is initialized when it is acquired
+        if self._start_error is not None:
+            raise self._start_error
+
+        if self._proc is None:
+            raise RuntimeError("executor not started")
+
+    async def join(self) -> None:
+        if not self.started:
+            raise RuntimeError("executor not started")
+
+        await asyncio.shield(self._join_fut)
+
+    async def aclose(self) -> None:
+        if self._proc is None or self._join_fut.done():
+            return
+
+        self._closing = True
+        if self._running_job is None:
+            self._release()
+            return
+
+        job_id = self._running_job.job.id
+        await self._proc._shutdown_job(job_id)
+        try:
+            await asyncio.wait_for(asyncio.shield(self._join_fut), timeout=self._close_timeout)
+            return
+        except asyncio.TimeoutError:
+            logger.error("job did not exit in time, cancelling it", extra=self.logging_extra())
+
+        await self._proc._shutdown_job(job_id, force=True)
+        try:
+            await asyncio.wait_for(asyncio.shield(self._join_fut), timeout=FORCE_SHUTDOWN_TIMEOUT)
+            return
+        except asyncio.TimeoutError:
+            pass
+
+        if self._proc.num_slots == 1:
+            logger.error("job did not exit in time, killing process", extra=self.logging_extra())
+            await self._proc.kill()
+        else:
+            # don't kill the other jobs of the process
+            logger.error(
+                "job did not exit after being cancelled, abandoning it",
+                extra=self.logging_extra(),
+            )
+            self._on_job_ended(success=False)
+
+    async def launch_job(self, info: RunningJobInfo) -> None:
+        """assign a job to the executor"""
+        if self._running_job is not None:
+            raise RuntimeError("executor already has a running job")
+
+        if self._proc is None:
+            raise RuntimeError("executor not started")
+
+        metrics.job_started()
+        self._job_status = JobStatus.RUNNING
+        self._running_job = info
+        await self._proc._launch_job(self, info)
+
+    def _update_usage(self, usage: proto.JobUsage) -> None:
+        self._usage.cpu_time = usage.cpu_time
+        self._usage.num_tasks = usage.num_tasks
+
+    def _on_job_ended(self, *, success: bool) -> None:
+        if self._join_fut.done():
+            return
+
+        metrics.job_ended()
+        metrics.job_resources(cpu_time=self._usage.cpu_time)
+        self._job_status = JobStatus.SUCCESS if success else JobStatus.FAILED
+        logger.info(
+            "job ended",
+            extra={
+                "success": success,
+                "cpu_time": round(self._usage.cpu_time, 3),
+                **self.logging_extra(),
+            },
+        )
+        self._release()
+
+    def _on_process_closed(self) -> None:
+        if self._join_fut.done():
+            return
+
+        if self._running_job is not None:
+            metrics.job_ended()
+            self._job_status = JobStatus.FAILED
+
+        self._release()
+
+    def _release(self) -> None:
+        if self._proc is not None:
+            self._group._release(self, self._proc)
+
+        with contextlib.suppress(asyncio.InvalidStateError):
+            self._join_fut.set_result(None)
+
+    def logging_extra(self) -> dict[str, Any]:
+        extra: dict[str, Any] = {"pid": self.pid}
+        if self._running_job:
+            extra["job_id"] = self._running_job.job.id
+            extra["room_id"] = self._running_job.job.room.sid
+
+        return extra
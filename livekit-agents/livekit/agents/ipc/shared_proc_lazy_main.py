@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+# the process is named "job_proc", signals are ignored when job_proc_lazy_main is imported
+import asyncio
+import contextlib
+import contextvars
+import socket
+import time
+from collections.abc import Awaitable, Coroutine, Generator
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from ..job import JobContext, JobExecutorType, JobProcess
+from ..log import logger
+from ..utils import aio, log_exceptions
+from .channel import Message
+from .job_proc_lazy_main import _JobProc
+from .proc_client import _ProcClient
+from .proto import (
+    Exiting,
+    InferenceResponse,
+    InitializeRequest,
+    JobEnded,
+    JobExiting,
+    JobUsage,
+    JobUsageReport,
+    ShutdownJobRequest,
+    ShutdownRequest,
+    StartJobRequest,
+)
+
+USAGE_REPORT_INTERVAL = 5.0
+
+
+@dataclass
+class SharedProcStartArgs:
+    initialize_process_fnc: Callable[[JobProcess], Any]
+    job_entrypoint_fnc: Callable[[JobContext], Any]
+    session_end_fnc: Callable[[JobContext], Awaitable[None]] | None
+    mp_cch: socket.socket
+    log_cch: socket.socket
+    user_arguments: Any | None = None
+
+
+def proc_main(args: SharedProcStartArgs) -> None:
+    import logging
+
+    from .log_queue import LogQueueHandler
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.NOTSET)
+
+    log_cch = aio.duplex_unix._Duplex.open(args.log_cch)
+    log_handler = LogQueueHandler(log_cch)
+    root_logger.addHandler(log_handler)
+
+    shared_proc = _SharedJobProc(args)
+    client = _ProcClient(args.mp_cch, args.log_cch, shared_proc.initialize, shared_proc.entrypoint)
+    try:
+        client.initialize()
+    except Exception:
+        return  # initialization failed, exit (initialize will send an error to the worker)
+
+    client.run()
+    log_handler.close()
+
+
+class _JobUsageTracker:
+    def __init__(self, job_id: str) -> None:
+        self.job_id = job_id
+        self.cpu_time = 0.0
+        self.num_tasks = 0
+
+    def to_proto(self) -> JobUsage:
+        return JobUsage(job_id=self.job_id, cpu_time=self.cpu_time, num_tasks=self.num_tasks)
+
+    def _on_task_done(self, _: asyncio.Task[Any]) -> None:
+        self.num_tasks -= 1
+
+
+_current_usage = contextvars.ContextVar[Optional[_JobUsageTracker]]("job_usage", default=None)
+
+
+class _TrackedCoroutine(Coroutine[Any, Any, Any]):
+    """Account the CPU time spent stepping the wrapped coroutine to a job"""
+
+    __slots__ = ("_coro", "_usage")
+
+    def __init__(self, coro: Coroutine[Any, Any, Any], usage: _JobUsageTracker) -> None:
+        self._coro = coro
+        self._usage = usage
+
+    def send(self, value: Any) -> Any:
+        start = time.thread_time()
+        try:
+            return self._coro.send(value)
+        finally:
+            self._usage.cpu_time += time.thread_time() - start
+
+    def throw(self, typ: Any, val: Any = None, tb: Any = None) -> Any:
+        start = time.thread_time()
+        try:
+            if val is None and tb is None:
+                return self._coro.throw(typ)
+
+            return self._coro.throw(typ, val, tb)
+        finally:
+            self._usage.cpu_time += time.thread_time() - start
+
+    def close(self) -> None:
+        self._coro.close()
+
+    def __await__(self) -> Generator[Any, None, Any]:
+        return self._coro.__await__()
+
+    def __getattr__(self, name: str) -> Any:
+        # cr_frame, cr_code, ... (used to format the tasks)
+        return getattr(self._coro, name)
+
+
+def _task_factory(loop: asyncio.AbstractEventLoop, coro: Any, **kwargs: Any) -> asyncio.Task[Any]:
+    context: contextvars.Context | None = kwargs.get("context")
+    usage = context.get(_current_usage) if context is not None else _current_usage.get()
+    if usage is None or not asyncio.iscoroutine(coro):
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+    task = asyncio.Task(_TrackedCoroutine(coro, usage), loop=loop, **kwargs)
+    usage.num_tasks += 1
+    task.add_done_callback(usage._on_task_done)
+    return task
+
+
+class _JobClient:
+    """Client given to the job, the messages are tagged with the job id"""
+
+    def __init__(self, client: _ProcClient, job_id: str) -> None:
+        self._client = client
+        self._job_id = job_id
+
+    async def send(self, msg: Message) -> None:
+        if isinstance(msg, Exiting):
+            msg = JobExiting(job_id=self._job_id, reason=msg.reason)
+
+        await self._client.send(msg)
+
+
+class _SharedJob:
+    def __init__(self, shared_proc: _SharedJobProc, start_req: StartJobRequest) -> None:
+        self.id = start_req.running_job.job.id
+        self.usage = _JobUsageTracker(self.id)
+        self._ch = aio.Chan[Message]()
+        self._job_proc = _JobProc(
+            shared_proc._initialize_process_fnc,
+            shared_proc._job_entrypoint_fnc,
+            shared_proc._session_end_fnc,
+            JobExecutorType.SHARED_PROCESS,
+            job_process=shared_proc._job_process,
+        )
+        self._job_proc.initialize(
+            shared_proc._init_req,
+            _JobClient(shared_proc._client, self.id),  # type: ignore[arg-type]
+        )
+        self._ch.send_nowait(start_req)
+
+        # every task created by the job inherits the tracker from this context
+        token = _current_usage.set(self.usage)
+        try:
+            self.task = asyncio.create_task(self._run(), name=f"shared_job_{self.id}")
+        finally:
+            _current_usage.reset(token)
+
+    def has_inference_request(self, request_id: str) -> bool:
+        return request_id in self._job_proc._inf_client._active_requests
+
+    def send(self, msg: Message) -> None:
+        with contextlib.suppress(aio.ChanClosed):
+            self._ch.send_nowait(msg)
+
+    def shutdown(self, reason: str, *, force: bool = False) -> None:
+        if not force:
+            self.send(ShutdownRequest(reason=reason))
+            return
+
+        logger.warning("cancelling the job task", extra={"job_id": self.id, "reason": reason})
+        if (job_task := self._job_proc._job_task) is not None:
+            job_task.cancel()
+        else:
+            self.task.cancel()
+
+    async def _run(self) -> bool:
+        try:
+            await self._job_proc.entrypoint(self._ch)
+        finally:
+            self._ch.close()
+
+        job_task = self._job_proc._job_task
+        return job_task is not None and not job_task.cancelled() and job_task.exception() is None
+
+
+class _SharedJobProc:
+    def __init__(self, args: SharedProcStartArgs) -> None:
+        self._initialize_process_fnc = args.initialize_process_fnc
+        self._job_entrypoint_fnc = args.job_entrypoint_fnc
+        self._session_end_fnc = args.session_end_fnc
+        self._user_arguments = args.user_arguments
+        self._jobs: dict[str, _SharedJob] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._closing = False
+
+    def initialize(self, init_req: InitializeRequest, client: _ProcClient) -> None:
+        self._init_req = init_req
+        self._client = client
+        self._job_process = JobProcess(
+            executor_type=JobExecutorType.SHARED_PROCESS,
+            user_arguments=self._user_arguments,
+            http_proxy=init_req.http_proxy or None,
+        )
+        self._initialize_process_fnc(self._job_process)
+
+    @log_exceptions(logger=logger)
+    async def entrypoint(self, cch: aio.ChanReceiver[Message]) -> None:
+        asyncio.get_running_loop().set_task_factory(_task_factory)  # type: ignore[arg-type]
+        self._exit_flag = asyncio.Event()
+
+        @log_exceptions(logger=logger)
+        async def _read_ipc_task() -> None:
+            async for msg in cch:
+                if isinstance(msg, StartJobRequest):
+                    job_id = msg.running_job.job.id
+                    if self._closing or job_id in self._jobs:
+                        logger.warning("ignoring job start request", extra={"job_id": job_id})
+                        continue
+
+                    job = _SharedJob(self, msg)
+                    self._jobs[job.id] = job
+                    job.task.add_done_callback(lambda t, job=job: self._on_job_done(job, t))
+
+                if isinstance(msg, ShutdownJobRequest):
+                    if job := self._jobs.get(msg.job_id):
+                        job.shutdown(msg.reason, force=msg.force)
+
+                if isinstance(msg, ShutdownRequest):
+                    self._closing = True
+                    if not self._jobs:
+                        self._exit_flag.set()
+                        break
+
+                    for job in self._jobs.values():
+                        job.shutdown(msg.reason)
+
+                if isinstance(msg, InferenceResponse):
+                    for job in self._jobs.values():
+                        if job.has_inference_request(msg.request_id):
+                            job.send(msg)
+                            break
+
+        read_task = asyncio.create_task(_read_ipc_task(), name="shared_job_ipc_read")
+        report_task = asyncio.create_task(self._report_usage_task(), name="shared_job_usage")
+
+        try:
+            await self._exit_flag.wait()
+        finally:
+            await aio.cancel_and_wait(read_task, report_task)
+
+    def _on_job_done(self, job: _SharedJob, task: asyncio.Task[bool]) -> None:
+        success = not task.cancelled() and task.exception() is None and task.result()
+
+        async def _send_ended() -> None:
+            with contextlib.suppress(aio.duplex_unix.DuplexClosed):
+                await self._client.send(JobEnded(usage=job.usage.to_proto(), success=success))
+
+            self._jobs.pop(job.id, None)
+            if self._closing and not self._jobs:
+                self._exit_flag.set()
+
+        t = asyncio.create_task(_send_ended())
+        self._tasks.add(t)
+        t.add_done_callback(self._tasks.discard)
+
+    async def _report_usage_task(self) -> None:
+        while True:
+            await asyncio.sleep(USAGE_REPORT_INTERVAL)
+            if not self._jobs:
+                continue
+
+            await self._client.send(
+                JobUsageReport(jobs=[job.usage.to_proto() for job in self._jobs.values()])
+            )
@@ -7,15 +7,12 @@ import multiprocessing as mp
 import signal
 import socket
 import sys
-import threading
 import time
 from abc import ABC, abstractmethod
 from collections.abc import Generator
 from dataclasses import dataclass
 from multiprocessing.context import BaseContext
-from typing import Any
-
-import psutil
+from typing import Any, Callable
 
 from ..log import logger
 from ..telemetry import metrics
@@ -23,6 +20,7 @@ from ..utils import aio, log_exceptions, time_ms
 from ..utils.aio import duplex_unix
 from . import channel, proto
 from .log_queue import LogQueueListener
+from .proc_supervisor import ProcSample, get_proc_supervisor
 
 
 @contextlib.contextmanager
@@ -56,6 +54,7 @@ class _ProcOpts:
     ping_timeout: float
     high_ping_threshold: float
     http_proxy: str | None
+    loop_monitor_threshold: float
 
 
 class SupervisedProc(ABC):
@@ -72,6 +71,7 @@ class SupervisedProc(ABC):
         http_proxy: str | None,
         mp_ctx: BaseContext,
         loop: asyncio.AbstractEventLoop,
+        loop_monitor_threshold: float = 0.0,
     ) -> None:
         self._loop = loop
         self._mp_ctx = mp_ctx
@@ -84,10 +84,13 @@ class SupervisedProc(ABC):
             ping_timeout=ping_timeout,
             high_ping_threshold=high_ping_threshold,
             http_proxy=http_proxy,
+            loop_monitor_threshold=loop_monitor_threshold,
         )
 
         self._exitcode: int | None = None
         self._pid: int | None = None
+        self._last_sample: ProcSample | None = None
+        self._peak_memory_bytes = 0
 
         self._supervise_atask: asyncio.Task[None] | None = None
         self._closing = False
@@ -113,6 +116,11 @@ class SupervisedProc(ABC):
     def pid(self) -> int | None:
         return self._pid
 
+    @property
+    def last_sample(self) -> ProcSample | None:
+        """The latest resource usage sample of the process"""
+        return self._last_sample
+
     @property
     def started(self) -> bool:
         return self._supervise_atask is not None
@@ -141,7 +149,6 @@ class SupervisedProc(ABC):
 
             log_pch = duplex_unix._Duplex.open(mp_log_pch)
             log_listener = LogQueueListener(log_pch, _add_proc_ctx_log)
-            log_listener.start()
 
             self._proc = self._create_process(mp_cch, mp_log_cch)
 
@@ -157,16 +164,15 @@ class SupervisedProc(ABC):
             self._pid = self._proc.pid
             self._join_fut = asyncio.Future[None]()
 
-            def _sync_run() -> None:
-                self._proc.join()
-                log_listener.stop()
-                try:
-                    self._loop.call_soon_threadsafe(self._join_fut.set_result, None)
-                except RuntimeError:
-                    pass
-
-            thread = threading.Thread(target=_sync_run, name="proc_join_thread")
-            thread.start()
+            # the exit, the logs and the resource usage of the process are handled by the
+            # supervisor thread
+            get_proc_supervisor().watch(
+                self._proc,
+                on_exit=lambda: self._call_threadsafe(self._join_fut.set_result, None),
+                on_sample=lambda sample: self._call_threadsafe(self._on_sample, sample),
+                log_duplex=log_pch,
+                log_listener=log_listener,
+            )
             self._supervise_atask = asyncio.create_task(self._supervise_task())
 
     async def join(self) -> None:
@@ -188,6 +194,7 @@ class SupervisedProc(ABC):
                 ping_timeout=self._opts.ping_timeout,
                 high_ping_threshold=self._opts.high_ping_threshold,
                 http_proxy=self._opts.http_proxy or "",
+                loop_monitor_threshold=self._opts.loop_monitor_threshold,
             ),
         )
 
@@ -297,18 +304,11 @@ class SupervisedProc(ABC):
         ping_task = asyncio.create_task(self._ping_pong_task(pong_timeout))
         read_ipc_task.add_done_callback(lambda _: ipc_ch.close())
 
-        memory_monitor_task: asyncio.Task[None] | None = None
-        if self._opts.memory_limit_mb > 0 or self._opts.memory_warn_mb > 0:
-            memory_monitor_task = asyncio.create_task(self._memory_monitor_task())
-
         await self._join_fut
         self._exitcode = self._proc.exitcode
         self._proc.close()
         await aio.cancel_and_wait(ping_task, read_ipc_task, main_task)
 
-        if memory_monitor_task is not None:
-            await aio.cancel_and_wait(memory_monitor_task)
-
         with contextlib.suppress(duplex_unix.DuplexClosed):
             await self._pch.aclose()
 
@@ -373,62 +373,40 @@ class SupervisedProc(ABC):
         finally:
             await aio.cancel_and_wait(*tasks)
 
-    @log_exceptions(logger=logger)
-    async def _memory_monitor_task(self) -> None:
-        """Monitor memory usage and kill the process if it exceeds the limit."""
-        while not self._closing and not self._kill_sent:
-            try:
-                if not self._pid:
-                    await asyncio.sleep(5)
-                    continue
-
-                # get process memory info
-                process = psutil.Process(self._pid)
-                memory_info = process.memory_info()
-                memory_mb = memory_info.rss / (1024 * 1024)  # Convert to MB
-
-                if self._opts.memory_limit_mb > 0 and memory_mb > self._opts.memory_limit_mb:
-                    logger.error(
-                        "process exceeded memory limit, killing process",
-                        extra={
-                            "memory_usage_mb": memory_mb,
-                            "memory_limit_mb": self._opts.memory_limit_mb,
-                            **self.logging_extra(),
-                        },
-                    )
-                    self._send_kill_signal()
-                elif self._opts.memory_warn_mb > 0 and memory_mb > self._opts.memory_warn_mb:
-                    logger.warning(
-                        "process memory usage is high",
-                        extra={
-                            "memory_usage_mb": memory_mb,
-                            "memory_warn_mb": self._opts.memory_warn_mb,
-                            "memory_limit_mb": self._opts.memory_limit_mb,
-                            **self.logging_extra(),
-                        },
-                    )
-
-            except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-                if self._closing or self._kill_sent:
-                    return
-
-                logger.warning(
-                    "Failed to get memory info for process",
-                    extra=self.logging_extra(),
-                    exc_info=e,
-                )
-                # don't bother rechecking if we cannot get process info
-                return
-            except Exception:
-                if self._closing or self._kill_sent:
-                    return
-
-                logger.exception(
-                    "Error in memory monitoring task",
-                    extra=self.logging_extra(),
-                )
+    def _call_threadsafe(self, callback: Callable[..., Any], *args: Any) -> None:
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            pass  # the loop is closed
+
+    def _on_sample(self, sample: ProcSample) -> None:
+        """Check the memory usage of the process, it is killed if it exceeds the limit"""
+        self._last_sample = sample
+        self._peak_memory_bytes = max(self._peak_memory_bytes, sample.memory_bytes)
+        if self._closing or self._kill_sent:
+            return
 
-            await asyncio.sleep(5)  # check every 5 seconds
+        memory_mb = sample.memory_mb
+        if self._opts.memory_limit_mb > 0 and memory_mb > self._opts.memory_limit_mb:
+            logger.error(
+                "process exceeded memory limit, killing process",
+                extra={
+                    "memory_usage_mb": memory_mb,
+                    "memory_limit_mb": self._opts.memory_limit_mb,
+                    **self.logging_extra(),
+                },
+            )
+            self._send_kill_signal()
+        elif self._opts.memory_warn_mb > 0 and memory_mb > self._opts.memory_warn_mb:
+            logger.warning(
+                "process memory usage is high",
+                extra={
+                    "memory_usage_mb": memory_mb,
+                    "memory_warn_mb": self._opts.memory_warn_mb,
+                    "memory_limit_mb": self._opts.memory_limit_mb,
+                    **self.logging_extra(),
+                },
+            )
 
     def logging_extra(self) -> dict[str, Any]:
         extra: dict[str, Any] = {
@@ -0,0 +1,380 @@
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextlib
+import logging
+import multiprocessing as mp
+import os
+import pickle
+import signal
+import socket
+import threading
+from collections.abc import Awaitable
+from multiprocessing.context import BaseContext
+from typing import Any, Callable
+
+import psutil
+
+from ..job import JobContext, JobProcess
+from ..log import logger
+from ..utils import shortuuid
+from ..utils.aio import duplex_unix
+from .inference_executor import InferenceExecutor
+from .job_proc_executor import ProcJobExecutor
+from .log_queue import LogQueueListener
+from .supervised_proc import _mask_ctrl_c
+from .zygote_lazy_main import ZygoteStartArgs, send_with_fds, zygote_main
+
+
+def is_supported() -> bool:
+    return hasattr(os, "fork") and hasattr(socket, "send_fds")
+
+
+class JobZygote:
+    """Template process forking the job processes.
+
+    `initialize_process_fnc` (the user `setup_fnc`) runs once inside the zygote, every job
+    process is then forked from it and shares the memory it allocated (e.g. the loaded models)
+    copy-on-write instead of initializing its own copy.
+
+    Only a single-threaded process without a running event loop can be safely forked, the
+    zygote refuses to start if `setup_fnc` leaves threads behind.
+    """
+
+    def __init__(
+        self,
+        *,
+        initialize_process_fnc: Callable[[JobProcess], Any],
+        job_entrypoint_fnc: Callable[[JobContext], Awaitable[None]],
+        session_end_fnc: Callable[[JobContext], Awaitable[None]] | None,
+        initialize_timeout: float,
+        close_timeout: float,
+        http_proxy: str | None,
+        mp_ctx: BaseContext,
+        loop: asyncio.AbstractEventLoop,
+        user_arguments: Any | None = None,
+    ) -> None:
+        if not is_supported():
+            raise RuntimeError("the job zygote requires os.fork")
+
+        self._initialize_process_fnc = initialize_process_fnc
+        self._job_entrypoint_fnc = job_entrypoint_fnc
+        self._session_end_fnc = session_end_fnc
+        self._initialize_timeout = initialize_timeout
+        self._close_timeout = close_timeout
+        self._http_proxy = http_proxy
+        self._mp_ctx = mp_ctx
+        self._loop = loop
+        self._user_arguments = user_arguments
+
+        self._proc: mp.Process | None = None
+        self._ctl: duplex_unix._Duplex | None = None
+        self._send_lock = threading.Lock()
+        self._ready_fut = concurrent.futures.Future[None]()
+        self._pending_forks: dict[str, tuple[ForkedProcess, concurrent.futures.Future[None]]] = {}
+        self._children: dict[int, ForkedProcess] = {}
+        self._children_lock = threading.Lock()
+        self._alive = False
+
+    @property
+    def alive(self) -> bool:
+        return self._alive
+
+    @property
+    def pid(self) -> int | None:
+        return self._proc.pid if self._proc is not None else None
+
+    async def start(self) -> None:
+        """Start the zygote and wait for `initialize_process_fnc` to complete"""
+        if self._proc is not None:
+            raise RuntimeError("zygote already started")
+
+        ctl_pch, ctl_cch = socket.socketpair()
+        log_pch, log_cch = socket.socketpair()
+
+        self._ctl = duplex_unix._Duplex.open(ctl_pch)
+        self._log_listener = LogQueueListener(
+            duplex_unix._Duplex.open(log_pch), self._add_zygote_ctx_log
+        )
+        self._log_listener.start()
+
+        self._proc = self._mp_ctx.Process(  # type: ignore
+            target=zygote_main,
+            args=(
+                ZygoteStartArgs(
+                    initialize_process_fnc=self._initialize_process_fnc,
+                    job_entrypoint_fnc=self._job_entrypoint_fnc,
+                    session_end_fnc=self._session_end_fnc,
+                    ctl_cch=ctl_cch,
+                    log_cch=log_cch,
+                    http_proxy=self._http_proxy,
+                    user_arguments=self._user_arguments,
+                ),
+            ),
+            name="job_zygote",
+        )
+
+        with _mask_ctrl_c():
+            await self._loop.run_in_executor(None, self._proc.start)
+
+        ctl_cch.close()
+        log_cch.close()
+
+        self._read_thread = threading.Thread(target=self._read_ctl, name="job_zygote_reader")
+        self._read_thread.start()
+
+        logger.info("initializing job zygote", extra={"pid": self._proc.pid})
+        try:
+            await asyncio.wait_for(
+                asyncio.wrap_future(self._ready_fut), timeout=self._initialize_timeout
+            )
+        except BaseException:
+            await self.aclose()
+            raise
+
+        self._alive = True
+        logger.info("job zygote initialized", extra={"pid": self._proc.pid})
+
+    async def aclose(self) -> None:
+        """Stop the zygote, the job processes forked from it keep running until their job ends"""
+        if self._proc is None or self._ctl is None:
+            return
+
+        self._alive = False
+        with self._send_lock:
+            # the zygote exits once its control socket is closed, shutdown also wakes up
+            # the reader thread
+            if (sock := self._ctl._sock) is not None:
+                with contextlib.suppress(OSError):
+                    sock.shutdown(socket.SHUT_RDWR)
+
+        proc = self._proc
+        await self._loop.run_in_executor(None, proc.join, self._close_timeout)
+        if proc.exitcode is None:
+            logger.error("job zygote did not exit in time, killing it", extra={"pid": proc.pid})
+            proc.kill()
+            await self._loop.run_in_executor(None, proc.join)
+
+        await self._loop.run_in_executor(None, self._read_thread.join)
+        await self._loop.run_in_executor(None, self._log_listener.stop)
+        with contextlib.suppress(duplex_unix.DuplexClosed):
+            self._ctl.close()
+
+    def create_process(
+        self, cch: socket.socket, log_cch: socket.socket, user_arguments: Any | None
+    ) -> ForkedProcess:
+        return ForkedProcess(self, cch, log_cch, user_arguments)
+
+    def _fork(self, proc: ForkedProcess) -> None:
+        """Ask the zygote to fork a new job process, blocks until it is forked"""
+        if not self._alive or self._ctl is None:
+            raise RuntimeError("job zygote isn't running")
+
+        request_id = shortuuid("FORK_")
+        fut = concurrent.futures.Future[None]()
+        self._pending_forks[request_id] = (proc, fut)
+
+        try:
+            data = pickle.dumps(("fork", request_id, proc._user_arguments))
+        except Exception:
+            # e.g. multiprocessing primitives, they can only be inherited when spawning
+            logger.warning(
+                "the user arguments can't be sent to the job zygote, the forked process "
+                "uses the arguments of the zygote",
+                exc_info=True,
+            )
+            data = pickle.dumps(("fork", request_id, None))
+
+        try:
+            with self._send_lock:
+                sock = self._ctl._sock
+                if sock is None:
+                    raise RuntimeError("job zygote isn't running")
+
+                send_with_fds(sock, data, [proc._cch.fileno(), proc._log_cch.fileno()])
+        except BaseException:
+            self._pending_forks.pop(request_id, None)
+            raise
+
+        fut.result()
+
+    def _read_ctl(self) -> None:
+        assert self._ctl is not None
+        while True:
+            try:
+                msg = pickle.loads(self._ctl.recv_bytes())
+            except duplex_unix.DuplexClosed:
+                break
+
+            if msg[0] == "ready":
+                if msg[1] is None:
+                    self._ready_fut.set_result(None)
+                else:
+                    self._ready_fut.set_exception(
+                        RuntimeError(f"job zygote initialization failed: {msg[1]}")
+                    )
+            elif msg[0] == "forked":
+                _, request_id, pid, error = msg
+                proc, fut = self._pending_forks.pop(request_id)
+                if error is not None:
+                    fut.set_exception(RuntimeError(f"failed to fork the job process: {error}"))
+                    continue
+
+                with self._children_lock:
+                    self._children[pid] = proc
+
+                proc._pid = pid
+                fut.set_result(None)
+            elif msg[0] == "exited":
+                _, pid, exitcode = msg
+                with self._children_lock:
+                    child = self._children.pop(pid, None)
+
+                if child is not None:
+                    child._set_exited(exitcode)
+
+        self._alive = False
+        if not self._ready_fut.done():
+            self._ready_fut.set_exception(RuntimeError("job zygote exited during initialization"))
+
+        for _, fut in self._pending_forks.values():
+            if not fut.done():
+                fut.set_exception(RuntimeError("job zygote exited"))
+
+        self._pending_forks.clear()
+
+        # the exit status of the remaining children can't be known anymore
+        with self._children_lock:
+            children, self._children = list(self._children.values()), {}
+
+        for child in children:
+            child._set_orphaned()
+
+    def _add_zygote_ctx_log(self, record: logging.LogRecord) -> None:
+        record.pid = self.pid  # type: ignore[attr-defined]
+
+
+class ForkedProcess:
+    """`multiprocessing.Process` look-alike for a job process forked by the zygote, the process
+    isn't a child of the worker, its exit status is reported by the zygote."""
+
+    def __init__(
+        self,
+        zygote: JobZygote,
+        cch: socket.socket,
+        log_cch: socket.socket,
+        user_arguments: Any | None,
+    ) -> None:
+        self._zygote = zygote
+        self._cch = cch
+        self._log_cch = log_cch
+        self._user_arguments = user_arguments
+        self._pid: int | None = None
+        self._exitcode: int | None = None
+        self._exited = threading.Event()
+        self._orphaned = False
+
+    @property
+    def pid(self) -> int | None:
+        return self._pid
+
+    @property
+    def exitcode(self) -> int | None:
+        return self._exitcode
+
+    def start(self) -> None:
+        self._zygote._fork(self)
+
+    def join(self, timeout: float | None = None) -> None:
+        if self._pid is None:
+            raise RuntimeError("process not started")
+
+        self._exited.wait(timeout)
+
+    def is_alive(self) -> bool:
+        return self._pid is not None and not self._exited.is_set()
+
+    def kill(self) -> None:
+        self._send_signal(signal.SIGKILL)
+
+    def terminate(self) -> None:
+        self._send_signal(signal.SIGTERM)
+
+    def close(self) -> None:
+        pass
+
+    def _send_signal(self, sig: int) -> None:
+        if self._pid is None or self._exited.is_set():
+            return
+
+        with contextlib.suppress(ProcessLookupError):
+            os.kill(self._pid, sig)
+
+    def _set_exited(self, exitcode: int) -> None:
+        self._exitcode = exitcode
+        self._exited.set()
+
+    def _set_orphaned(self) -> None:
+        if self._orphaned or self._exited.is_set():
+            return
+
+        self._orphaned = True
+        threading.Thread(
+            target=self._watch_orphan, name="job_zygote_orphan_watch", daemon=True
+        ).start()
+
+    def _watch_orphan(self) -> None:
+        assert self._pid is not None
+        try:
+            psutil.Process(self._pid).wait()
+        except psutil.NoSuchProcess:
+            pass
+
+        self._set_exited(-1)
+
+
+class ZygoteJobExecutor(ProcJobExecutor):
+    """Job executor whose process is forked from a `JobZygote` instead of being spawned"""
+
+    def __init__(
+        self,
+        *,
+        zygote: JobZygote,
+        initialize_process_fnc: Callable[[JobProcess], Any],
+        job_entrypoint_fnc: Callable[[JobContext], Awaitable[None]],
+        session_end_fnc: Callable[[JobContext], Awaitable[None]] | None,
+        inference_executor: InferenceExecutor | None,
+        initialize_timeout: float,
+        close_timeout: float,
+        memory_warn_mb: float,
+        memory_limit_mb: float,
+        ping_interval: float,
+        ping_timeout: float,
+        high_ping_threshold: float,
+        http_proxy: str | None,
+        mp_ctx: BaseContext,
+        loop: asyncio.AbstractEventLoop,
+        loop_monitor_threshold: float = 0.0,
+    ) -> None:
+        super().__init__(
+            initialize_process_fnc=initialize_process_fnc,
+            job_entrypoint_fnc=job_entrypoint_fnc,
+            session_end_fnc=session_end_fnc,
+            inference_executor=inference_executor,
+            initialize_timeout=initialize_timeout,
+            close_timeout=close_timeout,
+            memory_warn_mb=memory_warn_mb,
+            memory_limit_mb=memory_limit_mb,
+            ping_interval=ping_interval,
+            ping_timeout=ping_timeout,
+            high_ping_threshold=high_ping_threshold,
+            http_proxy=http_proxy,
+            mp_ctx=mp_ctx,
+            loop=loop,
+            loop_monitor_threshold=loop_monitor_threshold,
+        )
+        self._zygote = zygote
+
+    def _create_process(self, cch: socket.socket, log_cch: socket.socket) -> mp.Process:
+        return self._zygote.create_process(cch, log_cch, self._user_args)  # type: ignore
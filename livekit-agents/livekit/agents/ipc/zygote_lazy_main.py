@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+from multiprocessing import current_process
+
+if current_process().name == "job_zygote":
+    import signal
+
+    # ignore signals in the zygote (and the forked job processes), the worker handles them
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+import asyncio
+import gc
+import logging
+import os
+import pickle
+import select
+import signal
+import socket
+import struct
+import sys
+import threading
+import time
+from collections.abc import Awaitable
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import psutil
+
+from ..job import JobContext, JobExecutorType, JobProcess
+from ..log import logger
+from ..utils.aio import duplex_unix
+
+# worker -> zygote
+#   ("fork", request_id, user_arguments) + [mp_cch, log_cch] fds
+# zygote -> worker
+#   ("ready", error)
+#   ("forked", request_id, pid, error)
+#   ("exited", pid, exitcode)
+
+_MAX_FDS = 2
+_NATIVE_THREADS_EXIT_TIMEOUT = 1.0
+
+
+@dataclass
+class ZygoteStartArgs:
+    initialize_process_fnc: Callable[[JobProcess], Any]
+    job_entrypoint_fnc: Callable[[JobContext], Any]
+    session_end_fnc: Callable[[JobContext], Awaitable[None]] | None
+    ctl_cch: socket.socket
+    log_cch: socket.socket
+    http_proxy: str | None
+    user_arguments: Any | None = None
+
+
+def send_with_fds(sock: socket.socket, data: bytes, fds: list[int]) -> None:
+    """Send a length-prefixed frame (compatible with `duplex_unix._Duplex`) along with fds"""
+    frame = struct.pack("!I", len(data)) + data
+    sent = socket.send_fds(sock, [frame], fds)
+    if sent < len(frame):
+        sock.sendall(frame[sent:])
+
+
+def _recv_with_fds(sock: socket.socket) -> tuple[bytes, list[int]]:
+    # the fds are attached to the first bytes of the frame
+    header, fds, _, _ = socket.recv_fds(sock, 4, _MAX_FDS)
+    if not header:
+        raise duplex_unix.DuplexClosed()
+
+    if len(header) < 4:
+        header += duplex_unix._read_exactly(sock, 4 - len(header))
+
+    length = struct.unpack("!I", header)[0]
+    return duplex_unix._read_exactly(sock, length), fds
+
+
+def _check_fork_safety() -> None:
+    """Forking only copies the calling thread, and a running event loop can't be reused by the
+    children. Refuse to act as a zygote if `setup_fnc` left any of them behind."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        raise RuntimeError("an event loop is running in the zygote")
+
+    threads = [t.name for t in threading.enumerate() if t is not threading.main_thread()]
+    if threads:
+        raise RuntimeError(
+            f"setup_fnc left threads running ({', '.join(threads)}), they wouldn't survive fork"
+        )
+
+    # native threads (e.g. the thread pool of an inference library) aren't visible to threading.
+    # a joined thread can still be terminating at the OS level, give them a moment to exit
+    process = psutil.Process()
+    deadline = time.monotonic() + _NATIVE_THREADS_EXIT_TIMEOUT
+    while (num_threads := process.num_threads()) > 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    if num_threads > 1:
+        raise RuntimeError(
+            f"the process has {num_threads} native threads after setup_fnc, "
+            "they wouldn't survive fork"
+        )
+
+
+def zygote_main(args: ZygoteStartArgs) -> None:
+    from .log_queue import LogQueueHandler
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.NOTSET)
+
+    log_handler = LogQueueHandler(duplex_unix._Duplex.open(args.log_cch))
+    root_logger.addHandler(log_handler)
+
+    ctl = duplex_unix._Duplex.open(args.ctl_cch)
+    job_process = JobProcess(
+        executor_type=JobExecutorType.PROCESS,
+        user_arguments=args.user_arguments,
+        http_proxy=args.http_proxy,
+    )
+
+    error: str | None = None
+    try:
+        args.initialize_process_fnc(job_process)
+    except Exception as e:
+        logger.exception("error while running setup_fnc in the job zygote")
+        error = str(e)
+
+    # the log forwarding thread must be stopped before forking, the children set up their own
+    root_logger.removeHandler(log_handler)
+    log_handler.close()
+    log_handler.thread.join()
+
+    if error is None:
+        try:
+            asyncio.set_event_loop(None)
+            _check_fork_safety()
+        except Exception as e:
+            error = str(e)
+
+    try:
+        ctl.send_bytes(pickle.dumps(("ready", error)))
+    except duplex_unix.DuplexClosed:
+        return
+
+    if error is not None:
+        return
+
+    # move everything allocated so far to the permanent generation, the gc of the children
+    # won't touch (and copy) the pages shared with the zygote
+    gc.collect()
+    gc.freeze()
+
+    _Zygote(args, ctl, job_process).run()
+
+
+class _Zygote:
+    def __init__(
+        self, args: ZygoteStartArgs, ctl: duplex_unix._Duplex, job_process: JobProcess
+    ) -> None:
+        self._args = args
+        self._ctl = ctl
+        self._job_process = job_process
+
+    def run(self) -> None:
+        wakeup_r, wakeup_w = os.pipe()
+        os.set_blocking(wakeup_r, False)
+        os.set_blocking(wakeup_w, False)
+
+        # SIGCHLD wakes up the select below so exited children are reaped (and reported) promptly
+        signal.signal(signal.SIGCHLD, lambda *_: None)
+        signal.set_wakeup_fd(wakeup_w)
+        self._wakeup_fds = (wakeup_r, wakeup_w)
+
+        assert self._ctl._sock is not None
+        sock = self._ctl._sock
+        try:
+            while True:
+                readable, _, _ = select.select([sock, wakeup_r], [], [])
+                if wakeup_r in readable:
+                    while True:
+                        try:
+                            if not os.read(wakeup_r, 512):
+                                break
+                        except BlockingIOError:
+                            break
+
+                    self._reap_children()
+
+                if sock in readable:
+                    try:
+                        data, fds = _recv_with_fds(sock)
+                    except (OSError, EOFError, duplex_unix.DuplexClosed):
+                        break  # the worker is gone
+
+                    msg = pickle.loads(data)
+                    if msg[0] == "fork":
+                        self._fork(msg[1], msg[2], fds)
+                    else:
+                        for fd in fds:
+                            os.close(fd)
+        finally:
+            signal.set_wakeup_fd(-1)
+            os.close(wakeup_r)
+            os.close(wakeup_w)
+
+    def _reap_children(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+
+            if pid == 0:
+                return
+
+            self._send(("exited", pid, os.waitstatus_to_exitcode(status)))
+
+    def _send(self, msg: tuple[Any, ...]) -> None:
+        try:
+            self._ctl.send_bytes(pickle.dumps(msg))
+        except duplex_unix.DuplexClosed:
+            pass
+
+    def _fork(self, request_id: str, user_arguments: Any | None, fds: list[int]) -> None:
+        if len(fds) != 2:
+            for fd in fds:
+                os.close(fd)
+
+            self._send(("forked", request_id, 0, "expected the ipc and log sockets"))
+            return
+
+        try:
+            pid = os.fork()
+        except OSError as e:
+            for fd in fds:
+                os.close(fd)
+
+            self._send(("forked", request_id, 0, str(e)))
+            return
+
+        if pid == 0:
+            exitcode = 1
+            try:
+                exitcode = self._child_main(fds[0], fds[1], user_arguments)
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(exitcode)
+
+        for fd in fds:
+            os.close(fd)
+
+        self._send(("forked", request_id, pid, None))
+
+    def _child_main(self, mp_fd: int, log_fd: int, user_arguments: Any | None) -> int:
+        from .job_proc_lazy_main import ProcStartArgs, proc_main
+
+        # drop everything belonging to the zygote itself
+        signal.set_wakeup_fd(-1)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        for fd in self._wakeup_fds:
+            os.close(fd)
+
+        self._ctl.close()
+
+        if user_arguments is not None:
+            self._job_process._user_arguments = user_arguments
+
+        try:
+            proc_main(
+                ProcStartArgs(
+                    initialize_process_fnc=self._args.initialize_process_fnc,
+                    job_entrypoint_fnc=self._args.job_entrypoint_fnc,
+                    session_end_fnc=self._args.session_end_fnc,
+                    mp_cch=socket.socket(fileno=mp_fd),
+                    log_cch=socket.socket(fileno=log_fd),
+                    user_arguments=self._job_process.user_arguments,
+                    job_process=self._job_process,
+                )
+            )
+        except Exception:
+            logger.exception("unhandled exception in the forked job process")
+            return 1
+
+        return 0
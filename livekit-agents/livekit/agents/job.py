@@ -47,6 +47,28 @@ from .utils.misc import is_cloud
 _JobContextVar = contextvars.ContextVar["JobContext"]("agents_job_context")
 
 
+_shared_log_factory_installed = False
+
+
+def _install_shared_log_factory() -> None:
+    global _shared_log_factory_installed
+    if _shared_log_factory_installed:
+        return
+
+    _shared_log_factory_installed = True
+    old_factory = logging.getLogRecordFactory()
+
+    def record_factory(*args: Any, **kwargs: Any) -> logging.LogRecord:
+        record = old_factory(*args, **kwargs)
+        if (ctx := _JobContextVar.get(None)) is not None:
+            for key, value in ctx._log_fields.items():
+                setattr(record, key, value)
+
+        return record
+
+    logging.setLogRecordFactory(record_factory)
+
+
 if TYPE_CHECKING:
     from .ipc.inference_executor import InferenceExecutor
     from .voice.agent_session import AgentSession
@@ -70,6 +92,7 @@ get_current_job_context = get_job_context
 class JobExecutorType(Enum):
     PROCESS = "process"
     THREAD = "thread"
+    SHARED_PROCESS = "shared_process"
 
 
 class AutoSubscribe(str, Enum):
@@ -203,20 +226,16 @@ class JobContext:
         self._tempdir.cleanup()
 
     def _init_log_factory(self) -> None:
+        if self.proc.executor_type != JobExecutorType.PROCESS:
+            # the jobs sharing the process use a single factory looking up the current job,
+            # chaining one factory per job would grow for the whole lifetime of the process
+            _install_shared_log_factory()
+            return
+
         old_factory = logging.getLogRecordFactory()
 
         def record_factory(*args: Any, **kwargs: Any) -> logging.LogRecord:
             record = old_factory(*args, **kwargs)
-
-            if self.proc.executor_type != JobExecutorType.PROCESS:
-                try:
-                    ctx = get_job_context()
-                except RuntimeError:
-                    return record
-                else:
-                    if ctx != self:
-                        return record
-
             for key, value in self._log_fields.items():
                 setattr(record, key, value)
 
@@ -259,8 +278,10 @@ class JobContext:
             audio_recording_path=recorder_io.output_path if recorder_io else None,
             audio_recording_started_at=recorder_io.recording_started_at if recorder_io else None,
             started_at=session._started_at,
-            events=session._recorded_events,
+            events=session._event_journal.events,
             chat_history=session.history.copy(),
+            turn_latencies=list(session._event_journal.turn_latencies),
+            event_journal=session._event_journal,
         )
 
         if recorder_io:
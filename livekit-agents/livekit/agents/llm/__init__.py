@@ -1,3 +1,4 @@
+from ..utils.hedging import HedgingOptions
 from . import remote_chat_context, utils
 from .chat_context import (
     AgentHandoff,
@@ -39,6 +40,7 @@ from .tool_context import (
     FunctionTool,
     RawFunctionTool,
     StopResponse,
+    ToolCacheOptions,
     ToolChoice,
     ToolContext,
     ToolError,
@@ -67,6 +69,7 @@ __all__ = [
     "CompletionUsage",
     "FallbackAdapter",
     "AvailabilityChangedEvent",
+    "HedgingOptions",
     "ToolChoice",
     "is_function_tool",
     "function_tool",
@@ -76,6 +79,7 @@ __all__ = [
     "RawFunctionTool",
     "ToolContext",
     "ToolError",
+    "ToolCacheOptions",
     "StopResponse",
     "utils",
     "remote_chat_context",
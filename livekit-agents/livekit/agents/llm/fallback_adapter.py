@@ -3,13 +3,17 @@ from __future__ import annotations
 import asyncio
 import dataclasses
 import time
+from collections import deque
 from collections.abc import AsyncIterable
 from dataclasses import dataclass
-from typing import Any, ClassVar, Literal
+from typing import Any, Callable, ClassVar, Literal
 
 from .._exceptions import APIConnectionError, APIError
 from ..log import logger
+from ..telemetry import metrics as telemetry_metrics
 from ..types import DEFAULT_API_CONNECT_OPTIONS, NOT_GIVEN, APIConnectOptions, NotGivenOr
+from ..utils import aio
+from ..utils.hedging import HedgedAttempt, HedgingOptions, HedgingPolicy, race_attempts
 from .chat_context import ChatContext
 from .llm import LLM, ChatChunk, LLMStream
 from .tool_context import FunctionTool, RawFunctionTool, ToolChoice
@@ -43,6 +47,7 @@ class FallbackAdapter(
         max_retry_per_llm: int = 0,
         retry_interval: float = 0.5,
         retry_on_chunk_sent: bool = False,
+        hedging: HedgingOptions | None = None,
     ) -> None:
         """FallbackAdapter is an LLM that can fallback to a different LLM if the current LLM fails.
 
@@ -54,6 +59,9 @@ class FallbackAdapter(
             retry_interval (float, optional): Interval between retries. Defaults to 0.5.
             retry_on_chunk_sent (bool, optional): Whether to retry when a LLM failed after chunks
                 are sent. Defaults to False.
+            hedging (HedgingOptions, optional): When set, the request is also sent to the next
+                LLM if the current one didn't return its first chunk after the hedging delay, the
+                first LLM to answer is used and the other request is cancelled. Defaults to None.
 
         Raises:
             ValueError: If no LLM instances are provided.
@@ -68,6 +76,7 @@ class FallbackAdapter(
         self._max_retry_per_llm = max_retry_per_llm
         self._retry_interval = retry_interval
         self._retry_on_chunk_sent = retry_on_chunk_sent
+        self._hedging = HedgingPolicy(hedging) if hedging is not None else None
 
         self._status = [
             _LLMStatus(available=True, recovering_task=None) for _ in self._llm_instances
@@ -147,7 +156,11 @@ class FallbackLLMStream(LLMStream):
         return self._current_stream.tools
 
     async def _try_generate(
-        self, *, llm: LLM, check_recovery: bool = False
+        self,
+        *,
+        llm: LLM,
+        check_recovery: bool = False,
+        on_stream: Callable[[LLMStream], None] | None = None,
     ) -> AsyncIterable[ChatChunk]:
         """
         Try to generate with the given LLM.
@@ -157,6 +170,7 @@ class FallbackLLMStream(LLMStream):
             check_recovery: When True, indicates this is a background recovery check and the
                           result will not be used. Recovery checks verify if a previously
                           failed LLM has become available again.
+            on_stream: Called with the stream of the LLM once it is created.
         """
         try:
             async with llm.chat(
@@ -172,11 +186,10 @@ class FallbackLLMStream(LLMStream):
                     retry_interval=self._fallback_adapter._retry_interval,
                 ),
             ) as stream:
-                should_set_current = not check_recovery
+                if on_stream is not None:
+                    on_stream(stream)
+
                 async for chunk in stream:
-                    if should_set_current:
-                        should_set_current = False
-                        self._current_stream = stream
                     yield chunk
 
         except asyncio.TimeoutError:
@@ -238,55 +251,118 @@ class FallbackLLMStream(LLMStream):
 
     async def _run(self) -> None:
         start_time = time.time()
+        adapter = self._fallback_adapter
+        hedging = adapter._hedging
 
-        all_failed = all(not llm_status.available for llm_status in self._fallback_adapter._status)
+        telemetry_metrics.fallback_request("llm")
+        if hedging is not None:
+            hedging.on_request()
+
+        all_failed = all(not llm_status.available for llm_status in adapter._status)
         if all_failed:
             logger.error("all LLMs are unavailable, retrying..")
 
-        for i, llm in enumerate(self._fallback_adapter._llm_instances):
-            llm_status = self._fallback_adapter._status[i]
-            if llm_status.available or all_failed:
-                text_sent: str = ""
-                tool_calls_sent: list[str] = []
-                try:
-                    async for result in self._try_generate(llm=llm, check_recovery=False):
-                        if result.delta:
-                            if result.delta.content:
-                                text_sent += result.delta.content
-                            for tool_call in result.delta.tool_calls:
-                                tool_calls_sent.append(tool_call.name)
+        candidates = deque(
+            i for i, llm_status in enumerate(adapter._status) if llm_status.available or all_failed
+        )
+        started: list[_LLMAttempt] = []
+        succeeded = False
+
+        def _start_attempt(index: int) -> _LLMAttempt:
+            attempt = _LLMAttempt(self, index)
+            started.append(attempt)
+            return attempt
+
+        try:
+            while candidates:
+                winner = await race_attempts(
+                    _start_attempt(candidates.popleft()),
+                    component="llm",
+                    candidates=candidates,
+                    start_attempt=_start_attempt,
+                    on_failed=self._on_attempt_failed,
+                    hedging=hedging,
+                )
+                if winner is None:
+                    continue
 
-                        self._event_ch.send_nowait(result)
+                if winner.first_result_at is not None:
+                    self._current_stream = winner.stream
 
+                text_sent: str = ""
+                tool_calls_sent: list[str] = []
+                async for result in winner.ch:
+                    if result.delta:
+                        if result.delta.content:
+                            text_sent += result.delta.content
+                        for tool_call in result.delta.tool_calls:
+                            tool_calls_sent.append(tool_call.name)
+
+                    self._event_ch.send_nowait(result)
+
+                await winner.task
+                if winner.error is None:
+                    succeeded = True
                     return
-                except Exception:  # exceptions already logged inside _try_synthesize
-                    if llm_status.available:
-                        llm_status.available = False
-                        self._fallback_adapter.emit(
-                            "llm_availability_changed",
-                            AvailabilityChangedEvent(llm=llm, available=False),
-                        )
 
-                    if text_sent or tool_calls_sent:
-                        extra = {"text_sent": text_sent, "tool_calls_sent": tool_calls_sent}
-                        if not self._fallback_adapter._retry_on_chunk_sent:
-                            logger.error(
-                                f"{llm.label} failed after sending chunk, skip retrying. "
-                                "Set `retry_on_chunk_sent` to `True` to enable retrying after chunks are sent.",
-                                extra=extra,
-                            )
-                            raise
-
-                        logger.warning(
-                            f"{llm.label} failed after sending chunk, retrying..",
+                self._on_attempt_failed(winner)
+                if text_sent or tool_calls_sent:
+                    extra = {"text_sent": text_sent, "tool_calls_sent": tool_calls_sent}
+                    if not adapter._retry_on_chunk_sent:
+                        logger.error(
+                            f"{winner.llm.label} failed after sending chunk, skip retrying. "
+                            "Set `retry_on_chunk_sent` to `True` to enable retrying after chunks are sent.",
                             extra=extra,
                         )
+                        raise winner.error
 
-            self._try_recovery(llm)
+                    logger.warning(
+                        f"{winner.llm.label} failed after sending chunk, retrying..",
+                        extra=extra,
+                    )
+        finally:
+            await aio.cancel_and_wait(*(attempt.task for attempt in started))
+
+            # check the recovery of the unavailable LLMs with a higher priority than the one used
+            last_index = max(attempt.index for attempt in started) if succeeded else None
+            attempted = {attempt.index for attempt in started}
+            for i, llm in enumerate(adapter._llm_instances):
+                if last_index is not None and i > last_index:
+                    break
+                if i not in attempted:
+                    self._try_recovery(llm)
 
         raise APIConnectionError(
             f"all LLMs failed ({[llm.label for llm in self._fallback_adapter._llm_instances]}) after {time.time() - start_time} seconds"  # noqa: E501
         )
 
+    def _on_attempt_failed(self, attempt: _LLMAttempt) -> None:
+        # exceptions already logged inside _try_generate
+        llm_status = self._fallback_adapter._status[attempt.index]
+        if llm_status.available:
+            llm_status.available = False
+            self._fallback_adapter.emit(
+                "llm_availability_changed",
+                AvailabilityChangedEvent(llm=attempt.llm, available=False),
+            )
+
+        self._try_recovery(attempt.llm)
+
     async def _metrics_monitor_task(self, event_aiter: AsyncIterable[ChatChunk]) -> None:
         return
+
+
+class _LLMAttempt(HedgedAttempt[ChatChunk]):
+    """A request to one of the LLMs of the FallbackAdapter"""
+
+    def __init__(self, fallback_stream: FallbackLLMStream, index: int) -> None:
+        self.llm = fallback_stream._fallback_adapter._llm_instances[index]
+        self.stream: LLMStream | None = None
+        super().__init__(
+            index,
+            self.llm.label,
+            fallback_stream._try_generate(llm=self.llm, on_stream=self._set_stream),
+        )
+
+    def _set_stream(self, stream: LLMStream) -> None:
+        self.stream = stream
@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
 import json
+import time
+import weakref
 from abc import ABC, abstractmethod
+from collections.abc import Hashable
 from contextlib import AbstractAsyncContextManager, AsyncExitStack
 from datetime import timedelta
 from pathlib import Path
@@ -13,7 +18,7 @@ from urllib.parse import urlparse
 from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
 
 try:
-    from mcp import ClientSession, stdio_client
+    from mcp import ClientSession, stdio_client, types as mcp_types
     from mcp.client.sse import sse_client
     from mcp.client.stdio import StdioServerParameters
     from mcp.client.streamable_http import GetSessionIdCallback, streamablehttp_client
@@ -25,28 +30,255 @@ except ImportError as e:
     ) from e
 
 
+from ..log import logger
 from .tool_context import RawFunctionTool, ToolError, function_tool
 
 MCPTool = RawFunctionTool
 
 
+class _SharedConnection:
+    def __init__(self, key: Hashable, server: MCPServer) -> None:
+        self.key = key
+        self.server_repr = repr(server)
+        self.client: ClientSession | None = None
+        self.refs = 0
+        self.idle_handle: asyncio.TimerHandle | None = None
+
+        self.tools: list[mcp_types.Tool] | None = None
+        self.tools_fetched_at = 0.0
+        self.tools_version = 0
+        self.tools_lock = asyncio.Lock()
+
+        self.ready = asyncio.Future[None]()
+        self.closed = False
+        self._close_ev = asyncio.Event()
+
+    def close(self) -> None:
+        self._close_ev.set()
+
+    async def run(
+        self,
+        client_streams: AbstractAsyncContextManager[tuple[Any, ...]],
+        read_timeout: float,
+    ) -> None:
+        # doesn't reference the MCPServer opening the connection, so it can be garbage collected
+        try:
+            async with AsyncExitStack() as stack:
+                streams = await stack.enter_async_context(client_streams)
+                client = await stack.enter_async_context(
+                    ClientSession(
+                        streams[0],
+                        streams[1],
+                        read_timeout_seconds=timedelta(seconds=read_timeout)
+                        if read_timeout
+                        else None,
+                        message_handler=self._on_message,
+                    )
+                )
+                await client.initialize()
+                self.client = client
+                self.ready.set_result(None)
+                logger.debug("MCP connection opened", extra={"server": self.server_repr})
+                await self._close_ev.wait()
+        except Exception as e:
+            if not self.ready.done():
+                self.ready.set_exception(e)
+            else:
+                logger.warning(
+                    "MCP connection closed unexpectedly",
+                    extra={"server": self.server_repr},
+                    exc_info=e,
+                )
+        finally:
+            self.client = None
+            self.closed = True
+            if not self.ready.done():
+                self.ready.set_exception(RuntimeError("MCP connection closed"))
+
+    async def _on_message(self, message: Any) -> None:
+        if isinstance(message, mcp_types.ServerNotification) and isinstance(
+            message.root, mcp_types.ToolListChangedNotification
+        ):
+            self.tools = None
+
+
+class MCPConnectionManager:
+    """Shares the MCP client sessions and tool schemas between the MCPServers of a process.
+
+    The MCPServers using the same manager and connection parameters (same URL and headers, or
+    same command, arguments and environment) share a single initialized client session, so
+    only the first job of a process pays for the MCP initialization and, for the stdio servers,
+    for spawning the subprocess. The tool schemas are cached for `tools_ttl` seconds and
+    refreshed when the server notifies that its tool list changed.
+
+    A connection is closed `idle_timeout` seconds after the last MCPServer using it is closed
+    or garbage collected. The connections are bound to the event loop they were opened on.
+    """
+
+    _default: MCPConnectionManager | None = None
+
+    def __init__(self, *, tools_ttl: float | None = 300.0, idle_timeout: float = 300.0) -> None:
+        """
+        Args:
+            tools_ttl (float, optional): How long the tool schemas are cached, in seconds.
+                ``None`` caches them until they are invalidated. Defaults to 300.
+            idle_timeout (float): Time to keep an unused connection open, in seconds.
+                Defaults to 300.
+        """
+        self._tools_ttl = tools_ttl
+        self._idle_timeout = idle_timeout
+        self._connections: dict[tuple[asyncio.AbstractEventLoop, Hashable], _SharedConnection] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    @classmethod
+    def default(cls) -> MCPConnectionManager:
+        """The manager shared by the whole process"""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    async def acquire(self, server: MCPServer) -> _SharedConnection:
+        loop = asyncio.get_running_loop()
+        key = (loop, server._connection_key())
+        conn = self._connections.get(key)
+        if conn is None or conn.closed:
+            conn = self._connections[key] = _SharedConnection(key, server)
+            # run the connection outside of the job context, it outlives the job opening it
+            task = contextvars.Context().run(
+                asyncio.create_task,
+                conn.run(server.client_streams(), server._read_timeout),
+                name="MCPConnectionManager._run",
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            task.add_done_callback(lambda _, conn=conn: self._on_closed(conn))  # type: ignore
+
+        conn.refs += 1
+        if conn.idle_handle is not None:
+            conn.idle_handle.cancel()
+            conn.idle_handle = None
+
+        try:
+            await asyncio.shield(conn.ready)
+        except BaseException:
+            self._release(conn)
+            raise
+
+        return conn
+
+    def release(self, conn: _SharedConnection) -> None:
+        self._release(conn)
+
+    async def list_tools(self, conn: _SharedConnection) -> list[mcp_types.Tool]:
+        # the lock coalesces the concurrent listings of the jobs starting at the same time
+        async with conn.tools_lock:
+            expired = self._tools_ttl is not None and (
+                time.monotonic() - conn.tools_fetched_at > self._tools_ttl
+            )
+            if conn.tools is None or expired:
+                if conn.client is None:
+                    raise RuntimeError("MCP connection is closed")
+
+                result = await conn.client.list_tools()
+                conn.tools = result.tools
+                conn.tools_fetched_at = time.monotonic()
+                conn.tools_version += 1
+
+            return conn.tools
+
+    def invalidate_tools(self, server: MCPServer | None = None) -> None:
+        """Invalidate the cached tool schemas of `server`, or of every server if omitted"""
+        key = server._connection_key() if server is not None else None
+        for (_, conn_key), conn in self._connections.items():
+            if key is None or conn_key == key:
+                conn.tools = None
+
+    async def aclose(self) -> None:
+        """Close the connections opened on the running event loop"""
+        loop = asyncio.get_running_loop()
+        tasks = [t for t in self._tasks if t.get_loop() is loop]
+        for (conn_loop, _), conn in list(self._connections.items()):
+            if conn_loop is loop:
+                conn.close()
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _release(self, conn: _SharedConnection) -> None:
+        conn.refs -= 1
+        if conn.refs > 0 or conn.closed:
+            return
+
+        if self._idle_timeout > 0:
+            conn.idle_handle = asyncio.get_running_loop().call_later(self._idle_timeout, conn.close)
+        else:
+            conn.close()
+
+    def _release_threadsafe(self, loop: asyncio.AbstractEventLoop, conn: _SharedConnection) -> None:
+        # called when a MCPServer is garbage collected without being closed
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(self._release, conn)
+
+    def _on_closed(self, conn: _SharedConnection) -> None:
+        if self._connections.get(conn.key) is conn:
+            del self._connections[conn.key]
+
+        if conn.idle_handle is not None:
+            conn.idle_handle.cancel()
+            conn.idle_handle = None
+
+
 class MCPServer(ABC):
-    def __init__(self, *, client_session_timeout_seconds: float) -> None:
+    def __init__(
+        self,
+        *,
+        client_session_timeout_seconds: float,
+        connection_manager: MCPConnectionManager | None = None,
+    ) -> None:
         self._client: ClientSession | None = None
         self._exit_stack: AsyncExitStack = AsyncExitStack()
         self._read_timeout = client_session_timeout_seconds
 
+        self._connection_manager = connection_manager
+        self._instance_key = object()
+        self._conn: _SharedConnection | None = None
+        self._lease: weakref.finalize | None = None
+        self._tools_version = 0
+
         self._cache_dirty = True
         self._lk_tools: list[MCPTool] | None = None
 
     @property
     def initialized(self) -> bool:
+        if self._conn is not None and self._conn.closed:
+            return False
+
         return self._client is not None
 
     def invalidate_cache(self) -> None:
         self._cache_dirty = True
+        if self._connection_manager is not None:
+            self._connection_manager.invalidate_tools(self)
+
+    def _connection_key(self) -> Hashable:
+        """Servers with the same key can share their connection in a `MCPConnectionManager`"""
+        return (type(self), self._instance_key)
 
     async def initialize(self) -> None:
+        if self._connection_manager is not None:
+            if self._lease is not None:
+                # the shared connection was closed, release it before acquiring a new one
+                self._lease()
+
+            conn = await self._connection_manager.acquire(self)
+            self._conn, self._client = conn, conn.client
+            self._lease = weakref.finalize(
+                self,
+                self._connection_manager._release_threadsafe,
+                asyncio.get_running_loop(),
+                conn,
+            )
+            return
+
         try:
             streams = await self._exit_stack.enter_async_context(self.client_streams())
             receive_stream, send_stream = streams[0], streams[1]
@@ -69,13 +301,21 @@ class MCPServer(ABC):
         if self._client is None:
             raise RuntimeError("MCPServer isn't initialized")
 
-        if not self._cache_dirty and self._lk_tools is not None:
-            return self._lk_tools
+        if self._connection_manager is not None and self._conn is not None:
+            tools = await self._connection_manager.list_tools(self._conn)
+            if self._lk_tools is not None and self._tools_version == self._conn.tools_version:
+                return self._lk_tools
+
+            self._tools_version = self._conn.tools_version
+        else:
+            if not self._cache_dirty and self._lk_tools is not None:
+                return self._lk_tools
+
+            tools = (await self._client.list_tools()).tools
 
-        tools = await self._client.list_tools()
         lk_tools = [
             self._make_function_tool(tool.name, tool.description, tool.inputSchema, tool.meta)
-            for tool in tools.tools
+            for tool in tools
         ]
 
         self._lk_tools = lk_tools
@@ -125,10 +365,17 @@ class MCPServer(ABC):
         return function_tool(_tool_called, raw_schema=raw_schema)
 
     async def aclose(self) -> None:
+        if self._lease is not None:
+            self._lease.detach()
+            self._lease = None
+            if self._conn is not None and self._connection_manager is not None:
+                self._connection_manager.release(self._conn)
+
         try:
             await self._exit_stack.aclose()
         finally:
             self._client = None
+            self._conn = None
             self._lk_tools = None
 
     @abstractmethod
@@ -166,8 +413,12 @@ class MCPServerHTTP(MCPServer):
         timeout: float = 5,
         sse_read_timeout: float = 60 * 5,
         client_session_timeout_seconds: float = 5,
+        connection_manager: MCPConnectionManager | None = None,
     ) -> None:
-        super().__init__(client_session_timeout_seconds=client_session_timeout_seconds)
+        super().__init__(
+            client_session_timeout_seconds=client_session_timeout_seconds,
+            connection_manager=connection_manager,
+        )
         self.url = url
         self.headers = headers
         self._timeout = timeout
@@ -185,6 +436,17 @@ class MCPServerHTTP(MCPServer):
         path_lower = parsed_url.path.lower().rstrip("/")
         return path_lower.endswith("mcp")
 
+    def _connection_key(self) -> Hashable:
+        headers = tuple(sorted((k, str(v)) for k, v in (self.headers or {}).items()))
+        return (
+            type(self),
+            self.url,
+            headers,
+            self._timeout,
+            self._sse_read_timeout,
+            self._read_timeout,
+        )
+
     def client_streams(
         self,
     ) -> AbstractAsyncContextManager[
@@ -226,13 +488,22 @@ class MCPServerStdio(MCPServer):
         env: dict[str, str] | None = None,
         cwd: str | Path | None = None,
         client_session_timeout_seconds: float = 5,
+        connection_manager: MCPConnectionManager | None = None,
     ) -> None:
-        super().__init__(client_session_timeout_seconds=client_session_timeout_seconds)
+        super().__init__(
+            client_session_timeout_seconds=client_session_timeout_seconds,
+            connection_manager=connection_manager,
+        )
         self.command = command
         self.args = args
         self.env = env
         self.cwd = cwd
 
+    def _connection_key(self) -> Hashable:
+        env = tuple(sorted(self.env.items())) if self.env is not None else None
+        cwd = str(self.cwd) if self.cwd is not None else None
+        return (type(self), self.command, tuple(self.args), env, cwd, self._read_timeout)
+
     def client_streams(
         self,
     ) -> AbstractAsyncContextManager[
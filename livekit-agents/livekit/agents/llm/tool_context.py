@@ -14,8 +14,13 @@
 
 from __future__ import annotations
 
+import asyncio
 import inspect
-from collections.abc import Awaitable
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Hashable
 from dataclasses import dataclass
 from enum import Flag, auto
 from typing import (
@@ -76,11 +81,43 @@ class StopResponse(Exception):
         super().__init__()
 
 
+@dataclass
+class ToolCacheOptions:
+    """Cache the results of an idempotent tool, see `function_tool(cache=...)`.
+
+    Concurrent calls with the same key are coalesced into a single execution. Only successful
+    results are cached.
+    """
+
+    ttl: float = 60.0
+    """Seconds during which a result is reused"""
+    scope: Literal["session", "global"] = "session"
+    """Share the results within a session, or between all the sessions of the process"""
+    key_fnc: Callable[[dict[str, Any]], Hashable] | None = None
+    """Build the cache key from the parsed arguments. By default, arguments that are equal once
+    parsed (regardless of their order and formatting) share a key"""
+
+    def _make_key(self, tool: Callable[..., Any], name: str, arguments: str) -> Hashable:
+        # different tools can share a name (e.g. across agent handoffs), key by the function.
+        # Within a session, the methods of different agent instances don't share their results
+        fnc = getattr(tool, "__func__", tool)
+        owner = getattr(tool, "__self__", None) if self.scope == "session" else None
+
+        args = json.loads(arguments or "{}")
+        if self.key_fnc is not None:
+            return (fnc, owner, name, self.key_fnc(args))
+
+        return (fnc, owner, name, json.dumps(args, sort_keys=True, separators=(",", ":")))
+
+
 @dataclass
 class _FunctionToolInfo:
     name: str
     description: str | None
     flags: ToolFlag
+    timeout: float | None = None
+    max_concurrency: int | None = None
+    cache: ToolCacheOptions | None = None
 
 
 @runtime_checkable
@@ -93,6 +130,9 @@ class FunctionTool(Protocol):
 class ToolFlag(Flag):
     NONE = 0
     IGNORE_ON_ENTER = auto()
+    CANCEL_ON_INTERRUPT = auto()
+    """cancel the running tool when the speech that called it is interrupted, instead of waiting
+    for it to complete"""
 
 
 class RawFunctionDescription(TypedDict):
@@ -117,6 +157,9 @@ class _RawFunctionToolInfo:
     name: str
     raw_schema: dict[str, Any]
     flags: ToolFlag
+    timeout: float | None = None
+    max_concurrency: int | None = None
+    cache: ToolCacheOptions | None = None
 
 
 @runtime_checkable
@@ -136,6 +179,9 @@ def function_tool(
     *,
     raw_schema: RawFunctionDescription | dict[str, Any],
     flags: ToolFlag = ToolFlag.NONE,
+    timeout: float | None = None,
+    max_concurrency: int | None = None,
+    cache: ToolCacheOptions | bool = False,
 ) -> RawFunctionTool: ...
 
 
@@ -145,6 +191,9 @@ def function_tool(
     *,
     raw_schema: RawFunctionDescription | dict[str, Any],
     flags: ToolFlag = ToolFlag.NONE,
+    timeout: float | None = None,
+    max_concurrency: int | None = None,
+    cache: ToolCacheOptions | bool = False,
 ) -> Callable[[Raw_F], RawFunctionTool]: ...
 
 
@@ -155,6 +204,9 @@ def function_tool(
     name: str | None = None,
     description: str | None = None,
     flags: ToolFlag = ToolFlag.NONE,
+    timeout: float | None = None,
+    max_concurrency: int | None = None,
+    cache: ToolCacheOptions | bool = False,
 ) -> FunctionTool: ...
 
 
@@ -165,6 +217,9 @@ def function_tool(
     name: str | None = None,
     description: str | None = None,
     flags: ToolFlag = ToolFlag.NONE,
+    timeout: float | None = None,
+    max_concurrency: int | None = None,
+    cache: ToolCacheOptions | bool = False,
 ) -> Callable[[F], FunctionTool]: ...
 
 
@@ -175,12 +230,33 @@ def function_tool(
     description: str | None = None,
     raw_schema: RawFunctionDescription | dict[str, Any] | None = None,
     flags: ToolFlag = ToolFlag.NONE,
+    timeout: float | None = None,
+    max_concurrency: int | None = None,
+    cache: ToolCacheOptions | bool = False,
 ) -> (
     FunctionTool
     | RawFunctionTool
     | Callable[[F], FunctionTool]
     | Callable[[Raw_F], RawFunctionTool]
 ):
+    """Mark a function as a tool callable by the LLM.
+
+    Args:
+        timeout: Maximum execution time in seconds, the LLM receives an error when it's exceeded.
+        max_concurrency: Maximum number of concurrent executions of the tool within a session,
+            the other calls wait for their turn.
+        cache: Reuse the results of the tool for identical arguments, True uses the default
+            `ToolCacheOptions`. Only for tools without side effects.
+    """
+    if max_concurrency is not None and max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    cache_opts: ToolCacheOptions | None = None
+    if isinstance(cache, ToolCacheOptions):
+        cache_opts = cache
+    elif cache:
+        cache_opts = ToolCacheOptions()
+
     def deco_raw(func: Raw_F) -> RawFunctionTool:
         assert raw_schema is not None
 
@@ -191,7 +267,14 @@ def function_tool(
             # support empty parameters
             raise ValueError("raw function description must contain a parameters key")
 
-        info = _RawFunctionToolInfo(raw_schema={**raw_schema}, name=raw_schema["name"], flags=flags)
+        info = _RawFunctionToolInfo(
+            raw_schema={**raw_schema},
+            name=raw_schema["name"],
+            flags=flags,
+            timeout=timeout,
+            max_concurrency=max_concurrency,
+            cache=cache_opts,
+        )
         setattr(func, "__livekit_raw_tool_info", info)
         return cast(RawFunctionTool, func)
 
@@ -203,6 +286,9 @@ def function_tool(
             name=name or func.__name__,
             description=description or docstring.description,
             flags=flags,
+            timeout=timeout,
+            max_concurrency=max_concurrency,
+            cache=cache_opts,
         )
         setattr(func, "__livekit_tool_info", info)
         return cast(FunctionTool, func)
@@ -275,3 +361,85 @@ class ToolContext:
 
     def copy(self) -> ToolContext:
         return ToolContext(self._tools.copy())
+
+
+class _ToolResultCache:
+    """TTL cache of tool results with single-flight execution of the concurrent identical calls"""
+
+    def __init__(self, *, max_entries: int = 1024) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        # the global cache can be used by jobs running in different threads (and event loops)
+        self._lock = threading.Lock()
+        self._inflight: dict[tuple[int, Hashable], asyncio.Future[Any]] = {}
+
+    async def get_or_run(
+        self,
+        key: Hashable,
+        *,
+        ttl: float,
+        fnc: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool],
+    ) -> tuple[Any, Literal["hit", "coalesced", "miss"]]:
+        loop = asyncio.get_running_loop()
+        inflight_key = (id(loop), key)
+
+        while True:
+            found, value = self._lookup(key)
+            if found:
+                return value, "hit"
+
+            fut = self._inflight.get(inflight_key)
+            if fut is None:
+                break
+
+            try:
+                return await asyncio.shield(fut), "coalesced"
+            except asyncio.CancelledError:
+                if not fut.cancelled():
+                    raise
+                # the leading call was cancelled (e.g. timeout), retry
+
+        fut = loop.create_future()
+        self._inflight[inflight_key] = fut
+        try:
+            value = await fnc()
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # the followers (if any) get the same error
+            raise
+        finally:
+            self._inflight.pop(inflight_key, None)
+
+        fut.set_result(value)
+        if cacheable(value):
+            self._store(key, value, ttl)
+
+        return value, "miss"
+
+    def _lookup(self, key: Hashable) -> tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False, None
+
+            self._entries.move_to_end(key)
+            return True, value
+
+    def _store(self, key: Hashable, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+_global_tool_cache = _ToolResultCache()
@@ -5,6 +5,8 @@ import base64
 import inspect
 import sys
 import types
+import weakref
+from collections.abc import Iterable
 from dataclasses import dataclass
 from typing import (
     TYPE_CHECKING,
@@ -195,14 +197,103 @@ def serialize_image(image: ImageContent, *, use_cache: bool = True) -> Serialize
     return serialized_image
 
 
+_REQUIRED = object()
+
+
+@dataclass
+class _CompiledFunctionTool:
+    """Artifacts of a function tool that only depend on its signature, built once per function"""
+
+    signature: inspect.Signature
+    type_hints: dict[str, Any]
+    context_params: list[str]
+    # value used when the LLM sends null for a parameter that can't be None
+    null_defaults: dict[str, Any]
+    model: type[BaseModel] | None
+    # the cached schemas are shared between the requests and must not be mutated
+    schemas: dict[str, dict[str, Any]]
+
+    def parameters_schema(self, kind: str) -> dict[str, Any]:
+        schema = self.schemas.get(kind)
+        if schema is None:
+            assert self.model is not None
+            if kind == "strict":
+                schema = _strict.to_strict_json_schema(self.model)
+            else:
+                schema = self.model.model_json_schema()
+            self.schemas[kind] = schema
+
+        return schema
+
+
+# keyed by the underlying function, so the bound methods of every instance share the artifacts
+_compiled_tools: weakref.WeakKeyDictionary[Any, dict[bool, _CompiledFunctionTool]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _compile_function_tool(fnc: Callable[..., Any]) -> _CompiledFunctionTool:
+    func = getattr(fnc, "__func__", fnc)
+    bound = func is not fnc
+    try:
+        compiled = _compiled_tools.get(func, {}).get(bound)
+    except TypeError:  # not weak referenceable
+        compiled = None
+
+    if compiled is not None:
+        return compiled
+
+    signature = inspect.signature(fnc)
+    type_hints = get_type_hints(fnc, include_extras=True)
+
+    # Function arguments with default values are treated as optional
+    # when converted to strict LLM function descriptions. (e.g., we convert default
+    # parameters to type: ["string", "null"]).
+    # The defaults are used when we receive None. (Only if the type can't be Optional)
+    null_defaults: dict[str, Any] = {}
+    context_params: list[str] = []
+    for param_name, param in signature.parameters.items():
+        type_hint = type_hints[param_name]
+        if is_context_type(type_hint):
+            context_params.append(param_name)
+        elif not _is_optional_type(type_hint):
+            null_defaults[param_name] = (
+                param.default if param.default is not inspect.Parameter.empty else _REQUIRED
+            )
+
+    compiled = _CompiledFunctionTool(
+        signature=signature,
+        type_hints=type_hints,
+        context_params=context_params,
+        null_defaults=null_defaults,
+        model=_build_pydantic_model(fnc, signature, type_hints) if is_function_tool(fnc) else None,
+        schemas={},
+    )
+
+    try:
+        _compiled_tools.setdefault(func, {})[bound] = compiled
+    except TypeError:
+        pass
+
+    return compiled
+
+
+def invalidate_function_tools(tools: Iterable[Callable[..., Any]]) -> None:
+    """Drop the cached models and schemas of `tools`, they are rebuilt on their next use"""
+    for tool in tools:
+        try:
+            _compiled_tools.pop(getattr(tool, "__func__", tool), None)
+        except TypeError:
+            pass
+
+
 def build_legacy_openai_schema(
     function_tool: FunctionTool, *, internally_tagged: bool = False
 ) -> dict[str, Any]:
     """non-strict mode tool description
     see https://serde.rs/enum-representations.html for the internally tagged representation"""
-    model = function_arguments_to_pydantic_model(function_tool)
     info = get_function_info(function_tool)
-    schema = model.model_json_schema()
+    schema = _compile_function_tool(function_tool).parameters_schema("legacy")
 
     if internally_tagged:
         return {
@@ -226,9 +317,8 @@ def build_strict_openai_schema(
     function_tool: FunctionTool,
 ) -> dict[str, Any]:
     """strict mode tool description"""
-    model = function_arguments_to_pydantic_model(function_tool)
     info = get_function_info(function_tool)
-    schema = _strict.to_strict_json_schema(model)
+    schema = _compile_function_tool(function_tool).parameters_schema("strict")
 
     return {
         "type": "function",
@@ -301,7 +391,19 @@ def to_openai_response_format(response_format: type | dict[str, Any]) -> dict[st
 
 def function_arguments_to_pydantic_model(func: Callable[..., Any]) -> type[BaseModel]:
     """Create a Pydantic model from a function's signature. (excluding context types)"""
+    if is_function_tool(func):
+        model = _compile_function_tool(func).model
+        assert model is not None
+        return model
+
+    signature = inspect.signature(func)
+    type_hints = get_type_hints(func, include_extras=True)
+    return _build_pydantic_model(func, signature, type_hints)
+
 
+def _build_pydantic_model(
+    func: Callable[..., Any], signature: inspect.Signature, type_hints: dict[str, Any]
+) -> type[BaseModel]:
     from docstring_parser import parse_from_object
 
     fnc_names = func.__name__.split("_")
@@ -311,9 +413,6 @@ def function_arguments_to_pydantic_model(func: Callable[..., Any]) -> type[BaseM
     docstring = parse_from_object(func)
     param_docs = {p.arg_name: p.description for p in docstring.params}
 
-    signature = inspect.signature(func)
-    type_hints = get_type_hints(func, include_extras=True)
-
     # field_name -> (type, FieldInfo or default)
     fields: dict[str, Any] = {}
 
@@ -356,31 +455,24 @@ def prepare_function_arguments(
     the raw function output from the LLM.
     """
 
-    signature = inspect.signature(fnc)
-    type_hints = get_type_hints(fnc, include_extras=True)
+    compiled = _compile_function_tool(fnc)
     args_dict = from_json(json_arguments)
 
     if is_function_tool(fnc):
-        model_type = function_arguments_to_pydantic_model(fnc)
-
-        # Function arguments with default values are treated as optional
-        # when converted to strict LLM function descriptions. (e.g., we convert default
-        # parameters to type: ["string", "null"]).
-        # The following make sure to use the default value when we receive None.
-        # (Only if the type can't be Optional)
-        for param_name, param in signature.parameters.items():
-            type_hint = type_hints[param_name]
-            if param_name in args_dict and args_dict[param_name] is None:
-                if not _is_optional_type(type_hint):
-                    if param.default is not inspect.Parameter.empty:
-                        args_dict[param_name] = param.default
-                    else:
-                        raise ValueError(
-                            f"Received None for required parameter '{param_name} ;"
-                            "this argument cannot be None and no default is available."
-                        )
-
-        model = model_type.model_validate(args_dict)  # can raise ValidationError
+        assert compiled.model is not None
+
+        # use the default value when we receive None for a parameter that can't be None
+        for param_name, value in args_dict.items():
+            if value is None and param_name in compiled.null_defaults:
+                default = compiled.null_defaults[param_name]
+                if default is _REQUIRED:
+                    raise ValueError(
+                        f"Received None for required parameter '{param_name} ;"
+                        "this argument cannot be None and no default is available."
+                    )
+                args_dict[param_name] = default
+
+        model = compiled.model.model_validate(args_dict)  # can raise ValidationError
         raw_fields = _shallow_model_dump(model)
     elif is_raw_function_tool(fnc):
         # e.g async def open_gate(self, raw_arguments: dict[str, object]):
@@ -393,12 +485,10 @@ def prepare_function_arguments(
 
     # inject RunContext if needed
     context_dict = {}
-    for param_name, _ in signature.parameters.items():
-        type_hint = type_hints[param_name]
-        if is_context_type(type_hint) and call_ctx is not None:
-            context_dict[param_name] = call_ctx
+    if call_ctx is not None:
+        context_dict = dict.fromkeys(compiled.context_params, call_ctx)
 
-    bound = signature.bind(**{**raw_fields, **context_dict})
+    bound = compiled.signature.bind(**{**raw_fields, **context_dict})
     bound.apply_defaults()
     return bound.args, bound.kwargs
 
@@ -11,7 +11,6 @@ from livekit import rtc
 from .. import utils
 from ..log import logger
 from ..types import DEFAULT_API_CONNECT_OPTIONS, NOT_GIVEN, APIConnectOptions, NotGivenOr
-from ..utils.audio import AudioByteStream
 from .stt import STT, RecognizeStream, SpeechData, SpeechEvent, SpeechEventType
 
 
@@ -139,6 +138,10 @@ class MultiSpeakerAdapterWrapper(RecognizeStream):
             await stream.aclose()
 
 
+# number of RMS frames computed at once, the pending audio is also processed on final transcripts
+_RMS_BATCH_SIZE = 10
+
+
 @dataclass
 class PrimarySpeakerDetectionOptions:
     """Configuration for primary speaker detection"""
@@ -161,6 +164,34 @@ class PrimarySpeakerDetectionOptions:
     """Minimum threshold multiplier (candidate can be min_multiplier quieter)"""
 
 
+class _RMSBuffer:
+    """The last `max_size` RMS values, in a preallocated buffer that is compacted when full"""
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max(max_size, 1)
+        self._buf = np.empty(2 * self._max_size, dtype=np.float32)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def values(self) -> np.ndarray[tuple[int], np.dtype[np.float32]]:
+        return self._buf[self._start : self._end]
+
+    def extend(self, values: np.ndarray[tuple[int], np.dtype[np.float32]]) -> None:
+        values = values[-self._max_size :]
+        if self._end + len(values) > len(self._buf):
+            keep = min(len(self), self._max_size - len(values))
+            self._buf[:keep] = self._buf[self._end - keep : self._end]
+            self._start, self._end = 0, keep
+
+        self._buf[self._end : self._end + len(values)] = values
+        self._end += len(values)
+        self._start = max(self._start, self._end - self._max_size)
+
+
 class _PrimarySpeakerDetector:
     @dataclass
     class SpeakerData:
@@ -204,33 +235,59 @@ class _PrimarySpeakerDetector:
         self._pushed_duration: float = 0.0
         self._primary_speaker: str | None = None
         self._speaker_data: dict[str, _PrimarySpeakerDetector.SpeakerData] = {}
-        self._bstream: AudioByteStream | None = None
 
-        self._rms_buffer: list[float] = []
         self._frame_size = self._opt.frame_size_ms / 1000
-        self._max_rms_size = int(self._opt.rms_buffer_duration / self._frame_size)
+        self._rms_buffer = _RMSBuffer(int(self._opt.rms_buffer_duration / self._frame_size))
+
+        # samples not processed yet, the RMS is computed for a batch of RMS frames at once
+        self._pending = np.empty(0, dtype=np.int16)
+        self._pending_size = 0
+        self._samples_per_rms_frame = 0
+        self._squares = np.empty(0, dtype=np.float32)
 
     def push_audio(self, frame: rtc.AudioFrame) -> None:
         if not self._detect_primary:
             self._pushed_duration += frame.duration
             return
 
-        if not self._bstream:
+        if not self._samples_per_rms_frame:
             sample_per_channel = int(frame.sample_rate * self._frame_size)
-            self._bstream = AudioByteStream(
-                sample_rate=frame.sample_rate,
-                num_channels=frame.num_channels,
-                samples_per_channel=sample_per_channel,
-            )
+            self._samples_per_rms_frame = sample_per_channel * frame.num_channels
             self._frame_size = sample_per_channel / frame.sample_rate  # accurate frame size
+            self._pending = np.empty(_RMS_BATCH_SIZE * self._samples_per_rms_frame, dtype=np.int16)
+
+        samples = np.frombuffer(frame.data, dtype=np.int16)
+        while len(samples):
+            n = min(len(samples), len(self._pending) - self._pending_size)
+            self._pending[self._pending_size : self._pending_size + n] = samples[:n]
+            self._pending_size += n
+            samples = samples[n:]
+
+            if self._pending_size == len(self._pending):
+                self._process_pending()
+
+    def _process_pending(self) -> None:
+        if not self._samples_per_rms_frame:
+            return
 
-        for f in self._bstream.push(frame.data):
-            rms = self._compute_rms(f)
-            self._rms_buffer.append(rms)
-            self._pushed_duration += f.duration
+        num_frames = self._pending_size // self._samples_per_rms_frame
+        if num_frames == 0:
+            return
+
+        size = num_frames * self._samples_per_rms_frame
+        if len(self._squares) < size:
+            self._squares = np.empty(len(self._pending), dtype=np.float32)
+
+        squares = self._squares[:size]
+        np.square(self._pending[:size], out=squares, dtype=np.float32)
+        rms = squares.reshape(num_frames, self._samples_per_rms_frame).mean(axis=1)
+        np.sqrt(rms, out=rms)
+        self._rms_buffer.extend(rms)
+        self._pushed_duration += num_frames * self._frame_size
 
-        if len(self._rms_buffer) > self._max_rms_size:
-            self._rms_buffer = self._rms_buffer[-self._max_rms_size :]
+        remaining = self._pending_size - size
+        self._pending[:remaining] = self._pending[size : self._pending_size]
+        self._pending_size = remaining
 
     def on_stt_event(self, ev: SpeechEvent) -> SpeechEvent | None:
         if not ev.alternatives:
@@ -238,6 +295,7 @@ class _PrimarySpeakerDetector:
 
         sd = ev.alternatives[0]
         if ev.type == SpeechEventType.FINAL_TRANSCRIPT:
+            self._process_pending()
             self._update_primary_speaker(sd)
 
         if sd.speaker_id is None or self._primary_speaker is None:
@@ -255,31 +313,25 @@ class _PrimarySpeakerDetector:
             sd.text = self._background_format.format(text=sd.text, speaker_id=sd.speaker_id)
         return ev
 
-    def _compute_rms(self, frame: rtc.AudioFrame) -> float:
-        audio_data = np.frombuffer(frame.data, dtype=np.int16)
-        if len(audio_data) == 0:
-            return 0.0
-
-        rms = np.sqrt(np.mean(audio_data.astype(np.float32) ** 2))
-        return float(rms)
-
     def _get_rms_for_timerange(self, start_time: float, end_time: float) -> float | None:
-        if not self._rms_buffer:
+        rms_values = self._rms_buffer.values
+        if not len(rms_values):
             return None
 
         start = int((self._pushed_duration - start_time) / self._frame_size)
         end = int((self._pushed_duration - end_time) / self._frame_size)
-        start = len(self._rms_buffer) - start - 1
-        end = len(self._rms_buffer) - end
+        start = len(rms_values) - start - 1
+        end = len(rms_values) - end
 
-        if end < 0 or start >= len(self._rms_buffer):
+        if end < 0 or start >= len(rms_values):
             return None
         start = max(start, 0)
 
         if end - start < self._opt.min_rms_samples:
             return None
 
-        return float(np.median(self._rms_buffer[start:end]))
+        # np.median partitions a copy of the window, the buffer itself isn't modified
+        return float(np.median(rms_values[start:end]))
 
     def _update_primary_speaker(self, sd: SpeechData) -> None:
         if sd.speaker_id is None or not self._detect_primary:
@@ -1,5 +1,13 @@
 from . import http_server, metrics, trace_types, utils
-from .traces import _setup_cloud_tracer, _upload_session_report, set_tracer_provider, tracer
+from .traces import (
+    AttributePolicy,
+    _setup_cloud_tracer,
+    _upload_session_report,
+    set_attribute_policies,
+    set_lazy_attribute,
+    set_tracer_provider,
+    tracer,
+)
 
 __all__ = [
     "tracer",
@@ -7,6 +15,9 @@ __all__ = [
     "trace_types",
     "http_server",
     "set_tracer_provider",
+    "set_attribute_policies",
+    "set_lazy_attribute",
+    "AttributePolicy",
     "utils",
     "_setup_cloud_tracer",
     "_upload_session_report",
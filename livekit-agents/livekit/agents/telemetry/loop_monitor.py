@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import sys
+import threading
+import time
+import traceback
+from typing import Any
+
+from ..log import logger
+from . import metrics, trace_types
+from .traces import tracer
+
+LAG_PROBE_INTERVAL = 0.25
+MAX_STACK_DEPTH = 30
+
+# thread id -> monitor of the loop running in this thread
+_monitors: dict[int, LoopMonitor] = {}
+_original_handle_run: Any = None
+_install_lock = threading.Lock()
+
+
+def _install_handle_hook() -> None:
+    global _original_handle_run
+
+    with _install_lock:
+        if _original_handle_run is not None:
+            return
+
+        _original_handle_run = asyncio.events.Handle._run
+        run = _original_handle_run
+        get_ident = threading.get_ident
+
+        def _monitored_run(handle: asyncio.Handle) -> None:
+            monitor = _monitors.get(get_ident())
+            if monitor is None:
+                return run(handle)
+
+            monitor._callback_started(handle)
+            try:
+                return run(handle)
+            finally:
+                monitor._callback_ended(handle)
+
+        asyncio.events.Handle._run = _monitored_run  # type: ignore[method-assign]
+
+
+class LoopMonitor:
+    """Monitor how long an event loop is blocked.
+
+    The scheduling lag (how late a timer runs) is sampled every `lag_interval` seconds. A
+    watchdog thread captures the stack of the loop thread when a callback runs for longer than
+    `slow_callback_threshold`, the callback is then reported with the job, agent and speech it
+    belongs to (taken from the context it runs in).
+
+    Both are exported as Prometheus histograms, and every slow callback is also recorded as a
+    span and logged.
+    """
+
+    def __init__(
+        self, *, slow_callback_threshold: float, lag_interval: float = LAG_PROBE_INTERVAL
+    ) -> None:
+        self._threshold = slow_callback_threshold
+        self._lag_interval = lag_interval
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread_id: int | None = None
+        self._lag_handle: asyncio.TimerHandle | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+        # state of the callback being run, written by the loop thread and read by the watchdog
+        self._generation = 0
+        self._callback_start: float | None = None
+        self._stack_sample: tuple[int, list[str]] | None = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start monitoring `loop`, must be called from the thread running it"""
+        if self._loop is not None:
+            raise RuntimeError("loop monitor already started")
+
+        _install_handle_hook()
+        self._loop = loop
+        self._thread_id = threading.get_ident()
+        _monitors[self._thread_id] = self
+
+        self._schedule_lag_probe()
+        self._watchdog = threading.Thread(
+            target=self._watchdog_thread, name="loop_monitor_watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        if self._thread_id is not None:
+            _monitors.pop(self._thread_id, None)
+
+        if self._lag_handle is not None:
+            self._lag_handle.cancel()
+            self._lag_handle = None
+
+        self._stopped.set()
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+    def _schedule_lag_probe(self) -> None:
+        assert self._loop is not None
+        expected = self._loop.time() + self._lag_interval
+        self._lag_handle = self._loop.call_at(expected, self._on_lag_probe, expected)
+
+    def _on_lag_probe(self, expected: float) -> None:
+        assert self._loop is not None
+        metrics.event_loop_lag(max(self._loop.time() - expected, 0.0))
+        self._schedule_lag_probe()
+
+    def _callback_started(self, handle: asyncio.Handle) -> None:
+        self._generation += 1
+        self._callback_start = time.perf_counter()
+
+    def _callback_ended(self, handle: asyncio.Handle) -> None:
+        start, self._callback_start = self._callback_start, None
+        if start is None:
+            return
+
+        duration = time.perf_counter() - start
+        if duration < self._threshold:
+            return
+
+        stack: list[str] | None = None
+        if (sample := self._stack_sample) is not None and sample[0] == self._generation:
+            stack = sample[1]
+
+        try:
+            self._report_slow_callback(handle, duration, stack)
+        except Exception:
+            logger.exception("failed to report a slow callback")
+
+    def _watchdog_thread(self) -> None:
+        interval = max(self._threshold / 2, 0.005)
+        sampled_generation = -1
+        while not self._stopped.wait(interval):
+            generation, start = self._generation, self._callback_start
+            if start is None or generation == sampled_generation:
+                continue
+
+            if time.perf_counter() - start < self._threshold:
+                continue
+
+            assert self._thread_id is not None
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                continue
+
+            # the callback may have returned meanwhile, the generation is checked when reporting
+            sampled_generation = generation
+            stack = traceback.format_stack(frame, limit=MAX_STACK_DEPTH)
+            self._stack_sample = (generation, stack)
+
+    def _report_slow_callback(
+        self, handle: asyncio.Handle, duration: float, stack: list[str] | None
+    ) -> None:
+        attrs = _attribution(handle)
+        metrics.slow_callback(duration)
+
+        callback = _describe(handle)
+        logger.warning(
+            "event loop blocked for %.3fs by %s",
+            duration,
+            callback,
+            extra={"duration": round(duration, 3), **attrs},
+        )
+
+        end_ns = time.time_ns()
+        span = tracer.start_span(
+            "slow_callback",
+            start_time=end_ns - int(duration * 1e9),
+            attributes={
+                trace_types.ATTR_LOOP_CALLBACK: callback,
+                trace_types.ATTR_LOOP_CALLBACK_DURATION: duration,
+                trace_types.ATTR_LOOP_STACK: "".join(stack) if stack else "",
+                **{_SPAN_ATTRS[key]: value for key, value in attrs.items()},
+            },
+        )
+        span.end(end_time=end_ns)
+
+
+_SPAN_ATTRS = {
+    "job_id": trace_types.ATTR_JOB_ID,
+    "agent_label": trace_types.ATTR_AGENT_LABEL,
+    "speech_id": trace_types.ATTR_SPEECH_ID,
+    "task_name": trace_types.ATTR_LOOP_TASK_NAME,
+}
+
+
+def _describe(handle: asyncio.Handle) -> str:
+    callback = getattr(handle, "_callback", None)
+    task = getattr(callback, "__self__", None)
+    if isinstance(task, asyncio.Task):
+        coro = task.get_coro()
+        return f"task {task.get_name()} ({getattr(coro, '__qualname__', coro)})"
+
+    return repr(handle)
+
+
+def _attribution(handle: asyncio.Handle) -> dict[str, str]:
+    """Find the job, agent and speech the callback belongs to from the context it runs in"""
+    attrs: dict[str, str] = {}
+    callback = getattr(handle, "_callback", None)
+    task = getattr(callback, "__self__", None)
+    if isinstance(task, asyncio.Task):
+        attrs["task_name"] = task.get_name()
+
+    context: contextvars.Context | None = getattr(handle, "_context", None)
+    if context is None:
+        return attrs
+
+    # matched by name to avoid importing the voice module here
+    for var, value in context.items():
+        try:
+            if var.name == "agents_job_context":
+                attrs["job_id"] = value.job.id
+            elif var.name == "agents_activity":
+                attrs["agent_label"] = value.agent.label
+            elif var.name == "agents_speech_handle":
+                attrs["speech_id"] = value.id
+        except Exception:
+            continue
+
+    return attrs
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import os
 
 import prometheus_client
@@ -35,6 +37,97 @@ CPU_LOAD_GAUGE = prometheus_client.Gauge(
     ["nodename"],
 )
 
+CHILD_PROC_MEMORY_GAUGE = prometheus_client.Gauge(
+    "lk_agents_child_process_memory_bytes",
+    "Resident memory of the supervised child processes",
+    ["nodename"],
+    multiprocess_mode="max",
+)
+
+CHILD_PROC_CPU_COUNTER = prometheus_client.Counter(
+    "lk_agents_child_process_cpu_seconds",
+    "CPU time spent by the supervised child processes",
+    ["nodename"],
+)
+
+JOB_CPU_TIME = prometheus_client.Histogram(
+    "lk_agents_job_cpu_seconds",
+    "CPU time used by a job",
+    ["nodename"],
+    buckets=[1, 5, 15, 30, 60, 120, 300, 600, 1800],
+)
+
+JOB_PEAK_MEMORY = prometheus_client.Histogram(
+    "lk_agents_job_peak_memory_bytes",
+    "Peak resident memory of the process running a job",
+    ["nodename"],
+    buckets=[mb * 1024 * 1024 for mb in (128, 256, 512, 1024, 2048, 4096, 8192)],
+)
+
+
+EVENT_LOOP_LAG = prometheus_client.Histogram(
+    "lk_agents_event_loop_lag_seconds",
+    "Scheduling lag of the job event loops",
+    ["nodename"],
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5],
+)
+
+SLOW_CALLBACK_DURATION = prometheus_client.Histogram(
+    "lk_agents_slow_callback_duration_seconds",
+    "Duration of the callbacks blocking a job event loop longer than the threshold",
+    ["nodename"],
+    buckets=[0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10],
+)
+
+
+TOOL_CACHE_LOOKUPS = prometheus_client.Counter(
+    "lk_agents_tool_cache_lookups",
+    "Calls to the cached function tools, by result (hit, coalesced or miss)",
+    ["nodename", "tool", "result"],
+)
+
+FALLBACK_REQUESTS = prometheus_client.Counter(
+    "lk_agents_fallback_requests",
+    "Requests of the fallback adapters, by component (llm or tts)",
+    ["nodename", "component"],
+)
+
+HEDGED_REQUESTS = prometheus_client.Counter(
+    "lk_agents_hedged_requests",
+    "Requests of the fallback adapters also sent to the next provider, by the provider that "
+    "answered first (primary, hedge or none)",
+    ["nodename", "component", "winner"],
+)
+
+PREEMPTIVE_GENERATIONS = prometheus_client.Counter(
+    "lk_agents_preemptive_generations",
+    "Preemptive generations, by outcome (used, transcript_extended, transcript_changed, "
+    "context_changed or cancelled)",
+    ["nodename", "outcome"],
+)
+
+PREEMPTIVE_WASTED_TOKENS = prometheus_client.Counter(
+    "lk_agents_preemptive_wasted_tokens",
+    "Tokens reported by the LLM for the discarded preemptive generations, by kind "
+    "(prompt, excluding the cached tokens, or completion)",
+    ["nodename", "kind"],
+)
+
+TURN_LATENCY = prometheus_client.Histogram(
+    "lk_agents_turn_latency_seconds",
+    "Latency of the user turns, by stage (end_of_turn, transcription, on_user_turn_completed, "
+    "llm_ttft, tts_ttfb or e2e)",
+    ["nodename", "stage"],
+    buckets=[0.05, 0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 3, 5, 10],
+)
+
+ENDPOINTING_DELAY = prometheus_client.Histogram(
+    "lk_agents_endpointing_delay_seconds",
+    "Endpointing delay of the user turns, by outcome (end_of_turn or cutoff)",
+    ["nodename", "outcome"],
+    buckets=[0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 3, 5],
+)
+
 
 # Note: set_function() is not supported in multiprocess mode.# We need to update this metric explicitly.
 def _update_child_proc_count() -> None:
@@ -47,6 +140,16 @@ def _update_child_proc_count() -> None:
         pass
 
 
+def _update_child_proc_usage(*, count: int, memory_bytes: int, cpu_time: float) -> None:
+    """Update the child process metrics from a supervisor sample, `cpu_time` is the CPU time
+    spent since the previous sample."""
+    nodename = utils.nodename()
+    CHILD_PROC_GAUGE.labels(nodename=nodename).set(count)
+    CHILD_PROC_MEMORY_GAUGE.labels(nodename=nodename).set(memory_bytes)
+    if cpu_time > 0:
+        CHILD_PROC_CPU_COUNTER.labels(nodename=nodename).inc(cpu_time)
+
+
 def _update_worker_load(worker_load: float) -> None:
     CPU_LOAD_GAUGE.labels(nodename=utils.nodename()).set(worker_load)
 
@@ -61,3 +164,52 @@ def job_ended() -> None:
 
 def proc_initialized(*, time_elapsed: float) -> None:
     PROC_INITIALIZE_TIME.labels(nodename=utils.nodename()).observe(time_elapsed)
+
+
+def job_resources(*, cpu_time: float, peak_memory_bytes: int | None = None) -> None:
+    nodename = utils.nodename()
+    JOB_CPU_TIME.labels(nodename=nodename).observe(cpu_time)
+    if peak_memory_bytes is not None:
+        JOB_PEAK_MEMORY.labels(nodename=nodename).observe(peak_memory_bytes)
+
+
+def event_loop_lag(lag: float) -> None:
+    EVENT_LOOP_LAG.labels(nodename=utils.nodename()).observe(lag)
+
+
+def slow_callback(duration: float) -> None:
+    SLOW_CALLBACK_DURATION.labels(nodename=utils.nodename()).observe(duration)
+
+
+def tool_cache_lookup(tool: str, result: str) -> None:
+    TOOL_CACHE_LOOKUPS.labels(nodename=utils.nodename(), tool=tool, result=result).inc()
+
+
+def endpointing_delay(delay: float, *, outcome: str) -> None:
+    ENDPOINTING_DELAY.labels(nodename=utils.nodename(), outcome=outcome).observe(delay)
+
+
+def turn_latency(stages: dict[str, float]) -> None:
+    nodename = utils.nodename()
+    for stage, latency in stages.items():
+        TURN_LATENCY.labels(nodename=nodename, stage=stage).observe(latency)
+
+
+def fallback_request(component: str) -> None:
+    FALLBACK_REQUESTS.labels(nodename=utils.nodename(), component=component).inc()
+
+
+def hedged_request(component: str, *, winner: str) -> None:
+    HEDGED_REQUESTS.labels(nodename=utils.nodename(), component=component, winner=winner).inc()
+
+
+def preemptive_generation(outcome: str) -> None:
+    PREEMPTIVE_GENERATIONS.labels(nodename=utils.nodename(), outcome=outcome).inc()
+
+
+def preemptive_wasted_tokens(*, prompt_tokens: int, completion_tokens: int) -> None:
+    nodename = utils.nodename()
+    if prompt_tokens > 0:
+        PREEMPTIVE_WASTED_TOKENS.labels(nodename=nodename, kind="prompt").inc(prompt_tokens)
+    if completion_tokens > 0:
+        PREEMPTIVE_WASTED_TOKENS.labels(nodename=nodename, kind="completion").inc(completion_tokens)
@@ -31,6 +31,7 @@ ATTR_FUNCTION_TOOL_NAME = "lk.function_tool.name"
 ATTR_FUNCTION_TOOL_ARGS = "lk.function_tool.arguments"
 ATTR_FUNCTION_TOOL_IS_ERROR = "lk.function_tool.is_error"
 ATTR_FUNCTION_TOOL_OUTPUT = "lk.function_tool.output"
+ATTR_FUNCTION_TOOL_CACHE = "lk.function_tool.cache"
 
 # tts node
 ATTR_TTS_INPUT_TEXT = "lk.input_text"
@@ -47,6 +48,12 @@ ATTR_TRANSCRIPT_CONFIDENCE = "lk.transcript_confidence"
 ATTR_TRANSCRIPTION_DELAY = "lk.transcription_delay"
 ATTR_END_OF_TURN_DELAY = "lk.end_of_turn_delay"
 
+# event loop monitor
+ATTR_LOOP_CALLBACK = "lk.loop.callback"
+ATTR_LOOP_CALLBACK_DURATION = "lk.loop.callback_duration"
+ATTR_LOOP_STACK = "lk.loop.stack"
+ATTR_LOOP_TASK_NAME = "lk.loop.task_name"
+
 # metrics
 ATTR_LLM_METRICS = "lk.llm_metrics"
 ATTR_TTS_METRICS = "lk.tts_metrics"
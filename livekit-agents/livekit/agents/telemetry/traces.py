@@ -3,8 +3,9 @@ from __future__ import annotations
 import json
 import logging
 from collections.abc import Iterator
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Callable
 
 import aiofiles
 import aiohttp
@@ -34,6 +35,7 @@ from livekit import api
 from livekit.protocol import agent_pb, metrics as proto_metrics
 
 from ..log import logger
+from . import trace_types
 
 if TYPE_CHECKING:
     from ..llm import ChatItem
@@ -99,18 +101,93 @@ class _MetadataLogProcessor(LogRecordProcessor):
         return True
 
 
+@dataclass
+class AttributePolicy:
+    """Controls the cost of a heavy span attribute (chat contexts, tool arguments...)"""
+
+    max_size: int | None = None
+    """Maximum length of the value, longer strings are truncated. None = unlimited"""
+    sample_rate: float = 1.0
+    """Fraction of the traces carrying the attribute, decided per trace so that all the spans of
+    a sampled trace have it"""
+
+
+_TRUNCATED_SUFFIX = "...[truncated]"
+
+_attribute_policies: dict[str, AttributePolicy] = {
+    trace_types.ATTR_CHAT_CTX: AttributePolicy(),
+    trace_types.ATTR_FUNCTION_TOOLS: AttributePolicy(),
+    trace_types.ATTR_RESPONSE_FUNCTION_CALLS: AttributePolicy(),
+    trace_types.ATTR_FUNCTION_TOOL_ARGS: AttributePolicy(),
+    trace_types.ATTR_FUNCTION_TOOL_OUTPUT: AttributePolicy(),
+}
+
+
+def set_attribute_policies(policies: dict[str, AttributePolicy]) -> None:
+    """Set the size caps and sampling of the heavy span attributes, by attribute name.
+
+    The policies apply to the current process, call this next to `set_tracer_provider` (e.g. in
+    the entrypoint) to configure a worker.
+    """
+    _attribute_policies.update(policies)
+
+
+def set_lazy_attribute(span: Span, key: str, value_fnc: Callable[[], AttributeValue]) -> None:
+    """Set an attribute whose value is expensive to produce.
+
+    `value_fnc` is only called when the span is recorded and the attribute is sampled for this
+    trace, the value is then truncated to the size cap of the attribute.
+    """
+    if not span.is_recording():
+        return
+
+    policy = _attribute_policies.get(key)
+    if policy is not None and not _is_sampled(span, policy.sample_rate):
+        return
+
+    value = value_fnc()
+    if (
+        policy is not None
+        and policy.max_size is not None
+        and isinstance(value, str)
+        and len(value) > policy.max_size
+    ):
+        value = value[: policy.max_size] + _TRUNCATED_SUFFIX
+
+    span.set_attribute(key, value)
+
+
+def _is_sampled(span: Span, sample_rate: float) -> bool:
+    if sample_rate >= 1.0:
+        return True
+
+    if sample_rate <= 0.0:
+        return False
+
+    # the lower 64 bits of the trace id are random
+    trace_id = span.get_span_context().trace_id & 0xFFFFFFFFFFFFFFFF
+    return trace_id < sample_rate * 2**64
+
+
 def set_tracer_provider(
-    tracer_provider: TracerProvider, *, metadata: dict[str, AttributeValue] | None = None
+    tracer_provider: TracerProvider,
+    *,
+    metadata: dict[str, AttributeValue] | None = None,
+    attribute_policies: dict[str, AttributePolicy] | None = None,
 ) -> None:
     """Set the tracer provider for the livekit-agents.
 
     Args:
         tracer_provider (TracerProvider): The tracer provider to set.
         metadata (dict[str, AttributeValue] | None, optional): Metadata to set on all spans. Defaults to None.
-    """
+        attribute_policies (dict[str, AttributePolicy] | None, optional): Size caps and sampling of the heavy attributes, see `set_attribute_policies`. Defaults to None.
+    """  # noqa: E501
     if metadata:
         tracer_provider.add_span_processor(_MetadataSpanProcessor(metadata))
 
+    if attribute_policies:
+        set_attribute_policies(attribute_policies)
+
     tracer.set_provider(tracer_provider)
 
 
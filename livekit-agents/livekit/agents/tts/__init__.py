@@ -1,3 +1,4 @@
+from ..utils.hedging import HedgingOptions
 from .fallback_adapter import (
     AvailabilityChangedEvent,
     FallbackAdapter,
@@ -28,6 +29,7 @@ __all__ = [
     "FallbackAdapter",
     "FallbackChunkedStream",
     "FallbackSynthesizeStream",
+    "HedgingOptions",
     "AudioEmitter",
     "TTSError",
     "SentenceStreamPacer",
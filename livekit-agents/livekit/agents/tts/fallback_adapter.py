@@ -3,17 +3,20 @@ from __future__ import annotations
 import asyncio
 import dataclasses
 import time
+from collections import deque
 from collections.abc import AsyncGenerator, AsyncIterable
 from dataclasses import dataclass
-from typing import Any, ClassVar, Literal, Union
+from typing import Any, Callable, ClassVar, Literal, Union
 
 from livekit import rtc
 
 from .. import utils
 from .._exceptions import APIConnectionError
 from ..log import logger
+from ..telemetry import metrics as telemetry_metrics
 from ..types import DEFAULT_API_CONNECT_OPTIONS, USERDATA_TIMED_TRANSCRIPT, APIConnectOptions
 from ..utils import aio
+from ..utils.hedging import HedgedAttempt, HedgingOptions, HedgingPolicy, race_attempts
 from .stream_adapter import StreamAdapter
 from .tts import (
     TTS,
@@ -34,7 +37,6 @@ DEFAULT_FALLBACK_API_CONNECT_OPTIONS = APIConnectOptions(
 class _TTSStatus:
     available: bool
     recovering_task: asyncio.Task[None] | None
-    resampler: rtc.AudioResampler | None
 
 
 @dataclass
@@ -56,6 +58,7 @@ class FallbackAdapter(
         *,
         max_retry_per_tts: int = 2,
         sample_rate: int | None = None,
+        hedging: HedgingOptions | None = None,
     ) -> None:
         """
         Initialize a FallbackAdapter that manages multiple TTS instances.
@@ -64,6 +67,7 @@ class FallbackAdapter(
             tts (list[TTS]): A list of TTS instances to use for fallback.
             max_retry_per_tts (int, optional): Maximum number of retries per TTS instance. Defaults to 2.
             sample_rate (int | None, optional): Desired sample rate for the synthesized audio. If None, uses the maximum sample rate among the TTS instances.
+            hedging (HedgingOptions | None, optional): When set, the synthesis is also started on the next TTS if the current one didn't produce audio after the hedging delay, the audio of the first TTS to answer is used and the other synthesis is cancelled. Defaults to None.
 
         Raises:
             ValueError: If less than one TTS instance is provided.
@@ -92,17 +96,14 @@ class FallbackAdapter(
 
         self._tts_instances = tts
         self._max_retry_per_tts = max_retry_per_tts
+        self._hedging = HedgingPolicy(hedging) if hedging is not None else None
 
         self._status: list[_TTSStatus] = []
         for t in tts:
-            resampler = None
             if sample_rate != t.sample_rate:
                 logger.info(f"resampling {t.label} from {t.sample_rate}Hz to {sample_rate}Hz")
-                resampler = rtc.AudioResampler(input_rate=t.sample_rate, output_rate=sample_rate)
 
-            self._status.append(
-                _TTSStatus(available=True, recovering_task=None, resampler=resampler)
-            )
+            self._status.append(_TTSStatus(available=True, recovering_task=None))
 
             t.on("metrics_collected", self._on_metrics_collected)
 
@@ -131,6 +132,15 @@ class FallbackAdapter(
     def _on_metrics_collected(self, *args: Any, **kwargs: Any) -> None:
         self.emit("metrics_collected", *args, **kwargs)
 
+    def _mark_unavailable(self, index: int) -> None:
+        tts_status = self._status[index]
+        if tts_status.available:
+            tts_status.available = False
+            self.emit(
+                "tts_availability_changed",
+                AvailabilityChangedEvent(tts=self._tts_instances[index], available=False),
+            )
+
     async def aclose(self) -> None:
         for tts_status in self._status:
             if tts_status.recovering_task is not None:
@@ -204,61 +214,94 @@ class FallbackChunkedStream(ChunkedStream):
             tts_status.recovering_task = asyncio.create_task(_recover_tts_task(tts))
 
     async def _run(self, output_emitter: AudioEmitter) -> None:
-        assert isinstance(self._tts, FallbackAdapter)
-
         start_time = time.time()
+        adapter = self._fallback_adapter
+        hedging = adapter._hedging
+
+        telemetry_metrics.fallback_request("tts")
+        if hedging is not None:
+            hedging.on_request()
 
-        all_failed = all(not tts_status.available for tts_status in self._tts._status)
+        all_failed = all(not tts_status.available for tts_status in adapter._status)
         if all_failed:
             logger.error("all TTSs are unavailable, retrying..")
 
         output_emitter.initialize(
             request_id=utils.shortuuid(),
-            sample_rate=self._tts.sample_rate,
-            num_channels=self._tts.num_channels,
+            sample_rate=adapter.sample_rate,
+            num_channels=adapter.num_channels,
             mime_type="audio/pcm",
         )
 
-        for i, tts in enumerate(self._tts._tts_instances):
-            tts_status = self._tts._status[i]
-            if tts_status.available or all_failed:
-                try:
-                    resampler = tts_status.resampler
-                    async for synthesized_audio in self._try_synthesize(tts=tts, recovering=False):
-                        if texts := synthesized_audio.frame.userdata.get(USERDATA_TIMED_TRANSCRIPT):
-                            output_emitter.push_timed_transcript(texts)
+        candidates = deque(
+            i for i, tts_status in enumerate(adapter._status) if tts_status.available or all_failed
+        )
+        started: list[_TTSAttempt] = []
+        succeeded = False
+
+        def _start_attempt(index: int) -> _TTSAttempt:
+            tts = adapter._tts_instances[index]
+            attempt = _TTSAttempt(
+                index,
+                tts,
+                self._try_synthesize(tts=tts, recovering=False),
+                sample_rate=adapter.sample_rate,
+            )
+            started.append(attempt)
+            return attempt
+
+        try:
+            while candidates:
+                winner = await race_attempts(
+                    _start_attempt(candidates.popleft()),
+                    component="tts",
+                    candidates=candidates,
+                    start_attempt=_start_attempt,
+                    on_failed=self._on_attempt_failed,
+                    hedging=hedging,
+                )
+                if winner is None:
+                    continue
 
-                        if resampler is not None:
-                            for rf in resampler.push(synthesized_audio.frame):
-                                output_emitter.push(rf.data.tobytes())
-                        else:
-                            output_emitter.push(synthesized_audio.frame.data.tobytes())
+                resampler = winner.resampler
+                async for synthesized_audio in winner.ch:
+                    if texts := synthesized_audio.frame.userdata.get(USERDATA_TIMED_TRANSCRIPT):
+                        output_emitter.push_timed_transcript(texts)
+
+                    if resampler is not None:
+                        for rf in resampler.push(synthesized_audio.frame):
+                            output_emitter.push(rf.data.tobytes())
+                    else:
+                        output_emitter.push(synthesized_audio.frame.data.tobytes())
 
+                await winner.task
+                if winner.error is None:
                     if resampler is not None:
                         for rf in resampler.flush():
                             output_emitter.push(rf.data.tobytes())
 
+                    succeeded = True
                     return
-                except Exception:  # exceptions already logged inside _try_synthesize
-                    if tts_status.available:
-                        tts_status.available = False
-                        self._tts.emit(
-                            "tts_availability_changed",
-                            AvailabilityChangedEvent(tts=tts, available=False),
-                        )
-
-                    if output_emitter.pushed_duration() > 0.0:
-                        logger.warning(
-                            f"{tts.label} already synthesized of audio, ignoring fallback"
-                        )
-                        return
 
-            self._try_recovery(tts)
+                self._on_attempt_failed(winner)
+                if output_emitter.pushed_duration() > 0.0:
+                    logger.warning(
+                        f"{winner.tts.label} already synthesized of audio, ignoring fallback"
+                    )
+                    return
+        finally:
+            await aio.cancel_and_wait(*(attempt.task for attempt in started))
+            _recover_skipped(adapter, started, succeeded=succeeded, try_recovery=self._try_recovery)
 
         raise APIConnectionError(
-            f"all TTSs failed ({[tts.label for tts in self._tts._tts_instances]}) after {time.time() - start_time} seconds"  # noqa: E501
+            f"all TTSs failed ({[tts.label for tts in adapter._tts_instances]}) after {time.time() - start_time} seconds"  # noqa: E501
         )
 
+    def _on_attempt_failed(self, attempt: _TTSAttempt) -> None:
+        # exceptions already logged inside _try_synthesize
+        self._fallback_adapter._mark_unavailable(attempt.index)
+        self._try_recovery(attempt.tts)
+
 
 class FallbackSynthesizeStream(SynthesizeStream):
     _tts_request_span_name: ClassVar[str] = "tts_fallback_adapter"
@@ -327,98 +370,129 @@ class FallbackSynthesizeStream(SynthesizeStream):
 
     async def _run(self, output_emitter: AudioEmitter) -> None:
         start_time = time.time()
+        adapter = self._fallback_adapter
+        hedging = adapter._hedging
+
+        telemetry_metrics.fallback_request("tts")
+        if hedging is not None:
+            hedging.on_request()
 
-        all_failed = all(not tts_status.available for tts_status in self._fallback_adapter._status)
+        all_failed = all(not tts_status.available for tts_status in adapter._status)
         if all_failed:
             logger.error("all TTSs are unavailable, retrying..")
 
-        new_input_ch: aio.Chan[str | SynthesizeStream._FlushSentinel] | None = None
         output_emitter.initialize(
             request_id=utils.shortuuid(),
-            sample_rate=self._fallback_adapter.sample_rate,
-            num_channels=self._fallback_adapter.num_channels,
+            sample_rate=adapter.sample_rate,
+            num_channels=adapter.num_channels,
             mime_type="audio/pcm",
             stream=True,
         )
         output_emitter.start_segment(segment_id=utils.shortuuid())
 
-        async def _forward_input_task() -> None:
-            nonlocal new_input_ch
+        candidates = deque(
+            i for i, tts_status in enumerate(adapter._status) if tts_status.available or all_failed
+        )
+        started: list[_TTSAttempt] = []
+        succeeded = False
+        # time at which the first text was pushed, the time to first audio is measured from it
+        input_started: asyncio.Future[float] = asyncio.Future()
 
+        async def _forward_input_task() -> None:
             async for data in self._input_ch:
-                if new_input_ch:
-                    new_input_ch.send_nowait(data)
+                for attempt in started:
+                    if attempt.input_ch is not None and not attempt.task.done():
+                        attempt.input_ch.send_nowait(data)
 
                 if isinstance(data, str) and data:
                     self._pushed_tokens.append(data)
+                    if not input_started.done():
+                        input_started.set_result(time.perf_counter())
 
-            if new_input_ch:
-                new_input_ch.close()
+            for attempt in started:
+                if attempt.input_ch is not None:
+                    attempt.input_ch.close()
 
         input_task = asyncio.create_task(_forward_input_task())
 
-        try:
-            for i, tts in enumerate(self._fallback_adapter._tts_instances):
-                tts_status = self._fallback_adapter._status[i]
-                if tts_status.available or all_failed:
-                    try:
-                        new_input_ch = aio.Chan[Union[str, SynthesizeStream._FlushSentinel]]()
-
-                        for text in self._pushed_tokens:
-                            new_input_ch.send_nowait(text)
-
-                        if input_task.done():
-                            new_input_ch.close()
-
-                        resampler = tts_status.resampler
-                        async for synthesized_audio in self._try_synthesize(
-                            tts=tts,
-                            input_ch=new_input_ch,
-                            conn_options=dataclasses.replace(
-                                self._conn_options,
-                                max_retry=self._fallback_adapter._max_retry_per_tts,
-                                timeout=self._conn_options.timeout,
-                                retry_interval=self._conn_options.retry_interval,
-                            ),
-                            recovering=False,
-                        ):
-                            if texts := synthesized_audio.frame.userdata.get(
-                                USERDATA_TIMED_TRANSCRIPT
-                            ):
-                                output_emitter.push_timed_transcript(texts)
-
-                            if resampler is not None:
-                                for resampled_frame in resampler.push(synthesized_audio.frame):
-                                    output_emitter.push(resampled_frame.data.tobytes())
-
-                                if synthesized_audio.is_final:
-                                    for resampled_frame in resampler.flush():
-                                        output_emitter.push(resampled_frame.data.tobytes())
-                            else:
-                                output_emitter.push(synthesized_audio.frame.data.tobytes())
-
-                        return
-                    except Exception:
-                        if tts_status.available:
-                            tts_status.available = False
-                            self._tts.emit(
-                                "tts_availability_changed",
-                                AvailabilityChangedEvent(tts=tts, available=False),
-                            )
-
-                        if output_emitter.pushed_duration() > 0.0:
-                            logger.warning(
-                                f"{tts.label} already synthesized of audio, ignoring the current segment for the tts fallback"  # noqa: E501
-                            )
-                            return
-
-                self._try_recovery(tts)
-
-            raise APIConnectionError(
-                f"all TTSs failed ({[tts.label for tts in self._fallback_adapter._tts_instances]}) after {time.time() - start_time} seconds"  # noqa: E501
+        def _start_attempt(index: int) -> _TTSAttempt:
+            tts = adapter._tts_instances[index]
+            input_ch = aio.Chan[Union[str, SynthesizeStream._FlushSentinel]]()
+            for text in self._pushed_tokens:
+                input_ch.send_nowait(text)
+
+            if input_task.done():
+                input_ch.close()
+
+            source = self._try_synthesize(
+                tts=tts,
+                input_ch=input_ch,
+                conn_options=dataclasses.replace(
+                    self._conn_options,
+                    max_retry=adapter._max_retry_per_tts,
+                    timeout=self._conn_options.timeout,
+                    retry_interval=self._conn_options.retry_interval,
+                ),
+                recovering=False,
+            )
+            attempt = _TTSAttempt(
+                index, tts, source, sample_rate=adapter.sample_rate, input_ch=input_ch
             )
+            started.append(attempt)
+            return attempt
+
+        try:
+            while candidates:
+                winner = await race_attempts(
+                    _start_attempt(candidates.popleft()),
+                    component="tts",
+                    candidates=candidates,
+                    start_attempt=_start_attempt,
+                    on_failed=self._on_attempt_failed,
+                    hedging=hedging,
+                    input_started=input_started,
+                )
+                if winner is None:
+                    continue
+
+                resampler = winner.resampler
+                async for synthesized_audio in winner.ch:
+                    if texts := synthesized_audio.frame.userdata.get(USERDATA_TIMED_TRANSCRIPT):
+                        output_emitter.push_timed_transcript(texts)
+
+                    if resampler is not None:
+                        for resampled_frame in resampler.push(synthesized_audio.frame):
+                            output_emitter.push(resampled_frame.data.tobytes())
+
+                        if synthesized_audio.is_final:
+                            for resampled_frame in resampler.flush():
+                                output_emitter.push(resampled_frame.data.tobytes())
+                    else:
+                        output_emitter.push(synthesized_audio.frame.data.tobytes())
+
+                await winner.task
+                if winner.error is None:
+                    succeeded = True
+                    return
+
+                self._on_attempt_failed(winner)
+                if output_emitter.pushed_duration() > 0.0:
+                    logger.warning(
+                        f"{winner.tts.label} already synthesized of audio, ignoring the current segment for the tts fallback"  # noqa: E501
+                    )
+                    return
         finally:
-            await utils.aio.cancel_and_wait(input_task)
+            await utils.aio.cancel_and_wait(input_task, *(attempt.task for attempt in started))
+            _recover_skipped(adapter, started, succeeded=succeeded, try_recovery=self._try_recovery)
+
+        raise APIConnectionError(
+            f"all TTSs failed ({[tts.label for tts in adapter._tts_instances]}) after {time.time() - start_time} seconds"  # noqa: E501
+        )
+
+    def _on_attempt_failed(self, attempt: _TTSAttempt) -> None:
+        # exceptions already logged inside _try_synthesize
+        self._fallback_adapter._mark_unavailable(attempt.index)
+        self._try_recovery(attempt.tts)
 
     def _try_recovery(self, tts: TTS) -> None:
         assert isinstance(self._tts, FallbackAdapter)
@@ -461,3 +535,41 @@ class FallbackSynthesizeStream(SynthesizeStream):
                     return
 
             tts_status.recovering_task = asyncio.create_task(_recover_tts_task(tts))
+
+
+class _TTSAttempt(HedgedAttempt[SynthesizedAudio]):
+    """A synthesis on one of the TTSs of the FallbackAdapter"""
+
+    def __init__(
+        self,
+        index: int,
+        tts: TTS,
+        source: AsyncGenerator[SynthesizedAudio, None],
+        *,
+        sample_rate: int,
+        input_ch: aio.Chan[str | SynthesizeStream._FlushSentinel] | None = None,
+    ) -> None:
+        self.tts = tts
+        self.input_ch = input_ch
+        # the resampler is stateful, each synthesis needs its own
+        self.resampler: rtc.AudioResampler | None = None
+        if tts.sample_rate != sample_rate:
+            self.resampler = rtc.AudioResampler(input_rate=tts.sample_rate, output_rate=sample_rate)
+        super().__init__(index, tts.label, source)
+
+
+def _recover_skipped(
+    adapter: FallbackAdapter,
+    started: list[_TTSAttempt],
+    *,
+    succeeded: bool,
+    try_recovery: Callable[[TTS], None],
+) -> None:
+    """Check the recovery of the unavailable TTSs with a higher priority than the one used"""
+    last_index = max((attempt.index for attempt in started), default=-1) if succeeded else None
+    attempted = {attempt.index for attempt in started}
+    for i, tts in enumerate(adapter._tts_instances):
+        if last_index is not None and i > last_index:
+            break
+        if i not in attempted:
+            try_recovery(tts)
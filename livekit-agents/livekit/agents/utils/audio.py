@@ -192,3 +192,5 @@ async def audio_frames_from_file(
 
     finally:
         await cancel_and_wait(reader_task)
+        # unblock the decoder thread when the caller stops iterating early
+        await decoder.aclose()
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import AsyncIterable
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, TypeVar
+
+from ..log import logger
+from ..telemetry import metrics as telemetry_metrics
+from . import aio
+
+T = TypeVar("T")
+
+MAX_HEDGE_BURST = 3.0
+MIN_TTFB_SAMPLES = 10
+
+
+@dataclass
+class HedgingOptions:
+    """Send the request to the next provider of a FallbackAdapter when the current one is slow
+    to answer, the first provider to answer is used and the other request is cancelled."""
+
+    delay: float | None = None
+    """Time to wait for the first chunk before sending the request to the next provider.
+    When ``None``, the delay is the `quantile` of the time to first chunk of the provider,
+    learned from its previous requests."""
+    quantile: float = 0.95
+    min_delay: float = 0.25
+    """Lower bound of the learned delay"""
+    max_delay: float = 3.0
+    """Upper bound of the learned delay, also used until enough requests were observed"""
+    max_hedge_ratio: float = 0.2
+    """Maximum fraction of the requests that can be hedged, each hedge is an extra request"""
+
+    def __post_init__(self) -> None:
+        if not 0 < self.quantile <= 1:
+            raise ValueError("quantile must be in (0, 1]")
+
+        if self.min_delay > self.max_delay:
+            raise ValueError("min_delay must be lower than max_delay")
+
+        if self.max_hedge_ratio < 0:
+            raise ValueError("max_hedge_ratio must be positive")
+
+
+class HedgingPolicy:
+    """Hedging delays and budget shared by the requests of a FallbackAdapter.
+
+    The budget is a token bucket: every request adds `max_hedge_ratio` tokens and every hedge
+    consumes one.
+    """
+
+    def __init__(self, opts: HedgingOptions, *, window_size: int = 100) -> None:
+        self._opts = opts
+        self._window_size = window_size
+        self._ttfb: dict[int, deque[float]] = {}
+        self._tokens = 1.0
+
+    @property
+    def options(self) -> HedgingOptions:
+        return self._opts
+
+    def delay(self, index: int) -> float:
+        """Time to wait for the first chunk of the provider at `index`"""
+        if self._opts.delay is not None:
+            return self._opts.delay
+
+        samples = self._ttfb.get(index)
+        if samples is None or len(samples) < MIN_TTFB_SAMPLES:
+            return self._opts.max_delay
+
+        ordered = sorted(samples)
+        rank = min(max(math.ceil(self._opts.quantile * len(ordered)) - 1, 0), len(ordered) - 1)
+        return min(max(ordered[rank], self._opts.min_delay), self._opts.max_delay)
+
+    def record_ttfb(self, index: int, ttfb: float) -> None:
+        samples = self._ttfb.get(index)
+        if samples is None:
+            samples = self._ttfb[index] = deque(maxlen=self._window_size)
+        samples.append(ttfb)
+
+    def record_cancelled(self, index: int, elapsed: float) -> None:
+        """Record a request cancelled after `elapsed` seconds without its first chunk.
+
+        Its time to first chunk is at least `elapsed`, ignoring it would only keep the fast
+        answers of a provider that is often slow and lower its delay. The bound is only recorded
+        when it isn't below the current delay, a shorter one doesn't tell anything new.
+        """
+        if elapsed >= self.delay(index):
+            self.record_ttfb(index, elapsed)
+
+    def on_request(self) -> None:
+        self._tokens = min(self._tokens + self._opts.max_hedge_ratio, MAX_HEDGE_BURST)
+
+    def try_hedge(self) -> bool:
+        """Consume the budget of a hedge, returns False if the budget is exhausted"""
+        if self._tokens < 1.0:
+            return False
+
+        self._tokens -= 1.0
+        return True
+
+
+class HedgedAttempt(Generic[T]):
+    """A request to one of the providers of a FallbackAdapter, the results are buffered until
+    the attempt is selected"""
+
+    def __init__(self, index: int, label: str, source: AsyncIterable[T]) -> None:
+        self.index = index
+        self.label = label
+        self.error: Exception | None = None
+        self.started_at = time.perf_counter()
+        self.first_result_at: float | None = None
+        # done when the first result is received, or when the request ended
+        self.first_result: asyncio.Future[None] = asyncio.Future()
+        self.ch = aio.Chan[T]()
+        self.task = asyncio.create_task(self._run(source))
+
+    async def _run(self, source: AsyncIterable[T]) -> None:
+        try:
+            async for result in source:
+                if self.first_result_at is None:
+                    self.first_result_at = time.perf_counter()
+                    self.first_result.set_result(None)
+                self.ch.send_nowait(result)
+        except Exception as e:
+            self.error = e
+        finally:
+            if not self.first_result.done():
+                self.first_result.set_result(None)
+            self.ch.close()
+
+
+AttemptT = TypeVar("AttemptT", bound=HedgedAttempt[Any])
+
+
+async def race_attempts(
+    primary: AttemptT,
+    *,
+    component: str,
+    candidates: deque[int],
+    start_attempt: Callable[[int], AttemptT],
+    on_failed: Callable[[AttemptT], None],
+    hedging: HedgingPolicy | None,
+    input_started: asyncio.Future[float] | None = None,
+) -> AttemptT | None:
+    """Wait for the first result of the primary attempt, the request is hedged on the next
+    candidate if the primary is too slow. The attempts that aren't selected are cancelled.
+
+    When `input_started` is given, the hedging delay and the time to first result are measured
+    from the time the first input was sent.
+    """
+    attempts = [primary]
+    hedge: AttemptT | None = None
+    hedged = False
+    winner: AttemptT | None = None
+    while winner is None and attempts:
+        waiters: list[asyncio.Future[Any]] = [attempt.first_result for attempt in attempts]
+        timeout: float | None = None
+        if hedging is not None and not hedged and candidates:
+            if input_started is not None and not input_started.done():
+                waiters.append(input_started)
+            else:
+                hedge_at = _measured_from(primary, input_started) + hedging.delay(primary.index)
+                timeout = max(hedge_at - time.perf_counter(), 0)
+
+        done, _ = await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        if not done:
+            hedged = True
+            assert hedging is not None
+            if candidates and hedging.try_hedge():
+                hedge = start_attempt(candidates.popleft())
+                logger.debug(f"{primary.label} is slow to answer, hedging with {hedge.label}")
+                attempts.append(hedge)
+            continue
+
+        for attempt in list(attempts):
+            if not attempt.first_result.done():
+                continue
+
+            if attempt.error is None:
+                winner = attempt
+                break
+
+            attempts.remove(attempt)
+            on_failed(attempt)
+
+    if hedge is not None:
+        hedge_winner = "none" if winner is None else "hedge" if winner is hedge else "primary"
+        telemetry_metrics.hedged_request(component, winner=hedge_winner)
+
+    if hedging is not None and (input_started is None or input_started.done()):
+        now = time.perf_counter()
+        for attempt in attempts:
+            if attempt.error is not None:
+                continue
+
+            started_at = _measured_from(attempt, input_started)
+            if attempt.first_result_at is not None:
+                hedging.record_ttfb(attempt.index, attempt.first_result_at - started_at)
+            elif attempt is not winner:
+                hedging.record_cancelled(attempt.index, now - started_at)
+
+    await aio.cancel_and_wait(*(attempt.task for attempt in attempts if attempt is not winner))
+    return winner
+
+
+def _measured_from(
+    attempt: HedgedAttempt[Any], input_started: asyncio.Future[float] | None
+) -> float:
+    if input_started is None:
+        return attempt.started_at
+
+    return max(attempt.started_at, input_started.result())
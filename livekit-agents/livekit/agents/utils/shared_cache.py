@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import os
+import shutil
+import stat
+import tempfile
+
+from ..log import logger
+
+SHARED_CACHE_DIR_ENV = "LIVEKIT_AGENTS_SHARED_CACHE_DIR"
+
+
+def create_shared_cache_dir() -> str:
+    """Create the private cache directory shared by the processes of the worker.
+
+    The directory is created with `mkdtemp` (readable by the current user only) and passed to
+    the job processes through the environment.
+    """
+    path = tempfile.mkdtemp(prefix="livekit-agents-cache-")
+    os.environ[SHARED_CACHE_DIR_ENV] = path
+    return path
+
+
+def remove_shared_cache_dir(path: str) -> None:
+    if os.environ.get(SHARED_CACHE_DIR_ENV) == path:
+        del os.environ[SHARED_CACHE_DIR_ENV]
+
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def shared_cache_dir(name: str) -> str | None:
+    """Return the `name` subdirectory of the worker cache directory, creating it if needed.
+
+    Returns None outside of a worker, or if the directory could have been tampered with by
+    another user.
+    """
+    root = os.environ.get(SHARED_CACHE_DIR_ENV)
+    if not root or not is_private_dir(root):
+        return None
+
+    path = os.path.join(root, name)
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    except OSError:
+        logger.debug("failed to create the shared cache directory", exc_info=True)
+        return None
+
+    return path if is_private_dir(path) else None
+
+
+def is_private_dir(path: str) -> bool:
+    """Whether `path` is a directory (not a symlink) only accessible by the current user"""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+
+    if not stat.S_ISDIR(st.st_mode):
+        return False
+
+    if hasattr(os, "getuid"):  # the permissions aren't meaningful on Windows
+        if st.st_uid != os.getuid() or st.st_mode & 0o077:
+            logger.warning(
+                "ignoring the shared cache directory, it isn't private", extra={"path": path}
+            )
+            return False
+
+    return True
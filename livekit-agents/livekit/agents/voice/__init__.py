@@ -1,6 +1,7 @@
 from . import io, run_result
 from .agent import Agent, AgentTask, ModelSettings
 from .agent_session import AgentSession, VoiceActivityVideoSampler
+from .event_journal import EventJournal
 from .events import (
     AgentEvent,
     AgentFalseInterruptionEvent,
@@ -13,6 +14,7 @@ from .events import (
     MetricsCollectedEvent,
     RunContext,
     SpeechCreatedEvent,
+    TurnLatencyEvent,
     UserInputTranscribedEvent,
     UserStateChangedEvent,
 )
@@ -27,6 +29,7 @@ from .transcription import TranscriptSynchronizer
 __all__ = [
     "AgentSession",
     "VoiceActivityVideoSampler",
+    "EventJournal",
     "Agent",
     "ModelSettings",
     "AgentTask",
@@ -37,6 +40,7 @@ __all__ = [
     "MetricsCollectedEvent",
     "ConversationItemAddedEvent",
     "SpeechCreatedEvent",
+    "TurnLatencyEvent",
     "ErrorEvent",
     "CloseEvent",
     "CloseReason",
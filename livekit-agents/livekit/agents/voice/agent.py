@@ -172,6 +172,9 @@ class Agent:
                 f"Invalid tool type(s): {kinds}. Expected FunctionTool or RawFunctionTool."
             )
 
+        # rebuild the models and schemas of the tools, their signature or docstring may have changed
+        llm.utils.invalidate_function_tools([*self._tools, *tools])
+
         if self._activity is None:
             self._tools = list(set(tools))
             self._chat_ctx = self._chat_ctx.copy(tools=self._tools)
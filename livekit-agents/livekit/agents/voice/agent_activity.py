@@ -37,7 +37,13 @@ from ..metrics import (
     TTSMetrics,
     VADMetrics,
 )
-from ..telemetry import trace_types, tracer, utils as trace_utils
+from ..telemetry import (
+    metrics as telemetry_metrics,
+    set_lazy_attribute,
+    trace_types,
+    tracer,
+    utils as trace_utils,
+)
 from ..tokenize.basic import split_words
 from ..types import NOT_GIVEN, FlushSentinel, NotGivenOr
 from ..utils.misc import is_given
@@ -61,6 +67,7 @@ from .events import (
     FunctionToolsExecutedEvent,
     MetricsCollectedEvent,
     SpeechCreatedEvent,
+    TurnLatencyEvent,
     UserInputTranscribedEvent,
 )
 from .generation import (
@@ -106,6 +113,13 @@ class _PreemptiveGeneration:
     created_at: float
 
 
+def _normalize_transcript(text: str) -> str:
+    # ignore the casing and sentence punctuation changes between the interim and final
+    # transcripts, the symbols and the separators inside numbers (-5, $100, 3.5) are meaningful
+    text = re.sub(r"(?<!\d)[.,!?;:]|[.,!?;:](?!\d)", " ", text.casefold())
+    return re.sub(r"\s+", " ", text).strip()
+
+
 # NOTE: AgentActivity isn't exposed to the public API
 class AgentActivity(RecognitionHooks):
     def __init__(self, agent: Agent, sess: AgentSession) -> None:
@@ -137,6 +151,8 @@ class AgentActivity(RecognitionHooks):
         self._speech_tasks: list[asyncio.Task[Any]] = []
 
         self._preemptive_generation: _PreemptiveGeneration | None = None
+        # speeches of the discarded preemptive generations, used to count the wasted tokens
+        self._discarded_preemptive_speeches = utils.BoundedDict[str, None](maxsize=50)
 
         self._drain_blocked_tasks: list[asyncio.Task[Any]] = []
         self._mcp_tools: list[mcp.MCPTool] = []
@@ -696,6 +712,8 @@ class AgentActivity(RecognitionHooks):
             min_endpointing_delay=self.min_endpointing_delay,
             max_endpointing_delay=self.max_endpointing_delay,
             turn_detection=self._turn_detection,
+            endpointing=self._session._endpointing,
+            adaptive_endpointing=self._session.options.adaptive_endpointing,
         )
         self._audio_recognition.start()
 
@@ -879,6 +897,8 @@ class AgentActivity(RecognitionHooks):
         audio: NotGivenOr[AsyncIterable[rtc.AudioFrame]] = NOT_GIVEN,
         allow_interruptions: NotGivenOr[bool] = NOT_GIVEN,
         add_to_chat_ctx: bool = True,
+        expires_in: NotGivenOr[float] = NOT_GIVEN,
+        coalesce_key: NotGivenOr[str] = NOT_GIVEN,
     ) -> SpeechHandle:
         if (
             not is_given(audio)
@@ -921,7 +941,12 @@ class AgentActivity(RecognitionHooks):
             name="AgentActivity.tts_say",
         )
         task.add_done_callback(self._on_pipeline_reply_done)
-        self._schedule_speech(handle, SpeechHandle.SPEECH_PRIORITY_NORMAL)
+        self._schedule_speech(
+            handle,
+            SpeechHandle.SPEECH_PRIORITY_NORMAL,
+            expires_in=expires_in if is_given(expires_in) else None,
+            coalesce_key=coalesce_key if is_given(coalesce_key) else None,
+        )
         return handle
 
     def _generate_reply(
@@ -933,6 +958,8 @@ class AgentActivity(RecognitionHooks):
         tool_choice: NotGivenOr[llm.ToolChoice] = NOT_GIVEN,
         allow_interruptions: NotGivenOr[bool] = NOT_GIVEN,
         schedule_speech: bool = True,
+        expires_in: NotGivenOr[float] = NOT_GIVEN,
+        coalesce_key: NotGivenOr[str] = NOT_GIVEN,
     ) -> SpeechHandle:
         if (
             isinstance(self.llm, llm.RealtimeModel)
@@ -1025,13 +1052,21 @@ class AgentActivity(RecognitionHooks):
             task.add_done_callback(self._on_pipeline_reply_done)
 
         if schedule_speech:
-            self._schedule_speech(handle, SpeechHandle.SPEECH_PRIORITY_NORMAL)
+            self._schedule_speech(
+                handle,
+                SpeechHandle.SPEECH_PRIORITY_NORMAL,
+                expires_in=expires_in if is_given(expires_in) else None,
+                coalesce_key=coalesce_key if is_given(coalesce_key) else None,
+            )
 
         return handle
 
-    def _cancel_preemptive_generation(self) -> None:
+    def _cancel_preemptive_generation(self, *, reason: str = "cancelled") -> None:
         if self._preemptive_generation is not None:
-            self._preemptive_generation.speech_handle._cancel()
+            speech_handle = self._preemptive_generation.speech_handle
+            speech_handle._cancel()
+            self._discarded_preemptive_speeches[speech_handle.id] = None
+            telemetry_metrics.preemptive_generation(reason)
             self._preemptive_generation = None
 
     def _interrupt_background_speeches(self, force: bool = False) -> list[SpeechHandle]:
@@ -1094,11 +1129,22 @@ class AgentActivity(RecognitionHooks):
             stt_flush_duration=stt_flush_duration,
         )
 
-    def _schedule_speech(self, speech: SpeechHandle, priority: int, force: bool = False) -> None:
+    def _schedule_speech(
+        self,
+        speech: SpeechHandle,
+        priority: int,
+        force: bool = False,
+        *,
+        expires_in: float | None = None,
+        coalesce_key: str | None = None,
+    ) -> None:
         # when force=True, we still allow to schedule a new speech even if
         # `pause_speech_scheduling` is waiting for the schedule_task to drain.
         # This allows for tool responses to be generated before the AgentActivity is finalized.
 
+        # a queued speech is dropped (and its generation cancelled) when it isn't played within
+        # `expires_in` seconds, or when a newer speech with the same `coalesce_key` is scheduled.
+
         if self._scheduling_paused and not force:
             raise RuntimeError(
                 "cannot schedule new speech, the speech scheduling is draining/pausing"
@@ -1110,6 +1156,21 @@ class AgentActivity(RecognitionHooks):
             )
             return
 
+        if coalesce_key is not None:
+            for _, _, queued in self._speech_q:
+                if queued._coalesce_key == coalesce_key and queued is not speech:
+                    logger.debug(
+                        "dropping a speech superseded by a newer one",
+                        extra={"speech_id": queued.id, "coalesce_key": coalesce_key},
+                    )
+                    queued._drop()
+
+        speech._coalesce_key = coalesce_key
+        speech._deadline = None
+        if expires_in is not None:
+            speech._deadline = time.monotonic() + expires_in
+            asyncio.get_running_loop().call_later(expires_in, self._expire_speech, speech)
+
         while True:
             try:
                 # negate the priority to make it a max heap
@@ -1123,6 +1184,14 @@ class AgentActivity(RecognitionHooks):
         speech._mark_scheduled()
         self._wake_up_scheduling_task()
 
+    def _expire_speech(self, speech: SpeechHandle) -> None:
+        if speech._deadline is None or time.monotonic() < speech._deadline:
+            return  # rescheduled
+
+        if any(queued is speech for _, _, queued in self._speech_q):
+            logger.debug("dropping an expired speech", extra={"speech_id": speech.id})
+            speech._drop()
+
     @utils.log_exceptions(logger=logger)
     async def _scheduling_task(self) -> None:
         last_playout_ts = 0.0
@@ -1130,8 +1199,11 @@ class AgentActivity(RecognitionHooks):
             await self._q_updated.wait()
             while self._speech_q:
                 _, _, speech = heapq.heappop(self._speech_q)
-                if speech.done():
-                    # skip done speech (interrupted when it's in the queue)
+                if speech._deadline is not None and time.monotonic() >= speech._deadline:
+                    speech._drop()
+
+                if speech.done() or speech.dropped:
+                    # skip done speech (interrupted or dropped when it's in the queue)
                     self._current_speech = None
                     continue
                 self._current_speech = speech
@@ -1190,6 +1262,15 @@ class AgentActivity(RecognitionHooks):
             isinstance(ev, LLMMetrics) or isinstance(ev, TTSMetrics)
         ):
             ev.speech_id = speech_handle.id
+        if (
+            isinstance(ev, LLMMetrics)
+            and ev.speech_id is not None
+            and ev.speech_id in self._discarded_preemptive_speeches
+        ):
+            telemetry_metrics.preemptive_wasted_tokens(
+                prompt_tokens=ev.prompt_tokens - ev.prompt_cached_tokens,
+                completion_tokens=ev.completion_tokens,
+            )
         if (
             isinstance(ev, RealtimeModelMetrics)
             and self._realtime_spans is not None
@@ -1455,7 +1536,28 @@ class AgentActivity(RecognitionHooks):
         ):
             return
 
-        self._cancel_preemptive_generation()
+        if preemptive := self._preemptive_generation:
+            old_transcript = _normalize_transcript(preemptive.info.new_transcript)
+            new_transcript = _normalize_transcript(info.new_transcript)
+            if (
+                old_transcript == new_transcript
+                and preemptive.chat_ctx.is_equivalent(self._agent.chat_ctx)
+                and preemptive.tools == self.tools
+                and preemptive.tool_choice == self._tool_choice
+            ):
+                # only the casing or the punctuation changed, keep the request in flight
+                preemptive.info = info
+                preemptive.user_message.content = [info.new_transcript]
+                preemptive.user_message.transcript_confidence = info.transcript_confidence
+                return
+
+            # the answer to a shorter transcript can't be reused, the new request shares the
+            # same chat context prefix so it can still hit the prompt cache of the provider
+            self._cancel_preemptive_generation(
+                reason="transcript_extended"
+                if new_transcript.startswith(old_transcript)
+                else "transcript_changed"
+            )
 
         user_message = llm.ChatMessage(
             role="user",
@@ -1640,27 +1742,35 @@ class AgentActivity(RecognitionHooks):
         if preemptive := self._preemptive_generation:
             # make sure the on_user_turn_completed didn't change some request parameters
             # otherwise invalidate the preemptive generation
+            preemptive_transcript = _normalize_transcript(preemptive.info.new_transcript)
+            final_transcript = _normalize_transcript(user_message.text_content or "")
+            same_transcript = preemptive_transcript == final_transcript
             if (
-                preemptive.info.new_transcript == user_message.text_content
+                same_transcript
                 and preemptive.chat_ctx.is_equivalent(temp_mutable_chat_ctx)
                 and preemptive.tools == self.tools
                 and preemptive.tool_choice == self._tool_choice
             ):
                 speech_handle = preemptive.speech_handle
+                telemetry_metrics.preemptive_generation("used")
 
                 # preemptive generation is using another ChatMessage created outside of the on_end_of_turn callback,
-                # inject the metrics here.
+                # inject the metrics and the final transcript here.
                 preemptive.user_message.metrics = metrics_report
+                preemptive.user_message.content = user_message.content
                 self._schedule_speech(speech_handle, priority=SpeechHandle.SPEECH_PRIORITY_NORMAL)
                 logger.debug(
                     "using preemptive generation",
                     extra={"preemptive_lead_time": time.time() - preemptive.created_at},
                 )
             else:
-                logger.warning(
-                    "preemptive generation enabled but chat context or tools have changed after `on_user_turn_completed`",  # noqa: E501
+                if same_transcript:
+                    logger.warning(
+                        "preemptive generation enabled but chat context or tools have changed after `on_user_turn_completed`",  # noqa: E501
+                    )
+                self._cancel_preemptive_generation(
+                    reason="context_changed" if same_transcript else "transcript_changed"
                 )
-                preemptive.speech_handle._cancel()
 
             self._preemptive_generation = None
 
@@ -1697,6 +1807,37 @@ class AgentActivity(RecognitionHooks):
         )
         self._session.emit("metrics_collected", MetricsCollectedEvent(metrics=eou_metrics))
 
+    def _emit_turn_latency(
+        self,
+        speech_handle: SpeechHandle,
+        *,
+        user_metrics: llm.MetricsReport,
+        llm_ttft: float | None,
+        tts_ttfb: float | None,
+        e2e_latency: float,
+    ) -> None:
+        ev = TurnLatencyEvent(
+            speech_id=speech_handle.id,
+            end_of_turn_delay=user_metrics.get("end_of_turn_delay"),
+            transcription_delay=user_metrics.get("transcription_delay"),
+            on_user_turn_completed_delay=user_metrics.get("on_user_turn_completed_delay"),
+            llm_ttft=llm_ttft,
+            tts_ttfb=tts_ttfb,
+            e2e_latency=e2e_latency,
+        )
+        stages = {
+            "end_of_turn": ev.end_of_turn_delay,
+            "transcription": ev.transcription_delay,
+            "on_user_turn_completed": ev.on_user_turn_completed_delay,
+            "llm_ttft": ev.llm_ttft,
+            "tts_ttfb": ev.tts_ttfb,
+            "e2e": ev.e2e_latency,
+        }
+        telemetry_metrics.turn_latency(
+            {stage: value for stage, value in stages.items() if value is not None}
+        )
+        self._session.emit("turn_latency", ev)
+
     # AudioRecognition is calling this method to retrieve the chat context before running the TurnDetector model  # noqa: E501
     def retrieve_chat_ctx(self) -> llm.ChatContext:
         return self._agent.chat_ctx
@@ -1974,6 +2115,15 @@ class AgentActivity(RecognitionHooks):
             started_speaking_at = time.time()
             self._session._update_agent_state("speaking")
 
+            if user_metrics and "stopped_speaking_at" in user_metrics:
+                self._emit_turn_latency(
+                    speech_handle,
+                    user_metrics=user_metrics,
+                    llm_ttft=llm_gen_data.ttft,
+                    tts_ttfb=tts_gen_data.ttfb if tts_gen_data else None,
+                    e2e_latency=started_speaking_at - user_metrics["stopped_speaking_at"],
+                )
+
         audio_out: _AudioOutput | None = None
         if audio_output is not None:
             assert tts_gen_data is not None
@@ -2146,6 +2296,8 @@ class AgentActivity(RecognitionHooks):
                 # add the function call and output to the event, including the None outputs
                 fnc_executed_ev.function_calls.append(sanitized_out.fnc_call)
                 fnc_executed_ev.function_call_outputs.append(sanitized_out.fnc_call_out)
+                if sanitized_out.cache_hit:
+                    fnc_executed_ev.cached_call_ids.append(sanitized_out.fnc_call.call_id)
 
                 if new_agent_task is not None and sanitized_out.agent_task is not None:
                     logger.error("expected to receive only one AgentTask from the tool executions")
@@ -2456,9 +2608,12 @@ class AgentActivity(RecognitionHooks):
         await speech_handle.wait_if_not_interrupted([*tasks])
 
         current_span.set_attribute(trace_types.ATTR_SPEECH_INTERRUPTED, speech_handle.interrupted)
-        current_span.set_attribute(
+        set_lazy_attribute(
+            current_span,
             trace_types.ATTR_RESPONSE_FUNCTION_CALLS,
-            json.dumps([fnc.model_dump(exclude={"type", "created_at"}) for fnc in function_calls]),
+            lambda: json.dumps(
+                [fnc.model_dump(exclude={"type", "created_at"}) for fnc in function_calls]
+            ),
         )
 
         if audio_output is not None:
@@ -2592,6 +2747,8 @@ class AgentActivity(RecognitionHooks):
                 # add the function call and output to the event, including the None outputs
                 fnc_executed_ev.function_calls.append(sanitized_out.fnc_call)
                 fnc_executed_ev.function_call_outputs.append(sanitized_out.fnc_call_out)
+                if sanitized_out.cache_hit:
+                    fnc_executed_ev.cached_call_ids.append(sanitized_out.fnc_call.call_id)
 
                 if sanitized_out.fnc_call_out is not None:
                     new_fnc_outputs.append(sanitized_out.fnc_call_out)
@@ -3,12 +3,15 @@ from __future__ import annotations
 import asyncio
 import copy
 import time
+import weakref
 from collections.abc import AsyncIterable, Sequence
 from contextlib import AbstractContextManager, nullcontext
 from dataclasses import dataclass
 from types import TracebackType
 from typing import (
     TYPE_CHECKING,
+    Any,
+    Callable,
     Generic,
     Literal,
     Optional,
@@ -23,9 +26,10 @@ from opentelemetry import context as otel_context, trace
 
 from livekit import rtc
 
-from .. import cli, inference, llm, stt, tts, utils, vad
+from .. import inference, llm, stt, tts, utils, vad
 from ..job import JobContext, get_job_context
 from ..llm import AgentHandoff, ChatContext
+from ..llm.tool_context import _ToolResultCache
 from ..log import logger
 from ..telemetry import trace_types, tracer
 from ..types import (
@@ -40,6 +44,8 @@ from ._utils import _set_participant_attributes
 from .agent import Agent
 from .agent_activity import AgentActivity
 from .audio_recognition import TurnDetectionMode
+from .endpointing import AdaptiveEndpointing
+from .event_journal import EventJournal
 from .events import (
     AgentEvent,
     AgentState,
@@ -53,7 +59,7 @@ from .events import (
     UserStateChangedEvent,
 )
 from .ivr import IVRActivity
-from .recorder_io import RecorderIO
+from .recorder_io import RecorderIO, RecordingOptions
 from .run_result import RunResult
 from .speech_handle import SpeechHandle
 
@@ -80,6 +86,7 @@ class AgentSessionOptions:
     min_interruption_words: int
     min_endpointing_delay: float
     max_endpointing_delay: float
+    adaptive_endpointing: bool
     max_tool_steps: int
     user_away_timeout: float | None
     false_interruption_timeout: float | None
@@ -149,6 +156,7 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
         min_interruption_words: int = 0,
         min_endpointing_delay: float = 0.5,
         max_endpointing_delay: float = 3.0,
+        adaptive_endpointing: bool = False,
         max_tool_steps: int = 3,
         video_sampler: NotGivenOr[_VideoSampler | None] = NOT_GIVEN,
         user_away_timeout: float | None = 15.0,
@@ -159,6 +167,7 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
         tts_text_transforms: NotGivenOr[Sequence[TextTransforms] | None] = NOT_GIVEN,
         preemptive_generation: bool = False,
         ivr_detection: bool = False,
+        event_journal: NotGivenOr[EventJournal] = NOT_GIVEN,
         conn_options: NotGivenOr[SessionConnectOptions] = NOT_GIVEN,
         loop: asyncio.AbstractEventLoop | None = None,
         # deprecated
@@ -212,6 +221,12 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
                 Default ``0.5`` s.
             max_endpointing_delay (float): Maximum time-in-seconds the agent
                 will wait before terminating the turn. Default ``3.0`` s.
+            adaptive_endpointing (bool): Whether to learn the endpointing delay from the
+                pauses of the user during the session instead of always waiting
+                ``min_endpointing_delay``. The learned delay stays between
+                ``min_endpointing_delay`` and ``max_endpointing_delay``, lower
+                ``min_endpointing_delay`` to let it answer users pausing briefly faster.
+                Default ``False``.
             max_tool_steps (int): Maximum consecutive tool calls per LLM turn.
                 Default ``3``.
             video_sampler (_VideoSampler, optional): Uses
@@ -235,6 +250,7 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
                 is ``False``. When NOT_GIVEN, it's disabled.
             tts_text_transforms (Sequence[TextTransforms], optional): The transforms to apply
                 to the tts input text, available built-in transforms: ``"filter_markdown"``, ``"filter_emoji"``.
+                Custom transforms can be added with `TextTransform` instances, e.g. `TextReplacer`.
                 Set to ``None`` to disable. When NOT_GIVEN, all filters will be applied.
             preemptive_generation (bool):
                 Whether to speculatively begin LLM and TTS requests before an end-of-turn is
@@ -245,6 +261,10 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
                 Defaults to ``False``.
             ivr_detection (bool): Whether to detect if the agent is interacting with an IVR system.
                 Default ``False``.
+            event_journal (EventJournal, optional): Records the events of the session for
+                the session report, it can append them to a file or stream them to a sink as
+                they happen, and bound the events retained in memory. Defaults to a journal
+                retaining every event except ``metrics_collected``.
             conn_options (SessionConnectOptions, optional): Connection options for
                 stt, llm, and tts.
             loop (asyncio.AbstractEventLoop, optional): Event loop to bind the
@@ -273,6 +293,7 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
             min_interruption_words=min_interruption_words,
             min_endpointing_delay=min_endpointing_delay,
             max_endpointing_delay=max_endpointing_delay,
+            adaptive_endpointing=adaptive_endpointing,
             max_tool_steps=max_tool_steps,
             user_away_timeout=user_away_timeout,
             false_interruption_timeout=false_interruption_timeout,
@@ -308,6 +329,14 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
         self._tts = tts or None
         self._mcp_servers = mcp_servers or None
         self._tools = tools if is_given(tools) else []
+        # concurrency limits of the tools (see `function_tool(max_concurrency=...)`), by function
+        self._tool_semaphores: weakref.WeakKeyDictionary[Callable[..., Any], asyncio.Semaphore] = (
+            weakref.WeakKeyDictionary()
+        )
+        # results of the tools cached with the "session" scope
+        self._tool_cache = _ToolResultCache()
+        # pauses of the user, kept across the agent handoffs
+        self._endpointing = AdaptiveEndpointing()
 
         # unrecoverable error counts, reset after agent speaking
         self._llm_error_counts = 0
@@ -351,7 +380,7 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
         self._session_span: trace.Span | None = None
         self._root_span_context: otel_context.Context | None = None
 
-        self._recorded_events: list[AgentEvent] = []
+        self._event_journal = event_journal if is_given(event_journal) else EventJournal()
         self._enable_recording: bool = False
         self._started_at: float | None = None
 
@@ -359,7 +388,7 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
         self._ivr_activity: IVRActivity | None = None
 
     def emit(self, event: EventTypes, arg: AgentEvent) -> None:  # type: ignore
-        self._recorded_events.append(arg)
+        self._event_journal.append(arg)
         super().emit(event, arg)
 
     @property
@@ -444,7 +473,7 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
         # deprecated
         room_input_options: NotGivenOr[room_io.RoomInputOptions] = NOT_GIVEN,
         room_output_options: NotGivenOr[room_io.RoomOutputOptions] = NOT_GIVEN,
-        record: bool = True,
+        record: bool | RecordingOptions = True,
     ) -> RunResult: ...
 
     @overload
@@ -458,7 +487,7 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
         # deprecated
         room_input_options: NotGivenOr[room_io.RoomInputOptions] = NOT_GIVEN,
         room_output_options: NotGivenOr[room_io.RoomOutputOptions] = NOT_GIVEN,
-        record: bool = True,
+        record: bool | RecordingOptions = True,
     ) -> None: ...
 
     async def start(
@@ -471,7 +500,7 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
         # deprecated
         room_input_options: NotGivenOr[room_io.RoomInputOptions] = NOT_GIVEN,
         room_output_options: NotGivenOr[room_io.RoomOutputOptions] = NOT_GIVEN,
-        record: NotGivenOr[bool] = NOT_GIVEN,
+        record: NotGivenOr[bool | RecordingOptions] = NOT_GIVEN,
     ) -> RunResult | None:
         """Start the voice agent.
 
@@ -483,7 +512,9 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
             room: The room to use for input and output
             room_input_options: Options for the room input
             room_output_options: Options for the room output
-            record: Whether to record the audio
+            record: Whether to record the audio, or the `RecordingOptions` of the recording
+                (e.g. to stream it to additional sinks). Without a job context, the recording is
+                only sent to the sinks of the `RecordingOptions`.
         """
         async with self._lock:
             if self._started:
@@ -493,23 +524,26 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
 
             # configure observability first
             job_ctx: JobContext | None = None
+            recording_options = record if isinstance(record, RecordingOptions) else None
             try:
                 job_ctx = get_job_context()
                 if not is_given(record):
                     record = job_ctx.job.enable_recording
 
-                self._enable_recording = record
+                self._enable_recording = bool(record)
 
                 if self._enable_recording:
                     job_ctx.init_recording()
 
             except RuntimeError:
                 # JobContext is not available in evals
-                pass
+                self._enable_recording = recording_options is not None and bool(
+                    recording_options.sinks
+                )
 
             self._session_span = current_span = tracer.start_span("agent_session")
 
-            self._recorded_events = []
+            self._event_journal.clear()
             self._room_io = None
             self._recorder_io = None
 
@@ -523,7 +557,9 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
 
             tasks: list[asyncio.Task[None]] = []
 
-            c = cli.AgentsConsole.get_instance()
+            from ..cli import AgentsConsole
+
+            c = AgentsConsole.get_instance()
             if c.enabled and not c.io_acquired:
                 if self.input.audio is not None or self.output.audio is not None:
                     logger.warning(
@@ -564,22 +600,33 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
                 self._room_io = room_io.RoomIO(room=room, agent_session=self, options=room_options)
                 await self._room_io.start()
 
-            if job_ctx:
-                # these aren't relevant during eval mode, as they require job context and/or room_io
-                if self.input.audio and self.output.audio:
-                    if self._enable_recording:
-                        self._recorder_io = RecorderIO(agent_session=self)
-                        self.input.audio = self._recorder_io.record_input(self.input.audio)
-                        self.output.audio = self._recorder_io.record_output(self.output.audio)
-
-                        if (c.enabled and c.record) or not c.enabled:
-                            task = asyncio.create_task(
-                                self._recorder_io.start(
-                                    output_path=job_ctx.session_directory / "audio.ogg"
-                                )
+            if self.input.audio and self.output.audio and self._enable_recording:
+                recording_options = recording_options or RecordingOptions()
+                output_path = (
+                    job_ctx.session_directory / "audio.ogg"
+                    if job_ctx and recording_options.save_to_file
+                    else None
+                )
+                if output_path is not None or recording_options.sinks:
+                    self._recorder_io = RecorderIO(
+                        agent_session=self,
+                        sample_rate=recording_options.sample_rate,
+                        channels=recording_options.channels,
+                        page_duration=recording_options.page_duration,
+                    )
+                    self.input.audio = self._recorder_io.record_input(self.input.audio)
+                    self.output.audio = self._recorder_io.record_output(self.output.audio)
+
+                    if (c.enabled and c.record) or not c.enabled:
+                        task = asyncio.create_task(
+                            self._recorder_io.start(
+                                output_path=output_path, sinks=recording_options.sinks
                             )
-                            tasks.append(task)
+                        )
+                        tasks.append(task)
 
+            if job_ctx:
+                # these aren't relevant during eval mode, as they require job context and/or room_io
                 if job_ctx._primary_agent_session is None:
                     job_ctx._primary_agent_session = self
                 elif self._enable_recording:
@@ -783,6 +830,8 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
                 await self._activity.aclose()
                 self._activity = None
 
+            self._endpointing.flush()
+
             if self._agent_speaking_span:
                 self._agent_speaking_span.end()
                 self._agent_speaking_span = None
@@ -810,6 +859,7 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
             self._started = False
 
             self.emit("close", CloseEvent(error=error, reason=reason))
+            self._event_journal.close()
 
             self._cancel_user_away_timer()
             self._user_state = "listening"
@@ -866,7 +916,13 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
         audio: NotGivenOr[AsyncIterable[rtc.AudioFrame]] = NOT_GIVEN,
         allow_interruptions: NotGivenOr[bool] = NOT_GIVEN,
         add_to_chat_ctx: bool = True,
+        expires_in: NotGivenOr[float] = NOT_GIVEN,
+        coalesce_key: NotGivenOr[str] = NOT_GIVEN,
     ) -> SpeechHandle:
+        """Speak a text (or pre-synthesized audio) to the user.
+
+        `expires_in` and `coalesce_key` work the same as in `generate_reply`.
+        """
         if self._activity is None:
             raise RuntimeError("AgentSession isn't running")
 
@@ -887,6 +943,8 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
                 audio=audio,
                 allow_interruptions=allow_interruptions,
                 add_to_chat_ctx=add_to_chat_ctx,
+                expires_in=expires_in,
+                coalesce_key=coalesce_key,
             )
             if run_state:
                 run_state._watch_handle(handle)
@@ -900,6 +958,8 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
         instructions: NotGivenOr[str] = NOT_GIVEN,
         tool_choice: NotGivenOr[llm.ToolChoice] = NOT_GIVEN,
         allow_interruptions: NotGivenOr[bool] = NOT_GIVEN,
+        expires_in: NotGivenOr[float] = NOT_GIVEN,
+        coalesce_key: NotGivenOr[str] = NOT_GIVEN,
     ) -> SpeechHandle:
         """Generate a reply for the agent to speak to the user.
 
@@ -910,6 +970,8 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
             tool_choice (NotGivenOr[llm.ToolChoice], optional): Specifies the external tool to use when
                 generating the reply. If generate_reply is invoked within a function_tool, defaults to "none".
             allow_interruptions (NotGivenOr[bool], optional): Indicates whether the user can interrupt this speech.
+            expires_in (NotGivenOr[float], optional): Drop the reply if it doesn't start playing within this many seconds (e.g. a status update that would be outdated).
+            coalesce_key (NotGivenOr[str], optional): Drop the queued speeches scheduled with the same key, only the latest one is played.
 
         Returns:
             SpeechHandle: A handle to the generated reply.
@@ -940,6 +1002,8 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
                 instructions=instructions,
                 tool_choice=tool_choice,
                 allow_interruptions=allow_interruptions,
+                expires_in=expires_in,
+                coalesce_key=coalesce_key,
             )
             if run_state:
                 run_state._watch_handle(handle)
@@ -1155,6 +1219,7 @@ class AgentSession(rtc.EventEmitter[EventTypes], Generic[Userdata_T]):
         if state == "speaking":
             self._llm_error_counts = 0
             self._tts_error_counts = 0
+            self._endpointing.on_agent_speech_started()
 
             if self._agent_speaking_span is None:
                 self._agent_speaking_span = tracer.start_span("agent_speaking")
@@ -14,12 +14,13 @@ from livekit import rtc
 
 from .. import llm, stt, utils, vad
 from ..log import logger
-from ..telemetry import trace_types, tracer
+from ..telemetry import set_lazy_attribute, trace_types, tracer
 from ..types import NOT_GIVEN, NotGivenOr
 from ..utils import aio, is_given
 from . import io
 from ._utils import _set_participant_attributes
 from .agent import ModelSettings
+from .endpointing import AdaptiveEndpointing
 
 if TYPE_CHECKING:
     from .agent_session import AgentSession
@@ -103,6 +104,8 @@ class AudioRecognition:
         turn_detection: TurnDetectionMode | None,
         min_endpointing_delay: float,
         max_endpointing_delay: float,
+        endpointing: AdaptiveEndpointing | None = None,
+        adaptive_endpointing: bool = False,
     ) -> None:
         self._session = session
         self._hooks = hooks
@@ -113,6 +116,10 @@ class AudioRecognition:
         self._end_of_turn_task: asyncio.Task[None] | None = None
         self._min_endpointing_delay = min_endpointing_delay
         self._max_endpointing_delay = max_endpointing_delay
+        # tracks the pauses of the user and the outcome of the turns, the learned delay is only
+        # used when adaptive_endpointing is enabled
+        self._endpointing = endpointing
+        self._adaptive_endpointing = adaptive_endpointing
         self._turn_detector = turn_detection if not isinstance(turn_detection, str) else None
         self._stt = stt
         self._vad = vad
@@ -382,6 +389,9 @@ class AudioRecognition:
                 # and using that timestamp for _last_speaking_time
                 self._last_speaking_time = time.time()
 
+            if not self._vad and self._endpointing is not None:
+                self._endpointing.on_speech_ended(time.time())
+
             if self._vad_base_turn_detection or self._user_turn_committed:
                 if transcript_changed:
                     self._hooks.on_preemptive_generation(
@@ -444,6 +454,11 @@ class AudioRecognition:
             self._hooks.on_interim_transcript(ev, speaking=self._speaking if self._vad else None)
             self._audio_interim_transcript = ev.alternatives[0].text
 
+            if not self._vad and self._endpointing is not None:
+                self._endpointing.on_speech_started(
+                    time.time(), max_pause=self._max_endpointing_delay
+                )
+
         elif ev.type == stt.SpeechEventType.END_OF_SPEECH and self._turn_detection_mode == "stt":
             with trace.use_span(self._ensure_user_turn_span()):
                 self._hooks.on_end_of_speech(None)
@@ -452,6 +467,9 @@ class AudioRecognition:
             self._user_turn_committed = True
             self._last_speaking_time = time.time()
 
+            if not self._vad and self._endpointing is not None:
+                self._endpointing.on_speech_ended(time.time())
+
             chat_ctx = self._hooks.retrieve_chat_ctx().copy()
             self._run_eou_detection(chat_ctx)
 
@@ -464,6 +482,11 @@ class AudioRecognition:
                 self._speech_start_time = time.time()
             self._last_speaking_time = time.time()
 
+            if not self._vad and self._endpointing is not None:
+                self._endpointing.on_speech_started(
+                    time.time(), max_pause=self._max_endpointing_delay
+                )
+
             if self._end_of_turn_task is not None:
                 self._end_of_turn_task.cancel()
 
@@ -474,6 +497,11 @@ class AudioRecognition:
 
             self._speaking = True
 
+            if self._endpointing is not None:
+                self._endpointing.on_speech_started(
+                    time.time() - ev.speech_duration, max_pause=self._max_endpointing_delay
+                )
+
             if self._end_of_turn_task is not None:
                 self._end_of_turn_task.cancel()
 
@@ -493,6 +521,9 @@ class AudioRecognition:
 
             self._speaking = False
 
+            if self._endpointing is not None:
+                self._endpointing.on_speech_ended(time.time() - ev.silence_duration)
+
             if self._vad_base_turn_detection or (
                 self._turn_detection_mode == "stt" and self._user_turn_committed
             ):
@@ -519,6 +550,11 @@ class AudioRecognition:
             speech_start_time: float | None = None,
         ) -> None:
             endpointing_delay = self._min_endpointing_delay
+            if self._adaptive_endpointing and self._endpointing is not None:
+                endpointing_delay = self._endpointing.delay(
+                    min_delay=self._min_endpointing_delay, max_delay=self._max_endpointing_delay
+                )
+
             user_turn_span = self._ensure_user_turn_span()
             if turn_detector is not None:
                 if not await turn_detector.supports_language(self._last_language):
@@ -546,15 +582,19 @@ class AudioRecognition:
                         except Exception:
                             logger.exception("Error predicting end of turn")
 
+                        set_lazy_attribute(
+                            eou_detection_span,
+                            trace_types.ATTR_CHAT_CTX,
+                            lambda: json.dumps(
+                                chat_ctx.to_dict(
+                                    exclude_audio=True,
+                                    exclude_image=True,
+                                    exclude_timestamp=False,
+                                )
+                            ),
+                        )
                         eou_detection_span.set_attributes(
                             {
-                                trace_types.ATTR_CHAT_CTX: json.dumps(
-                                    chat_ctx.to_dict(
-                                        exclude_audio=True,
-                                        exclude_image=True,
-                                        exclude_timestamp=False,
-                                    )
-                                ),
                                 trace_types.ATTR_EOU_PROBABILITY: end_of_turn_probability,
                                 trace_types.ATTR_EOU_UNLIKELY_THRESHOLD: unlikely_threshold or 0,
                                 trace_types.ATTR_EOU_DELAY: endpointing_delay,
@@ -606,8 +646,12 @@ class AudioRecognition:
                 )
             )
             if committed:
+                if self._endpointing is not None:
+                    self._endpointing.on_turn_committed(delay=endpointing_delay)
+
                 user_turn_span.set_attributes(
                     {
+                        trace_types.ATTR_EOU_DELAY: endpointing_delay,
                         trace_types.ATTR_USER_TRANSCRIPT: self._audio_transcript,
                         trace_types.ATTR_TRANSCRIPT_CONFIDENCE: confidence_avg,
                         trace_types.ATTR_TRANSCRIPTION_DELAY: transcription_delay or 0,
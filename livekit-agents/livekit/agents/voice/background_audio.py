@@ -4,7 +4,11 @@ import asyncio
 import atexit
 import contextlib
 import enum
+import hashlib
+import os
 import random
+import tempfile
+import threading
 from collections.abc import AsyncGenerator, AsyncIterator, Generator
 from importlib.resources import as_file, files
 from typing import Any, NamedTuple, Union, cast
@@ -16,7 +20,7 @@ from livekit import rtc
 from ..job import get_job_context
 from ..log import logger
 from ..types import NOT_GIVEN, NotGivenOr
-from ..utils import is_given, log_exceptions
+from ..utils import is_given, log_exceptions, shared_cache
 from ..utils.aio import cancel_and_wait
 from ..utils.audio import audio_frames_from_file
 from .agent_session import AgentSession
@@ -54,6 +58,10 @@ class AudioConfig(NamedTuple):
     probability: float = 1.0
 
 
+_MIXER_SAMPLE_RATE = 48000
+_MIXER_NUM_CHANNELS = 1
+_MIXER_BLOCKSIZE = 4800
+
 # The queue size is set to 400ms, which determines how much audio Rust will buffer.
 # We intentionally keep this small within BackgroundAudio because calling
 # AudioSource.clear_queue() would abruptly cut off ambient sounds.
@@ -98,9 +106,15 @@ class BackgroundAudioPlayer:
         self._ambient_sound = ambient_sound if is_given(ambient_sound) else None
         self._thinking_sound = thinking_sound if is_given(thinking_sound) else None
 
-        self._audio_source = rtc.AudioSource(48000, 1, queue_size_ms=_AUDIO_SOURCE_BUFFER_MS)
+        self._audio_source = rtc.AudioSource(
+            _MIXER_SAMPLE_RATE, _MIXER_NUM_CHANNELS, queue_size_ms=_AUDIO_SOURCE_BUFFER_MS
+        )
         self._audio_mixer = rtc.AudioMixer(
-            48000, 1, blocksize=4800, capacity=1, stream_timeout_ms=stream_timeout_ms
+            _MIXER_SAMPLE_RATE,
+            _MIXER_NUM_CHANNELS,
+            blocksize=_MIXER_BLOCKSIZE,
+            capacity=1,
+            stream_timeout_ms=stream_timeout_ms,
         )
         self.publication: rtc.LocalTrackPublication | None = None
         self._lock = asyncio.Lock()
@@ -335,7 +349,10 @@ class BackgroundAudioPlayer:
             sound = sound.path()
 
         if isinstance(sound, str):
-            if loop:
+            clip = await _clip_cache.get(sound)
+            if clip is not None:
+                sound = clip.frames(loop=loop)
+            elif loop:
                 sound = _loop_audio_frames(sound)
             else:
                 sound = audio_frames_from_file(sound)
@@ -435,3 +452,178 @@ async def _loop_audio_frames(file_path: str) -> AsyncGenerator[rtc.AudioFrame, N
     while True:
         async for frame in audio_frames_from_file(file_path):
             yield frame
+
+
+class _DecodedClip:
+    """PCM samples of a fully decoded audio file"""
+
+    def __init__(self, data: np.ndarray, *, sample_rate: int, num_channels: int) -> None:
+        self._data = data
+        self._sample_rate = sample_rate
+        self._num_channels = num_channels
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._data
+
+    @property
+    def num_samples(self) -> int:
+        return len(self._data) // self._num_channels
+
+    async def frames(
+        self, *, loop: bool = False, samples_per_frame: int = _MIXER_BLOCKSIZE
+    ) -> AsyncGenerator[rtc.AudioFrame, None]:
+        # frames are sliced out of the cached buffer, nothing is decoded again
+        buf = memoryview(self._data).cast("B")
+        bytes_per_sample = self._num_channels * 2
+        step = samples_per_frame * bytes_per_sample
+        total = self.num_samples * bytes_per_sample
+        if total == 0:
+            return
+
+        while True:
+            for start in range(0, total, step):
+                chunk = buf[start : min(start + step, total)]
+                yield rtc.AudioFrame(
+                    data=chunk,
+                    sample_rate=self._sample_rate,
+                    num_channels=self._num_channels,
+                    samples_per_channel=len(chunk) // bytes_per_sample,
+                )
+
+            if not loop:
+                break
+
+
+class _DecodedClipCache:
+    """Decode each audio file once per process.
+
+    When `shared_dir` is set, the decoded PCM is also written there and memory-mapped, so the
+    other job processes of the worker map the same pages instead of decoding the file again.
+    By default, it is the private cache directory created by the worker (see
+    `utils.shared_cache`). Clips bigger than `max_bytes` once decoded are not cached and keep
+    being streamed.
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_rate: int = _MIXER_SAMPLE_RATE,
+        num_channels: int = _MIXER_NUM_CHANNELS,
+        max_bytes: int = 64 * 1024 * 1024,
+        shared_dir: NotGivenOr[str | None] = NOT_GIVEN,
+    ) -> None:
+        self._sample_rate = sample_rate
+        self._num_channels = num_channels
+        self._max_bytes = max_bytes
+        self._shared_dir = shared_dir
+        self._clips: dict[str, _DecodedClip | None] = {}
+        # jobs running with the thread executor share this cache from different event loops
+        self._lock = threading.Lock()
+
+    async def get(self, file_path: str) -> _DecodedClip | None:
+        """Return the decoded clip, or None if the file can't be cached"""
+        try:
+            key = self._cache_key(file_path)
+        except OSError:
+            return None
+
+        with self._lock:
+            if key in self._clips:
+                return self._clips[key]
+
+        clip = self._load_shared(key)
+        if clip is None:
+            clip = await self._decode(file_path)
+            if clip is not None:
+                clip = self._store_shared(key, clip)
+
+        with self._lock:
+            # the same file may have been decoded concurrently, keep the first one
+            return self._clips.setdefault(key, clip)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clips.clear()
+
+    def _cache_key(self, file_path: str) -> str:
+        st = os.stat(file_path)
+        raw = (
+            f"{os.path.abspath(file_path)}:{st.st_size}:{st.st_mtime_ns}:"
+            f"{self._sample_rate}:{self._num_channels}"
+        )
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def _shared_path(self, key: str) -> str | None:
+        if not is_given(self._shared_dir):
+            # resolved lazily, the worker sets the cache directory before starting the jobs
+            self._shared_dir = shared_cache.shared_cache_dir("audio-clips")
+
+        if self._shared_dir is None:
+            return None
+
+        return os.path.join(self._shared_dir, f"{key}.pcm")
+
+    async def _decode(self, file_path: str) -> _DecodedClip | None:
+        chunks: list[np.ndarray] = []
+        total_bytes = 0
+        frames = audio_frames_from_file(
+            file_path, sample_rate=self._sample_rate, num_channels=self._num_channels
+        )
+        try:
+            async for frame in frames:
+                data = np.frombuffer(frame.data, dtype=np.int16)
+                total_bytes += data.nbytes
+                if total_bytes > self._max_bytes:
+                    logger.debug(
+                        "audio clip is too large to be cached, streaming it instead",
+                        extra={"file_path": file_path},
+                    )
+                    return None
+
+                chunks.append(data.copy())
+        finally:
+            await frames.aclose()
+
+        if not chunks:
+            return None  # decoding failed, don't cache it
+
+        data = np.concatenate(chunks)
+        return _DecodedClip(data, sample_rate=self._sample_rate, num_channels=self._num_channels)
+
+    def _load_shared(self, key: str) -> _DecodedClip | None:
+        path = self._shared_path(key)
+        if path is None or not os.path.exists(path):
+            return None
+
+        try:
+            data = np.memmap(path, dtype=np.int16, mode="r")
+        except (OSError, ValueError):
+            return None
+
+        return _DecodedClip(data, sample_rate=self._sample_rate, num_channels=self._num_channels)
+
+    def _store_shared(self, key: str, clip: _DecodedClip) -> _DecodedClip:
+        path = self._shared_path(key)
+        if path is None or not self._shared_dir:
+            return clip
+
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self._shared_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(clip.data.tobytes())
+                os.replace(tmp_path, path)  # atomic, so concurrent writers are fine
+            except BaseException:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_path)
+                raise
+        except OSError:
+            logger.debug("failed to share the decoded audio clip", exc_info=True)
+            return clip
+
+        # prefer the memory-mapped copy, its pages are shared with the other processes
+        return self._load_shared(key) or clip
+
+
+_clip_cache = _DecodedClipCache()
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Literal
+
+from ..log import logger
+from ..telemetry import metrics
+
+DEFAULT_ENDPOINTING_DELAY = 0.5
+
+EndpointingOutcome = Literal["end_of_turn", "cutoff"]
+
+
+class AdaptiveEndpointing:
+    """Learn the endpointing delay from the pauses of the user.
+
+    Every time the user resumes speaking after a pause, the length of the pause is recorded,
+    whether the pause happened within the turn (the end of turn wasn't reached yet) or right
+    after the turn was committed (the user was cut off). The delay of the next turns is a high
+    quantile of the recent pauses, so a user pausing briefly is answered faster while a user
+    taking longer pauses isn't interrupted. The delay always stays within the endpointing
+    bounds of the session.
+
+    Pauses longer than `max_pause` aren't considered as pauses of the user, and neither is the
+    time spent waiting for the agent once it started answering. The outcome of every committed
+    turn is reported with the delay that was used, as ``"cutoff"`` if the user resumed speaking
+    within `max_pause` and before the reply was played, ``"end_of_turn"`` otherwise.
+    """
+
+    def __init__(
+        self,
+        *,
+        quantile: float = 0.9,
+        margin: float = 0.1,
+        window: int = 32,
+        min_samples: int = 3,
+    ) -> None:
+        if not 0 < quantile <= 1:
+            raise ValueError("quantile must be in (0, 1]")
+
+        self._quantile = quantile
+        self._margin = margin
+        self._min_samples = min_samples
+        self._pauses: deque[float] = deque(maxlen=window)
+        self._stopped_at: float | None = None
+        # delay used by the last committed turn, until its outcome is known
+        self._committed_delay: float | None = None
+
+    @property
+    def pauses(self) -> list[float]:
+        """The recent pauses of the user, in seconds"""
+        return list(self._pauses)
+
+    def delay(self, *, min_delay: float, max_delay: float) -> float:
+        """The endpointing delay to use for the current turn"""
+        if len(self._pauses) < self._min_samples:
+            delay = DEFAULT_ENDPOINTING_DELAY
+        else:
+            pauses = sorted(self._pauses)
+            index = min(math.ceil(self._quantile * len(pauses)) - 1, len(pauses) - 1)
+            delay = pauses[max(index, 0)] + self._margin
+
+        return min(max(delay, min_delay), max(min_delay, max_delay))
+
+    def on_speech_ended(self, stopped_at: float) -> None:
+        self._stopped_at = stopped_at
+
+    def on_speech_started(self, started_at: float, *, max_pause: float) -> None:
+        stopped_at, self._stopped_at = self._stopped_at, None
+        committed_delay, self._committed_delay = self._committed_delay, None
+
+        if stopped_at is None:
+            if committed_delay is not None:
+                self._report(committed_delay, "end_of_turn")
+            return
+
+        pause = started_at - stopped_at
+        is_pause = 0 < pause <= max_pause
+        if is_pause:
+            self._pauses.append(pause)
+
+        if committed_delay is not None:
+            if is_pause:
+                self._report(committed_delay, "cutoff", pause=pause)
+            else:
+                self._report(committed_delay, "end_of_turn")
+
+    def on_turn_committed(self, *, delay: float) -> None:
+        """Called when the user turn is committed after waiting `delay` since the end of speech"""
+        self.flush()
+        if self._stopped_at is not None:
+            self._committed_delay = delay
+
+    def on_agent_speech_started(self) -> None:
+        """Called when the agent starts playing a reply, the user turn is over"""
+        self._stopped_at = None
+        self.flush()
+
+    def flush(self) -> None:
+        """Report the outcome of the last committed turn"""
+        if self._committed_delay is not None:
+            self._report(self._committed_delay, "end_of_turn")
+            self._committed_delay = None
+
+    def _report(
+        self, delay: float, outcome: EndpointingOutcome, *, pause: float | None = None
+    ) -> None:
+        metrics.endpointing_delay(delay, outcome=outcome)
+        if outcome == "cutoff":
+            logger.debug(
+                "user resumed speaking after the end of turn",
+                extra={"endpointing_delay": round(delay, 3), "pause": round(pause or 0, 3)},
+            )
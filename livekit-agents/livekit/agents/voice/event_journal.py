@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+from collections import deque
+from collections.abc import Iterable
+from pathlib import Path
+from typing import IO, Any, Callable
+
+from ..log import logger
+from .events import AgentEvent, TurnLatencyEvent
+
+DEFAULT_EXCLUDED_EVENTS = ("metrics_collected",)
+
+
+class EventJournal:
+    """Records the events of an `AgentSession` for its `SessionReport`.
+
+    Every event is serialized once, when it is emitted, so building the report at the end of
+    the session doesn't need to serialize the whole session again. The events can be appended
+    to a JSON Lines file and/or forwarded to a sink as they happen, while only the events passing
+    the filters are retained in memory.
+    """
+
+    def __init__(
+        self,
+        *,
+        path: str | Path | None = None,
+        sink: Callable[[dict[str, Any]], None] | None = None,
+        max_events: int | None = None,
+        exclude: Iterable[str] = DEFAULT_EXCLUDED_EVENTS,
+    ) -> None:
+        """
+        Args:
+            path (str | Path, optional): JSON Lines file the events are appended to, one event
+                per line. The file receives every event, including the excluded ones.
+            sink (Callable[[dict], None], optional): Called with every serialized event.
+            max_events (int, optional): Maximum number of events retained in memory, the oldest
+                events are dropped first. Defaults to ``None`` (unbounded).
+            exclude (Iterable[str]): Types of the events that aren't retained in memory.
+                Defaults to ``("metrics_collected",)``.
+        """
+        if max_events is not None and max_events < 0:
+            raise ValueError("max_events must be positive")
+
+        self._path = Path(path) if path is not None else None
+        self._sink = sink
+        self._max_events = max_events
+        self._exclude = frozenset(exclude)
+
+        self._events: deque[tuple[AgentEvent, dict[str, Any]]] = deque(maxlen=max_events)
+        self._turn_latencies: list[TurnLatencyEvent] = []
+        self._file: IO[str] | None = None
+        self._dropped = 0
+
+    @property
+    def path(self) -> Path | None:
+        return self._path
+
+    @property
+    def events(self) -> list[AgentEvent]:
+        """Events retained in memory"""
+        return [ev for ev, _ in self._events]
+
+    @property
+    def serialized_events(self) -> list[dict[str, Any]]:
+        """Serialized form of the events retained in memory"""
+        return [data for _, data in self._events]
+
+    @property
+    def turn_latencies(self) -> list[TurnLatencyEvent]:
+        """Latency breakdown of every user turn, kept regardless of the retention"""
+        return self._turn_latencies
+
+    @property
+    def dropped_events(self) -> int:
+        """Number of events dropped from the memory because of `max_events`"""
+        return self._dropped
+
+    def append(self, ev: AgentEvent) -> None:
+        if isinstance(ev, TurnLatencyEvent):
+            self._turn_latencies.append(ev)
+
+        retained = ev.type not in self._exclude and self._max_events != 0
+        if not retained and self._path is None and self._sink is None:
+            return
+
+        data = ev.model_dump()
+        if retained:
+            if self._max_events is not None and len(self._events) == self._max_events:
+                self._dropped += 1
+            self._events.append((ev, data))
+
+        if self._path is not None:
+            self._write(data)
+
+        if self._sink is not None:
+            try:
+                self._sink(data)
+            except Exception:
+                logger.exception("error in the event journal sink")
+
+    def clear(self) -> None:
+        """Drop the events retained in memory, the journal file is kept"""
+        self._events.clear()
+        self._turn_latencies = []
+        self._dropped = 0
+
+    def close(self) -> None:
+        """Flush and close the journal file, it is reopened if more events are appended"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, data: dict[str, Any]) -> None:
+        assert self._path is not None
+        try:
+            if self._file is None:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = self._path.open("a", encoding="utf-8")
+
+            self._file.write(json.dumps(data, separators=(",", ":"), default=str))
+            self._file.write("\n")
+        except Exception:
+            logger.exception("failed to write to the event journal", extra={"path": self._path})
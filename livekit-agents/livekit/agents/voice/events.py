@@ -90,6 +90,7 @@ EventTypes = Literal[
     "function_tools_executed",
     "metrics_collected",
     "speech_created",
+    "turn_latency",
     "error",
     "close",
 ]
@@ -159,6 +160,8 @@ class FunctionToolsExecutedEvent(BaseModel):
     type: Literal["function_tools_executed"] = "function_tools_executed"
     function_calls: list[FunctionCall]
     function_call_outputs: list[FunctionCallOutput | None]
+    cached_call_ids: list[str] = Field(default_factory=list)
+    """call_id of the function calls answered from the tool cache, see `ToolCacheOptions`"""
     created_at: float = Field(default_factory=time.time)
     _reply_required: bool = PrivateAttr(default=False)
     _handoff_required: bool = PrivateAttr(default=False)
@@ -201,6 +204,28 @@ class SpeechCreatedEvent(BaseModel):
     created_at: float = Field(default_factory=time.time)
 
 
+class TurnLatencyEvent(BaseModel):
+    """Latency breakdown of a user turn, from the end of the user's speech to the first frame
+    of the agent's answer being played. Stages that didn't run are ``None``."""
+
+    type: Literal["turn_latency"] = "turn_latency"
+    speech_id: str
+    """ID of the speech answering the user turn"""
+    end_of_turn_delay: float | None = None
+    """Time between the end of the user's speech and the decision to end the user's turn"""
+    transcription_delay: float | None = None
+    """Time taken to obtain the transcript after the end of the user's speech"""
+    on_user_turn_completed_delay: float | None = None
+    """Time taken to invoke the `Agent.on_user_turn_completed` callback"""
+    llm_ttft: float | None = None
+    """Time taken by the `llm_node` to return the first token"""
+    tts_ttfb: float | None = None
+    """Time taken by the `tts_node` to return the first audio frame"""
+    e2e_latency: float
+    """Time between the end of the user's speech and the first frame of the answer being played"""
+    created_at: float = Field(default_factory=time.time)
+
+
 class ErrorEvent(BaseModel):
     model_config = ConfigDict(arbitrary_types_allowed=True)
     type: Literal["error"] = "error"
@@ -235,6 +260,7 @@ AgentEvent = Annotated[
         ConversationItemAddedEvent,
         FunctionToolsExecutedEvent,
         SpeechCreatedEvent,
+        TurnLatencyEvent,
         ErrorEvent,
         CloseEvent,
     ],
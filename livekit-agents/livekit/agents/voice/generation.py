@@ -24,11 +24,18 @@ from ..llm import (
     utils as llm_utils,
 )
 from ..llm.tool_context import (
+    ToolCacheOptions,
+    ToolFlag,
+    _FunctionToolInfo,
+    _global_tool_cache,
+    _RawFunctionToolInfo,
+    get_function_info,
+    get_raw_function_info,
     is_function_tool,
     is_raw_function_tool,
 )
 from ..log import logger
-from ..telemetry import trace_types, tracer
+from ..telemetry import metrics as telemetry_metrics, set_lazy_attribute, trace_types, tracer
 from ..types import USERDATA_TIMED_TRANSCRIPT, FlushSentinel, NotGivenOr
 from ..utils import aio, is_given
 from ..utils.aio import itertools
@@ -99,14 +106,17 @@ async def _llm_inference_task(
     text_ch, function_ch = data.text_ch, data.function_ch
     tools = list(tool_ctx.function_tools.values())
 
-    current_span.set_attribute(
+    set_lazy_attribute(
+        current_span,
         trace_types.ATTR_CHAT_CTX,
-        json.dumps(
+        lambda: json.dumps(
             chat_ctx.to_dict(exclude_audio=True, exclude_image=True, exclude_timestamp=False)
         ),
     )
-    current_span.set_attribute(
-        trace_types.ATTR_FUNCTION_TOOLS, json.dumps(list(tool_ctx.function_tools.keys()))
+    set_lazy_attribute(
+        current_span,
+        trace_types.ATTR_FUNCTION_TOOLS,
+        lambda: json.dumps(list(tool_ctx.function_tools.keys())),
     )
 
     llm_node = node(chat_ctx, tools, model_settings)
@@ -169,9 +179,10 @@ async def _llm_inference_task(
             await llm_node.aclose()
 
     current_span.set_attribute(trace_types.ATTR_RESPONSE_TEXT, data.generated_text)
-    current_span.set_attribute(
+    set_lazy_attribute(
+        current_span,
         trace_types.ATTR_RESPONSE_FUNCTION_CALLS,
-        json.dumps(
+        lambda: json.dumps(
             [fnc.model_dump(exclude={"type", "created_at"}) for fnc in data.generated_functions]
         ),
     )
@@ -402,6 +413,93 @@ class _ToolOutput:
     first_tool_started_fut: asyncio.Future[None]
 
 
+def _get_tool_info(
+    tool: llm.FunctionTool | llm.RawFunctionTool,
+) -> _FunctionToolInfo | _RawFunctionToolInfo:
+    return get_raw_function_info(tool) if is_raw_function_tool(tool) else get_function_info(tool)
+
+
+class _ToolExecutionScope:
+    """Apply the execution options of a tool to the task running it: wait for a slot when the
+    tool has a concurrency limit, then cancel the task when the tool times out or when the speech
+    is interrupted (`ToolFlag.CANCEL_ON_INTERRUPT`).
+
+    `cancel_reason` is set when the task was cancelled by the scope."""
+
+    def __init__(
+        self,
+        *,
+        session: AgentSession,
+        speech_handle: SpeechHandle,
+        tool: llm.FunctionTool | llm.RawFunctionTool,
+    ) -> None:
+        info = _get_tool_info(tool)
+        self._name = info.name
+        self._timeout = info.timeout
+        self._cancel_on_interrupt = bool(info.flags & ToolFlag.CANCEL_ON_INTERRUPT)
+        self._speech_handle = speech_handle
+
+        self._semaphore: asyncio.Semaphore | None = None
+        if info.max_concurrency is not None:
+            # two agents can expose different tools with the same name, share the limit between
+            # the instances of the same function (methods are bound per agent instance)
+            fnc = getattr(tool, "__func__", tool)
+            self._semaphore = session._tool_semaphores.get(fnc)
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(info.max_concurrency)
+                session._tool_semaphores[fnc] = self._semaphore
+
+        self._task: asyncio.Task[Any] | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._acquired = False
+        self.cancel_reason: str | None = None
+
+    async def __aenter__(self) -> _ToolExecutionScope:
+        self._task = asyncio.current_task()
+        if self._cancel_on_interrupt:
+            self._speech_handle._interrupt_fut.add_done_callback(self._on_interrupted)
+
+        try:
+            if self._semaphore is not None:
+                await self._semaphore.acquire()
+                self._acquired = True
+        except BaseException:
+            self._cleanup()
+            raise
+
+        if self._timeout is not None:
+            self._timer = asyncio.get_running_loop().call_later(self._timeout, self._on_timeout)
+
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self._cleanup()
+
+    def _cleanup(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._cancel_on_interrupt:
+            self._speech_handle._interrupt_fut.remove_done_callback(self._on_interrupted)
+
+        if self._acquired:
+            assert self._semaphore is not None
+            self._semaphore.release()
+            self._acquired = False
+
+    def _cancel(self, reason: str) -> None:
+        if self.cancel_reason is None and self._task is not None and not self._task.done():
+            self.cancel_reason = reason
+            self._task.cancel()
+
+    def _on_timeout(self) -> None:
+        self._cancel(f"the tool `{self._name}` timed out after {self._timeout}s")
+
+    def _on_interrupted(self, _: asyncio.Future[None]) -> None:
+        self._cancel(f"the tool `{self._name}` was cancelled because the speech was interrupted")
+
+
 def perform_tool_executions(
     *,
     session: AgentSession,
@@ -513,6 +611,9 @@ async def _execute_tools_task(
                 tool_output.first_tool_started_fut.set_result(None)
 
             tool_execution_started_cb(fnc_call)
+            scope = _ToolExecutionScope(
+                session=session, speech_handle=speech_handle, tool=function_tool
+            )
             try:
                 from .run_result import _MockToolsContextVar
 
@@ -520,6 +621,7 @@ async def _execute_tools_task(
                     type(session.current_agent), {}
                 )
 
+                cache_opts: ToolCacheOptions | None = None
                 if mock := mock_tools.get(fnc_call.name):
                     logger.debug(
                         "executing mock tool",
@@ -576,22 +678,63 @@ async def _execute_tools_task(
                         },
                     )
                     function_callable = functools.partial(function_tool, *fnc_args, **fnc_kwargs)
+                    cache_opts = _get_tool_info(function_tool).cache
 
                 @tracer.start_as_current_span("function_tool")
                 async def _traceable_fnc_tool(
-                    function_callable: Callable, fnc_call: llm.FunctionCall
+                    function_callable: Callable,
+                    function_tool: llm.FunctionTool | llm.RawFunctionTool,
+                    fnc_call: llm.FunctionCall,
+                    scope: _ToolExecutionScope,
+                    cache_opts: ToolCacheOptions | None,
                 ) -> None:
                     current_span = trace.get_current_span()
                     current_span.set_attribute(trace_types.ATTR_FUNCTION_TOOL_NAME, fnc_call.name)
-                    current_span.set_attribute(
-                        trace_types.ATTR_FUNCTION_TOOL_ARGS, fnc_call.arguments
+                    set_lazy_attribute(
+                        current_span,
+                        trace_types.ATTR_FUNCTION_TOOL_ARGS,
+                        lambda: fnc_call.arguments,
                     )
 
+                    async def _execute() -> Any:
+                        async with scope:
+                            return await function_callable()
+
+                    cache_result: str | None = None
                     try:
-                        val = await function_callable()
+                        if cache_opts is not None:
+                            cache = (
+                                session._tool_cache
+                                if cache_opts.scope == "session"
+                                else _global_tool_cache
+                            )
+                            val, cache_result = await cache.get_or_run(
+                                cache_opts._make_key(
+                                    function_tool, fnc_call.name, fnc_call.arguments
+                                ),
+                                ttl=cache_opts.ttl,
+                                fnc=_execute,
+                                cacheable=_is_valid_function_output,
+                            )
+                            current_span.set_attribute(
+                                trace_types.ATTR_FUNCTION_TOOL_CACHE, cache_result
+                            )
+                            telemetry_metrics.tool_cache_lookup(fnc_call.name, cache_result)
+                        else:
+                            val = await _execute()
+
                         output = make_tool_output(fnc_call=fnc_call, output=val, exception=None)
+                        output.cache_hit = cache_result in ("hit", "coalesced")
                     except BaseException as e:
-                        if not isinstance(e, StopResponse):
+                        if isinstance(e, asyncio.CancelledError) and scope.cancel_reason:
+                            logger.warning(
+                                scope.cancel_reason,
+                                extra={"function": fnc_call.name, "speech_id": speech_handle.id},
+                            )
+                            if (task := asyncio.current_task()) and hasattr(task, "uncancel"):
+                                task.uncancel()
+                            e = ToolError(scope.cancel_reason)
+                        elif not isinstance(e, StopResponse):
                             logger.exception(
                                 "exception occurred while executing tool",
                                 extra={"function": fnc_call.name, "speech_id": speech_handle.id},
@@ -600,8 +743,10 @@ async def _execute_tools_task(
                         output = make_tool_output(fnc_call=fnc_call, output=None, exception=e)
 
                     if fnc_call_out := output.fnc_call_out:
-                        current_span.set_attribute(
-                            trace_types.ATTR_FUNCTION_TOOL_OUTPUT, fnc_call_out.output
+                        set_lazy_attribute(
+                            current_span,
+                            trace_types.ATTR_FUNCTION_TOOL_OUTPUT,
+                            lambda: fnc_call_out.output,
                         )
                         current_span.set_attribute(
                             trace_types.ATTR_FUNCTION_TOOL_IS_ERROR, fnc_call_out.is_error
@@ -610,7 +755,11 @@ async def _execute_tools_task(
                     # TODO(theomonnom): Add the agent handoff inside the current_span
                     _tool_completed(output)
 
-                task = asyncio.create_task(_traceable_fnc_tool(function_callable, fnc_call))
+                task = asyncio.create_task(
+                    _traceable_fnc_tool(
+                        function_callable, function_tool, fnc_call, scope, cache_opts
+                    )
+                )
                 _set_activity_task_info(
                     task, speech_handle=speech_handle, function_call=fnc_call, inline_task=True
                 )
@@ -681,6 +830,8 @@ class ToolExecutionOutput:
     raw_output: Any
     raw_exception: BaseException | None
     reply_required: bool = field(default=True)
+    cache_hit: bool = field(default=False)
+    """the output was reused from the tool cache instead of executing the tool"""
 
 
 def make_tool_output(
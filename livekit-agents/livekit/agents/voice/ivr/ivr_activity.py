@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import math
+import re
+from collections import Counter, deque
 from typing import TYPE_CHECKING, Optional
 
-import numpy as np
-
 from livekit.agents import llm
 
 from ...log import logger
@@ -95,6 +96,11 @@ class TfidfLoopDetector:
     This detector uses TF-IDF to detect loops in the user's input by comparing
     the similarity of the last N - 1 chunks of transcribed text to the last chunk.
 
+    The term counts of the chunks and the document frequencies of the window are updated
+    incrementally, so each check only compares the last chunk with the chunks sharing a term
+    with it. The weighting is the same as scikit-learn's ``TfidfVectorizer`` defaults (smoothed
+    idf, l2 normalization).
+
     Args:
         window_size: The number of chunks to compare. Default ``20``.
         similarity_threshold: The similarity threshold for a chunk to be considered similar to the last chunk. Default ``0.85``.
@@ -119,46 +125,72 @@ class TfidfLoopDetector:
         self._window_size = window_size
         self._similarity_threshold = similarity_threshold
         self._consecutive_threshold = consecutive_threshold
-        self._transcribed_chunks: list[str] = []
+        # term counts of the chunks in the window, and the number of chunks containing each term
+        self._chunk_terms: deque[Counter[str]] = deque()
+        self._document_freqs: Counter[str] = Counter()
         self._num_consecutive_similar_chunks = 0
 
     def reset(self) -> None:
-        self._transcribed_chunks = []
+        self._chunk_terms.clear()
+        self._document_freqs.clear()
         self._num_consecutive_similar_chunks = 0
 
     def add_chunk(self, chunk: str) -> None:
-        self._transcribed_chunks.append(chunk)
-        if len(self._transcribed_chunks) > self._window_size:
-            self._transcribed_chunks = self._transcribed_chunks[-self._window_size :]
+        terms = Counter(_TOKEN_PATTERN.findall(chunk.lower()))
+        self._chunk_terms.append(terms)
+        self._document_freqs.update(terms.keys())
 
-    def check_loop_detection(self) -> bool:
-        try:
-            from sklearn.feature_extraction.text import TfidfVectorizer  # type: ignore
-            from sklearn.metrics.pairwise import cosine_similarity  # type: ignore
-        except ImportError:
-            logger.warning(
-                "TfidfLoopDetector: sklearn is not installed; loop detection is disabled. Please install the 'scikit-learn' package to enable loop detection."
-            )
-            return False
-
-        vectorizer = TfidfVectorizer()
+        if len(self._chunk_terms) > self._window_size:
+            evicted = self._chunk_terms.popleft()
+            self._document_freqs.subtract(evicted.keys())
+            for term in evicted:
+                if self._document_freqs[term] <= 0:
+                    del self._document_freqs[term]
 
+    def check_loop_detection(self) -> bool:
         # Need at least two chunks to compute similarity against the last chunk
-        if len(self._transcribed_chunks) < 2:
+        if len(self._chunk_terms) < 2:
             return False
 
-        # NOTE: currently this is O(n^2) in the number of chunks, let's figure out a more efficient
-        # way if this become a bottleneck later.
-        doc_matrix = vectorizer.fit_transform(self._transcribed_chunks)
-        doc_similarity = cosine_similarity(doc_matrix)
-        last_chunk_similarity = doc_similarity[-1][:-1]
-
-        if (
-            last_chunk_similarity.size > 0
-            and np.max(last_chunk_similarity) > self._similarity_threshold
-        ):
+        if self._max_similarity() > self._similarity_threshold:
             self._num_consecutive_similar_chunks += 1
         else:
             self._num_consecutive_similar_chunks = 0
 
         return self._num_consecutive_similar_chunks >= self._consecutive_threshold
+
+    def _max_similarity(self) -> float:
+        """Cosine similarity between the last chunk and the most similar previous chunk"""
+        num_chunks = len(self._chunk_terms)
+        last = self._chunk_terms[-1]
+        if not last:
+            return 0.0
+
+        idf_cache: dict[str, float] = {}
+
+        def _idf(term: str) -> float:
+            if (idf := idf_cache.get(term)) is None:
+                idf = math.log((1 + num_chunks) / (1 + self._document_freqs[term])) + 1
+                idf_cache[term] = idf
+            return idf
+
+        def _norm(terms: Counter[str]) -> float:
+            return math.sqrt(sum((count * _idf(term)) ** 2 for term, count in terms.items()))
+
+        last_norm = _norm(last)
+        max_similarity = 0.0
+        for i in range(num_chunks - 1):
+            terms = self._chunk_terms[i]
+            dot = sum(
+                count * terms[term] * _idf(term) ** 2
+                for term, count in last.items()
+                if term in terms
+            )
+            if dot > 0:
+                max_similarity = max(max_similarity, dot / (last_norm * _norm(terms)))
+
+        return max_similarity
+
+
+# default token pattern of scikit-learn's vectorizers
+_TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
@@ -1,3 +1,13 @@
-from .recorder_io import RecorderAudioInput, RecorderAudioOutput, RecorderIO
+from .recorder_io import RecorderAudioInput, RecorderAudioOutput, RecorderIO, RecordingOptions
+from .sinks import FileRecordingSink, MemoryRecordingSink, RecordingSink, StreamingUploadSink
 
-__all__ = ["RecorderIO", "RecorderAudioInput", "RecorderAudioOutput"]
+__all__ = [
+    "RecorderIO",
+    "RecorderAudioInput",
+    "RecorderAudioOutput",
+    "RecordingOptions",
+    "RecordingSink",
+    "FileRecordingSink",
+    "MemoryRecordingSink",
+    "StreamingUploadSink",
+]
@@ -5,17 +5,20 @@ import contextlib
 import queue
 import threading
 import time
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Callable
+from typing import TYPE_CHECKING, Any, Callable, Literal
 
 import av
 import numpy as np
 
 from livekit import rtc
 
+from ... import utils
 from ...log import logger
 from .. import io
+from .sinks import FileRecordingSink, RecordingSink
 
 if TYPE_CHECKING:
     from ..agent_session import AgentSession
@@ -24,6 +27,25 @@ if TYPE_CHECKING:
 
 
 WRITE_INTERVAL = 2.5
+ENCODE_BLOCK_DURATION = 1.0
+
+
+@dataclass
+class RecordingOptions:
+    """Recording options of an AgentSession, see `AgentSession.start(record=...)`"""
+
+    sinks: Sequence[RecordingSink] = ()
+    """Additional destinations of the encoded recording, e.g. a `StreamingUploadSink` that
+    uploads the recording while the session is running instead of after it ended."""
+    save_to_file: bool = True
+    """Write the recording to ``audio.ogg`` in the session directory of the job."""
+    sample_rate: int = 48000
+    channels: Literal["stereo", "mono"] = "stereo"
+    """"stereo" records the input on the left channel and the output on the right one,
+    "mono" mixes both into a single channel."""
+    page_duration: float = 1.0
+    """Maximum duration in seconds of an OGG page, the sinks receive the encoded audio at
+    least this often."""
 
 
 class RecorderIO:
@@ -32,8 +54,23 @@ class RecorderIO:
         *,
         agent_session: AgentSession,
         sample_rate: int = 48000,
+        channels: Literal["stereo", "mono"] = "stereo",
+        page_duration: float = 1.0,
         loop: asyncio.AbstractEventLoop | None = None,
     ) -> None:
+        """
+        Record the input and output audio of an AgentSession.
+
+        The audio is encoded as OGG/Opus and streamed to the configured sinks while the session
+        is running.
+
+        Args:
+            sample_rate: Sample rate of the recording.
+            channels: "stereo" records the input on the left channel and the output on the
+                right one, "mono" mixes both into a single channel.
+            page_duration: Maximum duration in seconds of an OGG page, the sinks receive the
+                encoded audio at least this often.
+        """
         self._in_record: RecorderAudioInput | None = None
         self._out_record: RecorderAudioOutput | None = None
 
@@ -41,13 +78,28 @@ class RecorderIO:
         self._out_q: queue.Queue[list[rtc.AudioFrame] | None] = queue.Queue()
         self._session = agent_session
         self._sample_rate = sample_rate
+        self._channels = channels
+        self._page_duration = page_duration
         self._started = False
         self._loop = loop or asyncio.get_event_loop()
         self._lock = asyncio.Lock()
         self._close_fut: asyncio.Future[None] = self._loop.create_future()
         self._output_path: Path | None = None
+        self._sinks: list[RecordingSink] = []
 
-    async def start(self, *, output_path: str | Path) -> None:
+    async def start(
+        self,
+        *,
+        output_path: str | Path | None = None,
+        sinks: Sequence[RecordingSink] = (),
+    ) -> None:
+        """
+        Start recording.
+
+        Args:
+            output_path: Write the recording to this local file.
+            sinks: Additional destinations of the encoded recording (e.g. uploads).
+        """
         async with self._lock:
             if self._started:
                 return
@@ -58,7 +110,18 @@ class RecorderIO:
                     "must be called before starting the recorder."
                 )
 
-            self._output_path = Path(output_path)
+            if output_path is None and not sinks:
+                raise ValueError("either `output_path` or `sinks` must be provided")
+
+            self._sinks = list(sinks)
+            self._output_path = None
+            if output_path is not None:
+                self._output_path = Path(output_path)
+                self._sinks.insert(0, FileRecordingSink(self._output_path))
+
+            for sink in self._sinks:
+                await sink.start()
+
             self._started = True
             self._close_fut = self._loop.create_future()
             self._forward_atask = asyncio.create_task(self._forward_task())
@@ -73,9 +136,17 @@ class RecorderIO:
             if not self._started:
                 return
 
+            await utils.aio.cancel_and_wait(self._forward_atask)
             self._in_q.put_nowait(None)
             self._out_q.put_nowait(None)
             await asyncio.shield(self._close_fut)
+
+            for sink in self._sinks:
+                try:
+                    await sink.aclose()
+                except Exception:
+                    logger.exception("failed to close the recording sink")
+
             self._started = False
 
     def record_input(self, audio_input: io.AudioInput) -> RecorderAudioInput:
@@ -132,122 +203,161 @@ class RecorderIO:
             self._out_q.put_nowait([])
 
     def _encode_thread(self) -> None:
-        GROW_FACTOR = 1.5
-        INV_INT16 = 1.0 / 32768.0
+        writer = _SinkWriter(self._sinks)
+        layout = "stereo" if self._channels == "stereo" else "mono"
+        block_size = int(self._sample_rate * ENCODE_BLOCK_DURATION)
+
+        try:
+            container = av.open(
+                writer,  # type: ignore[arg-type]
+                mode="w",
+                format="ogg",
+                options={"page_duration": str(int(self._page_duration * 1_000_000))},
+            )
+            stream: av.AudioStream = container.add_stream(
+                "opus", rate=self._sample_rate, layout=layout
+            )  # type: ignore
 
-        assert self._output_path is not None
-        self._output_path.parent.mkdir(parents=True, exist_ok=True)
+            in_resampler: _BufferResampler | None = None
+            out_resampler: _BufferResampler | None = None
 
-        container = av.open(self._output_path, mode="w", format="ogg")
-        stream: av.AudioStream = container.add_stream(
-            "opus", rate=self._sample_rate, layout="stereo"
-        )  # type: ignore
+            with container:
+                while True:
+                    input_buf = self._in_q.get()
+                    output_buf = self._out_q.get()
 
-        in_resampler: rtc.AudioResampler | None = None
-        out_resampler: rtc.AudioResampler | None = None
+                    if input_buf is None or output_buf is None:
+                        break
 
-        capacity = self._sample_rate * 6  # 6s, 1ch
-        stereo_buf = np.zeros((2, capacity), dtype=np.float32)
+                    # lazy creation of the resamplers
+                    if in_resampler is None and len(input_buf):
+                        in_resampler = _BufferResampler(input_buf[0], self._sample_rate)
 
-        def remix_and_resample(frames: list[rtc.AudioFrame], channel_idx: int) -> int:
-            total_samples = sum(f.samples_per_channel * f.num_channels for f in frames)
+                    if out_resampler is None and len(output_buf):
+                        out_resampler = _BufferResampler(output_buf[0], self._sample_rate)
 
-            nonlocal capacity, stereo_buf
-            if total_samples > capacity:
-                while capacity < total_samples:
-                    capacity = int(capacity * GROW_FACTOR)
+                    left = in_resampler.process(input_buf) if in_resampler else _EMPTY
+                    # the output is sent per-segment. Always flush when the playback is done
+                    right = (
+                        out_resampler.process(output_buf, flush=True) if out_resampler else _EMPTY
+                    )
 
-                stereo_buf.resize((2, capacity), refcheck=False)
+                    if len(left) < len(right):
+                        logger.warning(
+                            f"Input is shorter by {len(right) - len(left)} samples; silence has "
+                            "been prepended to align the input channel. The resulting recording "
+                            "may not accurately reflect the original audio."
+                        )
+                        left = _pad_start(left, len(right))
+                    elif len(right) < len(left):
+                        right = _pad_start(right, len(left))
 
-            pos = 0
-            dest = stereo_buf[channel_idx]
-            for f in frames:
-                count = f.samples_per_channel * f.num_channels
-                arr_i16 = np.frombuffer(f.data, dtype=np.int16, count=count).reshape(
-                    -1, f.num_channels
-                )
-                slice_ = dest[pos : pos + f.samples_per_channel]
-                np.sum(arr_i16, axis=1, dtype=np.float32, out=slice_)
-                slice_ *= INV_INT16 / f.num_channels
-                pos += f.samples_per_channel
-
-            return pos
-
-        with container:
-            while True:
-                input_buf = self._in_q.get()
-                output_buf = self._out_q.get()
-
-                if input_buf is None or output_buf is None:
-                    break
-
-                # lazy creation of the resamplers
-                if in_resampler is None and len(input_buf):
-                    input_rate, num_channels = input_buf[0].sample_rate, input_buf[0].num_channels
-                    in_resampler = rtc.AudioResampler(
-                        input_rate=input_rate,
-                        output_rate=self._sample_rate,
-                        num_channels=num_channels,
-                    )
+                    if len(left) == 0:
+                        continue
 
-                if out_resampler is None and len(output_buf):
-                    input_rate, num_channels = output_buf[0].sample_rate, output_buf[0].num_channels
-                    out_resampler = rtc.AudioResampler(
-                        input_rate=input_rate,
-                        output_rate=self._sample_rate,
-                        num_channels=num_channels,
-                    )
+                    if self._channels == "stereo":
+                        samples = np.stack((left, right))
+                    else:
+                        samples = left + right
+                        np.clip(samples, -1.0, 1.0, out=samples)
+                        samples = samples.reshape(1, -1)
 
-                input_resampled = []
-                for frame in input_buf:
-                    assert in_resampler is not None
-                    input_resampled.extend(in_resampler.push(frame))
+                    # encode fixed-size blocks, the encoder never holds more than one block
+                    for i in range(0, samples.shape[1], block_size):
+                        block = np.ascontiguousarray(samples[:, i : i + block_size])
+                        av_frame = av.AudioFrame.from_ndarray(block, format="fltp", layout=layout)
+                        av_frame.sample_rate = self._sample_rate
 
-                output_resampled = []
-                for frame in output_buf:
-                    assert out_resampler is not None
-                    output_resampled.extend(out_resampler.push(frame))
+                        for packet in stream.encode(av_frame):
+                            container.mux(packet)
 
-                if output_buf:
-                    assert out_resampler is not None
-                    # the output is sent per-segment. Always flush when the playback is done
-                    output_resampled.extend(out_resampler.flush())
+                for packet in stream.encode(None):
+                    container.mux(packet)
+        except Exception:
+            logger.exception("failed to encode the session recording")
+        finally:
+            writer.close()
+            with contextlib.suppress(RuntimeError):
+                self._loop.call_soon_threadsafe(self._close_fut.set_result, None)
 
-                len_left = remix_and_resample(input_resampled, 0)
-                len_right = remix_and_resample(output_resampled, 1)
 
-                if len_left != len_right:
-                    diff = abs(len_right - len_left)
-                    if len_left < len_right:
-                        logger.warning(
-                            f"Input is shorter by {diff} samples; silence has been prepended to "
-                            "align the input channel. The resulting recording may not accurately "
-                            "reflect the original audio."
-                        )
-                        stereo_buf[0, diff : diff + len_left] = stereo_buf[0, :len_left]
-                        stereo_buf[0, :diff] = 0.0
-                        len_left = len_right
-                    else:
-                        stereo_buf[1, diff : diff + len_right] = stereo_buf[1, :len_right]
-                        stereo_buf[1, :diff] = 0.0
-                        len_right = len_left
+_EMPTY = np.empty(0, dtype=np.float32)
+_INV_INT16 = 1.0 / 32768.0
 
-                max_len = max(len_left, len_right)
-                if max_len <= 0:
-                    continue
 
-                stereo_slice = stereo_buf[:, :max_len]
-                av_frame = av.AudioFrame.from_ndarray(stereo_slice, format="fltp", layout="stereo")
-                av_frame.sample_rate = self._sample_rate
+def _pad_start(samples: np.ndarray, length: int) -> np.ndarray:
+    padded = np.zeros(length, dtype=np.float32)
+    padded[length - len(samples) :] = samples
+    return padded
 
-                for packet in stream.encode(av_frame):
-                    container.mux(packet)
 
-            for packet in stream.encode(None):
-                container.mux(packet)
+class _BufferResampler:
+    """Resample and downmix whole buffers of frames at once"""
+
+    def __init__(self, first_frame: rtc.AudioFrame, output_rate: int) -> None:
+        self._input_rate = first_frame.sample_rate
+        self._num_channels = first_frame.num_channels
+        self._resampler: rtc.AudioResampler | None = None
+        if self._input_rate != output_rate:
+            self._resampler = rtc.AudioResampler(
+                input_rate=self._input_rate,
+                output_rate=output_rate,
+                num_channels=self._num_channels,
+            )
+
+    def process(self, frames: list[rtc.AudioFrame], *, flush: bool = False) -> np.ndarray:
+        """Return the resampled buffer as mono float32 samples"""
+        resampled: list[rtc.AudioFrame] = []
+        if frames:
+            combined = rtc.combine_audio_frames(frames)
+            resampled = self._resampler.push(combined) if self._resampler else [combined]
+
+        if flush and self._resampler is not None:
+            resampled.extend(self._resampler.flush())
 
-        with contextlib.suppress(RuntimeError):
-            self._loop.call_soon_threadsafe(self._close_fut.set_result, None)
+        if not resampled:
+            return _EMPTY
+
+        data = (
+            resampled[0].data if len(resampled) == 1 else rtc.combine_audio_frames(resampled).data
+        )
+        pcm = np.frombuffer(data, dtype=np.int16).reshape(-1, self._num_channels)
+        if self._num_channels == 1:
+            samples = pcm[:, 0].astype(np.float32)
+        else:
+            samples = pcm.sum(axis=1, dtype=np.float32)
+
+        samples *= _INV_INT16 / self._num_channels
+        return samples
+
+
+class _SinkWriter:
+    """File-like object forwarding the muxed OGG pages to the sinks"""
+
+    def __init__(self, sinks: list[RecordingSink]) -> None:
+        self._sinks = list(sinks)
+
+    def write(self, data: bytes) -> int:
+        chunk = bytes(data)
+        for sink in list(self._sinks):
+            try:
+                sink.write(chunk)
+            except Exception:
+                logger.exception("failed to write to the recording sink, removing it")
+                self._sinks.remove(sink)
+                self._close_sink(sink)
+
+        return len(data)
+
+    def close(self) -> None:
+        for sink in self._sinks:
+            self._close_sink(sink)
+
+    def _close_sink(self, sink: RecordingSink) -> None:
+        try:
+            sink.close()
+        except Exception:
+            logger.exception("failed to close the recording sink")
 
 
 class RecorderAudioInput(io.AudioInput):
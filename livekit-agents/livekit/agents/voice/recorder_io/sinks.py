@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from pathlib import Path
+from typing import BinaryIO
+
+from ...log import logger
+
+
+class RecordingSink(ABC):
+    """Destination of the encoded (OGG/Opus) session recording.
+
+    The recorder streams finished OGG pages to its sinks while the session is running, so the
+    recording doesn't need to be read back from disk once the session ends.
+
+    `write` and `close` are called from the encoder thread, `start` and `aclose` from the
+    event loop.
+    """
+
+    async def start(self) -> None:  # noqa: B027
+        """Called before the first write"""
+
+    @abstractmethod
+    def write(self, data: bytes) -> None:
+        """Write the next encoded chunk"""
+
+    def close(self) -> None:  # noqa: B027
+        """Called once the last chunk has been written"""
+
+    async def aclose(self) -> None:  # noqa: B027
+        """Called after `close`, wait here for any pending work (e.g. uploads)"""
+
+
+class FileRecordingSink(RecordingSink):
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._file: BinaryIO | None = None
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def write(self, data: bytes) -> None:
+        if self._file is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self._path, "wb")  # noqa: SIM115
+
+        self._file.write(data)
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class MemoryRecordingSink(RecordingSink):
+    """Keep the encoded recording in memory, mostly useful for tests"""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._closed = False
+
+    @property
+    def chunks(self) -> list[bytes]:
+        return self._chunks
+
+    @property
+    def data(self) -> bytes:
+        return b"".join(self._chunks)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def write(self, data: bytes) -> None:
+        self._chunks.append(data)
+
+    def close(self) -> None:
+        self._closed = True
+
+
+class StreamingUploadSink(RecordingSink):
+    """Base class for sinks uploading the recording while the session is running.
+
+    Chunks are handed over to the event loop and passed to `upload_chunk` in order, one at a
+    time. `finalize` is awaited once every chunk has been uploaded.
+
+    At most `max_buffered_bytes` of chunks waiting for their upload are kept in memory. When the
+    upload can't keep up, the next chunks are spilled to a temporary file and read back in order,
+    so a slow destination never blocks the encoder nor grows the memory of the job.
+    """
+
+    def __init__(self, *, max_buffered_bytes: int = 4 * 1024 * 1024) -> None:
+        self._max_buffered_bytes = max_buffered_bytes
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._upload_atask: asyncio.Task[None] | None = None
+
+        # written by the encoder thread, read by the upload task
+        self._lock = threading.Lock()
+        self._buffered: deque[bytes] = deque()
+        self._buffered_bytes = 0
+        # the spill file is only accessed from threads, `_lock` is never held during its I/O
+        self._spill_lock = threading.Lock()
+        self._spill_file: BinaryIO | None = None
+        self._spilled: deque[int] = deque()  # sizes of the chunks in the spill file
+        self._spill_read_pos = 0
+        self._closed = False
+
+    @abstractmethod
+    async def upload_chunk(self, data: bytes) -> None: ...
+
+    async def finalize(self) -> None:
+        pass
+
+    @property
+    def buffered_bytes(self) -> int:
+        """Size of the chunks waiting for their upload in memory"""
+        return self._buffered_bytes
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._upload_atask = asyncio.create_task(self._upload_task())
+
+    def write(self, data: bytes) -> None:
+        assert self._loop is not None and self._wakeup is not None, "the sink isn't started"
+        with self._lock:
+            # once spilling, keep spilling until the file is drained so the order is preserved
+            spill = bool(self._spilled) or (
+                self._buffered_bytes + len(data) > self._max_buffered_bytes
+            )
+            if not spill:
+                self._buffered.append(data)
+                self._buffered_bytes += len(data)
+
+        if spill:
+            self._spill(data)
+
+        self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def close(self) -> None:
+        if self._loop is not None and self._wakeup is not None:
+            with self._lock:
+                self._closed = True
+
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def aclose(self) -> None:
+        if self._upload_atask is not None:
+            await self._upload_atask
+
+    def _spill(self, data: bytes) -> None:
+        with self._spill_lock:
+            if self._spill_file is None:
+                logger.warning(
+                    "the recording upload is falling behind, spilling the chunks to disk",
+                    extra={"max_buffered_bytes": self._max_buffered_bytes},
+                )
+                self._spill_file = tempfile.TemporaryFile()  # noqa: SIM115
+
+            self._spill_file.seek(0, os.SEEK_END)
+            self._spill_file.write(data)
+            with self._lock:
+                self._spilled.append(len(data))
+
+    def _read_spilled(self) -> bytes:
+        with self._spill_lock:
+            assert self._spill_file is not None
+            with self._lock:
+                size = self._spilled[0]
+
+            self._spill_file.seek(self._spill_read_pos)
+            data = self._spill_file.read(size)
+            self._spill_read_pos += len(data)
+            with self._lock:
+                self._spilled.popleft()
+                drained = not self._spilled
+
+            if drained:
+                # no chunk is being spilled while `_spill_lock` is held, reuse the file
+                self._spill_file.seek(0)
+                self._spill_file.truncate()
+                self._spill_read_pos = 0
+
+            return data
+
+    async def _next_chunk(self) -> bytes | None:
+        with self._lock:
+            if self._buffered:
+                data = self._buffered.popleft()
+                self._buffered_bytes -= len(data)
+                return data
+
+            if not self._spilled:
+                return None
+
+        # only the upload task reads the spilled chunks, keep the disk I/O off the event loop
+        return await asyncio.to_thread(self._read_spilled)
+
+    async def _upload_task(self) -> None:
+        assert self._wakeup is not None
+        failed = False
+        try:
+            while True:
+                self._wakeup.clear()
+                while (data := await self._next_chunk()) is not None:
+                    if failed:
+                        continue
+
+                    try:
+                        await self.upload_chunk(data)
+                    except Exception:
+                        logger.exception(
+                            "failed to upload the recording chunk, stopping the upload"
+                        )
+                        failed = True
+
+                with self._lock:
+                    if self._closed and not self._buffered and not self._spilled:
+                        break
+
+                await self._wakeup.wait()
+        finally:
+            if self._spill_file is not None:
+                self._spill_file.close()
+                self._spill_file = None
+
+        if not failed:
+            await self.finalize()
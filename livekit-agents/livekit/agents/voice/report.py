@@ -6,7 +6,8 @@ from pathlib import Path
 
 from ..llm import ChatContext
 from .agent_session import AgentSessionOptions
-from .events import AgentEvent
+from .event_journal import EventJournal
+from .events import AgentEvent, TurnLatencyEvent
 
 
 @dataclass
@@ -18,6 +19,10 @@ class SessionReport:
     options: AgentSessionOptions
     events: list[AgentEvent]
     chat_history: ChatContext
+    turn_latencies: list[TurnLatencyEvent] = field(default_factory=list)
+    """Latency breakdown of the user turns answered during the session"""
+    event_journal: EventJournal | None = None
+    """Journal the events were recorded with, its serialized events are reused by `to_dict`"""
     audio_recording_path: Path | None = None
     audio_recording_started_at: float | None = None
     """Timestamp when the audio recording started"""
@@ -28,13 +33,20 @@ class SessionReport:
     """Timestamp when the session report was created, typically at the end of the session"""
 
     def to_dict(self) -> dict:
-        events_dict: list[dict] = []
+        if self.event_journal is not None:
+            serialized_events = self.event_journal.serialized_events
+        else:
+            serialized_events = [event.model_dump() for event in self.events]
 
-        for event in self.events:
-            if event.type == "metrics_collected":
+        events_dict: list[dict] = []
+        for event in serialized_events:
+            if event["type"] == "metrics_collected":
                 continue  # metrics are too noisy, Cloud is using the chat_history as the source of thruth
 
-            events_dict.append(event.model_dump())
+            if event["type"] == "turn_latency":
+                continue  # reported in turn_latencies
+
+            events_dict.append(event)
 
         return {
             "job_id": self.job_id,
@@ -45,6 +57,11 @@ class SessionReport:
                 str(self.audio_recording_path.absolute()) if self.audio_recording_path else None
             ),
             "audio_recording_started_at": self.audio_recording_started_at,
+            "events_path": (
+                str(self.event_journal.path.absolute())
+                if self.event_journal is not None and self.event_journal.path
+                else None
+            ),
             "options": {
                 "allow_interruptions": self.options.allow_interruptions,
                 "discard_audio_if_uninterruptible": self.options.discard_audio_if_uninterruptible,
@@ -52,11 +69,13 @@ class SessionReport:
                 "min_interruption_words": self.options.min_interruption_words,
                 "min_endpointing_delay": self.options.min_endpointing_delay,
                 "max_endpointing_delay": self.options.max_endpointing_delay,
+                "adaptive_endpointing": self.options.adaptive_endpointing,
                 "max_tool_steps": self.options.max_tool_steps,
                 "user_away_timeout": self.options.user_away_timeout,
                 "min_consecutive_speech_delay": self.options.min_consecutive_speech_delay,
                 "preemptive_generation": self.options.preemptive_generation,
             },
             "chat_history": self.chat_history.to_dict(exclude_timestamp=False),
+            "turn_latencies": [latency.model_dump() for latency in self.turn_latencies],
             "timestamp": self.timestamp,
         }
@@ -32,6 +32,11 @@ class SpeechHandle:
         self._chat_items: list[llm.ChatItem] = []
         self._num_steps = 1
 
+        # scheduling options, see `AgentActivity._schedule_speech`
+        self._deadline: float | None = None
+        self._coalesce_key: str | None = None
+        self._dropped = False
+
         self._item_added_callbacks: set[Callable[[llm.ChatItem], None]] = set()
         self._done_callbacks: set[Callable[[SpeechHandle], None]] = set()
 
@@ -65,6 +70,13 @@ class SpeechHandle:
     def interrupted(self) -> bool:
         return self._interrupt_fut.done()
 
+    @property
+    def dropped(self) -> bool:
+        """True if the speech was removed from the queue before being played, because it expired
+        or was superseded by a newer speech with the same coalescing key. A dropped speech is
+        also interrupted."""
+        return self._dropped
+
     @property
     def allow_interruptions(self) -> bool:
         return self._allow_interruptions
@@ -164,6 +176,13 @@ class SpeechHandle:
 
         return self
 
+    def _drop(self) -> None:
+        if self.done():
+            return
+
+        self._dropped = True
+        self._cancel()
+
     def _add_item_added_callback(self, callback: Callable[[llm.ChatItem], Any]) -> None:
         self._item_added_callbacks.add(callback)
 
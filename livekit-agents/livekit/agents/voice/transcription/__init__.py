@@ -1,9 +1,21 @@
 from ._utils import find_micro_track_id
+from .filters import (
+    EmojiFilter,
+    MarkdownFilter,
+    TextReplacer,
+    TextTransform,
+    TextTransformStream,
+)
 from .synchronizer import TranscriptSynchronizer
 
 __all__ = [
     "TranscriptSynchronizer",
     "find_micro_track_id",
+    "TextTransform",
+    "TextTransformStream",
+    "MarkdownFilter",
+    "EmojiFilter",
+    "TextReplacer",
 ]
 
 # Cleanup docs of unexported modules
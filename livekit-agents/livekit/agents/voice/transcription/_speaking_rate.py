@@ -51,6 +51,113 @@ class SpeakingRateDetector:
         return SpeakingRateStream(self, self._opts)
 
 
+class _AudioBuffer:
+    """float32 samples not consumed yet, in a preallocated buffer that is compacted when full"""
+
+    def __init__(self) -> None:
+        self._buf = np.empty(0, dtype=np.float32)
+        self._start = 0
+        self._end = 0
+        self.position = 0
+        """position of the first sample in the stream, in samples"""
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def append(self, frame: rtc.AudioFrame) -> None:
+        samples = np.frombuffer(frame.data, dtype=np.int16)
+        if self._end + len(samples) > len(self._buf):
+            size = len(self)
+            if size + len(samples) > len(self._buf):
+                buf = np.empty(max(2 * len(self._buf), size + len(samples)), dtype=np.float32)
+                buf[:size] = self._buf[self._start : self._end]
+                self._buf = buf
+            else:
+                self._buf[:size] = self._buf[self._start : self._end]
+            self._start, self._end = 0, size
+
+        np.divide(
+            samples,
+            np.iinfo(np.int16).max,
+            out=self._buf[self._end : self._end + len(samples)],
+            dtype=np.float32,
+        )
+        self._end += len(samples)
+
+    def data(self, size: int | None = None) -> np.ndarray[tuple[int], np.dtype[np.float32]]:
+        end = self._end if size is None else self._start + size
+        return self._buf[self._start : end]
+
+    def consume(self, size: int) -> None:
+        size = min(size, len(self))
+        self._start += size
+        self.position += size
+
+    def clear(self) -> None:
+        self.position += len(self)
+        self._start = self._end = 0
+
+
+class _SpectralFlux:
+    """
+    Speaking rate based on spectral flux.
+    Higher spectral flux correlates with more rapid speech articulation.
+
+    The windows overlap, the spectrum of the STFT frames of the previous window is kept so only
+    the frames of the new audio are computed when the step of the windows is a multiple of the
+    hop length.
+    """
+
+    def __init__(self, sample_rate: int) -> None:
+        self._frame_length = int(sample_rate * 0.025)  # 25ms
+        self._hop_length = self._frame_length // 2  # 50% overlap
+        self._window = np.hanning(self._frame_length)
+        self._scale_factor = 1.0 / np.sqrt(np.sum(self._window**2))
+
+        # spectral magnitudes and flux of the frames of the last window, and the position of
+        # its first frame
+        self._position: int | None = None
+        self._magnitudes = np.empty((0, self._frame_length // 2 + 1), dtype=np.float64)
+        self._flux = np.empty(0, dtype=np.float64)
+
+    def reset(self) -> None:
+        self._position = None
+
+    def compute(self, audio: np.ndarray[tuple[int], np.dtype[np.float32]], position: int) -> float:
+        """Average spectral flux of `audio`, starting at `position` in the stream"""
+        frame_length, hop_length = self._frame_length, self._hop_length
+        num_frames = (len(audio) - frame_length) // hop_length + 1
+        if num_frames < 2:
+            return 0.0
+
+        offset, reused = 0, 0
+        if (
+            self._position is not None
+            and position >= self._position
+            and (position - self._position) % hop_length == 0
+        ):
+            offset = (position - self._position) // hop_length
+            reused = max(min(len(self._magnitudes) - offset, num_frames), 0)
+
+        magnitudes = np.empty((num_frames, self._magnitudes.shape[1]), dtype=np.float64)
+        magnitudes[:reused] = self._magnitudes[offset : offset + reused]
+        if reused < num_frames:
+            frames = np.lib.stride_tricks.sliding_window_view(audio, frame_length)[::hop_length]
+            spectrum = np.fft.rfft(frames[reused:num_frames] * self._window, axis=-1)
+            magnitudes[reused:] = np.abs(spectrum * self._scale_factor)
+
+        # l1 norm of difference between consecutive spectral frames
+        flux = np.empty(num_frames - 1, dtype=np.float64)
+        reused_flux = max(reused - 1, 0)
+        flux[:reused_flux] = self._flux[offset : offset + reused_flux]
+        flux[reused_flux:] = np.sum(np.abs(np.diff(magnitudes[reused_flux:], axis=0)), axis=-1)
+
+        self._position = position
+        self._magnitudes = magnitudes
+        self._flux = flux
+        return float(np.mean(flux))
+
+
 class SpeakingRateStream:
     class _FlushSentinel:
         pass
@@ -72,22 +179,18 @@ class SpeakingRateStream:
     @log_exceptions(logger=logger)
     async def _main_task(self) -> None:
         _inference_sample_rate = 0
-        inference_f32_data = np.empty(0, dtype=np.float32)
+        audio = _AudioBuffer()
+        spectral_flux: _SpectralFlux | None = None
 
         pub_timestamp = self._opts.window_duration / 2
-        inference_frames: list[rtc.AudioFrame] = []
         resampler: rtc.AudioResampler | None = None
 
         async for input_frame in self._input_ch:
             if not isinstance(input_frame, rtc.AudioFrame):
                 # estimate the speech rate for the last frame
-                available_samples = sum(frame.samples_per_channel for frame in inference_frames)
-                if available_samples > self._window_size_samples * 0.5:
-                    frame = rtc.combine_audio_frames(inference_frames)
-                    frame_f32_data = np.divide(frame.data, np.iinfo(np.int16).max, dtype=np.float32)
-
-                    sr = self._compute_speaking_rate(frame_f32_data, _inference_sample_rate)
-                    pub_timestamp += frame.duration
+                if spectral_flux is not None and len(audio) > self._window_size_samples * 0.5:
+                    sr = self._compute_speaking_rate(audio.data(), audio.position, spectral_flux)
+                    pub_timestamp += len(audio) / _inference_sample_rate
                     self._event_ch.send_nowait(
                         SpeakingRateEvent(
                             timestamp=pub_timestamp,
@@ -95,7 +198,9 @@ class SpeakingRateStream:
                             speaking_rate=sr,
                         )
                     )
-                inference_frames = []
+                audio.clear()
+                if spectral_flux is not None:
+                    spectral_flux.reset()
                 continue
 
             # resample the input frame if necessary
@@ -105,7 +210,7 @@ class SpeakingRateStream:
 
                 self._window_size_samples = int(self._opts.window_duration * _inference_sample_rate)
                 self._step_size_samples = int(self._opts.step_size * _inference_sample_rate)
-                inference_f32_data = np.empty(self._window_size_samples, dtype=np.float32)
+                spectral_flux = _SpectralFlux(_inference_sample_rate)
 
                 if self._input_sample_rate != _inference_sample_rate:
                     resampler = rtc.AudioResampler(
@@ -124,26 +229,18 @@ class SpeakingRateStream:
                 )
                 continue
 
+            assert spectral_flux is not None
             if resampler is not None:
-                inference_frames.extend(resampler.push(input_frame))
+                for frame in resampler.push(input_frame):
+                    audio.append(frame)
             else:
-                inference_frames.append(input_frame)
-
-            while True:
-                available_samples = sum(frame.samples_per_channel for frame in inference_frames)
-                if available_samples < self._window_size_samples:
-                    break
-
-                inference_frame = rtc.combine_audio_frames(inference_frames)
-                np.divide(
-                    inference_frame.data[: self._window_size_samples],
-                    np.iinfo(np.int16).max,
-                    out=inference_f32_data,
-                    dtype=np.float32,
-                )
+                audio.append(input_frame)
 
+            while len(audio) >= self._window_size_samples:
                 # run the inference
-                sr = self._compute_speaking_rate(inference_f32_data, _inference_sample_rate)
+                sr = self._compute_speaking_rate(
+                    audio.data(self._window_size_samples), audio.position, spectral_flux
+                )
                 self._event_ch.send_nowait(
                     SpeakingRateEvent(
                         timestamp=pub_timestamp,
@@ -154,19 +251,13 @@ class SpeakingRateStream:
 
                 # move the window forward by the hop size
                 pub_timestamp += self._opts.step_size
-                if len(inference_frame.data) - self._step_size_samples > 0:
-                    data = inference_frame.data[self._step_size_samples :]
-                    inference_frames = [
-                        rtc.AudioFrame(
-                            data=data,
-                            sample_rate=inference_frame.sample_rate,
-                            num_channels=1,
-                            samples_per_channel=len(data) // 2,
-                        )
-                    ]
+                audio.consume(self._step_size_samples)
 
     def _compute_speaking_rate(
-        self, audio: np.ndarray[tuple[int], np.dtype[np.float32]], sample_rate: int
+        self,
+        audio: np.ndarray[tuple[int], np.dtype[np.float32]],
+        position: int,
+        spectral_flux: _SpectralFlux,
     ) -> float:
         """
         Compute the speaking rate of the audio using the selected method
@@ -184,58 +275,7 @@ class SpeakingRateStream:
         if len(tail_audio_sq) > 0 and np.sqrt(np.mean(tail_audio_sq)) < silence_threshold * 0.5:
             return 0.0
 
-        return self._spectral_flux(audio, sample_rate)
-
-    def _stft(
-        self,
-        audio: np.ndarray[tuple[int], np.dtype[np.float32]],
-        frame_length: int,
-        hop_length: int,
-    ) -> np.ndarray[tuple[int, int], np.dtype[np.complex128]]:
-        num_frames = (len(audio) - frame_length) // hop_length + 1
-        result = np.zeros((frame_length // 2 + 1, num_frames), dtype=np.complex128)
-
-        window = np.hanning(frame_length)
-        scale_factor = 1.0 / np.sqrt(np.sum(window**2))
-        for i in range(num_frames):
-            start = i * hop_length
-            end = start + frame_length
-            frame = audio[start:end]
-            windowed = frame * window
-
-            # perform fft and scale
-            fft_result = np.fft.rfft(windowed)
-            result[:, i] = fft_result * scale_factor
-
-        return result
-
-    def _spectral_flux(
-        self, audio: np.ndarray[tuple[int], np.dtype[np.float32]], sample_rate: int
-    ) -> float:
-        """
-        Calculate speaking rate based on spectral flux.
-        Higher spectral flux correlates with more rapid speech articulation.
-        """
-        # Parameters
-        frame_length = int(sample_rate * 0.025)  # 25ms
-        hop_length = frame_length // 2  # 50% overlap
-
-        Zxx = self._stft(audio, frame_length, hop_length)
-
-        # calculate spectral flux (sum of spectral magnitude changes between frames)
-        spectral_magnitudes = np.abs(Zxx)
-        spectral_flux_values = []
-
-        for i in range(1, spectral_magnitudes.shape[1]):
-            # l1 norm of difference between consecutive spectral frames
-            flux = np.sum(np.abs(spectral_magnitudes[:, i] - spectral_magnitudes[:, i - 1]))
-            spectral_flux_values.append(flux)
-
-        if not spectral_flux_values:
-            return 0.0
-
-        avg_flux = float(np.mean(spectral_flux_values))
-        return avg_flux
+        return spectral_flux.compute(audio, position)
 
     def push_frame(self, frame: rtc.AudioFrame) -> None:
         """Push audio frame for syllable rate detection"""
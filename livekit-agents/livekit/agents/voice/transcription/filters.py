@@ -1,26 +1,9 @@
-import re
-from collections.abc import AsyncIterable, Sequence
-from typing import Literal
-
-TextTransforms = Literal["filter_markdown", "filter_emoji"]
-
-
-def apply_text_transforms(
-    text: AsyncIterable[str], transforms: Sequence[TextTransforms]
-) -> AsyncIterable[str]:
-    all_transforms = {
-        "filter_markdown": filter_markdown,
-        "filter_emoji": filter_emoji,
-    }
-
-    for transform in transforms:
-        if transform not in all_transforms:
-            raise ValueError(
-                f"Invalid transform: {transform}, available transforms: {all_transforms.keys()}"
-            )
-        text = all_transforms[transform](text)
-    return text
+from __future__ import annotations
 
+import re
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterable, Mapping, Sequence
+from typing import Literal, Union
 
 LINE_PATTERNS = [
     # headers: remove # and following spaces
@@ -53,104 +36,237 @@ INLINE_PATTERNS = [
 ]
 INLINE_SPLIT_TOKENS = " ,.?!;，。？！；"
 
-COMPLETE_LINKS_PATTERN = re.compile(r"\[[^\]]*\]\([^)]*\)")  # links [text](url)
-COMPLETE_IMAGES_PATTERN = re.compile(r"!\[[^\]]*\]\([^)]*\)")  # images ![text](url)
+# a pattern can only match if the text contains one of these characters
+_LINE_TRIGGERS = ["#", "-+*", ">"]
+_INLINE_TRIGGERS = ["[", "[", "*", "*", "_", "_", "`", "`", "~"]
 
+# characters the markdown scanner has to look at, the other characters can't start, end or
+# split a markdown pattern
+_SCAN_PATTERN = re.compile("[" + re.escape("*_~`[]()!" + INLINE_SPLIT_TOKENS) + "]")
+_HOLD_SUFFIXES = frozenset("#-+*>!`~ ")
 
-async def filter_markdown(text: AsyncIterable[str]) -> AsyncIterable[str]:
-    """
-    Filter out markdown symbols from the text.
-    """
+# states of the link and image matching
+_OUTSIDE, _IN_TEXT, _AFTER_TEXT, _IN_URL = range(4)
 
-    def has_incomplete_pattern(buffer: str) -> bool:
-        """Check if buffer might contain incomplete markdown patterns that need more text."""
 
-        if buffer.endswith(("#", "-", "+", "*", ">", "!", "`", "~", " ")):
-            return True
+class TextTransform(ABC):
+    """A transform applied to the text sent to the TTS, see `apply_text_transforms`.
 
-        # check for incomplete bold (**text** or *text*)
-        double_asterisks = buffer.count("**")
-        if double_asterisks % 2 == 1:
-            return True
+    The transform holds the compiled rules, and creates a `TextTransformStream` for each text
+    stream, so the same transform can be used by concurrent generations.
+    """
 
-        single_asterisks = buffer.count("*") - (double_asterisks * 2)
-        if single_asterisks % 2 == 1:
+    @abstractmethod
+    def stream(self) -> TextTransformStream: ...
+
+
+class TextTransformStream(ABC):
+    """The state of a `TextTransform` for a single text stream"""
+
+    @abstractmethod
+    def push(self, text: str) -> str:
+        """Push the next chunk of the stream, returns the transformed text that is ready.
+        Text that might be part of an incomplete pattern can be held until the next chunks."""
+
+    def flush(self) -> str:
+        """End of the stream, returns the transformed text that was held"""
+        return ""
+
+
+class _MarkdownScanner:
+    """Incrementally tracks the markdown patterns left open in a buffer, and whether the text
+    before the last split token is complete, i.e. can be processed without the next chunks."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.size = 0
+        self.split_pos = -1
+        """position of the last split token"""
+        self.split_incomplete = False
+        """whether the text before the last split token has incomplete patterns"""
+
+        self._run_char = ""
+        self._run_len = 0
+        self._run_end = -1
+        self._pairs = {"*": 0, "_": 0, "~": 0}
+        self._singles = {"*": 0, "_": 0, "~": 0}
+        self._backticks = 0
+        self._open_brackets = 0
+        self._last_bang = -2
+        self._links = 0
+        self._link_state = _OUTSIDE
+        self._images = 0
+        self._image_state = _OUTSIDE
+        self._text_end = -1
+        self._last_char: str | None = None
+
+    def scan(self, text: str) -> None:
+        """Scan the text appended to the buffer"""
+        offset = self.size
+        for m in _SCAN_PATTERN.finditer(text):
+            prev_char = text[m.start() - 1] if m.start() else self._last_char
+            self._scan_char(m.group(), offset + m.start(), prev_char=prev_char)
+
+        if text:
+            self._last_char = text[-1]
+        self.size += len(text)
+
+    def _scan_char(self, c: str, pos: int, *, prev_char: str | None) -> None:
+        if self._run_char and (c != self._run_char or pos != self._run_end):
+            self._close_run()
+
+        if self._link_state == _AFTER_TEXT or self._image_state == _AFTER_TEXT:
+            # a link is only complete if "(" directly follows "]"
+            next_state = _IN_URL if c == "(" and pos == self._text_end else _OUTSIDE
+            if self._link_state == _AFTER_TEXT:
+                self._link_state = next_state
+            if self._image_state == _AFTER_TEXT:
+                self._image_state = next_state
+            if next_state == _IN_URL:
+                return
+
+        if c in "*_~":
+            if self._run_char == c:
+                self._run_len += 1
+            else:
+                self._run_char, self._run_len = c, 1
+            self._run_end = pos + 1
+        elif c == "`":
+            self._backticks += 1
+        elif c == "!":
+            self._last_bang = pos
+        elif c == "[":
+            self._open_brackets += 1
+            if self._link_state == _OUTSIDE:
+                self._link_state = _IN_TEXT
+            if self._image_state == _OUTSIDE and self._last_bang == pos - 1:
+                self._image_state = _IN_TEXT
+        elif c == "]":
+            if self._link_state == _IN_TEXT:
+                self._link_state = _AFTER_TEXT
+            if self._image_state == _IN_TEXT:
+                self._image_state = _AFTER_TEXT
+            self._text_end = pos + 1
+        elif c == ")":
+            if self._link_state == _IN_URL:
+                self._link_state = _OUTSIDE
+                self._links += 1
+            if self._image_state == _IN_URL:
+                self._image_state = _OUTSIDE
+                self._images += 1
+
+        if c in INLINE_SPLIT_TOKENS:
+            # the text before the split token can be processed if it is complete
+            self.split_pos = pos
+            self.split_incomplete = pos > 0 and self._has_incomplete_pattern(prev_char)
+
+    def _close_run(self) -> None:
+        # "**" and "~~" are counted like `str.count`, from the start of the run
+        self._pairs[self._run_char] += self._run_len // 2
+        self._singles[self._run_char] += self._run_len % 2
+        self._run_char, self._run_len = "", 0
+
+    def _has_incomplete_pattern(self, last_char: str | None) -> bool:
+        if last_char is None or last_char in _HOLD_SUFFIXES:
             return True
 
-        # check for incomplete underscores (__text__ or _text_)
-        double_underscores = buffer.count("__")
-        if double_underscores % 2 == 1:
-            return True
-        single_underscores = buffer.count("_") - (double_underscores * 2)
-        if single_underscores % 2 == 1:
-            return True
+        pairs, singles = dict(self._pairs), dict(self._singles)
+        if self._run_char:
+            pairs[self._run_char] += self._run_len // 2
+            singles[self._run_char] += self._run_len % 2
 
-        # check for incomplete code (`text`)
-        backticks = buffer.count("`")
-        if backticks % 2 == 1:
+        # incomplete bold, italic, code or strikethrough
+        if pairs["*"] % 2 or singles["*"] % 2 or pairs["_"] % 2 or singles["_"] % 2:
             return True
 
-        # check for incomplete strikethrough (~~text~~)
-        double_tildes = buffer.count("~~")
-        if double_tildes % 2 == 1:
+        if self._backticks % 2 or pairs["~"] % 2:
             return True
 
-        # check for incomplete links [text](url) or images ![text](url)
-        open_brackets = buffer.count("[")
-        complete_links = len(COMPLETE_LINKS_PATTERN.findall(buffer))
-        complete_images = len(COMPLETE_IMAGES_PATTERN.findall(buffer))
+        # incomplete links [text](url) or images ![text](url)
+        return self._open_brackets - self._links - self._images > 0
 
-        remaining_brackets = open_brackets - complete_links - complete_images
-        if remaining_brackets > 0:
-            return True
-
-        return False
 
-    def process_complete_text(text: str, is_newline: bool = False) -> str:
-        if is_newline:
-            for pattern, replacement in LINE_PATTERNS:
+def _process_complete_text(text: str, is_newline: bool = False) -> str:
+    if is_newline:
+        for (pattern, replacement), triggers in zip(LINE_PATTERNS, _LINE_TRIGGERS):
+            if any(c in text for c in triggers):
                 text = pattern.sub(replacement, text)
 
-        for pattern, replacement in INLINE_PATTERNS:
+    for (pattern, replacement), trigger in zip(INLINE_PATTERNS, _INLINE_TRIGGERS):
+        if trigger in text:
             text = pattern.sub(replacement, text)
 
-        return text
+    return text
 
-    buffer = ""
-    buffer_is_newline = True  # track if buffer is at start of line
 
-    async for chunk in text:
-        buffer += chunk
+class MarkdownFilter(TextTransform):
+    def __init__(self, *, max_lookahead: int = 256) -> None:
+        """Filter out markdown symbols from the text.
+
+        The text is processed up to the last split token (space or punctuation) once the
+        patterns it contains are complete.
+
+        Args:
+            max_lookahead (int): Maximum number of characters held while waiting for the end
+                of a pattern, the text is processed as is once it is exceeded. Defaults to 256.
+        """
+        self._max_lookahead = max_lookahead
+
+    def stream(self) -> TextTransformStream:
+        return _MarkdownFilterStream(max_lookahead=self._max_lookahead)
+
+
+class _MarkdownFilterStream(TextTransformStream):
+    def __init__(self, *, max_lookahead: int) -> None:
+        self._max_lookahead = max_lookahead
+        self._buffer = ""
+        self._buffer_is_newline = True  # track if buffer is at start of line
+        self._scanner = _MarkdownScanner()
+
+    def push(self, text: str) -> str:
+        out = ""
+        self._buffer += text
 
-        if "\n" in buffer:
-            lines = buffer.split("\n")
-            buffer = lines[-1]  # keep last incomplete line
+        if "\n" in text:
+            lines = self._buffer.split("\n")
+            self._buffer = lines[-1]  # keep last incomplete line
 
             for i, line in enumerate(lines[:-1]):
-                is_newline = buffer_is_newline if i == 0 else True
-                processed_line = process_complete_text(line, is_newline=is_newline)
-                yield processed_line + "\n"
+                is_newline = self._buffer_is_newline if i == 0 else True
+                out += _process_complete_text(line, is_newline=is_newline) + "\n"
 
-            buffer_is_newline = True
-            continue
+            self._buffer_is_newline = True
+            self._scanner.reset()
+            self._scanner.scan(self._buffer)
+            return out
+
+        self._scanner.scan(text)
 
         # split at the position after the split token
-        last_split_pos = 0
-        for token in INLINE_SPLIT_TOKENS:
-            last_split_pos = max(last_split_pos, buffer.rfind(token, last_split_pos))
-            if last_split_pos >= len(buffer) - 1:
-                break
+        split_pos = self._scanner.split_pos
+        if split_pos >= 1 and (
+            not self._scanner.split_incomplete or len(self._buffer) > self._max_lookahead
+        ):
+            out = _process_complete_text(
+                self._buffer[:split_pos],  # exclude the split token
+                is_newline=self._buffer_is_newline,
+            )
+            self._buffer = self._buffer[split_pos:]
+            self._buffer_is_newline = False
+            self._scanner.reset()
+            self._scanner.scan(self._buffer)
 
-        if last_split_pos >= 1:
-            processable = buffer[:last_split_pos]  # exclude the split token
-            rest = buffer[last_split_pos:]
-            if not has_incomplete_pattern(processable):
-                yield process_complete_text(processable, is_newline=buffer_is_newline)
-                buffer = rest
-                buffer_is_newline = False
+        return out
 
-    if buffer:
-        yield process_complete_text(buffer, is_newline=buffer_is_newline)
+    def flush(self) -> str:
+        buffer, self._buffer = self._buffer, ""
+        self._scanner.reset()
+        if not buffer:
+            return ""
+
+        return _process_complete_text(buffer, is_newline=self._buffer_is_newline)
 
 
 # Unicode block ranges from: https://unicode.org/Public/UNIDATA/Blocks.txt
@@ -167,11 +283,131 @@ EMOJI_PATTERN = re.compile(
 )
 
 
+class EmojiFilter(TextTransform):
+    """Filter out emojis from the text."""
+
+    def stream(self) -> TextTransformStream:
+        return _EmojiFilterStream()
+
+
+class _EmojiFilterStream(TextTransformStream):
+    def push(self, text: str) -> str:
+        if text.isascii():
+            return text
+
+        return EMOJI_PATTERN.sub("", text)
+
+
+class TextReplacer(TextTransform):
+    def __init__(self, replacements: Mapping[str, str]) -> None:
+        """Replace occurrences of the keys of `replacements` with their values, e.g. to fix the
+        pronunciation of a word. Longer keys take precedence when several keys match.
+
+        The replacements are applied on the text stream, the end of the text that could be the
+        beginning of a key is held until the next chunk.
+        """
+        if any(not key for key in replacements):
+            raise ValueError("replacement keys must not be empty")
+
+        self._replacements = dict(replacements)
+        keys = sorted(self._replacements, key=len, reverse=True)
+        self._pattern = re.compile("|".join(re.escape(key) for key in keys)) if keys else None
+        self._lookahead = max((len(key) for key in keys), default=1) - 1
+
+    def stream(self) -> TextTransformStream:
+        return _TextReplacerStream(self)
+
+
+class _TextReplacerStream(TextTransformStream):
+    def __init__(self, replacer: TextReplacer) -> None:
+        self._replacer = replacer
+        self._buffer = ""
+
+    def push(self, text: str) -> str:
+        self._buffer += text
+        return self._replace(final=False)
+
+    def flush(self) -> str:
+        return self._replace(final=True)
+
+    def _replace(self, *, final: bool) -> str:
+        pattern = self._replacer._pattern
+        if pattern is None:
+            out, self._buffer = self._buffer, ""
+            return out
+
+        # matches starting before `cut` are entirely in the buffer
+        cut = len(self._buffer) if final else len(self._buffer) - self._replacer._lookahead
+        parts: list[str] = []
+        pos = 0
+        for m in pattern.finditer(self._buffer):
+            if m.start() >= cut:
+                break
+            parts.append(self._buffer[pos : m.start()])
+            parts.append(self._replacer._replacements[m.group()])
+            pos = m.end()
+
+        cut = max(cut, pos)
+        parts.append(self._buffer[pos:cut])
+        self._buffer = self._buffer[cut:]
+        return "".join(parts)
+
+
+TextTransforms = Union[Literal["filter_markdown", "filter_emoji"], TextTransform]
+
+_BUILTIN_TRANSFORMS: dict[str, TextTransform] = {
+    "filter_markdown": MarkdownFilter(),
+    "filter_emoji": EmojiFilter(),
+}
+
+
+async def apply_text_transforms(
+    text: AsyncIterable[str], transforms: Sequence[TextTransforms]
+) -> AsyncIterable[str]:
+    """Apply the transforms to the text stream, in order, in a single pass over the chunks.
+
+    Built-in transforms can be referenced by name: ``"filter_markdown"``, ``"filter_emoji"``.
+    """
+    streams: list[TextTransformStream] = []
+    for transform in transforms:
+        if isinstance(transform, str):
+            if transform not in _BUILTIN_TRANSFORMS:
+                raise ValueError(
+                    f"Invalid transform: {transform}, "
+                    f"available transforms: {_BUILTIN_TRANSFORMS.keys()}"
+                )
+            transform = _BUILTIN_TRANSFORMS[transform]
+
+        streams.append(transform.stream())
+
+    async for chunk in text:
+        for stream in streams:
+            chunk = stream.push(chunk)
+            if not chunk:
+                break
+
+        if chunk:
+            yield chunk
+
+    chunk = ""
+    for stream in streams:
+        chunk = (stream.push(chunk) if chunk else "") + stream.flush()
+
+    if chunk:
+        yield chunk
+
+
+async def filter_markdown(text: AsyncIterable[str]) -> AsyncIterable[str]:
+    """
+    Filter out markdown symbols from the text.
+    """
+    async for chunk in apply_text_transforms(text, ["filter_markdown"]):
+        yield chunk
+
+
 async def filter_emoji(text: AsyncIterable[str]) -> AsyncIterable[str]:
     """
     Filter out emojis from the text.
     """
-
-    async for chunk in text:
-        filtered_chunk = EMOJI_PATTERN.sub("", chunk)
-        yield filtered_chunk
+    async for chunk in apply_text_transforms(text, ["filter_emoji"]):
+        yield chunk
@@ -23,7 +23,7 @@ import math
 import multiprocessing as mp
 import os
 import sys
-import threading
+import time
 from collections.abc import Awaitable
 from dataclasses import dataclass, field
 from enum import Enum
@@ -52,9 +52,17 @@ from .job import (
 from .log import DEV_LEVEL, logger
 from .plugin import Plugin
 from .types import NOT_GIVEN, NotGivenOr
-from .utils import http_server, is_given
+from .utils import http_server, is_given, shared_cache
 from .utils.hw import get_cpu_monitor
 from .version import __version__
+from .worker_load import (
+    RAMP_UP_DURATION,
+    LoadEstimator,
+    LoadSignals,
+    _cpu_load,
+    _job_counts,
+    _memory_usage,
+)
 
 ASSIGNMENT_TIMEOUT = 7.5
 UPDATE_STATUS_INTERVAL = 2.5
@@ -79,33 +87,14 @@ WorkerType = ServerType
 
 
 class _DefaultLoadCalc:
-    _instance = None
-
-    def __init__(self) -> None:
-        self._m_avg = utils.MovingAverage(5)  # avg over 2.5
-        self._cpu_monitor = get_cpu_monitor()
-        self._thread = threading.Thread(
-            target=self._calc_load, daemon=True, name="worker_cpu_load_monitor"
-        )
-        self._lock = threading.Lock()
-        self._thread.start()
-
-    def _calc_load(self) -> None:
-        while True:
-            cpu_p = self._cpu_monitor.cpu_percent(interval=0.5)
-            with self._lock:
-                self._m_avg.add_sample(cpu_p)
-
-    def _get_avg(self) -> float:
-        with self._lock:
-            return self._m_avg.get_avg()
+    _estimator: LoadEstimator | None = None
 
     @classmethod
     def get_load(cls, worker: AgentServer) -> float:
-        if cls._instance is None:
-            cls._instance = _DefaultLoadCalc()
+        if cls._estimator is None:
+            cls._estimator = LoadEstimator()
 
-        return cls._instance._m_avg.get_avg()
+        return cls._estimator(worker)
 
 
 @dataclass
@@ -156,9 +145,17 @@ class ServerOptions:
     prewarm_fnc: Callable[[JobProcess], Any] = _default_setup_fnc
     """A function to perform any necessary initialization before the job starts."""
     load_fnc: Callable[[AgentServer], float] | Callable[[], float] = _DefaultLoadCalc.get_load
-    """Called to determine the current load of the worker. Should return a value between 0 and 1."""
+    """Called to determine the current load of the worker. Should return a value between 0 and 1.
+
+    The default combines the CPU and memory usage, the event loop lag, the inference queue and
+    the expected cost of the jobs that are still loading, see `worker_load.LoadEstimator`."""
     job_executor_type: JobExecutorType = _default_job_executor_type
-    """Which executor to use to run jobs. (currently thread or process are supported)"""
+    """Which executor to use to run jobs. (thread, process or shared_process)"""
+    max_jobs_per_process: int = 8
+    """Maximum number of jobs hosted by a single process when using the shared_process executor.
+
+    Jobs are spread across the processes, a new process is only started once all of them are full.
+    The memory limits apply to the whole process."""
     load_threshold: float | ServerEnvOption[float] = _default_load_threshold
     """When the load exceeds this threshold, the worker will be marked as unavailable.
 
@@ -171,6 +168,12 @@ class ServerOptions:
     """Maximum memory usage for a job in MB, the job process will be killed if it exceeds this limit.
     Defaults to 0 (disabled).
     """  # noqa: E501
+    job_slow_callback_threshold: float = 0
+    """Report the callbacks blocking the event loop of a job for longer than this, in seconds.
+
+    The stack of the blocking code is recorded in a span along with the job, agent and speech it
+    belongs to, and the event loop lag is exported to Prometheus. Defaults to 0 (disabled).
+    """
 
     drain_timeout: int = 1800
     """Number of seconds to wait for current jobs to finish upon receiving TERM or INT signal."""
@@ -222,6 +225,13 @@ class ServerOptions:
 
     By default it uses "spawn" on all platforms, but "forkserver" on Linux.
     """
+    job_zygote: bool = False
+    """Fork the job processes from a template process (zygote) instead of spawning them.
+
+    The prewarm function runs once inside the zygote, the job processes share the memory it
+    allocated (e.g. loaded models) copy-on-write. The prewarm function must not leave threads
+    running. Only available on POSIX with the process executor.
+    """
     prometheus_port: NotGivenOr[int] = NOT_GIVEN
     """When enabled, will expose prometheus metrics on :{prometheus_port}/metrics"""
     prometheus_multiproc_dir: str | None = None
@@ -263,6 +273,7 @@ class AgentServer(utils.EventEmitter[EventTypes]):
         load_threshold: float | ServerEnvOption[float] = _default_load_threshold,
         job_memory_warn_mb: float = 500,
         job_memory_limit_mb: float = 0,
+        job_slow_callback_threshold: float = 0,
         drain_timeout: int = 1800,
         num_idle_processes: int | ServerEnvOption[int] = _default_num_idle_processes,
         shutdown_process_timeout: float = 10.0,
@@ -278,6 +289,8 @@ class AgentServer(utils.EventEmitter[EventTypes]):
         multiprocessing_context: Literal["spawn", "forkserver"] = (
             "spawn" if not sys.platform.startswith("linux") else "forkserver"
         ),
+        job_zygote: bool = False,
+        max_jobs_per_process: int = 8,
         setup_fnc: Callable[[JobProcess], Any] | None = None,
         load_fnc: Callable[[AgentServer], float] | Callable[[], float] | None = None,
         prometheus_port: int | None = None,
@@ -294,6 +307,7 @@ class AgentServer(utils.EventEmitter[EventTypes]):
         self._load_threshold = load_threshold
         self._job_memory_warn_mb = job_memory_warn_mb
         self._job_memory_limit_mb = job_memory_limit_mb
+        self._job_slow_callback_threshold = job_slow_callback_threshold
         self._drain_timeout = drain_timeout
         self._num_idle_processes = num_idle_processes
         self._shutdown_process_timeout = shutdown_process_timeout
@@ -303,6 +317,8 @@ class AgentServer(utils.EventEmitter[EventTypes]):
         self._prometheus_port = prometheus_port
         self._mp_ctx_str = multiprocessing_context
         self._mp_ctx = mp.get_context(multiprocessing_context)
+        self._job_zygote = job_zygote
+        self._max_jobs_per_process = max_jobs_per_process
 
         if not is_given(http_proxy):
             http_proxy = os.environ.get("HTTPS_PROXY") or os.environ.get("HTTP_PROXY")
@@ -368,6 +384,7 @@ class AgentServer(utils.EventEmitter[EventTypes]):
             load_threshold=options.load_threshold,
             job_memory_limit_mb=options.job_memory_limit_mb,
             job_memory_warn_mb=options.job_memory_warn_mb,
+            job_slow_callback_threshold=options.job_slow_callback_threshold,
             drain_timeout=options.drain_timeout,
             num_idle_processes=options.num_idle_processes,
             shutdown_process_timeout=options.shutdown_process_timeout,
@@ -380,6 +397,8 @@ class AgentServer(utils.EventEmitter[EventTypes]):
             port=options.port,
             http_proxy=options.http_proxy,
             multiprocessing_context=options.multiprocessing_context,
+            job_zygote=options.job_zygote,
+            max_jobs_per_process=options.max_jobs_per_process,
             prometheus_port=options.prometheus_port if is_given(options.prometheus_port) else None,
             setup_fnc=options.prewarm_fnc,
             load_fnc=options.load_fnc,
@@ -522,8 +541,14 @@ class AgentServer(utils.EventEmitter[EventTypes]):
 
             self._loop = asyncio.get_event_loop()
             self._devmode = devmode
+            # private directory of the caches shared by the job processes, inherited through
+            # the environment, so it must exist before the processes are started
+            self._shared_cache_dir = shared_cache.create_shared_cache_dir()
             self._tasks = set[asyncio.Task[Any]]()
             self._pending_assignments: dict[str, asyncio.Future[agent.JobAssignment]] = {}
+            # accepted jobs that may not be fully loaded yet, job_id -> launch time
+            self._job_launch_times: dict[str, float | None] = {}
+            self._loop_lag = utils.MovingAverage(5)
             self._close_future: asyncio.Future[None] | None = None
             self._msg_chan = utils.aio.Chan[agent.WorkerMessage](128, loop=self._loop)
 
@@ -559,6 +584,9 @@ class AgentServer(utils.EventEmitter[EventTypes]):
                 memory_warn_mb=self._job_memory_warn_mb,
                 memory_limit_mb=self._job_memory_limit_mb,
                 http_proxy=self._http_proxy or None,
+                use_zygote=self._job_zygote,
+                max_jobs_per_process=self._max_jobs_per_process,
+                loop_monitor_threshold=self._job_slow_callback_threshold,
             )
 
             self._previous_status = agent.WorkerStatus.WS_AVAILABLE
@@ -658,6 +686,16 @@ class AgentServer(utils.EventEmitter[EventTypes]):
                 while True:
                     await interval.tick()
 
+                    # time spent waiting for the callbacks already scheduled on the loop
+                    lag_start = time.perf_counter()
+                    await asyncio.sleep(0)
+                    self._loop_lag.add_sample(time.perf_counter() - lag_start)
+
+                    now = time.monotonic()
+                    for job_id, launch_time in list(self._job_launch_times.items()):
+                        if launch_time is not None and now - launch_time >= RAMP_UP_DURATION:
+                            del self._job_launch_times[job_id]
+
                     def load_fnc() -> float:
                         assert self._load_fnc is not None
                         signature = inspect.signature(self._load_fnc)
@@ -691,6 +729,12 @@ class AgentServer(utils.EventEmitter[EventTypes]):
                         else:
                             self._proc_pool.set_target_idle_processes(default_num_idle_processes)
 
+                    # report the capacity change right away instead of on the next status update
+                    is_full = self._worker_load >= load_threshold
+                    was_full = self._previous_status == agent.WorkerStatus.WS_FULL
+                    if self._conn_task is not None and not self._draining and is_full != was_full:
+                        await self._update_worker_status()
+
             tasks = []
             self._load_task = asyncio.create_task(_load_task(), name="load_task")
             tasks.append(self._load_task)
@@ -844,7 +888,7 @@ class AgentServer(utils.EventEmitter[EventTypes]):
                 fake_job=fake_job,
             )
 
-            await self._proc_pool.launch_job(running_info)
+            await self._launch_job(running_info)
 
     async def aclose(self) -> None:
         async with self._lock:
@@ -872,6 +916,7 @@ class AgentServer(utils.EventEmitter[EventTypes]):
                 await utils.aio.cancel_and_wait(self._load_task)
 
             await self._proc_pool.aclose()
+            shared_cache.remove_shared_cache_dir(self._shared_cache_dir)
 
             if self._inference_executor is not None:
                 await self._inference_executor.aclose()
@@ -1081,7 +1126,34 @@ class AgentServer(utils.EventEmitter[EventTypes]):
                 worker_id=aj.worker_id,
                 fake_job=aj.fake_job,
             )
-            await self._proc_pool.launch_job(running_info)
+            await self._launch_job(running_info)
+
+    async def _launch_job(self, info: RunningJobInfo) -> None:
+        self._job_launch_times[info.job.id] = None
+        try:
+            await self._proc_pool.launch_job(info)
+        except BaseException:
+            self._job_launch_times.pop(info.job.id, None)
+            raise
+
+        self._job_launch_times[info.job.id] = time.monotonic()
+
+    def _load_signals(self) -> LoadSignals:
+        """Snapshot of the load signals, can be called from any thread"""
+        pending_jobs, ramping_jobs = _job_counts(
+            list(self._job_launch_times.values()), time.monotonic()
+        )
+        return LoadSignals(
+            cpu=_cpu_load(),
+            memory=_memory_usage(),
+            loop_lag=self._loop_lag.get_avg(),
+            inference_queue=(
+                self._inference_executor.num_pending_requests if self._inference_executor else 0
+            ),
+            active_jobs=len(self.active_jobs),
+            pending_jobs=pending_jobs,
+            ramping_jobs=ramping_jobs,
+        )
 
     def _handle_register(self, reg: agent.RegisterWorkerResponse) -> None:
         self._id = reg.worker_id
@@ -1133,11 +1205,14 @@ class AgentServer(utils.EventEmitter[EventTypes]):
 
             wait_assignment = asyncio.Future[agent.JobAssignment]()
             self._pending_assignments[job_req.id] = wait_assignment
+            # the job counts towards the load as soon as it is accepted
+            self._job_launch_times[job_req.id] = None
 
             # the job was accepted by the user, wait for the server assignment
             try:
                 await asyncio.wait_for(wait_assignment, ASSIGNMENT_TIMEOUT)
             except asyncio.TimeoutError:
+                self._job_launch_times.pop(job_req.id, None)
                 logger.warning(
                     f"assignment for job {job_req.id} timed out",
                     extra={"job_request": job_req, "agent_name": self._agent_name},
@@ -1154,7 +1229,7 @@ class AgentServer(utils.EventEmitter[EventTypes]):
                 fake_job=False,
             )
 
-            await self._proc_pool.launch_job(running_info)
+            await self._launch_job(running_info)
 
         job_req = JobRequest(job=msg.job, on_reject=_on_reject, on_accept=_on_accept)
 
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import psutil
+
+from . import utils
+from .utils.hw import get_cpu_monitor
+
+if TYPE_CHECKING:
+    from .worker import AgentServer
+
+
+RAMP_UP_DURATION = 10.0
+"""Seconds after its launch during which a job is considered as still loading"""
+
+
+@dataclass
+class LoadSignals:
+    cpu: float
+    """CPU usage averaged over the last 2.5s, between 0 and 1"""
+    memory: float
+    """Memory usage of the machine (or of the container), between 0 and 1"""
+    loop_lag: float
+    """How late the worker event loop runs its callbacks, in seconds"""
+    inference_queue: int
+    """Number of requests waiting for the inference process"""
+    active_jobs: int
+    """Number of jobs running in the job processes"""
+    pending_jobs: int
+    """Number of accepted jobs that aren't running yet (waiting for their assignment or a process)"""
+    ramping_jobs: int
+    """Number of running jobs launched less than `RAMP_UP_DURATION` seconds ago"""
+
+
+class LoadEstimator:
+    """Combine the load signals of the worker into a single value between 0 and 1.
+
+    The CPU load is predictive: the jobs that were accepted but aren't fully loaded yet are
+    counted with the CPU cost of a running job, learned from the load observed while no job is
+    ramping up. This way a burst of requests doesn't get accepted before its cost shows up in the
+    CPU usage.
+
+    Memory usage, event loop lag and the inference queue depth are each mapped to a load, the
+    highest load is reported.
+
+    Subclass and override `estimate` to change how the signals are combined, an instance can be
+    used as the `load_fnc` of the server.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_job_cost: float = 0.05,
+        job_cost_smoothing: float = 0.1,
+        max_loop_lag: float = 0.5,
+        max_inference_queue: int = 16,
+    ) -> None:
+        """
+        Args:
+            initial_job_cost: CPU load of a job until one was observed.
+            job_cost_smoothing: Weight of a new observation in the learned job cost.
+            max_loop_lag: Event loop lag (in seconds) at which the worker is considered full.
+            max_inference_queue: Number of pending inference requests at which the worker is
+                considered full.
+        """
+        self._job_cost = initial_job_cost
+        self._idle_cpu: float | None = None
+        self._smoothing = job_cost_smoothing
+        self._max_loop_lag = max_loop_lag
+        self._max_inference_queue = max_inference_queue
+
+    @property
+    def job_cost(self) -> float:
+        """The learned CPU load of a running job"""
+        return self._job_cost
+
+    def __call__(self, worker: AgentServer) -> float:
+        return self.estimate(worker._load_signals())
+
+    def estimate(self, signals: LoadSignals) -> float:
+        self._learn(signals)
+
+        committed_jobs = signals.pending_jobs + signals.ramping_jobs
+        cpu_load = signals.cpu + committed_jobs * self._job_cost
+        loop_load = signals.loop_lag / self._max_loop_lag if self._max_loop_lag > 0 else 0.0
+        inference_load = (
+            signals.inference_queue / self._max_inference_queue
+            if self._max_inference_queue > 0
+            else 0.0
+        )
+
+        return min(max(cpu_load, signals.memory, loop_load, inference_load), 1.0)
+
+    def _learn(self, signals: LoadSignals) -> None:
+        # only learn from a steady state, the CPU usage of loading jobs isn't representative
+        if signals.pending_jobs or signals.ramping_jobs:
+            return
+
+        if signals.active_jobs == 0:
+            # usage of the worker itself and of the idle processes
+            self._idle_cpu = self._ema(self._idle_cpu, signals.cpu)
+            return
+
+        job_cost = max(signals.cpu - (self._idle_cpu or 0.0), 0.0) / signals.active_jobs
+        self._job_cost = self._ema(self._job_cost, job_cost)
+
+    def _ema(self, value: float | None, sample: float) -> float:
+        if value is None:
+            return sample
+
+        return value + self._smoothing * (sample - value)
+
+
+class _CPULoadMonitor:
+    _instance: _CPULoadMonitor | None = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self._m_avg = utils.MovingAverage(5)  # avg over 2.5
+        self._cpu_monitor = get_cpu_monitor()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._calc_load, daemon=True, name="worker_cpu_load_monitor"
+        )
+        self._thread.start()
+
+    @classmethod
+    def get(cls) -> _CPULoadMonitor:
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = _CPULoadMonitor()
+
+            return cls._instance
+
+    def _calc_load(self) -> None:
+        while True:
+            cpu_p = self._cpu_monitor.cpu_percent(interval=0.5)
+            with self._lock:
+                self._m_avg.add_sample(cpu_p)
+
+    def get_avg(self) -> float:
+        with self._lock:
+            return self._m_avg.get_avg()
+
+
+def _cpu_load() -> float:
+    return _CPULoadMonitor.get().get_avg()
+
+
+def _memory_usage(cgroup_dir: str = "/sys/fs/cgroup") -> float:
+    """Memory usage between 0 and 1, the cgroup limit is used when there is one"""
+    try:
+        with open(os.path.join(cgroup_dir, "memory.max")) as f:
+            limit = f.read().strip()
+
+        if limit != "max":
+            with open(os.path.join(cgroup_dir, "memory.current")) as f:
+                current = int(f.read().strip())
+
+            # memory.current includes the page cache, the inactive file pages are reclaimed
+            # before hitting the limit. Use the working set like the OOM killer (and kubelet) do
+            return max(current - _cgroup_inactive_file(cgroup_dir), 0) / int(limit)
+    except (OSError, ValueError):
+        pass
+
+    return psutil.virtual_memory().percent / 100.0
+
+
+def _cgroup_inactive_file(cgroup_dir: str) -> int:
+    try:
+        with open(os.path.join(cgroup_dir, "memory.stat")) as f:
+            for line in f:
+                key, _, value = line.partition(" ")
+                if key == "inactive_file":
+                    return int(value)
+    except (OSError, ValueError):
+        pass
+
+    return 0
+
+
+def _job_counts(commits: list[float | None], now: float) -> tuple[int, int]:
+    """Return the number of pending and ramping jobs from their launch times"""
+    pending = sum(1 for t in commits if t is None)
+    ramping = sum(1 for t in commits if t is not None and now - t < RAMP_UP_DURATION)
+    return pending, ramping
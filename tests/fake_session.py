@@ -13,6 +13,7 @@ from livekit.agents import (
     utils,
 )
 from livekit.agents.llm import FunctionToolCall
+from livekit.agents.voice.recorder_io import RecordingOptions
 from livekit.agents.voice.transcription.synchronizer import (
     TranscriptSynchronizer,
     _SyncedAudioOutput,
@@ -68,7 +69,13 @@ def create_session(
     return session
 
 
-async def run_session(session: AgentSession, agent: Agent, *, drain_delay: float = 1.0) -> float:
+async def run_session(
+    session: AgentSession,
+    agent: Agent,
+    *,
+    drain_delay: float = 1.0,
+    record: NotGivenOr[bool | RecordingOptions] = NOT_GIVEN,
+) -> float:
     stt = session.stt
     audio_input = session.input.audio
     assert isinstance(stt, FakeSTT)
@@ -78,7 +85,7 @@ async def run_session(session: AgentSession, agent: Agent, *, drain_delay: float
     if isinstance(session.output.audio, _SyncedAudioOutput):
         transcription_sync = session.output.audio._synchronizer
 
-    await session.start(agent)
+    await session.start(agent, record=record)
 
     # start the fake vad and stt
     t_origin = time.time()
@@ -9,14 +9,18 @@ from livekit.agents import (
     AgentStateChangedEvent,
     ConversationItemAddedEvent,
     MetricsCollectedEvent,
+    TurnLatencyEvent,
     UserInputTranscribedEvent,
     UserStateChangedEvent,
     function_tool,
 )
 from livekit.agents.llm import FunctionToolCall
 from livekit.agents.llm.chat_context import ChatContext, ChatMessage
+from livekit.agents.llm.tool_context import ToolFlag
+from livekit.agents.voice.agent_activity import _normalize_transcript
 from livekit.agents.voice.events import FunctionToolsExecutedEvent
 from livekit.agents.voice.io import PlaybackFinishedEvent
+from livekit.agents.voice.speech_handle import SpeechHandle
 
 from .fake_session import FakeActions, create_session, run_session
 
@@ -85,12 +89,14 @@ async def test_events_and_metrics() -> None:
     metrics_events: list[MetricsCollectedEvent] = []
     conversation_events: list[ConversationItemAddedEvent] = []
     user_transcription_events: list[UserInputTranscribedEvent] = []
+    turn_latency_events: list[TurnLatencyEvent] = []
 
     session.on("user_state_changed", user_state_events.append)
     session.on("agent_state_changed", agent_state_events.append)
     session.on("metrics_collected", metrics_events.append)
     session.on("conversation_item_added", conversation_events.append)
     session.on("user_input_transcribed", user_transcription_events.append)
+    session.on("turn_latency", turn_latency_events.append)
 
     t_origin = await asyncio.wait_for(run_session(session, agent), timeout=SESSION_TIMEOUT)
 
@@ -142,6 +148,16 @@ async def test_events_and_metrics() -> None:
     check_timestamp(metrics_events[2].metrics.ttfb, 0.2, speed_factor=speed)
     check_timestamp(metrics_events[2].metrics.audio_duration, 2.0, speed_factor=speed)
 
+    # turn_latency
+    assert len(turn_latency_events) == 1
+    latency = turn_latency_events[0]
+    assert latency.speech_id == metrics_events[0].metrics.speech_id
+    check_timestamp(latency.end_of_turn_delay, 0.5, speed_factor=speed)
+    check_timestamp(latency.llm_ttft, 0.1, speed_factor=speed)
+    check_timestamp(latency.tts_ttfb, 0.2, speed_factor=speed)
+    check_timestamp(latency.e2e_latency, 1.0, speed_factor=speed)
+    check_timestamp(latency.created_at - t_origin, 3.5, speed_factor=speed)
+
 
 async def test_tool_call() -> None:
     speed = 5.0
@@ -214,6 +230,225 @@ async def test_tool_call() -> None:
     assert chat_ctx_items[5].text_content == "The weather in Tokyo is sunny today."
 
 
+class SlowToolsAgent(Agent):
+    def __init__(self) -> None:
+        super().__init__(instructions="You are a helpful assistant.")
+        self.running_lookups = 0
+        self.max_running_lookups = 0
+        self.store_hours_calls = 0
+
+    @function_tool(max_concurrency=1)
+    async def lookup_order(self, order_id: str) -> str:
+        """Look up an order."""
+        self.running_lookups += 1
+        self.max_running_lookups = max(self.max_running_lookups, self.running_lookups)
+        await asyncio.sleep(0.05)
+        self.running_lookups -= 1
+        return f"order {order_id} shipped"
+
+    @function_tool(timeout=0.3)
+    async def slow_lookup(self) -> str:
+        """Look up something slow."""
+        await asyncio.sleep(10)
+        return "never returned"
+
+    @function_tool(cache=True)
+    async def store_hours(self, store: str) -> str:
+        """Get the opening hours of a store."""
+        self.store_hours_calls += 1
+        await asyncio.sleep(0.05)
+        return "9am-5pm"
+
+
+async def test_tool_execution_options() -> None:
+    speed = 5.0
+    actions = FakeActions()
+    actions.add_user_speech(0.5, 2.5, "Where are my orders?")
+    actions.add_llm(
+        content="Let me check.",
+        tool_calls=[
+            FunctionToolCall(name="lookup_order", arguments='{"order_id": "1"}', call_id="1"),
+            FunctionToolCall(name="lookup_order", arguments='{"order_id": "2"}', call_id="2"),
+            FunctionToolCall(name="slow_lookup", arguments="{}", call_id="3"),
+            FunctionToolCall(name="store_hours", arguments='{"store": "a"}', call_id="4"),
+            FunctionToolCall(name="store_hours", arguments='{ "store":"a" }', call_id="5"),
+        ],
+    )
+    actions.add_tts(1.0)
+    actions.add_llm(
+        content="Both orders shipped.",
+        input="the tool `slow_lookup` timed out after 0.3s",
+    )
+    actions.add_tts(1.0)
+
+    session = create_session(actions, speed_factor=speed)
+    agent = SlowToolsAgent()
+
+    tool_executed_events: list[FunctionToolsExecutedEvent] = []
+    session.on("function_tools_executed", tool_executed_events.append)
+
+    await asyncio.wait_for(run_session(session, agent), timeout=SESSION_TIMEOUT)
+
+    assert agent.max_running_lookups == 1
+    assert len(tool_executed_events) == 1
+    outputs = {out.call_id: out for out in tool_executed_events[0].function_call_outputs if out}
+    assert outputs["1"].output == "order 1 shipped"
+    assert outputs["2"].output == "order 2 shipped"
+    assert outputs["3"].is_error
+    assert outputs["3"].output == "the tool `slow_lookup` timed out after 0.3s"
+
+    # identical concurrent calls are coalesced
+    assert agent.store_hours_calls == 1
+    assert outputs["4"].output == outputs["5"].output == "9am-5pm"
+    assert len(tool_executed_events[0].cached_call_ids) == 1
+
+
+class CancellableToolAgent(Agent):
+    def __init__(self) -> None:
+        super().__init__(instructions="You are a helpful assistant.")
+        self.started = False
+        self.cancelled = False
+
+    @function_tool(flags=ToolFlag.CANCEL_ON_INTERRUPT, max_concurrency=1)
+    async def book_table(self, restaurant: str) -> str:
+        """Book a table at a restaurant."""
+        self.started = True
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return f"booked a table at {restaurant}"
+
+
+async def test_tool_cancelled_on_interrupt() -> None:
+    speed = 5.0
+    actions = FakeActions()
+    actions.add_user_speech(0.5, 2.5, "Book a table at Luigi's.")
+    actions.add_llm(
+        content="Let me book it.",
+        tool_calls=[
+            FunctionToolCall(name="book_table", arguments='{"restaurant": "Luigi"}', call_id="1")
+        ],
+    )
+    actions.add_tts(5.0)  # playout from 3.5s to 8.5s
+    actions.add_user_speech(5.0, 6.0, "Actually, never mind.", stt_delay=0.2)
+    actions.add_llm("Okay.")
+    actions.add_tts(1.0)
+
+    session = create_session(actions, speed_factor=speed)
+    agent = CancellableToolAgent()
+
+    tool_executed_events: list[FunctionToolsExecutedEvent] = []
+    session.on("function_tools_executed", tool_executed_events.append)
+
+    await asyncio.wait_for(run_session(session, agent), timeout=SESSION_TIMEOUT)
+
+    assert agent.started
+    assert agent.cancelled
+    assert not any(ev.function_call_outputs for ev in tool_executed_events)
+    assert not [item for item in agent.chat_ctx.items if item.type == "function_call_output"]
+
+
+class FirstStoreAgent(Agent):
+    def __init__(self) -> None:
+        super().__init__(instructions="You are the assistant of the first store.")
+
+    @function_tool(cache=True)
+    async def store_hours(self) -> str:
+        """Get the opening hours of the store."""
+        return "first store: 9am-5pm"
+
+
+class SecondStoreAgent(Agent):
+    def __init__(self) -> None:
+        super().__init__(instructions="You are the assistant of the second store.")
+
+    async def on_enter(self) -> None:
+        self.session.generate_reply(user_input="And the second store?")
+
+    @function_tool(cache=True)
+    async def store_hours(self) -> str:
+        """Get the opening hours of the store."""
+        return "second store: 10am-6pm"
+
+
+async def test_tool_cache_across_handoff() -> None:
+    speed = 5.0
+    actions = FakeActions()
+    actions.add_user_speech(0.5, 2.5, "When is the first store open?")
+    actions.add_llm(
+        content="",
+        tool_calls=[FunctionToolCall(name="store_hours", arguments="{}", call_id="1")],
+    )
+    actions.add_llm("From 9am to 5pm.", input="first store: 9am-5pm")
+    actions.add_tts(0.5)
+    actions.add_llm(
+        content="",
+        input="And the second store?",
+        tool_calls=[FunctionToolCall(name="store_hours", arguments="{}", call_id="2")],
+    )
+    actions.add_llm("From 10am to 6pm.", input="second store: 10am-6pm")
+    actions.add_tts(0.5)
+
+    session = create_session(actions, speed_factor=speed)
+
+    tool_executed_events: list[FunctionToolsExecutedEvent] = []
+    session.on("function_tools_executed", tool_executed_events.append)
+
+    @session.on("conversation_item_added")
+    def _on_item_added(ev: ConversationItemAddedEvent) -> None:
+        # hand off to the second store once the first one answered
+        if ev.item.type == "message" and ev.item.text_content == "From 9am to 5pm.":
+            session.update_agent(SecondStoreAgent())
+
+    await asyncio.wait_for(
+        run_session(session, FirstStoreAgent(), drain_delay=2.0), timeout=SESSION_TIMEOUT
+    )
+
+    # the tools share their name but not their cached results
+    outputs = [out for ev in tool_executed_events for out in ev.function_call_outputs if out]
+    assert [out.output for out in outputs] == ["first store: 9am-5pm", "second store: 10am-6pm"]
+    assert not any(ev.cached_call_ids for ev in tool_executed_events)
+
+
+class StatusUpdatesAgent(Agent):
+    def __init__(self) -> None:
+        super().__init__(instructions="You are a helpful assistant.")
+        self.handles: list[SpeechHandle] = []
+
+    async def on_enter(self) -> None:
+        self.handles = [
+            self.session.say("Welcome!"),
+            self.session.say("Status 1", coalesce_key="status"),
+            self.session.say("Expired status", expires_in=0.1),
+            self.session.say("Status 2", coalesce_key="status"),
+        ]
+
+
+async def test_speech_expiry_and_coalescing() -> None:
+    actions = FakeActions()
+    for text in ("Welcome!", "Status 1", "Expired status", "Status 2"):
+        actions.add_tts(1.0, input=text)
+    actions.add_user_speech(3.0, 3.5, "Thanks.")
+    actions.add_llm("You're welcome.")
+    actions.add_tts(0.5)
+
+    session = create_session(actions, speed_factor=5.0)
+    agent = StatusUpdatesAgent()
+
+    conversation_events: list[ConversationItemAddedEvent] = []
+    session.on("conversation_item_added", conversation_events.append)
+
+    await asyncio.wait_for(run_session(session, agent), timeout=SESSION_TIMEOUT)
+
+    welcome, status_1, expired, status_2 = agent.handles
+    assert not welcome.dropped and not status_2.dropped
+    assert status_1.dropped and status_1.interrupted
+    assert expired.dropped
+    assert [ev.item.text_content for ev in conversation_events][:2] == ["Welcome!", "Status 2"]
+
+
 @pytest.mark.parametrize(
     "resume_false_interruption, expected_interruption_time",
     [
@@ -526,7 +761,12 @@ async def test_generate_reply() -> None:
         (False, 1.1),
     ],
 )
-async def test_preemptive_generation(preemptive_generation: bool, expected_latency: float) -> None:
+async def test_preemptive_generation(
+    preemptive_generation: bool, expected_latency: float, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    outcomes: list[str] = []
+    monkeypatch.setattr("livekit.agents.telemetry.metrics.preemptive_generation", outcomes.append)
+
     speed = 5.0
     actions = FakeActions()
     actions.add_user_speech(0.5, 2.0, "Hello, how are you?", stt_delay=0.2)
@@ -556,6 +796,20 @@ async def test_preemptive_generation(preemptive_generation: bool, expected_laten
         max_abs_diff=0.2,
     )
     assert agent_state_events[3].new_state == "listening"
+    assert outcomes == (["used"] if preemptive_generation else [])
+
+
+def test_preemptive_transcript_normalization() -> None:
+    assert _normalize_transcript("Hello, how are you?") == "hello how are you"
+    assert _normalize_transcript(" hello  HOW are you ") == "hello how are you"
+    assert _normalize_transcript("Ça va? I'm fine.") == "ça va i'm fine"
+    assert _normalize_transcript("hello how") != _normalize_transcript("hello, how are you")
+    assert _normalize_transcript("It costs 3.5 dollars.") == "it costs 3.5 dollars"
+
+    # the symbols change the meaning of the transcript
+    assert _normalize_transcript("It is -5 degrees") != _normalize_transcript("It is 5 degrees")
+    assert _normalize_transcript("Transfer $100") != _normalize_transcript("Transfer 100%")
+    assert _normalize_transcript("3.5 kg") != _normalize_transcript("3 5 kg")
 
 
 @pytest.mark.parametrize(
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import os
+import wave
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from livekit.agents.utils import shared_cache
+from livekit.agents.utils.audio import audio_frames_from_file
+from livekit.agents.voice.background_audio import _DecodedClipCache
+
+
+def _write_wav(path: Path, *, duration: float = 1.0, sample_rate: int = 48000) -> str:
+    samples = (np.sin(np.arange(int(duration * sample_rate)) / 10) * 10000).astype(np.int16)
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sample_rate)
+        f.writeframes(samples.tobytes())
+    return str(path)
+
+
+async def _decode(path: str) -> np.ndarray:
+    frames = [
+        np.frombuffer(frame.data, dtype=np.int16)
+        async for frame in audio_frames_from_file(path, sample_rate=48000, num_channels=1)
+    ]
+    return np.concatenate(frames)
+
+
+async def test_cache_hit(tmp_path: Path) -> None:
+    path = _write_wav(tmp_path / "clip.wav")
+    cache = _DecodedClipCache(shared_dir=None)
+
+    clip = await cache.get(path)
+    assert clip is not None
+    np.testing.assert_array_equal(clip.data, await _decode(path))
+    assert await cache.get(path) is clip
+
+    frames = [frame async for frame in clip.frames()]
+    assert sum(frame.samples_per_channel for frame in frames) == clip.num_samples
+
+
+async def test_too_large_clip_is_streamed(tmp_path: Path) -> None:
+    path = _write_wav(tmp_path / "clip.wav")
+    cache = _DecodedClipCache(shared_dir=None, max_bytes=1024)
+    assert await cache.get(path) is None
+
+
+async def test_decode_failure(tmp_path: Path) -> None:
+    path = tmp_path / "clip.wav"
+    path.write_bytes(b"not an audio file")
+    shared_dir = tmp_path / "shared"
+    shared_dir.mkdir(mode=0o700)
+
+    cache = _DecodedClipCache(shared_dir=str(shared_dir))
+    assert await cache.get(str(path)) is None
+    assert await cache.get(str(tmp_path / "missing.wav")) is None
+    assert list(shared_dir.iterdir()) == []
+
+
+async def test_load_shared_clip(tmp_path: Path) -> None:
+    path = _write_wav(tmp_path / "clip.wav")
+    shared_dir = tmp_path / "shared"
+    shared_dir.mkdir(mode=0o700)
+
+    first = await _DecodedClipCache(shared_dir=str(shared_dir)).get(path)
+    assert first is not None
+    assert len(list(shared_dir.glob("*.pcm"))) == 1
+
+    # another process maps the decoded file instead of decoding the clip again
+    second_cache = _DecodedClipCache(shared_dir=str(shared_dir))
+    second_cache._decode = None  # type: ignore[assignment]
+    second = await second_cache.get(path)
+    assert second is not None
+    assert isinstance(second.data, np.memmap)
+    np.testing.assert_array_equal(second.data, first.data)
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_shared_cache_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.delenv(shared_cache.SHARED_CACHE_DIR_ENV, raising=False)
+    assert shared_cache.shared_cache_dir("audio-clips") is None
+
+    root = shared_cache.create_shared_cache_dir()
+    try:
+        path = shared_cache.shared_cache_dir("audio-clips")
+        assert path == os.path.join(root, "audio-clips")
+        assert os.stat(path).st_mode & 0o777 == 0o700
+
+        # a directory others can write to isn't used
+        os.chmod(path, 0o777)
+        assert shared_cache.shared_cache_dir("audio-clips") is None
+    finally:
+        shared_cache.remove_shared_cache_dir(root)
+
+    assert not os.path.exists(root)
+    assert shared_cache.SHARED_CACHE_DIR_ENV not in os.environ
+
+    # a directory planted by someone else (here, a symlink) isn't used either
+    target = tmp_path / "target"
+    target.mkdir(mode=0o700)
+    (tmp_path / "link").symlink_to(target)
+    monkeypatch.setenv(shared_cache.SHARED_CACHE_DIR_ENV, str(tmp_path / "link"))
+    assert shared_cache.shared_cache_dir("audio-clips") is None
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from livekit.agents import Agent
+from livekit.agents.voice.endpointing import DEFAULT_ENDPOINTING_DELAY, AdaptiveEndpointing
+
+from .fake_session import FakeActions, create_session, run_session
+
+
+@pytest.fixture
+def outcomes(monkeypatch) -> list[tuple[float, str]]:
+    outcomes: list[tuple[float, str]] = []
+    monkeypatch.setattr(
+        "livekit.agents.telemetry.metrics.endpointing_delay",
+        lambda delay, *, outcome: outcomes.append((delay, outcome)),
+    )
+    return outcomes
+
+
+def _pause(endpointing: AdaptiveEndpointing, at: float, pause: float) -> None:
+    endpointing.on_speech_ended(at)
+    endpointing.on_speech_started(at + pause, max_pause=3.0)
+
+
+def test_delay_follows_user_pauses() -> None:
+    endpointing = AdaptiveEndpointing(quantile=0.9, margin=0.1)
+    assert endpointing.delay(min_delay=0.2, max_delay=3.0) == DEFAULT_ENDPOINTING_DELAY
+
+    # short pauses make the delay shorter than the default
+    for i in range(10):
+        _pause(endpointing, i * 10.0, 0.2)
+    assert endpointing.delay(min_delay=0.2, max_delay=3.0) == pytest.approx(0.3)
+    assert endpointing.delay(min_delay=0.5, max_delay=3.0) == 0.5
+
+    # long pauses make it longer, up to the max delay
+    for i in range(40):
+        _pause(endpointing, i * 10.0, 1.5)
+    assert endpointing.delay(min_delay=0.2, max_delay=3.0) == pytest.approx(1.6)
+    assert endpointing.delay(min_delay=0.2, max_delay=1.0) == 1.0
+
+    # gaps longer than max_pause aren't pauses of the user
+    endpointing.on_speech_ended(1000.0)
+    endpointing.on_speech_started(1010.0, max_pause=3.0)
+    assert max(endpointing.pauses) == 1.5
+
+
+def test_turn_outcomes(outcomes) -> None:
+    endpointing = AdaptiveEndpointing()
+
+    # the user resumed speaking right after the end of turn
+    endpointing.on_speech_ended(0.0)
+    endpointing.on_turn_committed(delay=0.5)
+    endpointing.on_speech_started(0.8, max_pause=3.0)
+    assert outcomes == [(0.5, "cutoff")]
+    assert endpointing.pauses == [0.8]
+
+    # the user waited for the answer
+    endpointing.on_speech_ended(10.0)
+    endpointing.on_turn_committed(delay=0.6)
+    endpointing.on_speech_started(20.0, max_pause=3.0)
+    assert outcomes[-1] == (0.6, "end_of_turn")
+
+    # the last turn is reported when the session closes
+    endpointing.on_speech_ended(30.0)
+    endpointing.on_turn_committed(delay=0.7)
+    endpointing.flush()
+    assert outcomes[-1] == (0.7, "end_of_turn")
+    assert len(outcomes) == 3
+
+
+def test_reply_ends_the_turn(outcomes) -> None:
+    endpointing = AdaptiveEndpointing()
+
+    # the user answers 1s after the end of a short reply, it isn't a pause of the user
+    endpointing.on_speech_ended(0.0)
+    endpointing.on_turn_committed(delay=0.5)
+    endpointing.on_agent_speech_started()
+    assert outcomes == [(0.5, "end_of_turn")]
+    endpointing.on_speech_started(2.0, max_pause=3.0)
+    assert outcomes == [(0.5, "end_of_turn")]
+    assert endpointing.pauses == []
+
+    # the user resumed before the reply was played
+    endpointing.on_speech_ended(10.0)
+    endpointing.on_turn_committed(delay=0.5)
+    endpointing.on_speech_started(10.8, max_pause=3.0)
+    endpointing.on_agent_speech_started()
+    assert outcomes[-1] == (0.5, "cutoff")
+
+
+async def test_back_and_forth(outcomes) -> None:
+    speed = 5.0
+    actions = FakeActions()
+    actions.add_user_speech(0.5, 2.5, "What time is it?", stt_delay=0.2)  # EOU at 3.0s
+    actions.add_llm("It is noon.", ttft=0.1, duration=0.3)
+    actions.add_tts(0.5, ttfb=0.1, duration=0.2)  # playout from ~3.4s to ~3.9s
+    # the user answers quickly, within max_endpointing_delay of their previous turn
+    actions.add_user_speech(4.5, 5.5, "Thanks.", stt_delay=0.2)
+    actions.add_llm("You're welcome.", ttft=0.1, duration=0.3)
+    actions.add_tts(0.5, ttfb=0.1, duration=0.2)
+
+    session = create_session(actions, speed_factor=speed)
+    await asyncio.wait_for(run_session(session, Agent(instructions="")), timeout=60.0)
+
+    assert [outcome for _, outcome in outcomes] == ["end_of_turn", "end_of_turn"]
+    assert session._endpointing.pauses == []
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from livekit.agents.metrics import VADMetrics
+from livekit.agents.voice import (
+    AgentStateChangedEvent,
+    EventJournal,
+    MetricsCollectedEvent,
+    TurnLatencyEvent,
+    UserInputTranscribedEvent,
+)
+
+
+def _transcript(i: int) -> UserInputTranscribedEvent:
+    return UserInputTranscribedEvent(transcript=f"hello {i}", is_final=True)
+
+
+def _metrics() -> MetricsCollectedEvent:
+    return MetricsCollectedEvent(
+        metrics=VADMetrics(
+            label="vad",
+            timestamp=0.0,
+            idle_time=0.0,
+            inference_duration_total=0.0,
+            inference_count=0,
+        )
+    )
+
+
+def test_retention() -> None:
+    journal = EventJournal(max_events=3)
+    journal.append(_metrics())
+    journal.append(TurnLatencyEvent(speech_id="speech_1", e2e_latency=0.8))
+    for i in range(4):
+        journal.append(_transcript(i))
+
+    assert [ev.type for ev in journal.events] == ["user_input_transcribed"] * 3
+    assert [data["transcript"] for data in journal.serialized_events] == [
+        "hello 1",
+        "hello 2",
+        "hello 3",
+    ]
+    assert journal.dropped_events == 2
+    # turn latencies are kept regardless of the retention
+    assert [ev.speech_id for ev in journal.turn_latencies] == ["speech_1"]
+
+    journal.clear()
+    assert not journal.events and not journal.turn_latencies
+
+
+def test_file_and_sink(tmp_path: Path) -> None:
+    path = tmp_path / "session" / "events.jsonl"
+    received: list[dict] = []
+    journal = EventJournal(path=path, sink=received.append, exclude=("metrics_collected",))
+
+    journal.append(AgentStateChangedEvent(old_state="initializing", new_state="listening"))
+    journal.append(_metrics())
+    journal.append(_transcript(0))
+    journal.close()
+
+    # excluded events are only filtered from the memory
+    assert [ev.type for ev in journal.events] == ["agent_state_changed", "user_input_transcribed"]
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["type"] for line in lines] == [
+        "agent_state_changed",
+        "metrics_collected",
+        "user_input_transcribed",
+    ]
+    assert [data["type"] for data in received] == [line["type"] for line in lines]
+
+    # the file is reopened in append mode
+    journal.append(_transcript(1))
+    journal.close()
+    assert len(path.read_text().splitlines()) == 4
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+from livekit.agents.cli.import_profiler import profile_job_imports
+
+
+def _run_python(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def test_package_is_imported_lazily() -> None:
+    out = _run_python(
+        "import sys, livekit.agents; "
+        "print('livekit.agents.voice' in sys.modules, 'livekit.agents.cli.cli' in sys.modules)"
+    )
+    assert out == "False False"
+
+
+def test_lazy_attributes() -> None:
+    out = _run_python(
+        "import livekit.agents as agents; from livekit.agents import cli, avatar, JobContext; "
+        "print(agents.AgentSession.__name__, JobContext.__name__, avatar.__name__, "
+        "cli.run_app.__name__, 'AgentSession' in dir(agents))"
+    )
+    assert out == "AgentSession JobContext livekit.agents.voice.avatar run_app True"
+
+
+def test_profile_job_imports(tmp_path) -> None:
+    (tmp_path / "my_helper.py").write_text("import json\nVALUE = 1\n")
+    main_file = tmp_path / "agent.py"
+    main_file.write_text(
+        "import my_helper\n"
+        "from livekit.agents import cli\n\n"
+        "if __name__ == '__main__':\n"
+        "    raise RuntimeError('the main block must not run')\n"
+    )
+
+    stats = {stat.module: stat for stat in profile_job_imports(str(main_file))}
+
+    assert "my_helper" in stats
+    assert "livekit.agents.ipc.job_proc_lazy_main" in stats
+    assert "livekit.agents.cli.cli" not in stats
+
+    main = stats["__mp_main__"]
+    assert main.cumulative_time >= stats["my_helper"].cumulative_time
+    assert main.cumulative_time >= main.self_time >= 0
@@ -3,15 +3,19 @@ from __future__ import annotations
 import asyncio
 import ctypes
 import io
+import logging
 import multiprocessing as mp
+import os
 import socket
+import threading
 import time
 import uuid
 from dataclasses import dataclass
 from multiprocessing.context import BaseContext
-from typing import ClassVar
+from typing import Callable, ClassVar
 
 import psutil
+import pytest
 
 from livekit.agents import JobContext, JobProcess, ipc, job, utils
 from livekit.protocol import agent
@@ -107,6 +111,168 @@ def test_sync_channel():
     pch.close()
 
 
+def _forward_logs(
+    handler_kwargs: dict, emit: Callable[[logging.Logger], None]
+) -> list[logging.LogRecord]:
+    from livekit.agents.ipc.log_queue import LogQueueHandler, LogQueueListener
+
+    mp_pch, mp_cch = socket.socketpair()
+    received: list[logging.LogRecord] = []
+
+    class _Collector(logging.Handler):
+        def emit(self, record: logging.LogRecord) -> None:
+            received.append(record)
+
+    collector = _Collector()
+    # dropped records are reported by the "livekit.agents" logger
+    parent_loggers = [logging.getLogger("test_log_queue"), logging.getLogger("livekit.agents")]
+    for parent_logger in parent_loggers:
+        parent_logger.addHandler(collector)
+    parent_loggers[0].setLevel(logging.DEBUG)
+
+    listener = LogQueueListener(
+        utils.aio.duplex_unix._Duplex.open(mp_pch), lambda r: setattr(r, "pid", 42)
+    )
+    listener.start()
+
+    handler = LogQueueHandler(utils.aio.duplex_unix._Duplex.open(mp_cch), **handler_kwargs)
+    child_logger = logging.Logger("test_log_queue")  # not registered, like in the job process
+    child_logger.addHandler(handler)
+    try:
+        emit(child_logger)
+    finally:
+        handler.close()
+        handler.thread.join()
+        listener._thread.join()  # type: ignore[union-attr]
+        listener.stop()
+        for parent_logger in parent_loggers:
+            parent_logger.removeHandler(collector)
+
+    return received
+
+
+def test_log_queue_batches_records():
+    class _Unserializable:
+        def __str__(self) -> str:
+            return "unserializable"
+
+    def _emit(lger: logging.Logger) -> None:
+        for i in range(100):
+            lger.debug("message %d", i, extra={"index": i, "obj": _Unserializable()})
+
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            lger.exception("failed")
+
+    received = _forward_logs({"batch_interval": 0.1}, _emit)
+
+    assert len(received) == 101
+    assert [r.getMessage() for r in received[:100]] == [f"message {i}" for i in range(100)]
+    assert received[5].index == 5
+    assert received[5].obj == "unserializable"
+    assert received[5].pid == 42
+    assert received[5].levelno == logging.DEBUG
+    assert received[5].funcName == "_emit"
+    assert received[100].levelno == logging.ERROR
+    assert "ValueError: boom" in received[100].getMessage()
+
+
+def test_log_queue_rate_limit():
+    def _emit(lger: logging.Logger) -> None:
+        for i in range(50):
+            lger.info("message %d", i)
+
+        lger.warning("warnings are never dropped")
+
+    received = _forward_logs({"max_records_per_second": 0.001, "burst_size": 10}, _emit)
+
+    messages = [r.getMessage() for r in received]
+    assert messages[:10] == [f"message {i}" for i in range(10)]
+    assert "warnings are never dropped" in messages
+    dropped = [r for r in received if hasattr(r, "dropped_records")]
+    assert len(dropped) == 1
+    assert dropped[0].dropped_records == 40
+
+
+def _log_and_exit_main(log_cch: socket.socket, exitcode: int) -> None:
+    from livekit.agents.ipc.log_queue import LogQueueHandler
+
+    handler = LogQueueHandler(utils.aio.duplex_unix._Duplex.open(log_cch))
+    child_logger = logging.Logger("test_proc_supervisor")
+    child_logger.addHandler(handler)
+    for i in range(10):
+        child_logger.warning("message %d", i)
+
+    _ = bytearray(32 * 1024 * 1024)
+    time.sleep(0.5)
+    handler.close()
+    handler.thread.join()
+    os._exit(exitcode)
+
+
+def test_proc_supervisor():
+    from livekit.agents.ipc.log_queue import LogQueueListener
+    from livekit.agents.ipc.proc_supervisor import ProcSample, ProcSupervisor
+
+    supervisor = ProcSupervisor(sample_interval=0.1)
+    mp_ctx = mp.get_context("spawn")
+    received: list[logging.LogRecord] = []
+    samples: dict[int, list[ProcSample]] = {}
+    exited: list[int] = []
+    exited_ev = threading.Event()
+
+    class _Collector(logging.Handler):
+        def emit(self, record: logging.LogRecord) -> None:
+            received.append(record)
+
+    collector = _Collector()
+    logging.getLogger("test_proc_supervisor").addHandler(collector)
+
+    procs = []
+    try:
+        for exitcode in (0, 3):
+            log_pch, log_cch = socket.socketpair()
+            proc = mp_ctx.Process(target=_log_and_exit_main, args=(log_cch, exitcode))
+            proc.start()
+            log_cch.close()
+            procs.append(proc)
+
+            def _on_exit(pid: int = proc.pid) -> None:
+                exited.append(pid)
+                if len(exited) == 2:
+                    exited_ev.set()
+
+            log_duplex = utils.aio.duplex_unix._Duplex.open(log_pch)
+            supervisor.watch(
+                proc,
+                on_exit=_on_exit,
+                on_sample=lambda s: samples.setdefault(s.pid, []).append(s),
+                log_duplex=log_duplex,
+                log_listener=LogQueueListener(
+                    log_duplex, lambda r, pid=proc.pid: setattr(r, "pid", pid)
+                ),
+            )
+
+        assert exited_ev.wait(20)
+    finally:
+        logging.getLogger("test_proc_supervisor").removeHandler(collector)
+
+    assert sorted(exited) == sorted(p.pid for p in procs)
+    assert [p.exitcode for p in procs] == [0, 3]
+
+    # every record was handled before the exit was reported
+    for proc in procs:
+        messages = [r.getMessage() for r in received if r.pid == proc.pid]
+        assert messages == [f"message {i}" for i in range(10)]
+        assert max(s.memory_bytes for s in samples[proc.pid]) > 32 * 1024 * 1024
+
+    # the supervisor thread stops once there is nothing left to supervise
+    time.sleep(0.2)
+    assert supervisor.num_processes == 0
+    assert supervisor._thread is None
+
+
 def _generate_fake_job() -> job.RunningJobInfo:
     return job.RunningJobInfo(
         job=agent.Job(id="fake_job_" + str(uuid.uuid4().hex), type=agent.JobType.JT_ROOM),
@@ -392,3 +558,188 @@ async def test_job_graceful_shutdown():
     assert proc.exitcode == 0, "process should have exited cleanly"
     assert not proc.killed
     assert start_args.shutdown_counter.value == 1
+
+
+def _create_zygote(
+    *, mp_ctx: BaseContext, initialize_process_fnc: Callable[[JobProcess], None]
+) -> tuple[ipc.zygote.JobZygote, _StartArgs]:
+    start_args = _new_start_args(mp_ctx)
+    zygote = ipc.zygote.JobZygote(
+        initialize_process_fnc=initialize_process_fnc,
+        job_entrypoint_fnc=_job_entrypoint,
+        session_end_fnc=None,
+        initialize_timeout=20.0,
+        close_timeout=10.0,
+        http_proxy=None,
+        mp_ctx=mp_ctx,
+        loop=asyncio.get_running_loop(),
+        user_arguments=start_args,
+    )
+    return zygote, start_args
+
+
+@pytest.mark.skipif(not ipc.zygote.is_supported(), reason="requires os.fork")
+async def test_zygote_forks_initialized_processes():
+    mp_ctx = mp.get_context("spawn")
+    zygote, start_args = _create_zygote(mp_ctx=mp_ctx, initialize_process_fnc=_initialize_proc)
+    await zygote.start()
+    assert zygote.alive
+
+    procs = []
+    for _ in range(2):
+        proc = ipc.zygote.ZygoteJobExecutor(
+            zygote=zygote,
+            initialize_process_fnc=_initialize_proc,
+            job_entrypoint_fnc=_job_entrypoint,
+            session_end_fnc=None,
+            inference_executor=None,
+            initialize_timeout=20.0,
+            close_timeout=10.0,
+            memory_warn_mb=0,
+            memory_limit_mb=0,
+            ping_interval=2.5,
+            ping_timeout=10.0,
+            high_ping_threshold=1.0,
+            http_proxy=None,
+            mp_ctx=mp_ctx,
+            loop=asyncio.get_running_loop(),
+        )
+        await proc.start()
+        await proc.initialize()
+        procs.append(proc)
+
+    # setup_fnc only ran once, inside the zygote
+    assert start_args.initialize_counter.value == 1
+    for proc in procs:
+        assert psutil.Process(proc.pid).ppid() == zygote.pid
+        await proc.launch_job(_generate_fake_job())
+
+    await asyncio.gather(*(proc.join() for proc in procs))
+    await zygote.aclose()
+
+    assert start_args.entrypoint_counter.value == 2
+    assert start_args.shutdown_counter.value == 2
+    for proc in procs:
+        assert proc.exitcode == 0
+        assert not proc.killed
+
+
+def _initialize_proc_with_thread(proc: JobProcess) -> None:
+    threading.Thread(target=time.sleep, args=(5.0,), daemon=True).start()
+
+
+@pytest.mark.skipif(not ipc.zygote.is_supported(), reason="requires os.fork")
+async def test_zygote_refuses_threads():
+    mp_ctx = mp.get_context("spawn")
+    zygote, _ = _create_zygote(mp_ctx=mp_ctx, initialize_process_fnc=_initialize_proc_with_thread)
+    with pytest.raises(RuntimeError, match="wouldn't survive fork"):
+        await zygote.start()
+
+    assert not zygote.alive
+
+
+async def test_shared_process_pool():
+    mp_ctx = mp.get_context("spawn")
+    pool = ipc.proc_pool.ProcPool(
+        initialize_process_fnc=_initialize_proc,
+        job_entrypoint_fnc=_job_entrypoint,
+        session_end_fnc=None,
+        num_idle_processes=0,
+        job_executor_type=job.JobExecutorType.SHARED_PROCESS,
+        max_jobs_per_process=2,
+        initialize_timeout=20.0,
+        close_timeout=20.0,
+        inference_executor=None,
+        memory_warn_mb=0,
+        memory_limit_mb=0,
+        http_proxy=None,
+        mp_ctx=mp_ctx,
+        loop=asyncio.get_running_loop(),
+    )
+
+    start_args = _new_start_args(mp_ctx)
+    start_args.entrypoint_simulate_work_time = 1.0
+    closed_q = asyncio.Queue()
+    executors: list[ipc.shared_proc_executor.SharedJobExecutor] = []
+
+    @pool.on("process_created")
+    def _process_created(proc: ipc.shared_proc_executor.SharedJobExecutor):
+        proc.user_arguments = start_args
+        executors.append(proc)
+
+    @pool.on("process_closed")
+    def _process_closed(proc: ipc.shared_proc_executor.SharedJobExecutor):
+        closed_q.put_nowait(proc)
+
+    await pool.start()
+
+    jobs_to_start = 3
+    await asyncio.gather(*(pool.launch_job(_generate_fake_job()) for _ in range(jobs_to_start)))
+
+    # 3 jobs with at most 2 jobs per process
+    pids = {proc.pid for proc in executors}
+    assert len(pids) == 2
+    assert start_args.initialize_counter.value == 2
+
+    await _wait_for_elements(closed_q, jobs_to_start)
+    await pool.aclose()
+
+    assert start_args.entrypoint_counter.value == jobs_to_start
+    assert start_args.shutdown_counter.value == jobs_to_start
+    for proc in executors:
+        assert proc.status == ipc.job_executor.JobStatus.SUCCESS
+        assert proc.resource_usage.cpu_time > 0
+
+    for pid in pids:
+        assert not psutil.pid_exists(pid)
+
+
+def _noop_initialize_proc(proc: JobProcess) -> None:
+    pass
+
+
+async def _crashing_job_entrypoint(job_ctx: JobContext) -> None:
+    if job_ctx.job.id.endswith("_crash"):
+        os._exit(1)
+
+    await asyncio.sleep(1.0)
+    job_ctx.shutdown("done")
+
+
+async def test_shared_process_crash_isolation():
+    mp_ctx = mp.get_context("spawn")
+    pool = ipc.proc_pool.ProcPool(
+        initialize_process_fnc=_noop_initialize_proc,
+        job_entrypoint_fnc=_crashing_job_entrypoint,
+        session_end_fnc=None,
+        num_idle_processes=0,
+        job_executor_type=job.JobExecutorType.SHARED_PROCESS,
+        max_jobs_per_process=1,
+        initialize_timeout=20.0,
+        close_timeout=20.0,
+        inference_executor=None,
+        memory_warn_mb=0,
+        memory_limit_mb=0,
+        http_proxy=None,
+        mp_ctx=mp_ctx,
+        loop=asyncio.get_running_loop(),
+    )
+    closed: dict[str, ipc.job_executor.JobStatus] = {}
+
+    @pool.on("process_closed")
+    def _process_closed(proc: ipc.shared_proc_executor.SharedJobExecutor):
+        closed[proc.running_job.job.id] = proc.status
+
+    await pool.start()
+
+    crash_job, ok_job = _generate_fake_job(), _generate_fake_job()
+    crash_job.job.id += "_crash"
+    await asyncio.gather(pool.launch_job(crash_job), pool.launch_job(ok_job))
+
+    while len(closed) < 2:
+        await asyncio.sleep(0.1)
+
+    await pool.aclose()
+
+    assert closed[crash_job.job.id] == ipc.job_executor.JobStatus.FAILED
+    assert closed[ok_job.job.id] == ipc.job_executor.JobStatus.SUCCESS
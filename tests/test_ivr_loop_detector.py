@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import pytest
+
+from livekit.agents.voice.ivr.ivr_activity import TfidfLoopDetector
+
+MENU = "For billing press one, for technical support press two, to repeat this menu press nine."
+
+
+def test_loop_detection() -> None:
+    detector = TfidfLoopDetector(window_size=5, consecutive_threshold=2)
+
+    detector.add_chunk("Welcome to the support line.")
+    assert not detector.check_loop_detection()
+
+    detector.add_chunk(MENU)
+    assert not detector.check_loop_detection()
+
+    detector.add_chunk("Please hold while we transfer your call.")
+    assert not detector.check_loop_detection()
+
+    detector.add_chunk(MENU)
+    assert not detector.check_loop_detection()  # first repetition
+
+    detector.add_chunk(MENU.upper())
+    assert detector.check_loop_detection()
+
+    detector.reset()
+    detector.add_chunk(MENU)
+    assert not detector.check_loop_detection()
+
+
+def test_window_eviction() -> None:
+    detector = TfidfLoopDetector(window_size=2, consecutive_threshold=1)
+    detector.add_chunk(MENU)
+    detector.add_chunk("Please hold while we transfer your call.")
+    detector.add_chunk(MENU)
+
+    # the first menu left the window
+    assert not detector.check_loop_detection()
+    assert "billing" in detector._document_freqs
+    assert detector._document_freqs["billing"] == 1
+
+
+def test_similarity_matches_sklearn() -> None:
+    text = pytest.importorskip("sklearn.feature_extraction.text")
+    pairwise = pytest.importorskip("sklearn.metrics.pairwise")
+
+    chunks = [
+        "Welcome to the support line.",
+        MENU,
+        "I'm sorry, I didn't get that.",
+        "For billing press one, for sales press two.",
+        "Please hold while we transfer your call to billing.",
+        MENU,
+        "",
+        "I'm sorry, I didn't get that, please try again.",
+    ]
+
+    detector = TfidfLoopDetector(window_size=4)
+    for i, chunk in enumerate(chunks):
+        detector.add_chunk(chunk)
+        window = chunks[max(0, i - 3) : i + 1]
+        if len(window) < 2:
+            continue
+
+        doc_matrix = text.TfidfVectorizer().fit_transform(window)
+        expected = pairwise.cosine_similarity(doc_matrix)[-1][:-1].max()
+        assert detector._max_similarity() == pytest.approx(expected)
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from livekit.agents import APIConnectionError
+from livekit.agents.llm import ChatContext, FallbackAdapter, HedgingOptions, LLMStream
+from livekit.agents.utils.hedging import MIN_TTFB_SAMPLES, HedgingPolicy
+
+from .fake_llm import FakeLLM, FakeLLMResponse, FakeLLMStream
+
+
+class FailingLLM(FakeLLM):
+    def chat(self, **kwargs) -> LLMStream:  # type: ignore[override]
+        return FailingLLMStream(
+            self, chat_ctx=kwargs["chat_ctx"], tools=[], conn_options=kwargs["conn_options"]
+        )
+
+
+class FailingLLMStream(FakeLLMStream):
+    async def _run(self) -> None:
+        raise APIConnectionError("fake failure", retryable=False)
+
+
+def _llm(content: str, ttft: float) -> FakeLLM:
+    return FakeLLM(
+        fake_responses=[FakeLLMResponse(input="hello", content=content, ttft=ttft, duration=ttft)]
+    )
+
+
+async def _generate(adapter: FallbackAdapter) -> str:
+    chat_ctx = ChatContext.empty()
+    chat_ctx.add_message(role="user", content="hello")
+    text = ""
+    async with adapter.chat(chat_ctx=chat_ctx) as stream:
+        async for chunk in stream:
+            if chunk.delta and chunk.delta.content:
+                text += chunk.delta.content
+    return text
+
+
+async def test_fallback_on_error() -> None:
+    adapter = FallbackAdapter([FailingLLM(), _llm("from secondary", 0.01)])
+    assert await _generate(adapter) == "from secondary"
+    assert not adapter._status[0].available
+    await adapter.aclose()
+
+
+async def test_hedging_with_slow_primary() -> None:
+    adapter = FallbackAdapter(
+        [_llm("from primary", 2.0), _llm("from secondary", 0.05)],
+        hedging=HedgingOptions(delay=0.1),
+    )
+
+    started_at = time.perf_counter()
+    assert await _generate(adapter) == "from secondary"
+    assert time.perf_counter() - started_at < 1.0
+
+    # the slow LLM isn't considered as unavailable
+    assert all(status.available for status in adapter._status)
+
+    # the cancelled request of the slow LLM is recorded with its elapsed time
+    assert adapter._hedging is not None
+    assert list(adapter._hedging._ttfb[0]) == [pytest.approx(0.15, abs=0.1)]
+    assert len(adapter._hedging._ttfb[1]) == 1
+    await adapter.aclose()
+
+
+async def test_no_hedging_with_fast_primary() -> None:
+    adapter = FallbackAdapter(
+        [_llm("from primary", 0.05), _llm("from secondary", 0.01)],
+        hedging=HedgingOptions(delay=0.2),
+    )
+    assert await _generate(adapter) == "from primary"
+    await adapter.aclose()
+
+
+async def test_hedging_budget() -> None:
+    adapter = FallbackAdapter(
+        [_llm("from primary", 0.3), _llm("from secondary", 0.01)],
+        hedging=HedgingOptions(delay=0.05, max_hedge_ratio=0.0),
+    )
+    assert await _generate(adapter) == "from secondary"
+    # the budget is exhausted, wait for the primary
+    assert await _generate(adapter) == "from primary"
+    await adapter.aclose()
+
+
+def test_hedging_policy_delay() -> None:
+    policy = HedgingPolicy(HedgingOptions(quantile=0.9, min_delay=0.1, max_delay=2.0))
+    assert policy.delay(0) == 2.0
+
+    for i in range(MIN_TTFB_SAMPLES * 2):
+        policy.record_ttfb(0, 0.3 if i % 10 else 1.0)
+    assert policy.delay(0) == pytest.approx(0.3)
+
+    for _ in range(MIN_TTFB_SAMPLES):
+        policy.record_ttfb(1, 0.01)
+    assert policy.delay(1) == 0.1
+
+    with pytest.raises(ValueError):
+        HedgingOptions(quantile=0)
+
+
+def test_hedging_policy_cancelled_requests() -> None:
+    policy = HedgingPolicy(HedgingOptions(quantile=0.9, min_delay=0.1, max_delay=3.0))
+    for _ in range(MIN_TTFB_SAMPLES):
+        policy.record_ttfb(0, 2.0)
+    assert policy.delay(0) == pytest.approx(2.0)
+
+    # the primary is mostly slow, its slow requests are cancelled once the hedge answered and
+    # only its fast answers are received
+    for i in range(500):
+        if i % 5 == 0:
+            policy.record_ttfb(0, 0.3)
+        else:
+            policy.record_cancelled(0, policy.delay(0) + 0.1)
+    assert policy.delay(0) >= 2.0
+
+    # a request cancelled before the delay is over doesn't lower it
+    for _ in range(MIN_TTFB_SAMPLES):
+        policy.record_ttfb(1, 1.0)
+    for _ in range(100):
+        policy.record_cancelled(1, 0.2)
+    assert policy.delay(1) == pytest.approx(1.0)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from livekit.agents.job import _JobContextVar
+from livekit.agents.telemetry.loop_monitor import LoopMonitor, _attribution
+
+
+def _blocking_code() -> None:
+    time.sleep(0.3)
+
+
+async def test_slow_callback_is_reported(monkeypatch) -> None:
+    reports: list[tuple[dict[str, str], float, list[str] | None]] = []
+
+    def _report(self, handle, duration, stack) -> None:
+        reports.append((_attribution(handle), duration, stack))
+
+    monkeypatch.setattr(LoopMonitor, "_report_slow_callback", _report)
+
+    monitor = LoopMonitor(slow_callback_threshold=0.1)
+    monitor.start(asyncio.get_running_loop())
+    try:
+
+        async def _job_task() -> None:
+            _JobContextVar.set(SimpleNamespace(job=SimpleNamespace(id="job_1")))  # type: ignore
+            await asyncio.sleep(0)
+            _blocking_code()
+
+        await asyncio.create_task(_job_task(), name="job_task")
+
+        # callbacks faster than the threshold aren't reported
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+    finally:
+        monitor.stop()
+
+    assert len(reports) == 1
+    attrs, duration, stack = reports[0]
+    assert duration >= 0.3
+    assert attrs == {"job_id": "job_1", "task_name": "job_task"}
+    assert stack is not None
+    assert "_blocking_code" in "".join(stack)
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+import pytest
+
+lk_mcp = pytest.importorskip("livekit.agents.llm.mcp", exc_type=ImportError)
+
+import anyio  # noqa: E402
+from mcp.server.fastmcp import FastMCP  # noqa: E402
+from mcp.shared.memory import create_client_server_memory_streams  # noqa: E402
+
+from livekit.agents.llm.tool_context import get_raw_function_info  # noqa: E402
+
+
+def _fast_mcp() -> FastMCP:
+    server = FastMCP("test")
+
+    @server.tool()
+    def add(a: int, b: int) -> int:
+        """Add two numbers"""
+        return a + b
+
+    return server
+
+
+class MemoryMCPServer(lk_mcp.MCPServer):
+    def __init__(
+        self, server: FastMCP, connection_manager: lk_mcp.MCPConnectionManager | None = None
+    ) -> None:
+        super().__init__(client_session_timeout_seconds=5, connection_manager=connection_manager)
+        self._server = server
+        self.num_connections = 0
+
+    def _connection_key(self) -> Any:
+        return (type(self), id(self._server))
+
+    @asynccontextmanager
+    async def client_streams(self) -> AsyncIterator[Any]:  # type: ignore[override]
+        self.num_connections += 1
+        lowlevel = self._server._mcp_server
+        async with create_client_server_memory_streams() as (client_streams, server_streams):
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(
+                    lambda: lowlevel.run(
+                        server_streams[0],
+                        server_streams[1],
+                        lowlevel.create_initialization_options(),
+                    )
+                )
+                yield client_streams
+                tg.cancel_scope.cancel()
+
+
+async def _connect(server: MemoryMCPServer) -> list[lk_mcp.MCPTool]:
+    await server.initialize()
+    return await server.list_tools()
+
+
+async def test_shared_connection() -> None:
+    manager = lk_mcp.MCPConnectionManager(idle_timeout=0)
+    fast_mcp = _fast_mcp()
+    first = MemoryMCPServer(fast_mcp, manager)
+    second = MemoryMCPServer(fast_mcp, manager)
+
+    first_tools, second_tools = await asyncio.gather(_connect(first), _connect(second))
+    assert [get_raw_function_info(t).name for t in first_tools] == ["add"]
+    assert [get_raw_function_info(t).name for t in second_tools] == ["add"]
+
+    # a single session was initialized and the tools were listed once
+    assert first.num_connections + second.num_connections == 1
+    assert first._conn is second._conn
+    assert first._conn.tools_version == 1
+
+    second.invalidate_cache()
+    await second.list_tools()
+    assert second._conn.tools_version == 2
+
+    # the connection is kept open while it is used
+    conn = first._conn
+    await first.aclose()
+    assert not conn.closed
+    assert "3" in await second_tools[0](raw_arguments={"a": 1, "b": 2})
+
+    await second.aclose()
+    await asyncio.sleep(0.1)
+    assert conn.closed
+
+    third = MemoryMCPServer(fast_mcp, manager)
+    await _connect(third)
+    assert third.num_connections == 1
+    await third.aclose()
+    await manager.aclose()
+
+
+async def test_tools_ttl() -> None:
+    manager = lk_mcp.MCPConnectionManager(tools_ttl=0.1)
+    server = MemoryMCPServer(_fast_mcp(), manager)
+    tools = await _connect(server)
+    assert await server.list_tools() is tools
+
+    await asyncio.sleep(0.2)
+    assert await server.list_tools() is not tools
+    assert server._conn.tools_version == 2
+
+    await server.aclose()
+    await manager.aclose()
+
+
+async def test_unshared_server() -> None:
+    server = MemoryMCPServer(_fast_mcp())
+    tools = await _connect(server)
+    assert [get_raw_function_info(t).name for t in tools] == ["add"]
+    await server.aclose()
+    assert not server.initialized
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from livekit import rtc
+from livekit.agents.stt import SpeechData, SpeechEvent, SpeechEventType
+from livekit.agents.stt.multi_speaker_adapter import (
+    PrimarySpeakerDetectionOptions,
+    _PrimarySpeakerDetector,
+)
+
+SAMPLE_RATE = 16000
+
+
+def _push(detector: _PrimarySpeakerDetector, samples: np.ndarray) -> None:
+    # frames of uneven sizes, not aligned with the RMS frames
+    rng = np.random.default_rng(0)
+    i = 0
+    while i < len(samples):
+        chunk = samples[i : i + int(rng.integers(100, 900))]
+        detector.push_audio(
+            rtc.AudioFrame(
+                data=chunk.tobytes(),
+                sample_rate=SAMPLE_RATE,
+                num_channels=1,
+                samples_per_channel=len(chunk),
+            )
+        )
+        i += len(chunk)
+
+
+def _final(speaker_id: str, start_time: float, end_time: float) -> SpeechEvent:
+    return SpeechEvent(
+        type=SpeechEventType.FINAL_TRANSCRIPT,
+        alternatives=[
+            SpeechData(
+                language="en",
+                text="hello",
+                speaker_id=speaker_id,
+                start_time=start_time,
+                end_time=end_time,
+            )
+        ],
+    )
+
+
+def test_rms_buffer() -> None:
+    detector = _PrimarySpeakerDetector(
+        primary_detection_options=PrimarySpeakerDetectionOptions(rms_buffer_duration=5.0)
+    )
+
+    rng = np.random.default_rng(1)
+    frame_size = SAMPLE_RATE // 10
+    # the level increases with every RMS frame
+    levels = np.repeat(np.arange(1, 121) * 50, frame_size)
+    samples = (rng.standard_normal(len(levels)) * levels).astype(np.int16)
+    _push(detector, samples)
+    detector._process_pending()
+
+    squares = samples.reshape(-1, frame_size).astype(np.float32) ** 2
+    expected = np.sqrt(np.mean(squares, axis=1))[-50:]
+    assert detector._pushed_duration == pytest.approx(12.0)
+    np.testing.assert_array_equal(detector._rms_buffer.values, expected)
+
+    assert detector._get_rms_for_timerange(8.0, 10.0) == pytest.approx(
+        float(np.median(expected[9:30]))
+    )
+    # out of the retained audio
+    assert detector._get_rms_for_timerange(1.0, 2.0) is None
+
+
+def test_primary_speaker() -> None:
+    detector = _PrimarySpeakerDetector(suppress_background_speaker=True)
+
+    rng = np.random.default_rng(2)
+    noise = rng.standard_normal(SAMPLE_RATE * 2)
+    _push(detector, (noise * 3000).astype(np.int16))
+    ev = detector.on_stt_event(_final("speaker_1", 0.0, 2.0))
+    assert ev is not None and ev.alternatives[0].is_primary_speaker
+
+    # a quieter speaker is suppressed, the pending audio is processed on final transcripts
+    _push(detector, (noise[: SAMPLE_RATE // 2] * 500).astype(np.int16))
+    assert detector.on_stt_event(_final("speaker_2", 2.0, 2.5)) is None
+
+    # a louder speaker becomes the primary speaker
+    _push(detector, (noise * 10000).astype(np.int16))
+    ev = detector.on_stt_event(_final("speaker_2", 2.5, 4.5))
+    assert ev is not None and ev.alternatives[0].is_primary_speaker
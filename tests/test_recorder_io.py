@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import threading
+from typing import Literal
+
+import av
+import numpy as np
+import pytest
+
+from livekit import rtc
+from livekit.agents import Agent
+from livekit.agents.voice.recorder_io import (
+    MemoryRecordingSink,
+    RecorderIO,
+    RecordingOptions,
+    StreamingUploadSink,
+)
+
+from .fake_io import FakeAudioInput, FakeAudioOutput
+from .fake_session import FakeActions, create_session, run_session
+
+
+class _LocalUploadSink(StreamingUploadSink):
+    def __init__(self, *, upload_delay: float = 0.0, max_buffered_bytes: int = 1024**2) -> None:
+        super().__init__(max_buffered_bytes=max_buffered_bytes)
+        self.uploaded: list[bytes] = []
+        self.finalized = False
+        self.max_buffered_bytes = 0
+        self._upload_delay = upload_delay
+
+    async def upload_chunk(self, data: bytes) -> None:
+        self.max_buffered_bytes = max(self.max_buffered_bytes, self.buffered_bytes)
+        await asyncio.sleep(self._upload_delay)
+        self.uploaded.append(data)
+
+    async def finalize(self) -> None:
+        self.finalized = True
+
+
+def _sine_frame(duration: float, sample_rate: int) -> rtc.AudioFrame:
+    num_samples = int(duration * sample_rate)
+    t = np.arange(num_samples) / sample_rate
+    data = (np.sin(2 * np.pi * 440 * t) * 8000).astype(np.int16)
+    return rtc.AudioFrame(
+        data=data.tobytes(),
+        sample_rate=sample_rate,
+        num_channels=1,
+        samples_per_channel=num_samples,
+    )
+
+
+def _decode(data: bytes) -> tuple[int, float]:
+    with av.open(io.BytesIO(data), mode="r", format="ogg") as container:
+        stream = container.streams.audio[0]
+        num_samples = 0
+        for frame in container.decode(stream):
+            num_samples += frame.samples
+
+        return stream.channels, num_samples / stream.rate
+
+
+@pytest.mark.parametrize("channels", ["stereo", "mono"])
+async def test_recording_is_streamed_to_sinks(channels: Literal["stereo", "mono"]) -> None:
+    recorder = RecorderIO(agent_session=None, channels=channels, page_duration=0.2)  # type: ignore
+    audio_input = recorder.record_input(FakeAudioInput())
+    audio_output = recorder.record_output(FakeAudioOutput())
+
+    memory_sink = MemoryRecordingSink()
+    upload_sink = _LocalUploadSink()
+    await recorder.start(sinks=[memory_sink, upload_sink])
+
+    source = audio_input.source
+    assert isinstance(source, FakeAudioInput)
+    for _ in range(10):
+        source.push(_sine_frame(0.1, 16000))
+        await audio_input.__anext__()
+
+    await audio_output.capture_frame(_sine_frame(1.0, 24000))
+    audio_output.on_playback_finished(playback_position=1.0, interrupted=False)
+
+    # the encoded pages are delivered while the recorder is still running
+    for _ in range(100):
+        if memory_sink.chunks:
+            break
+        await asyncio.sleep(0.01)
+
+    assert memory_sink.chunks
+    assert recorder.recording
+
+    await recorder.aclose()
+
+    assert memory_sink.closed
+    assert upload_sink.finalized
+    assert b"".join(upload_sink.uploaded) == memory_sink.data
+
+    num_channels, duration = _decode(memory_sink.data)
+    assert num_channels == (2 if channels == "stereo" else 1)
+    assert duration == pytest.approx(1.0, abs=0.05)
+
+
+async def test_recording_to_file(tmp_path) -> None:
+    recorder = RecorderIO(agent_session=None)  # type: ignore
+    recorder.record_input(FakeAudioInput())
+    audio_output = recorder.record_output(FakeAudioOutput())
+
+    output_path = tmp_path / "audio.ogg"
+    await recorder.start(output_path=output_path)
+    assert recorder.output_path == output_path
+
+    await audio_output.capture_frame(_sine_frame(0.5, 48000))
+    audio_output.on_playback_finished(playback_position=0.5, interrupted=False)
+    await recorder.aclose()
+
+    num_channels, duration = _decode(output_path.read_bytes())
+    assert num_channels == 2
+    assert duration == pytest.approx(0.5, abs=0.05)
+
+
+async def test_slow_upload_sink() -> None:
+    sink = _LocalUploadSink(upload_delay=0.005, max_buffered_bytes=1000)
+    await sink.start()
+
+    # the spill file is read off the event loop
+    read_spilled = sink._read_spilled
+    read_threads: set[threading.Thread] = set()
+
+    def _read_spilled() -> bytes:
+        read_threads.add(threading.current_thread())
+        return read_spilled()
+
+    sink._read_spilled = _read_spilled  # type: ignore[method-assign]
+
+    # the encoder writes faster than the upload, the backlog is spilled to disk
+    chunks = [bytes([i]) * 300 for i in range(40)]
+
+    def _encode() -> None:
+        for chunk in chunks:
+            sink.write(chunk)
+        sink.close()
+
+    await asyncio.to_thread(_encode)
+    assert sink.buffered_bytes <= 1000
+    assert sink._spill_file is not None
+
+    await sink.aclose()
+    assert sink.uploaded == chunks
+    assert sink.max_buffered_bytes <= 1000
+    assert sink.finalized
+    assert sink._spill_file is None
+    assert read_threads and threading.main_thread() not in read_threads
+
+
+async def test_session_recording_options() -> None:
+    actions = FakeActions()
+    actions.add_user_speech(0.5, 2.5, "Hello, how are you?")
+    actions.add_llm("I'm doing well, thank you!")
+    actions.add_tts(2.0)
+
+    session = create_session(actions, speed_factor=5.0)
+    upload_sink = _LocalUploadSink()
+    options = RecordingOptions(sinks=[upload_sink], channels="mono", page_duration=0.2)
+    await asyncio.wait_for(
+        run_session(session, Agent(instructions="You are a helpful assistant."), record=options),
+        timeout=60.0,
+    )
+
+    # without a job context, the recording is only sent to the given sinks
+    assert session._recorder_io is not None
+    assert session._recorder_io.output_path is None
+    assert not session._recorder_io.recording
+    assert upload_sink.finalized
+
+    num_channels, duration = _decode(b"".join(upload_sink.uploaded))
+    assert num_channels == 1
+    assert duration > 0
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from livekit import rtc
+from livekit.agents.voice.transcription._speaking_rate import (
+    SpeakingRateDetector,
+    SpeakingRateEvent,
+)
+
+
+def _reference_rate(audio: np.ndarray, sample_rate: int, silence_threshold: float) -> float:
+    audio_sq = audio**2
+    if np.sqrt(np.mean(audio_sq)) < silence_threshold:
+        return 0.0
+
+    tail_audio_sq = audio_sq[int(len(audio_sq) * 0.7) :]
+    if len(tail_audio_sq) > 0 and np.sqrt(np.mean(tail_audio_sq)) < silence_threshold * 0.5:
+        return 0.0
+
+    frame_length = int(sample_rate * 0.025)
+    hop_length = frame_length // 2
+    window = np.hanning(frame_length)
+    scale_factor = 1.0 / np.sqrt(np.sum(window**2))
+    num_frames = (len(audio) - frame_length) // hop_length + 1
+
+    magnitudes = []
+    for i in range(num_frames):
+        frame = audio[i * hop_length : i * hop_length + frame_length]
+        magnitudes.append(np.abs(np.fft.rfft(frame * window) * scale_factor))
+
+    flux = [np.sum(np.abs(magnitudes[i] - magnitudes[i - 1])) for i in range(1, num_frames)]
+    return float(np.mean(flux)) if flux else 0.0
+
+
+def _reference_events(
+    samples: np.ndarray, sample_rate: int, window_size: float, step_size: float
+) -> list[SpeakingRateEvent]:
+    audio = np.divide(samples, np.iinfo(np.int16).max, dtype=np.float32)
+    window_samples = int(window_size * sample_rate)
+    step_samples = int(step_size * sample_rate)
+
+    events = []
+    timestamp = window_size / 2
+    start = 0
+    while len(audio) - start >= window_samples:
+        sr = _reference_rate(audio[start : start + window_samples], sample_rate, 0.005)
+        events.append(SpeakingRateEvent(timestamp=timestamp, speaking=sr > 0, speaking_rate=sr))
+        timestamp += step_size
+        start += step_samples
+
+    # flush
+    if len(audio) - start > window_samples * 0.5:
+        sr = _reference_rate(audio[start:], sample_rate, 0.005)
+        timestamp += (len(audio) - start) / sample_rate
+        events.append(SpeakingRateEvent(timestamp=timestamp, speaking=sr > 0, speaking_rate=sr))
+
+    return events
+
+
+@pytest.mark.parametrize("sample_rate", [16000, 24000, 44100])
+async def test_speaking_rate_stream(sample_rate: int) -> None:
+    rng = np.random.default_rng(0)
+    duration = 3.37
+    t = np.arange(int(duration * sample_rate)) / sample_rate
+    # bursts of noise separated by silences
+    envelope = (np.sin(2 * np.pi * 3 * t) > 0) * (t < 2.5)
+    samples = (rng.standard_normal(len(t)) * 3000 * envelope).astype(np.int16)
+
+    stream = SpeakingRateDetector(window_size=1.0, step_size=0.1).stream()
+    frame_size = sample_rate // 100
+    for i in range(0, len(samples), frame_size):
+        chunk = samples[i : i + frame_size]
+        stream.push_frame(
+            rtc.AudioFrame(
+                data=chunk.tobytes(),
+                sample_rate=sample_rate,
+                num_channels=1,
+                samples_per_channel=len(chunk),
+            )
+        )
+    stream.end_input()
+
+    events = [ev async for ev in stream]
+    expected = _reference_events(samples, sample_rate, window_size=1.0, step_size=0.1)
+    assert len(events) == len(expected)
+    assert any(ev.speaking for ev in events) and not all(ev.speaking for ev in events)
+    assert events == expected
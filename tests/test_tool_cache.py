@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from livekit.agents.llm import ToolCacheOptions, function_tool
+from livekit.agents.llm.tool_context import _ToolResultCache, get_function_info
+
+
+async def _lookup() -> None:
+    pass
+
+
+async def _other_lookup() -> None:
+    pass
+
+
+class _Store:
+    async def hours(self) -> None:
+        pass
+
+
+def test_cache_key_normalizes_arguments() -> None:
+    opts = ToolCacheOptions()
+    assert opts._make_key(_lookup, "f", '{"a": 1, "b": "x"}') == opts._make_key(
+        _lookup, "f", '{"b":"x","a":1}'
+    )
+    assert opts._make_key(_lookup, "f", '{"a": 1}') != opts._make_key(_lookup, "g", '{"a": 1}')
+
+    opts = ToolCacheOptions(key_fnc=lambda args: args["city"].lower())
+    assert opts._make_key(_lookup, "f", '{"city": "Paris"}') == opts._make_key(
+        _lookup, "f", '{"city": "paris"}'
+    )
+
+
+def test_cache_key_identifies_the_tool() -> None:
+    opts = ToolCacheOptions()
+    # different tools with the same name
+    assert opts._make_key(_lookup, "f", "{}") != opts._make_key(_other_lookup, "f", "{}")
+
+    # the methods of an instance share their results within a session, not across instances
+    first, second = _Store(), _Store()
+    assert opts._make_key(first.hours, "hours", "{}") == opts._make_key(first.hours, "hours", "{}")
+    assert opts._make_key(first.hours, "hours", "{}") != opts._make_key(second.hours, "hours", "{}")
+
+    global_opts = ToolCacheOptions(scope="global")
+    assert global_opts._make_key(first.hours, "hours", "{}") == global_opts._make_key(
+        second.hours, "hours", "{}"
+    )
+
+
+def test_function_tool_cache_option() -> None:
+    @function_tool(cache=True)
+    async def store_hours() -> str:
+        """Get the opening hours of the store."""
+        return "9am-5pm"
+
+    info = get_function_info(store_hours)
+    assert info.cache == ToolCacheOptions()
+
+
+async def test_concurrent_calls_are_coalesced() -> None:
+    cache = _ToolResultCache()
+    calls = 0
+
+    async def _lookup() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return "result"
+
+    results = await asyncio.gather(
+        *(cache.get_or_run("k", ttl=60, fnc=_lookup, cacheable=lambda _: True) for _ in range(3))
+    )
+    assert calls == 1
+    assert sorted(r for _, r in results) == ["coalesced", "coalesced", "miss"]
+    assert all(value == "result" for value, _ in results)
+
+    assert await cache.get_or_run("k", ttl=60, fnc=_lookup, cacheable=lambda _: True) == (
+        "result",
+        "hit",
+    )
+    assert calls == 1
+
+
+async def test_cache_expiration_and_errors() -> None:
+    cache = _ToolResultCache()
+
+    async def _fail() -> str:
+        raise ValueError("backend unavailable")
+
+    with pytest.raises(ValueError):
+        await cache.get_or_run("k", ttl=60, fnc=_fail, cacheable=lambda _: True)
+
+    async def _lookup() -> str:
+        return "result"
+
+    # errors aren't cached
+    _, result = await cache.get_or_run("k", ttl=0.05, fnc=_lookup, cacheable=lambda _: True)
+    assert result == "miss"
+
+    await asyncio.sleep(0.1)
+    _, result = await cache.get_or_run("k", ttl=0.05, fnc=_lookup, cacheable=lambda _: True)
+    assert result == "miss"
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import pytest
+
+from livekit.agents import RunContext, function_tool
+from livekit.agents.llm import utils
+
+
+@function_tool
+async def get_weather(
+    location: str,
+    unit: str = "celsius",
+    days: Optional[int] = None,  # noqa: UP045, evaluated by get_type_hints on python 3.9
+) -> str:
+    """Get the weather
+
+    Args:
+        location: The city
+        unit: The temperature unit
+    """
+    return location
+
+
+class WeatherAgent:
+    @function_tool
+    async def forecast(self, ctx: RunContext, location: str) -> str:
+        """Get the forecast"""
+        return location
+
+
+def test_schemas_are_built_once() -> None:
+    strict = utils.build_strict_openai_schema(get_weather)
+    assert strict["function"]["name"] == "get_weather"
+    assert strict["function"]["parameters"]["required"] == ["location", "unit", "days"]
+
+    again = utils.build_strict_openai_schema(get_weather)
+    assert again == strict and again is not strict
+    assert again["function"]["parameters"] is strict["function"]["parameters"]
+
+    legacy = utils.build_legacy_openai_schema(get_weather, internally_tagged=True)
+    assert legacy["name"] == "get_weather"
+    assert "additionalProperties" not in legacy["parameters"]
+    unwrapped = utils.build_legacy_openai_schema(get_weather)
+    assert unwrapped["function"]["parameters"] is legacy["parameters"]
+    assert utils.function_arguments_to_pydantic_model(get_weather) is (
+        utils.function_arguments_to_pydantic_model(get_weather)
+    )
+
+    # the bound methods of every instance share the same artifacts
+    first, second = WeatherAgent(), WeatherAgent()
+    first_schema = utils.build_legacy_openai_schema(first.forecast)
+    second_schema = utils.build_legacy_openai_schema(second.forecast)
+    assert first_schema["function"]["parameters"] is second_schema["function"]["parameters"]
+
+
+def test_prepare_arguments() -> None:
+    args, kwargs = utils.prepare_function_arguments(
+        fnc=get_weather, json_arguments='{"location": "Paris", "unit": null, "days": null}'
+    )
+    assert (args, kwargs) == (("Paris", "celsius", None), {})
+
+    with pytest.raises(ValueError):
+        utils.prepare_function_arguments(fnc=get_weather, json_arguments='{"location": null}')
+
+    agent = WeatherAgent()
+    call_ctx: Any = object()
+    args, _ = utils.prepare_function_arguments(
+        fnc=agent.forecast, json_arguments='{"location": "Paris"}', call_ctx=call_ctx
+    )
+    assert args == (call_ctx, "Paris")
+
+
+def test_invalidate_function_tools() -> None:
+    @function_tool
+    async def lookup(query: str) -> str:
+        """Lookup something"""
+        return query
+
+    schema = utils.build_legacy_openai_schema(lookup)["function"]["parameters"]
+    assert schema["properties"]["query"]["type"] == "string"
+
+    lookup.__annotations__["query"] = "int"
+    assert utils.build_legacy_openai_schema(lookup)["function"]["parameters"] is schema
+
+    utils.invalidate_function_tools([lookup])
+    schema = utils.build_legacy_openai_schema(lookup)["function"]["parameters"]
+    assert schema["properties"]["query"]["type"] == "integer"
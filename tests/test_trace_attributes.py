@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.trace import NonRecordingSpan, SpanContext
+
+from livekit.agents.telemetry import AttributePolicy, set_lazy_attribute, trace_types, traces
+
+
+@pytest.fixture
+def policies(monkeypatch):
+    policies: dict[str, AttributePolicy] = {}
+    monkeypatch.setattr(traces, "_attribute_policies", policies)
+    return policies
+
+
+def test_lazy_attribute_not_computed_without_recording(policies) -> None:
+    span = NonRecordingSpan(SpanContext(trace_id=1, span_id=1, is_remote=False))
+
+    def _value() -> str:
+        raise AssertionError("the value must not be computed")
+
+    set_lazy_attribute(span, trace_types.ATTR_CHAT_CTX, _value)
+
+
+def test_lazy_attribute_size_cap(policies) -> None:
+    policies[trace_types.ATTR_CHAT_CTX] = AttributePolicy(max_size=10)
+    tracer = TracerProvider().get_tracer("test")
+
+    with tracer.start_as_current_span("test") as span:
+        set_lazy_attribute(span, trace_types.ATTR_CHAT_CTX, lambda: "x" * 100)
+        set_lazy_attribute(span, trace_types.ATTR_FUNCTION_TOOL_ARGS, lambda: "y" * 100)
+
+    assert span.attributes[trace_types.ATTR_CHAT_CTX] == "x" * 10 + traces._TRUNCATED_SUFFIX
+    assert span.attributes[trace_types.ATTR_FUNCTION_TOOL_ARGS] == "y" * 100
+
+
+def test_lazy_attribute_sampling(policies) -> None:
+    policies[trace_types.ATTR_CHAT_CTX] = AttributePolicy(sample_rate=0.5)
+    tracer = TracerProvider().get_tracer("test")
+
+    sampled = 0
+    for _ in range(200):
+        with tracer.start_as_current_span("parent") as parent:
+            set_lazy_attribute(parent, trace_types.ATTR_CHAT_CTX, lambda: "ctx")
+            with tracer.start_as_current_span("child") as child:
+                set_lazy_attribute(child, trace_types.ATTR_CHAT_CTX, lambda: "ctx")
+
+        # decided per trace
+        in_parent = trace_types.ATTR_CHAT_CTX in parent.attributes
+        assert in_parent == (trace_types.ATTR_CHAT_CTX in child.attributes)
+        sampled += in_parent
+
+    assert 50 < sampled < 150
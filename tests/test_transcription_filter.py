@@ -1,6 +1,14 @@
 import pytest
 
-from livekit.agents.voice.transcription.filters import filter_emoji, filter_markdown
+from livekit.agents.voice.transcription.filters import (
+    MarkdownFilter,
+    TextReplacer,
+    TextTransform,
+    TextTransformStream,
+    apply_text_transforms,
+    filter_emoji,
+    filter_markdown,
+)
 
 MARKDOWN_INPUT = """# Mathematics and Markdown Guide
 
@@ -240,3 +248,59 @@ async def test_emoji_filter(chunk_size: int):
     assert result == EMOJI_EXPECTED_OUTPUT
 
     print("\n=== EMOJI TEST COMPLETE ===")
+
+
+async def _transform(text: str, transforms: list, chunk_size: int) -> str:
+    async def stream_text():
+        for i in range(0, len(text), chunk_size):
+            yield text[i : i + chunk_size]
+
+    return "".join([chunk async for chunk in apply_text_transforms(stream_text(), transforms)])
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 50])
+async def test_text_replacer(chunk_size: int):
+    replacer = TextReplacer({"LiveKit": "Live Kit", "Live": "live", "SIP": "sip"})
+    text = "**LiveKit** supports SIP, Live streams and LiveKi."
+    assert (
+        await _transform(text, ["filter_markdown", replacer], chunk_size)
+        == "Live Kit supports sip, live streams and liveKi."
+    )
+
+
+async def test_custom_transform():
+    class _Upper(TextTransform):
+        def stream(self) -> TextTransformStream:
+            return _UpperStream()
+
+    class _UpperStream(TextTransformStream):
+        def push(self, text: str) -> str:
+            return text.upper()
+
+    text = "Hello *world* 😀!"
+    assert await _transform(text, ["filter_markdown", "filter_emoji", _Upper()], 3) == (
+        "HELLO WORLD !"
+    )
+
+    with pytest.raises(ValueError):
+        await _transform(text, ["filter_unknown"], 3)
+
+
+async def test_markdown_lookahead():
+    # an unmatched "*" holds the text until the end of the line
+    text = "3 * 4 is twelve, and it is more than ten." * 3
+    pushed = 0
+
+    async def stream_text():
+        nonlocal pushed
+        for i in range(0, len(text), 4):
+            pushed = i + 4
+            yield text[i : i + 4]
+
+    outputs = []
+    async for chunk in apply_text_transforms(stream_text(), [MarkdownFilter(max_lookahead=32)]):
+        outputs.append((pushed, chunk))
+
+    assert "".join(chunk for _, chunk in outputs) == text
+    # the text is released before the end of the line
+    assert outputs[0][0] <= 40
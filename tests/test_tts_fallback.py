@@ -2,16 +2,17 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import time
 
 import pytest
 
 from livekit import rtc
 from livekit.agents import APIConnectionError, APIConnectOptions, APIError, utils
-from livekit.agents.tts import TTS, AvailabilityChangedEvent, FallbackAdapter
+from livekit.agents.tts import TTS, AvailabilityChangedEvent, FallbackAdapter, HedgingOptions
 from livekit.agents.tts.tts import SynthesizedAudio, SynthesizeStream
 from livekit.agents.utils.aio.channel import ChanEmpty
 
-from .fake_tts import FakeTTS
+from .fake_tts import FakeTTS, FakeTTSResponse
 
 
 class FallbackAdapterTester(FallbackAdapter):
@@ -21,11 +22,13 @@ class FallbackAdapterTester(FallbackAdapter):
         *,
         max_retry_per_tts: int = 1,  # only retry once by default
         sample_rate: int | None = None,
+        hedging: HedgingOptions | None = None,
     ) -> None:
         super().__init__(
             tts,
             max_retry_per_tts=max_retry_per_tts,
             sample_rate=sample_rate,
+            hedging=hedging,
         )
 
         self.on("tts_availability_changed", self._on_tts_availability_changed)
@@ -222,6 +225,22 @@ async def test_audio_resampled() -> None:
     await fallback_adapter.aclose()
 
 
+async def test_concurrent_streams_resampled() -> None:
+    fake1 = FakeTTS(fake_audio_duration=5.0, sample_rate=16000)
+    fallback_adapter = FallbackAdapterTester([fake1], sample_rate=48000)
+
+    async def _synthesize() -> rtc.AudioFrame:
+        async with fallback_adapter.synthesize("hello test") as stream:
+            return rtc.combine_audio_frames([data.frame async for data in stream])
+
+    # each synthesis is resampled on its own, the audio of the streams isn't mixed
+    for frame in await asyncio.gather(_synthesize(), _synthesize()):
+        assert frame.duration == 5.01
+        assert frame.sample_rate == 48000
+
+    await fallback_adapter.aclose()
+
+
 async def test_timeout():
     fake1 = FakeTTS(fake_timeout=0.5, sample_rate=48000)
     fake2 = FakeTTS(fake_timeout=0.5, sample_rate=48000)
@@ -263,3 +282,110 @@ async def test_timeout():
     assert await asyncio.wait_for(fake2.stream_ch.recv(), 1.0)
 
     await fallback_adapter.aclose()
+
+
+def _tts(ttfb: float, *, sample_rate: int = 24000) -> FakeTTS:
+    return FakeTTS(
+        sample_rate=sample_rate,
+        fake_responses=[FakeTTSResponse(input="hello", audio_duration=1.0, ttfb=ttfb, duration=0)],
+    )
+
+
+async def test_hedging_with_slow_primary() -> None:
+    fake1 = _tts(2.0)
+    fake2 = _tts(0.05, sample_rate=16000)
+
+    fallback_adapter = FallbackAdapterTester(
+        [fake1, fake2], hedging=HedgingOptions(delay=0.1, max_hedge_ratio=1.0)
+    )
+
+    started_at = time.perf_counter()
+    async with fallback_adapter.synthesize("hello") as stream:
+        frames = [data.frame async for data in stream]
+
+    assert time.perf_counter() - started_at < 1.0
+    assert fake1.synthesize_ch.recv_nowait()
+    assert fake2.synthesize_ch.recv_nowait()
+
+    # only the audio of the secondary TTS is used
+    combined_frame = rtc.combine_audio_frames(frames)
+    assert combined_frame.duration == pytest.approx(1.0, abs=0.02)
+    assert combined_frame.sample_rate == 24000
+
+    # the slow TTS isn't considered as unavailable
+    assert all(status.available for status in fallback_adapter._status)
+
+    started_at = time.perf_counter()
+    async with fallback_adapter.stream() as stream:
+        stream.push_text("hello")
+        stream.flush()
+        stream.end_input()
+
+        frames = [data.frame async for data in stream]
+
+    assert time.perf_counter() - started_at < 1.0
+    assert fake1.stream_ch.recv_nowait()
+    assert fake2.stream_ch.recv_nowait()
+
+    combined_frame = rtc.combine_audio_frames(frames)
+    assert combined_frame.duration == pytest.approx(1.0, abs=0.02)
+
+    # the cancelled syntheses of the slow TTS are recorded with their elapsed time
+    assert fallback_adapter._hedging is not None
+    assert len(fallback_adapter._hedging._ttfb[0]) == 2
+    assert min(fallback_adapter._hedging._ttfb[0]) >= 0.1
+
+    await fallback_adapter.aclose()
+
+
+async def test_no_hedging_with_fast_primary() -> None:
+    fake1 = _tts(0.05)
+    fake2 = _tts(0.01)
+
+    fallback_adapter = FallbackAdapterTester([fake1, fake2], hedging=HedgingOptions(delay=0.3))
+
+    async with fallback_adapter.synthesize("hello") as stream:
+        async for _ in stream:
+            pass
+
+    assert fake1.synthesize_ch.recv_nowait()
+    with pytest.raises(ChanEmpty):
+        fake2.synthesize_ch.recv_nowait()
+
+    # the delay is measured from the first text pushed to the stream
+    async with fallback_adapter.stream() as stream:
+        await asyncio.sleep(0.5)
+        stream.push_text("hello")
+        stream.flush()
+        stream.end_input()
+
+        async for _ in stream:
+            pass
+
+    assert fake1.stream_ch.recv_nowait()
+    with pytest.raises(ChanEmpty):
+        fake2.stream_ch.recv_nowait()
+
+    assert len(fallback_adapter._hedging._ttfb[0]) == 2
+    await fallback_adapter.aclose()
+
+
+async def test_hedging_budget() -> None:
+    fake1 = _tts(0.3)
+    fake2 = _tts(0.01)
+
+    fallback_adapter = FallbackAdapterTester(
+        [fake1, fake2], hedging=HedgingOptions(delay=0.05, max_hedge_ratio=0.0)
+    )
+
+    for _ in range(2):
+        async with fallback_adapter.synthesize("hello") as stream:
+            async for _ in stream:
+                pass
+
+    assert fake2.synthesize_ch.recv_nowait()
+    # the budget is exhausted, the second synthesis waited for the primary
+    with pytest.raises(ChanEmpty):
+        fake2.synthesize_ch.recv_nowait()
+
+    await fallback_adapter.aclose()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from livekit.agents.worker_load import (
+    RAMP_UP_DURATION,
+    LoadEstimator,
+    LoadSignals,
+    _job_counts,
+    _memory_usage,
+)
+
+
+def _signals(**kwargs) -> LoadSignals:
+    defaults = {
+        "cpu": 0.0,
+        "memory": 0.0,
+        "loop_lag": 0.0,
+        "inference_queue": 0,
+        "active_jobs": 0,
+        "pending_jobs": 0,
+        "ramping_jobs": 0,
+    }
+    defaults.update(kwargs)
+    return LoadSignals(**defaults)
+
+
+def test_job_cost_is_learned_from_steady_state():
+    estimator = LoadEstimator(initial_job_cost=0.05, job_cost_smoothing=1.0)
+
+    # idle worker: 10% used by the worker itself
+    assert estimator.estimate(_signals(cpu=0.1)) == pytest.approx(0.1)
+
+    # 4 steady jobs using 40% on top of the idle usage
+    assert estimator.estimate(_signals(cpu=0.5, active_jobs=4)) == pytest.approx(0.5)
+    assert estimator.job_cost == pytest.approx(0.1)
+
+    # ramping jobs aren't used to learn the cost
+    estimator.estimate(_signals(cpu=0.5, active_jobs=5, ramping_jobs=1))
+    assert estimator.job_cost == pytest.approx(0.1)
+
+
+def test_committed_jobs_are_predicted():
+    estimator = LoadEstimator(initial_job_cost=0.1)
+
+    # 3 jobs were just accepted, their cost isn't visible in the CPU usage yet
+    load = estimator.estimate(_signals(cpu=0.3, active_jobs=3, pending_jobs=2, ramping_jobs=1))
+    assert load == pytest.approx(0.6)
+
+    load = estimator.estimate(_signals(cpu=0.3, active_jobs=3, pending_jobs=10))
+    assert load == 1.0
+
+
+def test_highest_signal_is_reported():
+    estimator = LoadEstimator(max_loop_lag=0.5, max_inference_queue=10)
+
+    assert estimator.estimate(_signals(cpu=0.2, memory=0.8)) == pytest.approx(0.8)
+    assert estimator.estimate(_signals(cpu=0.2, loop_lag=0.25)) == pytest.approx(0.5)
+    assert estimator.estimate(_signals(cpu=0.2, inference_queue=9)) == pytest.approx(0.9)
+
+
+def test_job_counts():
+    now = 100.0
+    launch_times = [None, None, now - 1.0, now - RAMP_UP_DURATION - 1.0]
+    assert _job_counts(launch_times, now) == (2, 1)
+
+
+def test_cgroup_memory_usage(tmp_path: Path):
+    (tmp_path / "memory.max").write_text("1000\n")
+    (tmp_path / "memory.current").write_text("800\n")
+    (tmp_path / "memory.stat").write_text(
+        "anon 300\nfile 500\nactive_file 200\ninactive_file 300\n"
+    )
+
+    # the reclaimable page cache isn't counted
+    assert _memory_usage(str(tmp_path)) == pytest.approx(0.5)
+
+    (tmp_path / "memory.stat").unlink()
+    assert _memory_usage(str(tmp_path)) == pytest.approx(0.8)